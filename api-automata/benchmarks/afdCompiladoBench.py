@@ -0,0 +1,80 @@
+"""
+Benchmark do simulador compilado de AFDs.
+Compara DFA.accepts_input (automata-lib) com AfdCompilado.aceita e
+AfdCompilado.aceitaLote em lotes de 10^5 e 10^6 strings.
+
+Uso (a partir de api-automata/):
+    python benchmarks/afdCompiladoBench.py [--estados 50] [--tamanho 32]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automata.fa.dfa import DFA
+from services.afdCompilado import AfdCompilado
+
+
+def gerarAfd(n_estados: int, simbolos: list[str], semente: int) -> DFA:
+    """Gera um AFD completo aleatório."""
+    aleatorio = random.Random(semente)
+    estados = [f"q{i}" for i in range(n_estados)]
+    transicoes = {estado: {simbolo: aleatorio.choice(estados) for simbolo in simbolos} for estado in estados}
+    finais = {estado for estado in estados if aleatorio.random() < 0.5}
+    return DFA(
+        states = set(estados),
+        input_symbols = set(simbolos),
+        transitions = transicoes,
+        initial_state = "q0",
+        final_states = finais
+    )
+
+
+def gerarStrings(quantidade: int, tamanho_maximo: int, simbolos: list[str], semente: int) -> list[str]:
+    aleatorio = random.Random(semente)
+    return [
+        "".join(aleatorio.choices(simbolos, k = aleatorio.randint(0, tamanho_maximo)))
+        for _ in range(quantidade)
+    ]
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estados", type = int, default = 50)
+    parser.add_argument("--tamanho", type = int, default = 32, help = "Tamanho máximo das strings")
+    parser.add_argument("--quantidades", type = int, nargs = "+", default = [10**5, 10**6])
+    args = parser.parse_args()
+
+    simbolos = ["0", "1"]
+    afd = gerarAfd(args.estados, simbolos, semente = 1)
+    compilado = AfdCompilado.deAfd(afd)
+    print(f"AFD com {args.estados} estados, strings de até {args.tamanho} símbolos, NumPy: {compilado.vetorizado}")
+
+    for quantidade in args.quantidades:
+        strings = gerarStrings(quantidade, args.tamanho, simbolos, semente = quantidade)
+
+        esperado, t_lib = cronometrar(lambda: [afd.accepts_input(s) for s in strings])
+        unitario, t_unitario = cronometrar(lambda: [compilado.aceita(s) for s in strings])
+        lote, t_lote = cronometrar(lambda: compilado.aceitaLote(strings))
+
+        if unitario != esperado or lote != esperado:
+            raise SystemExit("Divergência entre o simulador compilado e DFA.accepts_input")
+
+        print(f"\n{quantidade} strings")
+        print(f"  automata-lib accepts_input: {t_lib:8.3f}s")
+        print(f"  AfdCompilado.aceita:        {t_unitario:8.3f}s  ({t_lib / t_unitario:5.1f}x)")
+        print(f"  AfdCompilado.aceitaLote:    {t_lote:8.3f}s  ({t_lib / t_lote:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
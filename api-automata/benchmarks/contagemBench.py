@@ -0,0 +1,89 @@
+"""
+Benchmark da contagem e da enumeração das strings aceitas por um AFD.
+A contagem é medida com a programação dinâmica e com a potência da matriz de
+transições para comprimentos crescentes (módulo 10^9 + 7), mostrando o
+método que contarPalavras escolhe. A enumeração das primeiras strings em
+ordem shortlex é comparada a gerar todas as strings do alfabeto, em ordem, e
+testar cada uma no AFD.
+
+Uso (a partir de api-automata/):
+    python benchmarks/contagemBench.py [--estados 20] [--quantidade 2000]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import afdOperacoes
+from services.afdCompilado import AfdCompilado
+
+MODULO = 10 ** 9 + 7
+
+
+def multiplos(estados: int) -> AfdCompilado:
+    """AFD sobre {a, b, c} que aceita as strings com quantidade de a múltipla de `estados`."""
+    nomes = [f"q{i}" for i in range(estados)]
+    transicoes = {
+        nome: {"a": nomes[(i + 1) % estados], "b": nome, "c": nome}
+        for i, nome in enumerate(nomes)
+    }
+    return AfdCompilado(set(nomes), {"a", "b", "c"}, transicoes, "q0", {"q0"})
+
+
+def cronometrar(funcao) -> tuple[float, object]:
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estados", type = int, default = 20)
+    parser.add_argument("--quantidade", type = int, default = 2000, help = "Strings enumeradas")
+    args = parser.parse_args()
+
+    afd = multiplos(args.estados)
+    util = afdOperacoes._subgrafoUtil(afd)
+    linhas = [[(destino, 1) for destino in set(saida)] for saida in util[0]]
+    print(f"AFD com {args.estados} estados; contagem módulo {MODULO}")
+    print(f"{'comprimento':>20} {'prog. dinâmica':>16} {'potência':>12}  escolhido")
+    for comprimento in (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 9, 10 ** 18):
+        if comprimento <= 10 ** 5:
+            tempo_avanco, vetor = cronometrar(lambda: afdOperacoes._avancar(linhas, comprimento, MODULO))
+            avanco = f"{tempo_avanco * 1000:13.2f} ms"
+        else:
+            vetor, avanco = None, f"{'-':>16}"
+        tempo_potencia, potencia = cronometrar(lambda: afdOperacoes._potencia(linhas, comprimento, MODULO))
+        if vetor is not None and vetor != potencia:
+            raise SystemExit("Os métodos divergiram")
+        metodo = afdOperacoes.contarPalavras(afd, comprimento, MODULO, max_operacoes = 10 ** 12)["metodo"]
+        print(f"{comprimento:>20} {avanco} {tempo_potencia * 1000:9.2f} ms  {metodo}")
+
+    tempo_enumeracao, palavras = cronometrar(
+        lambda: [item["palavra"] for item in itertools.islice(afdOperacoes.enumerarPalavras(afd), args.quantidade)]
+    )
+
+    def filtrar() -> list[str]:
+        encontradas = []
+        for comprimento in itertools.count():
+            for simbolos in itertools.product(afd.simbolos, repeat = comprimento):
+                palavra = "".join(simbolos)
+                if afd.aceita(palavra):
+                    encontradas.append(palavra)
+                    if len(encontradas) == args.quantidade:
+                        return encontradas
+
+    tempo_filtro, filtradas = cronometrar(filtrar)
+    if palavras != filtradas:
+        raise SystemExit("A enumeração divergiu do filtro")
+    print(f"\nPrimeiras {args.quantidade} strings aceitas (até comprimento {len(palavras[-1])})")
+    print(f"  enumeração:          {tempo_enumeracao * 1000:10.2f} ms")
+    print(f"  gerar e testar:      {tempo_filtro * 1000:10.2f} ms  ({tempo_filtro / tempo_enumeracao:7.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
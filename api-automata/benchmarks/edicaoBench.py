@@ -0,0 +1,108 @@
+"""
+Benchmark da edição incremental de autômatos grandes.
+Compara trocar uma transição reenviando a definição inteira para POST /criar
+(schemas pydantic, validação do automata-lib e compilação) com
+PATCH /editar, que confere e recompila só o estado alterado. Também mede
+uma edição que adiciona e remove estados. Cada edição parte do ID devolvido
+pela anterior; as definições reenviadas trocam outra transição, para que
+nenhuma das duas medições seja um reaproveitamento por hash.
+
+Uso (a partir de api-automata/):
+    python benchmarks/edicaoBench.py [--estados 2000 20000] [--repeticoes 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AUTOMATA_ARMAZENAMENTO", "memoria")
+
+from fastapi.testclient import TestClient
+from main import app
+from formatoCompactoBench import afdCompacto, afdComum, mtCompacta, mtComum
+
+
+def cronometrar(requisicao) -> tuple[float, dict]:
+    inicio = time.perf_counter()
+    resposta = requisicao().json()
+    duracao = time.perf_counter() - inicio
+    if "erro" in resposta:
+        raise SystemExit(f"Falha: {resposta}")
+    return duracao, resposta
+
+
+def edicoesAfd(definicao: dict, repeticoes: int):
+    """Pares (definição com outra transição de q1, edição de uma transição de q2)."""
+    for i in range(repeticoes):
+        destino = definicao["estados"][(i + 2) % len(definicao["estados"])]
+        definicao["transicoes"]["q1"]["0"] = destino
+        yield definicao, {"transicoes": {"q2": {"0": destino}}}
+
+
+def edicoesMt(definicao: dict, repeticoes: int):
+    """Pares (definição com outra transição de q1, edição de uma transição de q2)."""
+    for i in range(repeticoes):
+        destino = definicao["estados"][(i + 2) % (len(definicao["estados"]) - 1)]
+        _, escrito, direcao = definicao["transicoes"]["q1"]["a"]
+        definicao["transicoes"]["q1"]["a"] = [destino, escrito, direcao]
+        _, escrito, direcao = definicao["transicoes"]["q2"]["a"]
+        yield definicao, {"transicoes": {"q2": {"a": [destino, escrito, direcao]}}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estados", type = int, nargs = "+", default = [2000, 20000])
+    parser.add_argument("--repeticoes", type = int, default = 5)
+    args = parser.parse_args()
+
+    cliente = TestClient(app)
+    tipos = [
+        ("afd", lambda n: afdComum(afdCompacto(n, 0)), edicoesAfd, {"0": "q0", "1": "q0"}),
+        ("mt", lambda n: mtComum(mtCompacta(n, 0)), edicoesMt, {"a": ["q0", "a", "R"]})
+    ]
+    for tipo, gerar, edicoes, transicoes_novo in tipos:
+        for n_estados in args.estados:
+            definicao = gerar(n_estados)
+            automato_id = cliente.post(f"/api/{tipo}/criar", json = definicao).json()["id"]
+
+            def editarCronometrado(edicao: dict) -> float:
+                nonlocal automato_id
+                duracao, resposta = cronometrar(
+                    lambda: cliente.patch(f"/api/{tipo}/editar", json = {"id": automato_id, **edicao})
+                )
+                automato_id = resposta["id"]
+                return duracao
+
+            recriar, editar = [], []
+            for completa, edicao in edicoes(definicao, args.repeticoes):
+                corpo = json.dumps(completa)
+                recriar.append(cronometrar(lambda: cliente.post(
+                    f"/api/{tipo}/criar", content = corpo, headers = {"content-type": "application/json"}
+                ))[0])
+                editar.append(editarCronometrado(edicao))
+
+            # Cria um estado e remove o criado na rodada anterior
+            estados = []
+            for i in range(args.repeticoes):
+                edicao = {"adicionar_estados": [f"novo{i}"], "transicoes": {f"novo{i}": transicoes_novo}}
+                if i:
+                    edicao["remover_estados"] = [f"novo{i - 1}"]
+                estados.append(editarCronometrado(edicao))
+
+            referencia = statistics.median(recriar)
+            print(f"\n{tipo.upper()} com {n_estados} estados")
+            for nome, tempos in [
+                ("POST /criar (definição inteira)", recriar),
+                ("PATCH /editar (uma transição)", editar),
+                ("PATCH /editar (+1 e -1 estado)", estados)
+            ]:
+                mediana = statistics.median(tempos)
+                print(f"  {nome:34s} {mediana * 1000:10.2f} ms  ({referencia / mediana:7.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark da criação de autômatos grandes no formato comum e no compacto.
+Mede POST /criar (schemas pydantic + validação do automata-lib) contra
+POST /criar-compacto, com o corpo em JSON e, se o pacote estiver instalado,
+em msgpack. Cada requisição usa uma definição diferente, para que o cache
+de definições idênticas não interfira.
+
+Uso (a partir de api-automata/):
+    python benchmarks/formatoCompactoBench.py [--estados 2000 20000] [--repeticoes 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AUTOMATA_ARMAZENAMENTO", "memoria")
+
+from fastapi.testclient import TestClient
+from main import app
+from services.formatoCompacto import msgpack
+
+SIMBOLOS_AFD = ["0", "1"]
+SIMBOLOS_MT = ["a", "b", "X", "_"]
+
+
+def afdCompacto(n_estados: int, semente: int) -> dict:
+    aleatorio = random.Random(semente)
+    return {
+        "estados": [f"q{i}" for i in range(n_estados)],
+        "simbolos": SIMBOLOS_AFD,
+        "transicoes": [aleatorio.randrange(n_estados) for _ in range(n_estados * len(SIMBOLOS_AFD))],
+        "estado_inicial": 0,
+        "estados_finais": [i for i in range(n_estados) if aleatorio.random() < 0.5]
+    }
+
+
+def afdComum(compacto: dict) -> dict:
+    estados, simbolos = compacto["estados"], compacto["simbolos"]
+    k = len(simbolos)
+    return {
+        "estados": estados,
+        "simbolos": simbolos,
+        "transicoes": {
+            estado: {simbolo: estados[compacto["transicoes"][i * k + j]] for j, simbolo in enumerate(simbolos)}
+            for i, estado in enumerate(estados)
+        },
+        "estado_inicial": estados[compacto["estado_inicial"]],
+        "estados_finais": [estados[i] for i in compacto["estados_finais"]]
+    }
+
+
+def mtCompacta(n_estados: int, semente: int) -> dict:
+    # O último estado é o final e não tem transições; os demais têm uma por símbolo
+    aleatorio = random.Random(semente)
+    k = len(SIMBOLOS_MT)
+    transicoes = []
+    for estado in range(n_estados):
+        for _ in range(k):
+            if estado == n_estados - 1:
+                transicoes += [-1, 0, 0]
+            else:
+                transicoes += [aleatorio.randrange(n_estados), aleatorio.randrange(k), aleatorio.choice((-1, 1))]
+    return {
+        "estados": [f"q{i}" for i in range(n_estados)],
+        "simbolos_fita": SIMBOLOS_MT,
+        "simbolos_entrada": [0, 1],
+        "simbolo_branco": k - 1,
+        "transicoes": transicoes,
+        "estado_inicial": 0,
+        "estados_finais": [n_estados - 1]
+    }
+
+
+def mtComum(compacta: dict) -> dict:
+    estados, simbolos = compacta["estados"], compacta["simbolos_fita"]
+    direcoes = {-1: "L", 0: "N", 1: "R"}
+    transicoes = {}
+    tabela = compacta["transicoes"]
+    for celula in range(len(tabela) // 3):
+        destino, escrito, deslocamento = tabela[3 * celula:3 * celula + 3]
+        if destino >= 0:
+            origem, lido = divmod(celula, len(simbolos))
+            transicoes.setdefault(estados[origem], {})[simbolos[lido]] = [
+                estados[destino], simbolos[escrito], direcoes[deslocamento]
+            ]
+    return {
+        "estados": estados,
+        "simbolos_fita": simbolos,
+        "simbolos_entrada": [simbolos[i] for i in compacta["simbolos_entrada"]],
+        "transicoes": transicoes,
+        "estado_inicial": estados[compacta["estado_inicial"]],
+        "simbolo_branco": simbolos[compacta["simbolo_branco"]],
+        "estados_finais": [estados[i] for i in compacta["estados_finais"]]
+    }
+
+
+def medir(cliente: TestClient, rota: str, corpos: list[bytes], tipo_conteudo: str) -> list[float]:
+    tempos = []
+    for corpo in corpos:
+        inicio = time.perf_counter()
+        resposta = cliente.post(rota, content = corpo, headers = {"content-type": tipo_conteudo}).json()
+        tempos.append(time.perf_counter() - inicio)
+        if "id" not in resposta or resposta["reutilizado"]:
+            raise SystemExit(f"Falha ao criar em {rota}: {resposta}")
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estados", type = int, nargs = "+", default = [2000, 20000])
+    parser.add_argument("--repeticoes", type = int, default = 3)
+    args = parser.parse_args()
+
+    cliente = TestClient(app)
+    print(f"msgpack: {'instalado' if msgpack is not None else 'não instalado'}")
+
+    tipos = [
+        ("afd", afdCompacto, afdComum, len(SIMBOLOS_AFD)),
+        ("mt", mtCompacta, mtComum, len(SIMBOLOS_MT))
+    ]
+    for tipo, gerarCompacto, converterComum, k in tipos:
+        for n_estados in args.estados:
+            transicoes = n_estados * k
+            compactos = [gerarCompacto(n_estados, semente) for semente in range(4 * args.repeticoes)]
+            formatos = [
+                ("/criar (JSON)", f"/api/{tipo}/criar", "application/json",
+                 lambda dados: json.dumps(converterComum(dados)).encode()),
+                ("/criar-compacto (JSON)", f"/api/{tipo}/criar-compacto", "application/json",
+                 lambda dados: json.dumps(dados).encode())
+            ]
+            if msgpack is not None:
+                formatos.append(("/criar-compacto (msgpack)", f"/api/{tipo}/criar-compacto", "application/msgpack", msgpack.packb))
+
+            print(f"\n{tipo.upper()} com {n_estados} estados ({transicoes} transições)")
+            referencia = None
+            for i, (nome, rota, tipo_conteudo, codificar) in enumerate(formatos):
+                corpos = [codificar(dados) for dados in compactos[i * args.repeticoes:(i + 1) * args.repeticoes]]
+                mediana = statistics.median(medir(cliente, rota, corpos, tipo_conteudo))
+                referencia = referencia or mediana
+                print(
+                    f"  {nome:28s} {mediana:8.3f}s  {transicoes / mediana:12.0f} transições/s"
+                    f"  {len(corpos[0]) / 1024:9.0f} KiB  ({referencia / mediana:4.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark da inicialização da API.
+Cada repetição roda em um processo Python novo, para que nenhum módulo já
+esteja importado, e mede: a importação de main (o que o uvicorn faz antes de
+aceitar conexões), o primeiro POST /api/afd/criar e o primeiro
+POST /api/afd/testar bem-sucedido. Os motores do automata-lib e o Graphviz
+são carregados no primeiro uso, então o custo deles aparece no primeiro
+/criar, e não na importação.
+
+Uso (a partir de api-automata/):
+    python benchmarks/inicializacaoBench.py [--rotas afd,afn,ap,mt afd] [--repeticoes 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado em cada processo novo; imprime os tempos de cada fase em JSON
+PROCESSO = """
+import json, time
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+
+from fastapi.testclient import TestClient
+cliente = TestClient(main.app)
+afd = {
+    "estados": ["par", "impar"], "simbolos": ["0", "1"],
+    "transicoes": {"par": {"0": "par", "1": "impar"}, "impar": {"0": "impar", "1": "par"}},
+    "estado_inicial": "par", "estados_finais": ["par"]
+}
+antes_criar = time.perf_counter()
+afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+criado = time.perf_counter()
+resposta = cliente.post("/api/afd/testar", json = {"id": afd_id, "input": "0110"})
+testado = time.perf_counter()
+assert resposta.status_code == 200 and resposta.json()["aceita"], resposta.text
+print(json.dumps({
+    "importacao": importado - inicio,
+    "primeiro_criar": criado - antes_criar,
+    "primeiro_testar": testado - criado,
+    "modulos_automata": sorted(nome for nome in __import__("sys").modules if nome.startswith("automata."))
+}))
+"""
+
+
+def medir(rotas: str) -> dict:
+    ambiente = {**os.environ, "AUTOMATA_ROTAS": rotas, "AUTOMATA_ARMAZENAMENTO": "memoria"}
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROCESSO], cwd = RAIZ, env = ambiente,
+        capture_output = True, text = True, check = True
+    )
+    tempos = json.loads(saida.stdout.strip().splitlines()[-1])
+    tempos["processo"] = time.perf_counter() - inicio
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rotas", nargs = "+", default = ["afd,afn,ap,mt", "afd"],
+                        help = "Valores de AUTOMATA_ROTAS comparados")
+    parser.add_argument("--repeticoes", type = int, default = 5)
+    args = parser.parse_args()
+
+    fases = ("importacao", "primeiro_criar", "primeiro_testar", "processo")
+    print(f"{'AUTOMATA_ROTAS':16s}" + "".join(f"{fase:>18s}" for fase in fases) + f"{'até /testar':>18s}")
+    for rotas in args.rotas:
+        medicoes = [medir(rotas) for _ in range(args.repeticoes)]
+        medianas = {fase: statistics.median(medicao[fase] for medicao in medicoes) for fase in fases}
+        ate_testar = statistics.median(
+            medicao["importacao"] + medicao["primeiro_criar"] + medicao["primeiro_testar"] for medicao in medicoes
+        )
+        print(f"{rotas:16s}" + "".join(f"{medianas[fase] * 1000:15.1f} ms" for fase in fases) + f"{ate_testar * 1000:15.1f} ms")
+        print(f"{'':16s}módulos do automata-lib após o /testar: {', '.join(medicoes[-1]['modulos_automata'])}")
+
+
+if __name__ == "__main__":
+    main()
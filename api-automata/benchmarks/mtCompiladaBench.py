@@ -0,0 +1,94 @@
+"""
+Benchmark do executor compilado de MTs.
+Compara a execução passo a passo do automata-lib (DTM.read_input_stepwise)
+com MtCompilada.executar e com o modo acelerado (MtCompilada.executarAcelerada),
+em passos por segundo, usando uma MT que decide a^n b^n marcando um par de
+símbolos por varredura (cerca de 2n² passos). Como cada varredura atravessa
+poucas sequências de símbolos iguais, o modo acelerado faz O(n) macropassos.
+
+Uso (a partir de api-automata/):
+    python benchmarks/mtCompiladaBench.py [--tamanhos 50 200 1000 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automata.tm.dtm import DTM
+from services.mtCompilada import MtCompilada
+from services.mtService import _executarMt
+
+SEM_LIMITE = 10**12
+
+
+def gerarMt() -> DTM:
+    """MT que aceita a^n b^n."""
+    return DTM(
+        states = {"q0", "q1", "q2", "q3", "qf"},
+        input_symbols = {"a", "b"},
+        tape_symbols = {"a", "b", "X", "Y", "_"},
+        transitions = {
+            "q0": {"a": ("q1", "X", "R"), "Y": ("q3", "Y", "R")},
+            "q1": {"a": ("q1", "a", "R"), "Y": ("q1", "Y", "R"), "b": ("q2", "Y", "L")},
+            "q2": {"a": ("q2", "a", "L"), "Y": ("q2", "Y", "L"), "X": ("q0", "X", "R")},
+            "q3": {"Y": ("q3", "Y", "R"), "_": ("qf", "_", "R")}
+        },
+        initial_state = "q0",
+        blank_symbol = "_",
+        final_states = {"qf"}
+    )
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type = int, nargs = "+", default = [50, 200, 1000, 5000])
+    parser.add_argument("--limite-lib", type = float, default = 30.0,
+                        help = "Pula o automata-lib quando a estimativa passar deste tempo (segundos)")
+    args = parser.parse_args()
+
+    mt = gerarMt()
+    compilada = MtCompilada.deMt(mt)
+    passos_por_segundo_lib = None
+    n_anterior = None
+
+    for n in args.tamanhos:
+        entrada = "a" * n + "b" * n
+        rapido, t_compilada = cronometrar(lambda: compilada.executar(entrada, SEM_LIMITE, time.monotonic() + 3600, SEM_LIMITE))
+        passos = rapido["passos"]
+
+        print(f"\nn = {n} ({passos} passos, fita de {rapido['max_celulas_fita']} células)")
+        print(f"  MtCompilada.executar:          {t_compilada:8.3f}s  {passos / t_compilada:12.0f} passos/s")
+
+        acelerado, t_acelerada = cronometrar(lambda: compilada.executarAcelerada(entrada, SEM_LIMITE, time.monotonic() + 3600, SEM_LIMITE))
+        macro_passos = acelerado.pop("macro_passos")
+        if acelerado != rapido:
+            raise SystemExit("Divergência entre o modo acelerado e o executor compilado")
+        print(f"  MtCompilada.executarAcelerada: {t_acelerada:8.3f}s  {passos / t_acelerada:12.0f} passos/s  "
+              f"({t_compilada / t_acelerada:6.1f}x, {macro_passos} macropassos)")
+
+        # O automata-lib copia a fita a cada passo; evita execuções longas demais
+        estimativa = None if passos_por_segundo_lib is None else passos / passos_por_segundo_lib * (n / n_anterior)
+        if estimativa is not None and estimativa > args.limite_lib:
+            print(f"  automata-lib stepwise:         pulado (estimativa de {estimativa:.0f}s)")
+            continue
+
+        lento, t_lib = cronometrar(lambda: _executarMt(mt, entrada, SEM_LIMITE, time.monotonic() + 3600, SEM_LIMITE))
+        if lento != rapido:
+            raise SystemExit("Divergência entre o executor compilado e o automata-lib")
+
+        passos_por_segundo_lib = passos / t_lib
+        n_anterior = n
+        print(f"  automata-lib stepwise:         {t_lib:8.3f}s  {passos_por_segundo_lib:12.0f} passos/s  ({t_lib / t_compilada:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark da criação de AFDs a partir de expressões regulares.
+Para cada expressão, mede a primeira chamada a POST /api/afd/regex
+(compilação, determinização e minimização) e as seguintes, que reaproveitam
+o AFD registrado pelo par (expressão, alfabeto), e mostra os estados de cada
+etapa.
+
+Uso (a partir de api-automata/):
+    python benchmarks/regexBench.py [--repeticoes 20] [--n 12]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AUTOMATA_ARMAZENAMENTO", "memoria")
+
+from fastapi.testclient import TestClient
+from main import app
+
+
+def expressoes(n: int) -> list[tuple[str, list[str]]]:
+    """Expressões com AFDs de tamanhos variados; a última tem cerca de 2^n estados."""
+    return [
+        ("(ab|ba)*c?", ["a", "b", "c"]),
+        ("[0-9]+(\\.[0-9]+)?", list("0123456789.")),
+        ("[a-c]*(abc|bca){3,8}c?", ["a", "b", "c"]),
+        (f"(a|b)*a(a|b){{{n}}}", ["a", "b"])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type = int, default = 20)
+    parser.add_argument("--n", type = int, default = 12, help = "Tamanho da janela na última expressão")
+    args = parser.parse_args()
+
+    cliente = TestClient(app)
+    # Carrega o automata-lib antes das medições
+    cliente.post("/api/afd/regex", json = {"padrao": "a", "simbolos": ["a"]})
+
+    for padrao, simbolos in expressoes(args.n):
+        corpo = {"padrao": padrao, "simbolos": simbolos}
+        inicio = time.perf_counter()
+        resposta = cliente.post("/api/afd/regex", json = corpo).json()
+        primeira = time.perf_counter() - inicio
+        if "erro" in resposta:
+            raise SystemExit(f"Falha: {resposta}")
+
+        repetidas = []
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            if not cliente.post("/api/afd/regex", json = corpo).json()["reutilizado"]:
+                raise SystemExit("A expressão foi compilada de novo")
+            repetidas.append(time.perf_counter() - inicio)
+
+        regex = resposta["regex"]
+        mediana = statistics.median(repetidas)
+        print(f"\n{padrao}")
+        print(f"  estados: AFN {regex['estados_afn']}, determinizado {regex['estados_determinizados']}, mínimo {regex['estados']}")
+        print(f"  compilação:           {regex['compilacao_ms']:10.2f} ms")
+        print(f"  primeira requisição:  {primeira * 1000:10.2f} ms")
+        print(f"  reaproveitada:        {mediana * 1000:10.2f} ms  ({primeira / mediana:7.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
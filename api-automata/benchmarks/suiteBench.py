@@ -0,0 +1,411 @@
+"""
+Suíte de benchmarks reprodutível dos routers e services da API.
+Gera cargas paramétricas (AFDs e AFNs aleatórios de N estados, um AP de
+parênteses balanceados e MTs de incremento binário e de cópia), executa
+cada caminho chamando os services diretamente e pela aplicação FastAPI
+em processo (TestClient), e grava os resultados em JSON.
+
+Com --comparar, compara o menor tempo de cada caso (menos sensível a
+interferências da máquina que a mediana) com um resultado anterior e
+termina com código 1 se algum caso ficar mais lento que a tolerância.
+
+Uso (a partir de api-automata/):
+    python benchmarks/suiteBench.py --saida base.json
+    python benchmarks/suiteBench.py --saida atual.json --comparar base.json [--tolerancia 0.15]
+    python benchmarks/suiteBench.py --filtro afd/servico --tamanhos 10 1000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# As MTs de benchmark passam dos limites padrão nas entradas maiores, e o
+# armazenamento persistente mediria o disco em vez dos services. Os testes
+# repetem a mesma string, e /visualizar o mesmo autômato, então o cache de
+# resultados e o de visualizações também ficam desligados
+os.environ.setdefault("AUTOMATA_MT_MAX_PASSOS", str(10**9))
+os.environ.setdefault("AUTOMATA_MT_MAX_SEGUNDOS", "3600")
+os.environ.setdefault("AUTOMATA_MT_MAX_CELULAS_FITA", str(10**8))
+os.environ["AUTOMATA_ARMAZENAMENTO"] = "memoria"
+os.environ["AUTOMATA_CACHE_RESULTADOS"] = "0"
+os.environ["AUTOMATA_RENDER_CACHE_MEMORIA_MAX_BYTES"] = "0"
+os.environ["AUTOMATA_RENDER_CACHE_DIRETORIO"] = ""
+
+from fastapi.testclient import TestClient
+
+from main import app
+from schemas.afdSchema import afdInput
+from schemas.afnSchema import afnInput
+from schemas.apSchema import apInput
+from schemas.mtSchema import mtInput
+from services import afdService, afnService, apService, mtService
+
+# Trabalho estimado (símbolos lidos, ou passos nas MTs quadráticas) somado
+# de todas as strings de um /testar-lote
+ORCAMENTO_LOTE = 10**6
+
+# Duração mínima de cada amostra de tempo, em segundos
+DURACAO_AMOSTRA = 0.05
+
+
+# --- Cargas ---------------------------------------------------------------
+
+def definicaoAfd(n_estados: int, semente: int) -> dict:
+    """AFD completo aleatório sobre {0, 1}."""
+    aleatorio = random.Random(semente)
+    estados = [f"q{i}" for i in range(n_estados)]
+    return {
+        "estados": estados,
+        "simbolos": ["0", "1"],
+        "transicoes": {estado: {s: aleatorio.choice(estados) for s in "01"} for estado in estados},
+        "estado_inicial": "q0",
+        "estados_finais": [estado for estado in estados if aleatorio.random() < 0.5]
+    }
+
+
+def definicaoAfn(n_estados: int, semente: int) -> dict:
+    """AFN aleatório sobre {0, 1}, com até dois destinos por símbolo e algumas transições vazias."""
+    aleatorio = random.Random(semente)
+    estados = [f"q{i}" for i in range(n_estados)]
+    transicoes = {}
+    for estado in estados:
+        saidas = {s: aleatorio.sample(estados, aleatorio.randint(0, min(2, n_estados))) for s in "01"}
+        if aleatorio.random() < 0.2:
+            saidas[""] = [aleatorio.choice(estados)]
+        transicoes[estado] = saidas
+    return {
+        "estados": estados,
+        "simbolos": ["0", "1"],
+        "transicoes": transicoes,
+        "estado_inicial": "q0",
+        "estados_finais": [estado for estado in estados if aleatorio.random() < 0.3]
+    }
+
+
+def definicaoParenteses() -> dict:
+    """AP determinístico que aceita parênteses balanceados (por estado final)."""
+    return {
+        "estados": ["qa", "qb", "qc"],
+        "simbolos_entrada": ["(", ")"],
+        "simbolos_pilha": ["Z", "X"],
+        "transitions": {
+            "qa": {"(": {"Z": ["qb", "XZ"]}},
+            "qb": {"(": {"X": ["qb", "XX"]}, ")": {"X": ["qc", ""]}},
+            # qc só tem transições vazias: decide pelo topo se ainda há "(" aberto
+            "qc": {"": {"X": ["qb", "X"], "Z": ["qa", "Z"]}}
+        },
+        "estado_inicial": "qa",
+        "estados_finais": ["qa"],
+        "simbolo_inicial_pilha": "Z"
+    }
+
+
+def definicaoIncremento() -> dict:
+    """MT que soma 1 a um número binário (cerca de 2n passos)."""
+    return {
+        "estados": ["q0", "q1", "qf"],
+        "simbolos_entrada": ["0", "1"],
+        "simbolos_fita": ["0", "1", "_"],
+        "transicoes": {
+            "q0": {"0": ["q0", "0", "R"], "1": ["q0", "1", "R"], "_": ["q1", "_", "L"]},
+            "q1": {"1": ["q1", "0", "L"], "0": ["qf", "1", "N"], "_": ["qf", "1", "N"]}
+        },
+        "estado_inicial": "q0",
+        "simbolo_branco": "_",
+        "estados_finais": ["qf"]
+    }
+
+
+def definicaoCopia() -> dict:
+    """MT que transforma w em w#w, copiando um símbolo por varredura (cerca de 2n² passos)."""
+    return {
+        "estados": ["qi", "qv", "q0", "c0", "d0", "c1", "d1", "qr", "qs", "qf"],
+        "simbolos_entrada": ["0", "1"],
+        "simbolos_fita": ["0", "1", "A", "B", "#", "_"],
+        "transicoes": {
+            # Escreve o separador no fim da entrada e volta ao início
+            "qi": {"0": ["qi", "0", "R"], "1": ["qi", "1", "R"], "_": ["qv", "#", "L"]},
+            "qv": {"0": ["qv", "0", "L"], "1": ["qv", "1", "L"], "_": ["q0", "_", "R"]},
+            # Marca o próximo símbolo (0 -> A, 1 -> B) e o leva para o fim da cópia
+            "q0": {"0": ["c0", "A", "R"], "1": ["c1", "B", "R"], "#": ["qs", "#", "L"]},
+            "c0": {"0": ["c0", "0", "R"], "1": ["c0", "1", "R"], "#": ["d0", "#", "R"]},
+            "d0": {"0": ["d0", "0", "R"], "1": ["d0", "1", "R"], "_": ["qr", "0", "L"]},
+            "c1": {"0": ["c1", "0", "R"], "1": ["c1", "1", "R"], "#": ["d1", "#", "R"]},
+            "d1": {"0": ["d1", "0", "R"], "1": ["d1", "1", "R"], "_": ["qr", "1", "L"]},
+            "qr": {"0": ["qr", "0", "L"], "1": ["qr", "1", "L"], "#": ["qr", "#", "L"],
+                   "A": ["q0", "A", "R"], "B": ["q0", "B", "R"]},
+            # Restaura as marcas da entrada original
+            "qs": {"A": ["qs", "0", "L"], "B": ["qs", "1", "L"], "_": ["qf", "_", "N"]}
+        },
+        "estado_inicial": "qi",
+        "simbolo_branco": "_",
+        "estados_finais": ["qf"]
+    }
+
+
+def _comEstadoExtra(definicao: dict, semente: int) -> dict:
+    """Acrescenta um estado isolado, para que cada semente gere uma definição distinta."""
+    definicao["estados"] = [*definicao["estados"], f"v{semente}"]
+    return definicao
+
+
+def stringBinaria(tamanho: int, semente: int) -> str:
+    aleatorio = random.Random(semente)
+    return "".join(aleatorio.choices("01", k = tamanho))
+
+
+def stringParenteses(tamanho: int, semente: int) -> str:
+    """Palavra de Dyck aleatória com `tamanho` símbolos (arredondado para par)."""
+    aleatorio = random.Random(semente)
+    pares = tamanho // 2
+    a_abrir, profundidade, simbolos = pares, 0, []
+    while a_abrir or profundidade:
+        if a_abrir and (profundidade == 0 or aleatorio.random() < 0.5):
+            simbolos.append("(")
+            a_abrir -= 1
+            profundidade += 1
+        else:
+            simbolos.append(")")
+            profundidade -= 1
+    return "".join(simbolos)
+
+
+# Cada carga: tipo, nome, definição, schema, services, gerador de strings,
+# maior tamanho de entrada suportado em tempo razoável, custo estimado de
+# uma string (padrão: seu tamanho) e verificação do resultado
+def cargas(estados: list[int]) -> list[dict]:
+    lista = []
+    for n in estados:
+        lista.append({
+            "tipo": "afd", "nome": f"aleatorio{n}", "parametros": {"estados": n},
+            "definicao": lambda semente, n = n: definicaoAfd(n, semente),
+            "schema": afdInput, "service": afdService, "criar": afdService.criarAfd,
+            "visualizar": afdService.visualizarAfd, "string": stringBinaria, "tamanho_maximo": 10**6
+        })
+        lista.append({
+            "tipo": "afn", "nome": f"aleatorio{n}", "parametros": {"estados": n},
+            "definicao": lambda semente, n = n: definicaoAfn(n, semente),
+            "schema": afnInput, "service": afnService, "criar": afnService.criarAfn,
+            "visualizar": afnService.visualizarAfn, "string": stringBinaria, "tamanho_maximo": 10**6
+        })
+    lista.append({
+        "tipo": "ap", "nome": "parenteses", "parametros": {},
+        "definicao": lambda semente: _comEstadoExtra(definicaoParenteses(), semente),
+        "schema": apInput, "service": apService, "criar": apService.criarAp,
+        "visualizar": apService.visualizarAp, "string": stringParenteses, "tamanho_maximo": 10**6,
+        "verificar": lambda resposta, s: resposta["aceita"]
+    })
+    lista.append({
+        "tipo": "mt", "nome": "incremento", "parametros": {},
+        "definicao": lambda semente: _comEstadoExtra(definicaoIncremento(), semente),
+        "schema": mtInput, "service": mtService, "criar": mtService.criarMt,
+        "visualizar": mtService.visualizarMt, "string": stringBinaria, "tamanho_maximo": 10**6,
+        "verificar": lambda resposta, s: resposta["aceita"]
+            and int(resposta["fita_final"].strip("_"), 2) == int(s or "0", 2) + 1
+    })
+    lista.append({
+        "tipo": "mt", "nome": "copia", "parametros": {},
+        "definicao": lambda semente: _comEstadoExtra(definicaoCopia(), semente),
+        "schema": mtInput, "service": mtService, "criar": mtService.criarMt,
+        "visualizar": mtService.visualizarMt, "string": stringBinaria, "tamanho_maximo": 10**3,
+        "custo": lambda tamanho: 2 * tamanho * tamanho,
+        "verificar": lambda resposta, s: resposta["aceita"] and resposta["fita_final"].strip("_") == f"{s}#{s}"
+    })
+    return lista
+
+
+# --- Medição --------------------------------------------------------------
+
+def medir(funcao, repeticoes: int) -> dict:
+    """
+    Mede o tempo de uma chamada de `funcao`.
+
+    Uma chamada de aquecimento define quantas chamadas cada amostra faz,
+    para que operações de microssegundos durem ao menos DURACAO_AMOSTRA e
+    não fiquem dominadas pela resolução do relógio. Os tempos são por chamada.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    aquecimento = time.perf_counter() - inicio
+    chamadas = max(1, min(10_000, int(DURACAO_AMOSTRA / max(aquecimento, 1e-9))))
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+    return {
+        "mediana_s": statistics.median(tempos),
+        "min_s": min(tempos),
+        "max_s": max(tempos),
+        "repeticoes": repeticoes,
+        "chamadas_por_amostra": chamadas
+    }
+
+
+def _verificar(carga: dict, resposta: dict, input_string: str):
+    if "erro" in resposta:
+        raise SystemExit(f"{carga['tipo']}/{carga['nome']}: {resposta['erro']}")
+    verificar = carga.get("verificar")
+    if verificar is not None and not verificar(resposta, input_string):
+        raise SystemExit(f"{carga['tipo']}/{carga['nome']}: resultado incorreto para entrada de {len(input_string)} símbolos")
+
+
+def _lote(carga: dict, tamanho: int) -> list[str]:
+    custo = carga.get("custo", lambda tamanho: tamanho)(max(tamanho, 1))
+    return [carga["string"](tamanho, semente) for semente in range(max(1, ORCAMENTO_LOTE // custo))]
+
+
+def casosServico(carga: dict, tamanhos: list[int]):
+    tipo, service = carga["tipo"], carga["service"]
+    base = f"{tipo}/servico"
+
+    # Cada repetição cria uma definição nova, para medir a construção e não o cache
+    sementes = iter(range(1, 10**9))
+    yield f"{base}/criar", {}, lambda: carga["criar"](carga["schema"](**carga["definicao"](next(sementes))))
+
+    automato_id = carga["criar"](carga["schema"](**carga["definicao"](0)))["id"]
+    yield f"{base}/visualizar", {"formato": "dot"}, lambda: asyncio.run(carga["visualizar"](automato_id, "dot"))
+
+    for tamanho in tamanhos:
+        if tamanho > carga["tamanho_maximo"]:
+            continue
+        entrada = carga["string"](tamanho, tamanho)
+        _verificar(carga, service.testarString(automato_id, entrada), entrada)
+        yield f"{base}/testarString", {"tamanho": tamanho}, lambda: service.testarString(automato_id, entrada)
+
+        lote = _lote(carga, tamanho)
+        yield f"{base}/testarLote", {"tamanho": tamanho, "quantidade": len(lote)}, \
+            lambda: service.testarLote(automato_id, lote, True)
+
+
+def casosHttp(cliente: TestClient, carga: dict, tamanhos: list[int]):
+    tipo = carga["tipo"]
+    base = f"{tipo}/http"
+
+    def post(rota: str, corpo: dict) -> dict:
+        resposta = cliente.post(f"/api/{tipo}/{rota}", json = corpo)
+        resposta.raise_for_status()
+        return resposta.json()
+
+    sementes = iter(range(10**9, 2 * 10**9))
+    yield f"{base}/criar", {}, lambda: post("criar", carga["definicao"](next(sementes)))
+
+    automato_id = post("criar", carga["definicao"](0))["id"]
+    yield f"{base}/visualizar", {"formato": "dot"}, \
+        lambda: cliente.get(f"/api/{tipo}/visualizar", params = {"id": automato_id, "formato": "dot"}).raise_for_status()
+
+    for tamanho in tamanhos:
+        if tamanho > carga["tamanho_maximo"]:
+            continue
+        entrada = carga["string"](tamanho, tamanho)
+        _verificar(carga, post("testar", {"id": automato_id, "input": entrada}), entrada)
+        yield f"{base}/testar", {"tamanho": tamanho}, lambda: post("testar", {"id": automato_id, "input": entrada})
+
+        lote = _lote(carga, tamanho)
+        yield f"{base}/testar-lote", {"tamanho": tamanho, "quantidade": len(lote)}, \
+            lambda: post("testar-lote", {"id": automato_id, "inputs": lote, "resumo": True})
+
+
+def _chave(resultado: dict) -> str:
+    return f"{resultado['caso']} {json.dumps(resultado['parametros'], sort_keys = True)}"
+
+
+def executar(args) -> list[dict]:
+    resultados = []
+    cliente = TestClient(app)
+    for carga in cargas(args.estados):
+        for gerador in (casosServico(carga, args.tamanhos), casosHttp(cliente, carga, args.tamanhos)):
+            for caso, parametros, funcao in gerador:
+                caso = caso.replace(f"{carga['tipo']}/", f"{carga['tipo']}/{carga['nome']}/", 1)
+                if args.filtro and not any(filtro in caso for filtro in args.filtro):
+                    continue
+                resultado = {"caso": caso, "parametros": {**carga["parametros"], **parametros}}
+                resultado.update(medir(funcao, args.repeticoes))
+                resultados.append(resultado)
+                print(f"{_chave(resultado):70s} {resultado['mediana_s'] * 1000:12.3f} ms", flush = True)
+    return resultados
+
+
+def comparar(resultados: list[dict], caminho_base: str, tolerancia: float) -> bool:
+    """Imprime a razão atual/base de cada caso; retorna False se houver regressão."""
+    with open(caminho_base, encoding = "utf-8") as arquivo:
+        base = {_chave(resultado): resultado for resultado in json.load(arquivo)["resultados"]}
+
+    ok = True
+    print(f"\nComparação com {caminho_base} (tolerância {tolerancia:.0%})")
+    for resultado in resultados:
+        anterior = base.get(_chave(resultado))
+        if anterior is None:
+            print(f"  {_chave(resultado):70s} sem referência")
+            continue
+        razao = resultado["min_s"] / anterior["min_s"]
+        situacao = "REGRESSÃO" if razao > 1 + tolerancia else ("melhora" if razao < 1 - tolerancia else "")
+        ok = ok and razao <= 1 + tolerancia
+        print(f"  {_chave(resultado):70s} {razao:6.2f}x {situacao}")
+    return ok
+
+
+def _versao(pacote: str) -> str | None:
+    try:
+        return metadata.version(pacote)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estados", type = int, nargs = "+", default = [10, 100, 1000],
+                        help = "Número de estados dos AFDs e AFNs aleatórios")
+    parser.add_argument("--tamanhos", type = int, nargs = "+", default = [10, 1000, 100000, 1000000],
+                        help = "Tamanhos das entradas testadas")
+    parser.add_argument("--repeticoes", type = int, default = 5)
+    parser.add_argument("--filtro", nargs = "+", help = "Executa só os casos que contêm algum destes trechos")
+    parser.add_argument("--saida", help = "Arquivo JSON onde gravar os resultados")
+    parser.add_argument("--comparar", help = "Arquivo JSON de uma execução anterior usado como referência")
+    parser.add_argument("--tolerancia", type = float, default = 0.10,
+                        help = "Aumento relativo do menor tempo aceito antes de apontar regressão")
+    args = parser.parse_args()
+
+    resultados = executar(args)
+    relatorio = {
+        "ambiente": {
+            "data": datetime.now(timezone.utc).isoformat(timespec = "seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "automata-lib": _versao("automata-lib"),
+            "fastapi": _versao("fastapi"),
+            "pydantic": _versao("pydantic"),
+            "numpy": _versao("numpy")
+        },
+        "configuracao": {
+            "estados": args.estados,
+            "tamanhos": args.tamanhos,
+            "repeticoes": args.repeticoes,
+            "orcamento_lote": ORCAMENTO_LOTE,
+            "duracao_amostra_s": DURACAO_AMOSTRA
+        },
+        "resultados": resultados
+    }
+    if args.saida:
+        with open(args.saida, "w", encoding = "utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent = 2, ensure_ascii = False)
+
+    if args.comparar and not comparar(resultados, args.comparar, args.tolerancia):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Configurações da API.
+Os valores podem ser sobrescritos por variáveis de ambiente.
+"""
+
+import os
+import tempfile
+
+
+def _lerInt(nome: str, padrao: int) -> int:
+    """Lê uma variável de ambiente inteira, usando o padrão se ausente."""
+    valor = os.environ.get(nome)
+    return int(valor) if valor else padrao
+
+
+def _lerFloat(nome: str, padrao: float) -> float:
+    """Lê uma variável de ambiente decimal, usando o padrão se ausente."""
+    valor = os.environ.get(nome)
+    return float(valor) if valor else padrao
+
+
+# Tipos de autômato cujas rotas são registradas (separados por vírgula); os
+# demais não são nem importados
+ROTAS = [tipo.strip() for tipo in os.environ.get("AUTOMATA_ROTAS", "afd,afn,ap,mt").split(",") if tipo.strip()]
+
+# Registro de autômatos (por tipo de autômato)
+REGISTRO_MAX_AUTOMATOS = _lerInt("AUTOMATA_REGISTRO_MAX_AUTOMATOS", 10000)
+REGISTRO_MAX_BYTES = _lerInt("AUTOMATA_REGISTRO_MAX_BYTES", 256 * 1024 * 1024)
+REGISTRO_TTL_SEGUNDOS = _lerFloat("AUTOMATA_REGISTRO_TTL_SEGUNDOS", 3600.0)
+
+# Armazenamento persistente dos autômatos (services/armazenamentoService.py):
+# "memoria" (sem persistência), "sqlite" ou "arquivos", e o diretório dos dados
+ARMAZENAMENTO = os.environ.get("AUTOMATA_ARMAZENAMENTO", "memoria")
+ARMAZENAMENTO_CAMINHO = os.environ.get("AUTOMATA_ARMAZENAMENTO_CAMINHO", "automata-dados")
+
+# Histogramas de latência expostos em GET /metrics (services/metricasService.py)
+METRICAS = os.environ.get("AUTOMATA_METRICAS", "1") != "0"
+
+# Simulação de AFDs pela tabela compilada (services/afdCompilado.py)
+AFD_COMPILADO = os.environ.get("AUTOMATA_AFD_COMPILADO", "1") != "0"
+
+# Execução de MTs pela tabela compilada (services/mtCompilada.py)
+MT_COMPILADA = os.environ.get("AUTOMATA_MT_COMPILADA", "1") != "0"
+
+# Modo acelerado das MTs (fita comprimida e detecção de laços) quando a
+# requisição não informa "acelerada"
+MT_ACELERADA = os.environ.get("AUTOMATA_MT_ACELERADA", "0") == "1"
+
+# Máximo de pares de estados gerados pelas operações entre AFDs (services/afdOperacoes.py)
+AFD_OPERACOES_MAX_ESTADOS = _lerInt("AUTOMATA_AFD_OPERACOES_MAX_ESTADOS", 1_000_000)
+
+# Contagem e enumeração das strings aceitas por um AFD: máximo de operações
+# estimadas por contagem e maior comprimento contado sem módulo ou enumerado
+AFD_CONTAGEM_MAX_OPERACOES = _lerInt("AUTOMATA_AFD_CONTAGEM_MAX_OPERACOES", 50_000_000)
+AFD_CONTAGEM_MAX_COMPRIMENTO = _lerInt("AUTOMATA_AFD_CONTAGEM_MAX_COMPRIMENTO", 10_000)
+
+# Máximo de conjuntos de estados guardados na determinização sob demanda de cada AFN
+AFN_CACHE_MAX_CONJUNTOS = _lerInt("AUTOMATA_AFN_CACHE_MAX_CONJUNTOS", 4096)
+
+# Máximo de configurações (estado, posição, topo) exploradas por string em APs não determinísticos
+APN_MAX_CONFIGURACOES = _lerInt("AUTOMATA_APN_MAX_CONFIGURACOES", 1_000_000)
+
+# Rastreamento passo a passo (/rastrear): configurações por página (padrão e
+# máximo) e máximo de células da fita ou símbolos da pilha em cada configuração
+RASTREIO_PAGINA_PADRAO = _lerInt("AUTOMATA_RASTREIO_PAGINA_PADRAO", 1000)
+RASTREIO_PAGINA_MAX = _lerInt("AUTOMATA_RASTREIO_PAGINA_MAX", 100_000)
+RASTREIO_JANELA_MAX = _lerInt("AUTOMATA_RASTREIO_JANELA_MAX", 256)
+
+# Cache dos resultados de /testar (services/cacheResultados.py): liga/desliga
+# e limites de resultados guardados e de bytes estimados, somando todos os tipos
+CACHE_RESULTADOS = os.environ.get("AUTOMATA_CACHE_RESULTADOS", "1") != "0"
+CACHE_RESULTADOS_MAX_ITENS = _lerInt("AUTOMATA_CACHE_RESULTADOS_MAX_ITENS", 100_000)
+CACHE_RESULTADOS_MAX_BYTES = _lerInt("AUTOMATA_CACHE_RESULTADOS_MAX_BYTES", 64 * 1024 * 1024)
+
+# Tamanho, em bytes, de cada trecho lido de arquivos enviados para teste em stream
+STREAM_TAMANHO_TRECHO = _lerInt("AUTOMATA_STREAM_TAMANHO_TRECHO", 64 * 1024)
+
+# Limites globais de execução de MTs (por string testada)
+MT_MAX_PASSOS = _lerInt("AUTOMATA_MT_MAX_PASSOS", 1_000_000)
+MT_MAX_SEGUNDOS = _lerFloat("AUTOMATA_MT_MAX_SEGUNDOS", 10.0)
+MT_MAX_CELULAS_FITA = _lerInt("AUTOMATA_MT_MAX_CELULAS_FITA", 1_000_000)
+
+# Cache das imagens geradas em /visualizar
+RENDER_CACHE_MEMORIA_MAX_BYTES = _lerInt("AUTOMATA_RENDER_CACHE_MEMORIA_MAX_BYTES", 64 * 1024 * 1024)
+RENDER_CACHE_DIRETORIO = os.environ.get(
+    "AUTOMATA_RENDER_CACHE_DIRETORIO", os.path.join(tempfile.gettempdir(), "api-automata-render")
+)
+RENDER_CACHE_DISCO_MAX_BYTES = _lerInt("AUTOMATA_RENDER_CACHE_DISCO_MAX_BYTES", 512 * 1024 * 1024)
+
+# Renderização das visualizações: processos do Graphviz executados em paralelo,
+# renderizações aguardando ou em execução, e tempo máximo de cada uma
+RENDER_WORKERS = _lerInt("AUTOMATA_RENDER_WORKERS", min(4, os.cpu_count() or 1))
+RENDER_FILA_MAX = _lerInt("AUTOMATA_RENDER_FILA_MAX", 32)
+RENDER_TIMEOUT_SEGUNDOS = _lerFloat("AUTOMATA_RENDER_TIMEOUT_SEGUNDOS", 30.0)
+
+# Diagramas com mais elementos (estados + transições) que o limite usam um
+# motor de layout mais barato que o dot
+RENDER_LIMITE_ELEMENTOS = _lerInt("AUTOMATA_RENDER_LIMITE_ELEMENTOS", 500)
+RENDER_MOTOR_GRANDE = os.environ.get("AUTOMATA_RENDER_MOTOR_GRANDE", "sfdp")
@@ -1,26 +1,46 @@
 """
 API para manipulação de autômatos e máquinas de Turing.
-Fornece endpoints para criar, testar e visualizar AFDs, APs e MTs.
+Fornece endpoints para criar, testar e visualizar AFDs, AFNs, APs e MTs.
 """
 
+from importlib import import_module
+
+import config
 from fastapi import FastAPI
-from routers.afdRoute import router as afd_router
-from routers.apRoute import router as ap_router
-from routers.mtRoute import router as mt_router
+from fastapi.responses import PlainTextResponse
+from services.metricasService import MiddlewareMetricas, formatoPrometheus
+
+# Módulo e tag das rotas de cada tipo de autômato
+ROTEADORES = {
+    "afd": ("routers.afdRoute", "Autômatos Finitos"),
+    "afn": ("routers.afnRoute", "Autômatos Finitos Não Determinísticos"),
+    "ap": ("routers.apRoute", "Autômatos com Pilha"),
+    "mt": ("routers.mtRoute", "Maquinas de Turing")
+}
 
 app = FastAPI(
     title="Automata API",
-    description="API para manipulação de Autômatos Finitos Deterministicos, Automatos Com Pilha e Maquinas de Turing",
+    description="API para manipulação de Autômatos Finitos Deterministicos e Não Deterministicos, Automatos Com Pilha e Maquinas de Turing",
     version="1.0.0"
 )
 
-# Registra as rotas para cada tipo de autômato
-app.include_router(afd_router, prefix = "/api/afd", tags = ["Autômatos Finitos"])
-app.include_router(ap_router, prefix = "/api/ap", tags = ["Autômatos com Pilha"])
-app.include_router(mt_router, prefix = "/api/mt", tags = ["Maquinas de Turing"])
+app.add_middleware(MiddlewareMetricas)
+
+# Registra as rotas dos tipos de autômato habilitados em AUTOMATA_ROTAS
+for tipo in config.ROTAS:
+    if tipo not in ROTEADORES:
+        raise ValueError(f"Tipo de autômato desconhecido em AUTOMATA_ROTAS: {tipo}")
+    modulo, tag = ROTEADORES[tipo]
+    app.include_router(import_module(modulo).router, prefix = f"/api/{tipo}", tags = [tag])
 
 
 @app.get("/")
 async def root():
     """Rota principal que verifica se a API está funcionando."""
-    return {"message": "Rodando API"}
\ No newline at end of file
+    return {"message": "Rodando API"}
+
+
+@app.get("/metrics", response_class = PlainTextResponse, include_in_schema = False)
+async def metrics():
+    """Histogramas de latência e vazão no formato de texto do Prometheus."""
+    return PlainTextResponse(formatoPrometheus(), media_type = "text/plain; version=0.0.4; charset=utf-8")
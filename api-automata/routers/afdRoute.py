@@ -4,20 +4,42 @@ Fornece endpoints para criar, testar, visualizar e obter informações de AFDs.
 
 Endpoints:
     POST /criar: Cria novo AFD
-    POST /testar: Testa string no AFD atual
-    GET /info: Obtém informações do AFD atual 
-    GET /visualizar: Gera visualização do AFD atual
+    POST /criar-compacto: Cria novo AFD a partir de listas indexadas (JSON ou msgpack)
+    POST /regex: Cria o AFD mínimo de uma expressão regular
+    PATCH /editar: Cria um AFD com estados, transições e estados finais alterados
+    POST /testar: Testa string no AFD informado
+    POST /testar-lote: Testa várias strings no AFD informado
+    POST /testar-stream: Testa uma entrada enviada em partes no corpo da requisição
+    POST /testar-arquivo: Testa o conteúdo de um arquivo enviado (multipart)
+    GET/POST /rastrear: Lista, em NDJSON paginado, os estados visitados ao ler uma string
+    POST /uniao, /intersecao, /diferenca: Cria o AFD da operação entre dois AFDs
+    POST /complemento: Cria o AFD do complemento de um AFD
+    POST /equivalentes: Verifica se dois AFDs aceitam a mesma linguagem
+    POST /subconjunto: Verifica se a linguagem de um AFD está contida na de outro
+    GET /propriedades: Verifica se a linguagem do AFD é vazia e se é finita
+    GET /contar: Conta as strings de um comprimento aceitas pelo AFD
+    GET/POST /enumerar: Lista, em NDJSON paginado, as strings aceitas em ordem shortlex
+    GET /info: Obtém informações do AFD informado 
+    GET /visualizar: Gera visualização do AFD informado
+    GET /estatisticas: Obtém ocupação do registro e contadores do cache
 """
 
-from fastapi import APIRouter, HTTPException
-from schemas.afdSchema import afdInput, StringInput
-from services.afdService import criarAfd, testarString, getAfdInfo, visualizarAfd
-from fastapi.responses import FileResponse
+from importlib.util import find_spec
+
+import config
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from schemas.afdSchema import afdInput, StringInput, LoteInput, RastreioInput, IdInput, ParInput, EdicaoInput, RegexInput, EnumeracaoInput
+from services.afdService import criarAfd, testarString, testarLote, getAfdInfo, visualizarAfd, getEstatisticas
+from services.afdService import testarStream, testarLinhasStream, rastrear, criarAfdCompacto
+from services.afdService import operarAfds, complementarAfd, compararAfds, analisarLinguagem, editarAfd, criarAfdDeRegex
+from services.afdService import contarPalavras, enumerarPalavras
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()  
 
 @router.post("/criar")
-async def criar_afd(afd_input: afdInput):
+def criar_afd(afd_input: afdInput, minimizar: bool = False):
     """
     Cria um novo Autômato Finito Determinístico (AFD).
     
@@ -27,20 +49,88 @@ async def criar_afd(afd_input: afdInput):
     - transicoes: Função de transição do autômato
     - estado_inicial: Estado inicial do autômato
     - estados_finais: Conjunto de estados finais do autômato
+    - minimizar (query): Se verdadeiro, remove estados inalcançáveis e
+      minimiza o AFD antes de armazená-lo
     
     Retorna:
     - Mensagem de sucesso ou erro na criação do AFD
+    - id: Identificador do AFD, usado nos demais endpoints
+    - minimizacao: Com minimizar=true, quantidades de estados e transições
+      antes e depois, estados inalcançáveis e o mapa para os nomes originais
+    """
+    return criarAfd(afd_input, minimizar)
+
+
+@router.post("/criar-compacto")
+async def criar_afd_compacto(request: Request, minimizar: bool = False):
+    """
+    Cria um AFD a partir de uma definição compacta, indicada para AFDs grandes.
+
+    O corpo (JSON, ou msgpack com Content-Type application/msgpack) traz:
+    - estados, simbolos: Listas de nomes, referenciados pelo índice
+    - transicoes: Tabela plana com o índice do destino de cada estado e
+      símbolo, na posição estado * len(simbolos) + símbolo
+    - estado_inicial: Índice do estado inicial
+    - estados_finais: Índices dos estados finais
+    - minimizar (query): Como em /criar
+
+    Retorna:
+    - Mesmo formato de /criar
+    """
+    corpo = await request.body()
+    return await run_in_threadpool(criarAfdCompacto, corpo, request.headers.get("content-type", ""), minimizar)
+
+
+@router.post("/regex")
+def criar_afd_regex(input_data: RegexInput):
+    """
+    Cria o AFD mínimo que aceita as strings descritas por uma expressão regular.
+
+    Parameters:
+        input_data (RegexInput): Expressão e alfabeto
+            - padrao: Expressão com concatenação, |, *, +, ?, {m,n}, grupos,
+              . (qualquer símbolo) e classes [a-c] / [^a]; \\ torna literal
+              o caractere seguinte
+            - simbolos: Alfabeto do AFD, com símbolos de um caractere
+
+    Returns:
+        dict: Mesmo formato de /criar, com o relatório "regex" (estados do
+            AFN, da determinização e do AFD mínimo e compilacao_ms). A mesma
+            expressão sobre o mesmo alfabeto devolve o mesmo ID, sem compilar
+            de novo.
+    """
+    return criarAfdDeRegex(input_data.padrao, input_data.simbolos)
+
+
+@router.patch("/editar")
+def editar_afd(edicao: EdicaoInput):
     """
-    return criarAfd(afd_input)
+    Cria um AFD a partir do informado, com as alterações pedidas, sem
+    reconstruí-lo.
+
+    Só os estados tocados são conferidos e a tabela compilada é atualizada
+    apenas nas linhas deles. Os campos são aplicados nesta ordem:
+    - remover_estados: Estados apagados (nenhuma transição restante pode levar a eles)
+    - adicionar_estados: Estados novos, com uma transição por símbolo em transicoes
+    - transicoes: {estado: {símbolo: destino}} novas ou substituídas
+    - remover_finais / adicionar_finais: Estados finais
+
+    Retorna:
+    - Mensagem de sucesso ou erro, id do AFD editado (o original não muda),
+      reutilizado (um AFD idêntico já existia), editado_de, estados e
+      estados_conferidos
+    """
+    return editarAfd(edicao)
 
 
 @router.post("/testar")
-async def testar_string(input_data: StringInput):
+def testar_string(input_data: StringInput):
     """
-    Testa se uma string é aceita pelo AFD atual.
+    Testa se uma string é aceita pelo AFD informado.
     
     Parameters:
         input_data (StringInput): Dados para teste
+            - id: ID do AFD retornado em /criar
             - input: String a ser testada no autômato
     
     Returns:
@@ -48,14 +138,307 @@ async def testar_string(input_data: StringInput):
             - string: String testada
             - aceita: Booleano indicando aceitação
             - mensagem: Descrição do resultado
+            - cache: Se o resultado veio do cache de resultados
+    """
+    return testarString(input_data.id, input_data.input)
+
+
+@router.post("/testar-lote")
+def testar_lote(input_data: LoteInput):
+    """
+    Testa uma lista de strings no AFD informado.
+
+    Parameters:
+        input_data (LoteInput): Dados para teste
+            - id: ID do AFD retornado em /criar
+            - inputs: Strings a serem testadas
+            - resumo: Se verdadeiro, retorna só contagens e índices rejeitados
+
+    Returns:
+        dict: Resultado do lote contendo:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - aceitas, rejeitadas, indices_rejeitados: No modo resumo
+    """
+    return testarLote(input_data.id, input_data.inputs, input_data.resumo)
+
+
+class _RespostaNdjson(StreamingResponse):
+    """
+    Resposta NDJSON gerada enquanto o corpo da requisição ainda é lido.
+
+    O StreamingResponse padrão escuta `receive` em paralelo para detectar a
+    desconexão do cliente, o que consumiria os trechos do corpo que o gerador
+    de resultados está lendo. Aqui a resposta apenas repassa o gerador.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _responderStream(automato_id: str, trechos, linhas: bool):
+    if not linhas:
+        return await testarStream(automato_id, trechos)
+
+    resultado = testarLinhasStream(automato_id, trechos)
+    if isinstance(resultado, dict):
+        return resultado
+    return _RespostaNdjson(resultado)
+
+
+@router.post("/testar-stream")
+async def testar_stream(request: Request, automato_id: str = Query(alias = "id"), linhas: bool = False):
+    """
+    Testa uma entrada enviada no corpo da requisição, lida em partes.
+
+    O corpo é processado à medida que chega, guardando apenas o estado atual
+    do AFD, o que permite testar entradas maiores que a memória disponível.
+
+    Parameters:
+        id: ID do AFD retornado em /criar
+        linhas: Se verdadeiro, cada linha do corpo é testada como uma string
+            independente e os resultados são devolvidos em NDJSON
+
+    Returns:
+        dict: aceita, estado_final e simbolos_lidos da entrada inteira
+        StreamingResponse: No modo linhas, um objeto {"indice", "aceita"} por linha
+    """
+    return await _responderStream(automato_id, request.stream(), linhas)
+
+
+# O upload multipart depende do pacote opcional python-multipart
+if find_spec("python_multipart") or find_spec("multipart"):
+    from fastapi import File, UploadFile
+
+    async def _trechosArquivo(arquivo: UploadFile):
+        while trecho := await arquivo.read(config.STREAM_TAMANHO_TRECHO):
+            yield trecho
+
+    @router.post("/testar-arquivo")
+    async def testar_arquivo(
+        arquivo: UploadFile = File(...),
+        automato_id: str = Query(alias = "id"),
+        linhas: bool = False
+    ):
+        """
+        Testa o conteúdo de um arquivo enviado como multipart/form-data.
+
+        Parameters:
+            arquivo: Arquivo com a entrada
+            id: ID do AFD retornado em /criar
+            linhas: Se verdadeiro, testa cada linha do arquivo separadamente (NDJSON)
+
+        Returns:
+            Mesmo formato de /testar-stream
+        """
+        return await _responderStream(automato_id, _trechosArquivo(arquivo), linhas)
+
+
+def _respostaRastreio(resultado):
+    if isinstance(resultado, dict):
+        return resultado
+    return StreamingResponse(resultado, media_type = "application/x-ndjson")
+
+
+@router.post("/rastrear")
+def rastrear_string(input_data: RastreioInput):
+    """
+    Lista os estados pelos quais o AFD passa ao ler uma string.
+
+    Parameters:
+        input_data (RastreioInput): Dados do rastreamento
+            - id: ID do AFD retornado em /criar
+            - input: String a ser lida
+            - cursor: Primeiro passo da página (proximo_cursor da página anterior)
+            - limite: Máximo de configurações na página
+
+    Returns:
+        StreamingResponse: NDJSON com um objeto {"passo", "estado", "simbolo"}
+            por símbolo lido e, por último, {"fim": false, "proximo_cursor"}
+            ou {"fim": true, "situacao", "aceita", "estado_final", "passos"}
+    """
+    return _respostaRastreio(rastrear(input_data.id, input_data.input, input_data.cursor, input_data.limite))
+
+
+@router.get("/rastrear")
+def rastrear_string_get(
+    automato_id: str = Query(alias = "id"),
+    input_string: str = Query("", alias = "input"),
+    cursor: int = Query(0, ge = 0),
+    limite: int | None = Query(None, gt = 0)
+):
+    """Mesmo que POST /rastrear, com os parâmetros na query."""
+    return _respostaRastreio(rastrear(automato_id, input_string, cursor, limite))
+
+
+@router.post("/uniao")
+def uniao_afds(input_data: ParInput, minimizar: bool = False):
+    """
+    Cria o AFD que aceita as strings aceitas por algum dos dois AFDs.
+
+    Parameters:
+        input_data (ParInput): IDs dos AFDs (id_a e id_b)
+        minimizar: Se True, minimiza o AFD resultante antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de /criar, com o ID do novo AFD
+    """
+    return operarAfds(input_data.id_a, input_data.id_b, "uniao", minimizar)
+
+
+@router.post("/intersecao")
+def intersecao_afds(input_data: ParInput, minimizar: bool = False):
+    """
+    Cria o AFD que aceita as strings aceitas pelos dois AFDs.
+
+    Parameters:
+        input_data (ParInput): IDs dos AFDs (id_a e id_b)
+        minimizar: Se True, minimiza o AFD resultante antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de /criar, com o ID do novo AFD
+    """
+    return operarAfds(input_data.id_a, input_data.id_b, "intersecao", minimizar)
+
+
+@router.post("/diferenca")
+def diferenca_afds(input_data: ParInput, minimizar: bool = False):
+    """
+    Cria o AFD que aceita as strings aceitas por id_a e rejeitadas por id_b.
+
+    Parameters:
+        input_data (ParInput): IDs dos AFDs (id_a e id_b)
+        minimizar: Se True, minimiza o AFD resultante antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de /criar, com o ID do novo AFD
+    """
+    return operarAfds(input_data.id_a, input_data.id_b, "diferenca", minimizar)
+
+
+@router.post("/complemento")
+def complemento_afd(input_data: IdInput, minimizar: bool = False):
+    """
+    Cria o AFD que aceita as strings (sobre o mesmo alfabeto) rejeitadas pelo AFD informado.
+
+    Parameters:
+        input_data (IdInput): ID do AFD
+        minimizar: Se True, minimiza o AFD resultante antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de /criar, com o ID do novo AFD
     """
-    return testarString(input_data.input)
+    return complementarAfd(input_data.id, minimizar)
+
+
+@router.post("/equivalentes")
+def equivalentes_afds(input_data: ParInput):
+    """
+    Verifica se dois AFDs aceitam a mesma linguagem.
+
+    Parameters:
+        input_data (ParInput): IDs dos AFDs (id_a e id_b)
+
+    Returns:
+        dict: equivalentes (bool) e contraexemplo (menor string aceita por
+            só um dos AFDs, ou None)
+    """
+    return compararAfds(input_data.id_a, input_data.id_b)
+
+
+@router.post("/subconjunto")
+def subconjunto_afds(input_data: ParInput):
+    """
+    Verifica se toda string aceita por id_a também é aceita por id_b.
+
+    Parameters:
+        input_data (ParInput): IDs dos AFDs (id_a e id_b)
+
+    Returns:
+        dict: subconjunto (bool) e contraexemplo (menor string aceita por
+            id_a e rejeitada por id_b, ou None)
+    """
+    return compararAfds(input_data.id_a, input_data.id_b, inclusao = True)
+
+
+@router.get("/propriedades")
+def get_propriedades(automato_id: str = Query(alias = "id")):
+    """
+    Verifica se a linguagem do AFD informado é vazia e se é finita.
+
+    Parameters:
+        id: ID retornado em /criar
+
+    Returns:
+        dict: vazia, menor_aceita, finita e tamanho_maximo (maior string
+            aceita, se a linguagem for finita e não vazia)
+    """
+    return analisarLinguagem(automato_id)
+
+
+@router.get("/contar")
+def contar_palavras(
+    automato_id: str = Query(alias = "id"),
+    comprimento: int = Query(ge = 0),
+    modulo: int | None = Query(None, gt = 1)
+):
+    """
+    Conta as strings de um comprimento aceitas pelo AFD informado.
+
+    Parameters:
+        id: ID retornado em /criar
+        comprimento: Comprimento das strings
+        modulo: Se informado, o total é devolvido módulo este valor; é
+            necessário para comprimentos acima de AUTOMATA_AFD_CONTAGEM_MAX_COMPRIMENTO
+
+    Returns:
+        dict: comprimento, modulo, total, metodo (programação dinâmica ou
+            potência da matriz de transições) e estados_uteis
+    """
+    return contarPalavras(automato_id, comprimento, modulo)
+
+
+@router.post("/enumerar")
+def enumerar_palavras(input_data: EnumeracaoInput):
+    """
+    Lista as strings aceitas pelo AFD em ordem shortlex (por comprimento e,
+    no mesmo comprimento, em ordem alfabética).
+
+    Parameters:
+        input_data (EnumeracaoInput): Dados da enumeração
+            - id: ID do AFD retornado em /criar
+            - cursor: Índice da primeira string (proximo_cursor da página anterior)
+            - limite: Máximo de strings na página
+
+    Returns:
+        StreamingResponse: NDJSON com um objeto {"indice", "palavra"} por
+            string e, por último, {"fim": false, "proximo_cursor"},
+            {"fim": true, "total"} se as strings acabaram ou
+            {"fim": true, "comprimento_maximo"} se a enumeração chegou a
+            AUTOMATA_AFD_CONTAGEM_MAX_COMPRIMENTO ou {"fim": true,
+            "limite_operacoes"} se chegou a AUTOMATA_AFD_CONTAGEM_MAX_OPERACOES
+    """
+    return _respostaRastreio(enumerarPalavras(input_data.id, input_data.cursor, input_data.limite))
+
+
+@router.get("/enumerar")
+def enumerar_palavras_get(
+    automato_id: str = Query(alias = "id"),
+    cursor: int = Query(0, ge = 0),
+    limite: int | None = Query(None, gt = 0)
+):
+    """Mesmo que POST /enumerar, com os parâmetros na query."""
+    return _respostaRastreio(enumerarPalavras(automato_id, cursor, limite))
 
 
 @router.get("/info")
-async def get_info():
+def get_info(automato_id: str = Query(alias = "id")):
     """
-    Obtém informações do AFD atual.
+    Obtém informações do AFD informado.
     
     Returns:
         afdInfo: Informações completas do AFD
@@ -64,23 +447,53 @@ async def get_info():
             - transicoes: Função de transição
             - estado_inicial: Estado inicial
             - estados_finais: Estados finais
+            - memoria: Bytes ocupados pela definição e pelas tabelas compiladas
     """
-    return getAfdInfo()
+    return getAfdInfo(automato_id)
 
 
 
 @router.get("/visualizar")
-async def get_visualization():
+async def get_visualization(
+    automato_id: str = Query(alias = "id"),
+    formato: str = "png",
+    if_none_match: str | None = Header(default = None)
+):
     """
-    Gera visualização gráfica do AFD atual.
+    Gera visualização gráfica do AFD informado.
     
+    Parameters:
+        id: ID retornado em /criar
+        formato: "png" (padrão), "svg", "pdf" ou "dot" (código-fonte DOT, sem executar o Graphviz)
+
     Returns:
-        FileResponse: Imagem PNG do diagrama do AFD
+        Response: Imagem do diagrama do AFD no formato pedido
+            (304 sem corpo se o cabeçalho If-None-Match corresponder à ETag)
     
     Raises:
-        HTTPException: Se nenhum AFD foi criado
+        HTTPException: 400 se o AFD não existir ou o formato for inválido;
+            503 se a fila de renderização estiver cheia; 504 se exceder o tempo limite
     """
-    result = visualizarAfd()
+    result = await visualizarAfd(automato_id, formato, if_none_match)
     if "erro" in result:
-        raise HTTPException(status_code = 400, detail = result["erro"])
-    return FileResponse("afd_visualization.png")
\ No newline at end of file
+        raise HTTPException(status_code = result.get("codigo_http", 400), detail = result["erro"])
+    if result["imagem"] is None:
+        return Response(status_code = 304, headers = {"ETag": result["etag"]})
+    return Response(content = result["imagem"], media_type = result["media_type"], headers = {"ETag": result["etag"]})
+
+
+@router.get("/estatisticas")
+def get_estatisticas():
+    """
+    Obtém estatísticas do registro de AFDs.
+
+    Returns:
+        dict: Ocupação do registro e contadores do cache de criação
+            - automatos: Quantidade de AFDs armazenados
+            - bytes: Memória estimada ocupada
+            - cache_acertos: Criações que reaproveitaram um AFD idêntico
+            - cache_falhas: Criações que construíram um novo AFD
+            - cache_resultados: Ocupação, acertos, falhas e taxa_acertos do cache
+              de resultados de /testar
+    """
+    return getEstatisticas()
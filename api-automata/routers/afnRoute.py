@@ -0,0 +1,145 @@
+"""
+Router para manipulação de Autômatos Finitos Não Determinísticos (AFN).
+Fornece endpoints para criar, testar, visualizar e obter informações de AFNs.
+
+Endpoints:
+    POST /criar: Cria novo AFN
+    POST /testar: Testa string no AFN informado
+    POST /testar-lote: Testa várias strings no AFN informado
+    GET /info: Obtém informações do AFN informado
+    GET /visualizar: Gera visualização do AFN informado
+    GET /estatisticas: Obtém ocupação do registro e contadores do cache
+"""
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from schemas.afnSchema import afnInput, StringInput, LoteInput
+from services.afnService import criarAfn, testarString, testarLote, getAfnInfo, visualizarAfn, getEstatisticas
+from fastapi.responses import Response
+
+router = APIRouter()
+
+@router.post("/criar")
+def criar_afn(afn_input: afnInput, determinizar: bool = False):
+    """
+    Cria um novo Autômato Finito Não Determinístico (AFN).
+
+    Parâmetros:
+    - estados: Conjunto de estados do autômato
+    - simbolos: Alfabeto de entrada do autômato
+    - transicoes: {estado: {símbolo: [estados destino]}}, com "" para transições vazias
+    - estado_inicial: Estado inicial do autômato
+    - estados_finais: Conjunto de estados finais do autômato
+    - determinizar (query): Se verdadeiro, guarda as transições entre
+      conjuntos de estados à medida que são calculadas, para que testes
+      repetidos rodem na velocidade de um AFD
+
+    Retorna:
+    - Mensagem de sucesso ou erro na criação do AFN
+    - id: Identificador do AFN, usado nos demais endpoints
+    """
+    return criarAfn(afn_input, determinizar)
+
+
+@router.post("/testar")
+def testar_string(input_data: StringInput):
+    """
+    Testa se uma string é aceita pelo AFN informado.
+
+    Parameters:
+        input_data (StringInput): Dados para teste
+            - id: ID do AFN retornado em /criar
+            - input: String a ser testada no autômato
+
+    Returns:
+        dict: Resultado do teste contendo:
+            - string: String testada
+            - aceita: Booleano indicando aceitação
+            - estados_ativos: Estados alcançados ao fim da leitura
+            - mensagem: Descrição do resultado
+            - cache: Se o resultado veio do cache de resultados
+    """
+    return testarString(input_data.id, input_data.input)
+
+
+@router.post("/testar-lote")
+def testar_lote(input_data: LoteInput):
+    """
+    Testa uma lista de strings no AFN informado.
+
+    Parameters:
+        input_data (LoteInput): Dados para teste
+            - id: ID do AFN retornado em /criar
+            - inputs: Strings a serem testadas
+            - resumo: Se verdadeiro, retorna só contagens e índices rejeitados
+
+    Returns:
+        dict: Resultado do lote contendo:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - aceitas, rejeitadas, indices_rejeitados: No modo resumo
+    """
+    return testarLote(input_data.id, input_data.inputs, input_data.resumo)
+
+
+@router.get("/info")
+def get_info(automato_id: str = Query(alias = "id")):
+    """
+    Obtém informações do AFN informado.
+
+    Returns:
+        afnInfo: Informações completas do AFN
+            - estados: Conjunto de estados
+            - simbolos: Alfabeto
+            - transicoes: Função de transição
+            - estado_inicial: Estado inicial
+            - estados_finais: Estados finais
+            - determinizar: Se a determinização sob demanda está ativa
+            - memoria: Bytes ocupados pela definição e pelas tabelas compiladas
+    """
+    return getAfnInfo(automato_id)
+
+
+@router.get("/visualizar")
+async def get_visualization(
+    automato_id: str = Query(alias = "id"),
+    formato: str = "png",
+    if_none_match: str | None = Header(default = None)
+):
+    """
+    Gera visualização gráfica do AFN informado.
+
+    Parameters:
+        id: ID retornado em /criar
+        formato: "png" (padrão), "svg", "pdf" ou "dot" (código-fonte DOT, sem executar o Graphviz)
+
+    Returns:
+        Response: Imagem do diagrama do AFN no formato pedido
+            (304 sem corpo se o cabeçalho If-None-Match corresponder à ETag)
+
+    Raises:
+        HTTPException: 400 se o AFN não existir ou o formato for inválido;
+            503 se a fila de renderização estiver cheia; 504 se exceder o tempo limite
+    """
+    result = await visualizarAfn(automato_id, formato, if_none_match)
+    if "erro" in result:
+        raise HTTPException(status_code = result.get("codigo_http", 400), detail = result["erro"])
+    if result["imagem"] is None:
+        return Response(status_code = 304, headers = {"ETag": result["etag"]})
+    return Response(content = result["imagem"], media_type = result["media_type"], headers = {"ETag": result["etag"]})
+
+
+@router.get("/estatisticas")
+def get_estatisticas():
+    """
+    Obtém estatísticas do registro de AFNs.
+
+    Returns:
+        dict: Ocupação do registro e contadores do cache de criação
+            - automatos: Quantidade de AFNs armazenados
+            - bytes: Memória estimada ocupada
+            - cache_acertos: Criações que reaproveitaram um AFN idêntico
+            - cache_falhas: Criações que construíram um novo AFN
+            - cache_resultados: Ocupação, acertos, falhas e taxa_acertos do cache
+              de resultados de /testar
+    """
+    return getEstatisticas()
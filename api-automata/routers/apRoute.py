@@ -3,23 +3,28 @@ Router para manipulação de Autômatos com Pilha (AP).
 Fornece endpoints para criar, testar, visualizar e obter informações de APs.
 
 Endpoints:
-    POST /criar: Cria novo AP determinístico
-    POST /testar: Testa string no AP atual
-    GET /info: Obtém informações do AP atual 
-    GET /visualizar: Gera visualização do AP atual
+    POST /criar: Cria novo AP determinístico ou não determinístico
+    PATCH /editar: Cria um AP determinístico com estados, transições e estados finais alterados
+    POST /testar: Testa string no AP informado
+    POST /testar-lote: Testa várias strings no AP informado
+    GET/POST /rastrear: Lista, em NDJSON paginado, as configurações ao executar uma string
+    GET /info: Obtém informações do AP informado 
+    GET /visualizar: Gera visualização do AP informado
+    GET /estatisticas: Obtém ocupação do registro e contadores do cache
 """
 
-from fastapi import APIRouter, HTTPException
-from schemas.apSchema import apInput, StringInput
-from services.apService import criarAp, testarString, getApInfo, visualizarAp
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Query
+from schemas.apSchema import apInput, StringInput, LoteInput, RastreioInput, EdicaoInput
+from services.apService import criarAp, testarString, testarLote, getApInfo, visualizarAp, getEstatisticas, rastrear
+from services.apService import editarAp
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 
 @router.post("/criar")
-async def criar_ap(ap_input: apInput):
+def criar_ap(ap_input: apInput):
     """
-    Cria um novo Autômato com Pilha (AP) Determinístico.
+    Cria um novo Autômato com Pilha (AP), determinístico ou não.
 
     Parâmetros:
     - estados: Conjunto de estados (set)
@@ -29,36 +34,131 @@ async def criar_ap(ap_input: apInput):
     - estado_inicial: Estado inicial (str)
     - simbolo_inicial_pilha: Símbolo inicial da pilha (str)
     - estados_finais: Conjunto de estados finais (set)
+    - deterministico: Se falso, cria um AP não determinístico; cada
+      transição passa a ser uma lista de pares [estado, empilhar]
 
     Retorna:
-    - dict: Mensagem de sucesso/erro na criação
+    - dict: Mensagem de sucesso/erro na criação e id do AP,
+      usado nos demais endpoints
     """
     return criarAp(ap_input)
 
+@router.patch("/editar")
+def editar_ap(edicao: EdicaoInput):
+    """
+    Cria um AP determinístico a partir do informado, com as alterações pedidas.
+
+    Só os estados tocados são conferidos. Os campos são aplicados nesta ordem:
+    - remover_transicoes: {estado: {símbolo: [topos]}} cujas transições são apagadas
+    - remover_estados: Estados apagados (nenhuma transição restante pode levar a eles)
+    - adicionar_estados: Estados novos
+    - transicoes: {estado: {símbolo: {topo: [destino, empilhar]}}} novas ou
+      substituídas; o símbolo "" é a transição vazia
+    - remover_finais / adicionar_finais: Estados finais
+
+    Retorna:
+    - Mensagem de sucesso ou erro, id do AP editado (o original não muda),
+      reutilizado, editado_de, estados e estados_conferidos
+    """
+    return editarAp(edicao)
+
 @router.post("/testar")
-async def testar_string(input_data: StringInput):
+def testar_string(input_data: StringInput):
     """
-    Testa se uma string é aceita pelo AP atual.
+    Testa se uma string é aceita pelo AP informado.
 
     Parameters:
         input_data (StringInput): Dados para teste contendo:
+            - id: ID do AP retornado em /criar
             - input: String a ser processada pelo autômato
 
     Returns:
         dict: Resultado do teste com:
             - string: String testada
             - aceita: Status de aceitação (bool)
+            - situacao: "aceita", "rejeitada" ou "laco_epsilon" (laço infinito
+              de transições vazias interrompido); em APs não determinísticos,
+              "limite_excedido" se a busca passar do limite de configurações
+            - estado_final: Estado em que o AP parou (só determinísticos)
+            - passos: Transições aplicadas
+            - max_altura_pilha: Maior altura atingida pela pilha (só determinísticos)
+            - configuracoes: Configurações exploradas (só não determinísticos)
             - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
 
     Raises:
         HTTPException: Se ocorrer erro no processamento
     """
-    return testarString(input_data.input)
+    return testarString(input_data.id, input_data.input)
+
+@router.post("/testar-lote")
+def testar_lote(input_data: LoteInput):
+    """
+    Testa uma lista de strings no AP informado.
+
+    Parameters:
+        input_data (LoteInput): Dados para teste
+            - id: ID do AP retornado em /criar
+            - inputs: Strings a serem testadas
+            - resumo: Se verdadeiro, retorna só contagens e índices rejeitados
+
+    Returns:
+        dict: Resultado do lote contendo:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - situacoes: Situação de cada execução
+            - aceitas, rejeitadas, lacos_epsilon, limites_excedidos,
+              indices_rejeitados: No modo resumo
+    """
+    return testarLote(input_data.id, input_data.inputs, input_data.resumo)
+
+
+def _respostaRastreio(resultado):
+    if isinstance(resultado, dict):
+        return resultado
+    return StreamingResponse(resultado, media_type = "application/x-ndjson")
+
+
+@router.post("/rastrear")
+def rastrear_string(input_data: RastreioInput):
+    """
+    Lista as configurações de um AP determinístico ao ler uma string.
+
+    Parameters:
+        input_data (RastreioInput): Dados do rastreamento
+            - id: ID do AP retornado em /criar
+            - input: String a ser processada
+            - cursor: Primeiro passo da página (proximo_cursor da página anterior)
+            - limite: Máximo de configurações na página
+            - janela: Quantidade de símbolos do topo da pilha em cada configuração
+
+    Returns:
+        StreamingResponse: NDJSON com um objeto {"passo", "estado",
+            "posicao", "altura_pilha", "pilha"} por configuração (pilha do
+            topo para baixo) e, por último, {"fim": false, "proximo_cursor"}
+            ou {"fim": true, "situacao", "aceita", "estado_final", "passos", "max_altura_pilha"}
+    """
+    return _respostaRastreio(
+        rastrear(input_data.id, input_data.input, input_data.cursor, input_data.limite, input_data.janela)
+    )
+
+
+@router.get("/rastrear")
+def rastrear_string_get(
+    automato_id: str = Query(alias = "id"),
+    input_string: str = Query("", alias = "input"),
+    cursor: int = Query(0, ge = 0),
+    limite: int | None = Query(None, gt = 0),
+    janela: int | None = Query(None, ge = 0)
+):
+    """Mesmo que POST /rastrear, com os parâmetros na query."""
+    return _respostaRastreio(rastrear(automato_id, input_string, cursor, limite, janela))
+
 
 @router.get("/info")
-async def get_info():
+def get_info(automato_id: str = Query(alias = "id")):
     """
-    Obtém informações completas do AP atual.
+    Obtém informações completas do AP informado.
 
     Returns:
         apInfo: Estrutura com todos os dados do autômato contendo:
@@ -69,29 +169,60 @@ async def get_info():
             - estado_inicial: Estado inicial
             - estados_finais: Estados finais
             - simbolo_inicial_pilha: Símbolo inicial da pilha
+            - deterministico: Se o AP é determinístico
+            - memoria: Bytes ocupados pela definição e pelas tabelas compiladas
 
     Raises:
-        HTTPException: Se nenhum AP foi criado
+        HTTPException: Se o AP não existir
     """
-    return getApInfo()
+    return getApInfo(automato_id)
 
 @router.get("/visualizar")
-async def get_visualization():
+async def get_visualization(
+    automato_id: str = Query(alias = "id"),
+    formato: str = "png",
+    if_none_match: str | None = Header(default = None)
+):
     """
-    Gera diagrama do AP no formato PNG.
+    Gera diagrama do AP (PNG por padrão).
+
+    Parameters:
+        id: ID retornado em /criar
+        formato: "png" (padrão), "svg", "pdf" ou "dot" (código-fonte DOT, sem executar o Graphviz)
 
     Returns:
-        FileResponse: Imagem PNG do autômato
+        Response: Imagem do autômato no formato pedido
+            (304 sem corpo se o cabeçalho If-None-Match corresponder à ETag)
 
     Raises:
-        HTTPException: 400 se nenhum AP foi criado
+        HTTPException: 400 se o formato for inválido ou o AP não existir;
+            503 se a fila de renderização estiver cheia; 504 se exceder o tempo limite
 
     Notes:
         - Estados finais têm círculo duplo
         - Transições mostram: símbolo_entrada,pop_pilha/push_pilha
         - Layout horizontal para melhor visualização
     """
-    result = visualizarAp()
+    result = await visualizarAp(automato_id, formato, if_none_match)
     if "erro" in result:
-        raise HTTPException(status_code=400, detail=result["erro"])
-    return FileResponse("ap_visualization.png")
\ No newline at end of file
+        raise HTTPException(status_code = result.get("codigo_http", 400), detail = result["erro"])
+    if result["imagem"] is None:
+        return Response(status_code = 304, headers = {"ETag": result["etag"]})
+    return Response(content = result["imagem"], media_type = result["media_type"], headers = {"ETag": result["etag"]})
+
+
+@router.get("/estatisticas")
+def get_estatisticas():
+    """
+    Obtém estatísticas do registro de APs.
+
+    Returns:
+        dict: Ocupação do registro e contadores do cache de criação
+            - automatos: Quantidade de APs armazenados
+            - bytes: Memória estimada ocupada
+            - cache_acertos: Criações que reaproveitaram um AP idêntico
+            - cache_falhas: Criações que construíram um novo AP
+            - cache_resultados: Ocupação, acertos, falhas e taxa_acertos do cache
+              de resultados de /testar
+    """
+    return getEstatisticas()
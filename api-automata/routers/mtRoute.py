@@ -4,20 +4,27 @@ Fornece endpoints para criar, testar, visualizar e obter informações de MTs.
 
 Endpoints:
     POST /criar: Cria nova MT determinística
-    POST /testar: Testa string na MT atual
-    GET /info: Obtém informações da MT atual 
-    GET /visualizar: Gera visualização da MT atual
+    POST /criar-compacto: Cria nova MT a partir de listas indexadas (JSON ou msgpack)
+    PATCH /editar: Cria uma MT com estados, transições e estados finais alterados
+    POST /testar: Testa string na MT informada
+    POST /testar-lote: Testa várias strings na MT informada
+    GET/POST /rastrear: Lista, em NDJSON paginado, as configurações ao executar uma string
+    GET /info: Obtém informações da MT informada 
+    GET /visualizar: Gera visualização da MT informada
+    GET /estatisticas: Obtém ocupação do registro e contadores do cache
 """
 
-from fastapi import APIRouter, HTTPException
-from schemas.mtSchema import mtInput, StringInput
-from services.mtService import criarMt, testarString, getMtInfo, visualizarMt
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from schemas.mtSchema import mtInput, StringInput, LoteInput, RastreioInput, EdicaoInput
+from services.mtService import criarMt, testarString, testarLote, getMtInfo, visualizarMt, getEstatisticas, rastrear, criarMtCompacta
+from services.mtService import editarMt
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 
 @router.post("/criar")
-async def criar_mt(mt_input: mtInput):
+def criar_mt(mt_input: mtInput):
     """
     Cria uma nova Máquina de Turing (MT) determinística.
 
@@ -31,38 +38,171 @@ async def criar_mt(mt_input: mtInput):
     - simbolo_branco: Símbolo branco da fita (str)
 
     Retorna:
-    - dict: Mensagem de sucesso/erro na criação
+    - dict: Mensagem de sucesso/erro na criação e id da MT,
+      usado nos demais endpoints
 
     Raises:
         HTTPException: Se ocorrer erro na validação dos parâmetros
     """
     return criarMt(mt_input)
 
+
+@router.post("/criar-compacto")
+async def criar_mt_compacto(request: Request):
+    """
+    Cria uma MT a partir de uma definição compacta, indicada para MTs grandes.
+
+    O corpo (JSON, ou msgpack com Content-Type application/msgpack) traz:
+    - estados, simbolos_fita: Listas de nomes, referenciados pelo índice
+    - simbolos_entrada: Índices, em simbolos_fita, dos símbolos de entrada
+    - simbolo_branco: Índice do símbolo branco em simbolos_fita
+    - transicoes: Tabela plana com 3 inteiros (destino, símbolo escrito,
+      deslocamento -1, 0 ou 1) por estado e símbolo lido, a partir da
+      posição 3 * (estado * len(simbolos_fita) + símbolo); destino -1
+      indica que não há transição
+    - estado_inicial: Índice do estado inicial
+    - estados_finais: Índices dos estados finais
+
+    Retorna:
+    - Mesmo formato de /criar
+    """
+    corpo = await request.body()
+    return await run_in_threadpool(criarMtCompacta, corpo, request.headers.get("content-type", ""))
+
+@router.patch("/editar")
+def editar_mt(edicao: EdicaoInput):
+    """
+    Cria uma MT a partir da informada, com as alterações pedidas, sem
+    reconstruí-la.
+
+    Só os estados tocados são conferidos e a tabela compilada é atualizada
+    apenas nas linhas deles. Os campos são aplicados nesta ordem:
+    - remover_transicoes: {estado: [símbolos lidos]} cujas transições são apagadas
+    - remover_estados: Estados apagados (nenhuma transição restante pode levar a eles)
+    - adicionar_estados: Estados novos
+    - transicoes: {estado: {lido: [destino, escrito, direção]}} novas ou substituídas
+    - remover_finais / adicionar_finais: Estados finais (sem transições)
+
+    Retorna:
+    - Mensagem de sucesso ou erro, id da MT editada (a original não muda),
+      reutilizado (uma MT idêntica já existia), editado_de, estados e
+      estados_conferidos
+    """
+    return editarMt(edicao)
+
+
 @router.post("/testar")
-async def testar_string(input_data: StringInput):
+def testar_string(input_data: StringInput):
     """
-    Testa o processamento de uma string pela MT atual.
+    Testa o processamento de uma string pela MT informada.
 
     Parameters:
         input_data (StringInput): Dados para teste contendo:
+            - id: ID da MT retornado em /criar
             - input: String a ser processada na fita
+            - max_passos, max_segundos, max_celulas: Limites opcionais de
+              execução, que só podem reduzir os limites globais
+            - acelerada: Fita comprimida, atravessando sequências de um
+              símbolo de uma vez e detectando configurações repetidas
 
     Returns:
         dict: Resultado do teste com:
             - string: String testada
             - aceita: Status de aceitação (bool)
+            - situacao: "aceita", "rejeitada", "limite_excedido", "laco" ou "erro"
             - fita_final: Conteúdo final da fita
+            - estado_final: Estado em que a MT parou
+            - passos: Transições aplicadas
+            - max_celulas_fita: Maior tamanho atingido pela fita
+            - limite: Limite atingido ("passos", "tempo" ou "fita"), se houver
             - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
+    """
+    return testarString(
+        input_data.id, input_data.input,
+        input_data.max_passos, input_data.max_segundos, input_data.max_celulas, input_data.acelerada
+    )
 
-    Raises:
-        HTTPException: Se MT não existir ou erro no processamento
+@router.post("/testar-lote")
+def testar_lote(input_data: LoteInput):
     """
-    return testarString(input_data.input)
+    Testa uma lista de strings na MT informada.
+
+    Parameters:
+        input_data (LoteInput): Dados para teste
+            - id: ID da MT retornado em /criar
+            - inputs: Strings a serem testadas
+            - resumo: Se verdadeiro, retorna só contagens e índices rejeitados
+            - max_passos, max_celulas: Limites por string
+            - max_segundos: Tempo máximo para o lote inteiro
+            - acelerada: Modo acelerado, como em /testar
+
+    Returns:
+        dict: Resultado do lote contendo:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - situacoes: Situação de cada execução ("aceita", "rejeitada",
+              "limite_excedido", "laco" ou "erro")
+            - fitas_finais: Conteúdo final da fita de cada string
+            - passos: Transições aplicadas em cada string
+            - max_celulas_fita: Maior tamanho de fita atingido no lote
+            - aceitas, rejeitadas, limites_excedidos, lacos, erros,
+              indices_rejeitados, passos_total: No modo resumo
+    """
+    return testarLote(
+        input_data.id, input_data.inputs, input_data.resumo,
+        input_data.max_passos, input_data.max_segundos, input_data.max_celulas, input_data.acelerada
+    )
+
+
+def _respostaRastreio(resultado):
+    if isinstance(resultado, dict):
+        return resultado
+    return StreamingResponse(resultado, media_type = "application/x-ndjson")
+
+
+@router.post("/rastrear")
+def rastrear_string(input_data: RastreioInput):
+    """
+    Lista as configurações da MT ao executar uma string.
+
+    A execução respeita os limites globais de passos, tempo e células da fita.
+
+    Parameters:
+        input_data (RastreioInput): Dados do rastreamento
+            - id: ID da MT retornado em /criar
+            - input: String a ser processada
+            - cursor: Primeiro passo da página (proximo_cursor da página anterior)
+            - limite: Máximo de configurações na página
+            - janela: Quantidade de células de cada lado do cabeçote em cada configuração
+
+    Returns:
+        StreamingResponse: NDJSON com um objeto {"passo", "estado",
+            "cabecote", "inicio_janela", "fita"} por configuração e, por
+            último, {"fim": false, "proximo_cursor"} ou {"fim": true,
+            "situacao", "aceita", "estado_final", "passos", "max_celulas_fita", "limite"}
+    """
+    return _respostaRastreio(
+        rastrear(input_data.id, input_data.input, input_data.cursor, input_data.limite, input_data.janela)
+    )
+
+
+@router.get("/rastrear")
+def rastrear_string_get(
+    automato_id: str = Query(alias = "id"),
+    input_string: str = Query("", alias = "input"),
+    cursor: int = Query(0, ge = 0),
+    limite: int | None = Query(None, gt = 0),
+    janela: int | None = Query(None, ge = 0)
+):
+    """Mesmo que POST /rastrear, com os parâmetros na query."""
+    return _respostaRastreio(rastrear(automato_id, input_string, cursor, limite, janela))
+
 
 @router.get("/info")
-async def get_info():
+def get_info(automato_id: str = Query(alias = "id")):
     """
-    Obtém informações completas da MT atual.
+    Obtém informações completas da MT informada.
 
     Returns:
         mtInfo: Estrutura com todos os dados da máquina contendo:
@@ -73,22 +213,33 @@ async def get_info():
             - estado_inicial: Estado inicial
             - estados_finais: Estados finais
             - simbolo_branco: Símbolo branco
+            - memoria: Bytes ocupados pela definição e pelas tabelas compiladas
 
     Raises:
-        HTTPException: Se nenhuma MT foi criada
+        HTTPException: Se a MT não existir
     """
-    return getMtInfo()
+    return getMtInfo(automato_id)
 
 @router.get("/visualizar")
-async def get_visualization():
+async def get_visualization(
+    automato_id: str = Query(alias = "id"),
+    formato: str = "png",
+    if_none_match: str | None = Header(default = None)
+):
     """
-    Gera diagrama de estados da MT em formato PNG.
+    Gera diagrama de estados da MT (PNG por padrão).
+
+    Parameters:
+        id: ID retornado em /criar
+        formato: "png" (padrão), "svg", "pdf" ou "dot" (código-fonte DOT, sem executar o Graphviz)
 
     Returns:
-        FileResponse: Imagem PNG do diagrama
+        Response: Imagem do diagrama no formato pedido
+            (304 sem corpo se o cabeçalho If-None-Match corresponder à ETag)
 
     Raises:
-        HTTPException: 400 se nenhuma MT foi criada
+        HTTPException: 400 se o formato for inválido ou a MT não existir;
+            503 se a fila de renderização estiver cheia; 504 se exceder o tempo limite
 
     Notes:
         - Estados finais com círculo duplo
@@ -96,7 +247,26 @@ async def get_visualization():
         - Layout horizontal para melhor organização
         - Cabeçote de leitura/escrita representado nas transições
     """
-    result = visualizarMt()
+    result = await visualizarMt(automato_id, formato, if_none_match)
     if "erro" in result:
-        raise HTTPException(status_code=400, detail=result["erro"])
-    return FileResponse("mt_visualization.png")
\ No newline at end of file
+        raise HTTPException(status_code = result.get("codigo_http", 400), detail = result["erro"])
+    if result["imagem"] is None:
+        return Response(status_code = 304, headers = {"ETag": result["etag"]})
+    return Response(content = result["imagem"], media_type = result["media_type"], headers = {"ETag": result["etag"]})
+
+
+@router.get("/estatisticas")
+def get_estatisticas():
+    """
+    Obtém estatísticas do registro de MTs.
+
+    Returns:
+        dict: Ocupação do registro e contadores do cache de criação
+            - automatos: Quantidade de MTs armazenadas
+            - bytes: Memória estimada ocupada
+            - cache_acertos: Criações que reaproveitaram uma MT idêntica
+            - cache_falhas: Criações que construíram uma nova MT
+            - cache_resultados: Ocupação, acertos, falhas e taxa_acertos do cache
+              de resultados de /testar
+    """
+    return getEstatisticas()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, Set
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+from typing import Dict, List, Optional, Set
 
 class afdInput(BaseModel):
     estados: Set[str]
@@ -10,12 +10,64 @@ class afdInput(BaseModel):
 
 
 class StringInput(BaseModel):
+    id: str
     input: str
 
 
+class IdInput(BaseModel):
+    id: str
+
+
+class ParInput(BaseModel):
+    id_a: str
+    id_b: str
+
+
+class RegexInput(BaseModel):
+    padrao: str
+    # Alfabeto do AFD; cada símbolo tem um caractere
+    simbolos: Set[str]
+
+
+class EdicaoInput(BaseModel):
+    id: str
+    adicionar_estados: Set[str] = set()
+    remover_estados: Set[str] = set()
+    # Transições novas ou substituídas: {estado: {símbolo: destino}}
+    transicoes: Dict[str, Dict[str, str]] = {}
+    adicionar_finais: Set[str] = set()
+    remover_finais: Set[str] = set()
+
+
+class LoteInput(BaseModel):
+    id: str
+    inputs: List[str]
+    resumo: bool = False
+
+
+class RastreioInput(BaseModel):
+    id: str
+    input: str
+    # Primeiro passo da página (proximo_cursor da página anterior)
+    cursor: NonNegativeInt = 0
+    # Configurações por página; só pode reduzir AUTOMATA_RASTREIO_PAGINA_MAX
+    limite: Optional[PositiveInt] = None
+
+
+class EnumeracaoInput(BaseModel):
+    id: str
+    # Índice da primeira string da página (proximo_cursor da página anterior)
+    cursor: NonNegativeInt = 0
+    # Strings por página; só pode reduzir AUTOMATA_RASTREIO_PAGINA_MAX
+    limite: Optional[PositiveInt] = None
+
+
 class afdInfo(BaseModel):
     estados: Set[str]
     simbolos: Set[str]
     transicoes: Dict[str, Dict[str, str]]
     estado_inicial: str
-    estados_finais: Set[str]
\ No newline at end of file
+    estados_finais: Set[str]
+    mapa_estados: Optional[Dict[str, List[str]]] = None
+    # definicao_bytes, compilado_bytes e total_bytes
+    memoria: Dict[str, int]
\ No newline at end of file
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Dict, List, Set
+
+class afnInput(BaseModel):
+    estados: Set[str]
+    simbolos: Set[str]
+    # O símbolo "" representa as transições vazias (ε)
+    transicoes: Dict[str, Dict[str, Set[str]]]
+    estado_inicial: str
+    estados_finais: Set[str]
+
+
+class StringInput(BaseModel):
+    id: str
+    input: str
+
+
+class LoteInput(BaseModel):
+    id: str
+    inputs: List[str]
+    resumo: bool = False
+
+
+class afnInfo(BaseModel):
+    estados: Set[str]
+    simbolos: Set[str]
+    transicoes: Dict[str, Dict[str, Set[str]]]
+    estado_inicial: str
+    estados_finais: Set[str]
+    determinizar: bool
+    # definicao_bytes, compilado_bytes e total_bytes
+    memoria: Dict[str, int]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, Set, List
+from pydantic import BaseModel, NonNegativeInt, PositiveInt
+from typing import Dict, Set, List, Optional, Tuple, Union
 
 
 class apInput(BaseModel):
@@ -10,10 +10,38 @@ class apInput(BaseModel):
     estado_inicial: str
     estados_finais: Set[str]
     simbolo_inicial_pilha: str
+    deterministico: bool = True
+
+class EdicaoInput(BaseModel):
+    id: str
+    adicionar_estados: Set[str] = set()
+    remover_estados: Set[str] = set()
+    # Transições novas ou substituídas: {estado: {símbolo lido ou "": {topo: (destino, empilhar)}}}
+    transicoes: Dict[str, Dict[str, Dict[str, Tuple[str, Union[str, List[str]]]]]] = {}
+    # Transições apagadas: {estado: {símbolo lido ou "": {topo}}}
+    remover_transicoes: Dict[str, Dict[str, Set[str]]] = {}
+    adicionar_finais: Set[str] = set()
+    remover_finais: Set[str] = set()
 
 class StringInput(BaseModel):
+    id: str
     input: str
 
+class LoteInput(BaseModel):
+    id: str
+    inputs: List[str]
+    resumo: bool = False
+
+class RastreioInput(BaseModel):
+    id: str
+    input: str
+    # Primeiro passo da página (proximo_cursor da página anterior)
+    cursor: NonNegativeInt = 0
+    # Configurações por página; só pode reduzir AUTOMATA_RASTREIO_PAGINA_MAX
+    limite: Optional[PositiveInt] = None
+    # Símbolos do topo da pilha em cada configuração
+    janela: Optional[NonNegativeInt] = None
+
 class apInfo(BaseModel):
     estados: Set[str]
     simbolos_entrada: Set[str]
@@ -21,4 +49,7 @@ class apInfo(BaseModel):
     transitions: Dict[str, Dict[str, Dict[str, list]]]
     estado_inicial: str
     estados_finais: Set[str]
-    simbolo_inicial_pilha: str
\ No newline at end of file
+    simbolo_inicial_pilha: str
+    deterministico: bool = True
+    # definicao_bytes, compilado_bytes e total_bytes
+    memoria: Dict[str, int]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, Set, Tuple
+from pydantic import BaseModel, NonNegativeInt, PositiveFloat, PositiveInt
+from typing import Dict, List, Optional, Set, Tuple
 
 class mtInput(BaseModel):
     estados: Set[str]
@@ -11,7 +11,46 @@ class mtInput(BaseModel):
     simbolo_branco: str
 
 class StringInput(BaseModel):
+    id: str
     input: str
+    # Limites de execução; só podem reduzir os limites globais da API
+    max_passos: Optional[PositiveInt] = None
+    max_segundos: Optional[PositiveFloat] = None
+    max_celulas: Optional[PositiveInt] = None
+    # Fita comprimida com macropassos e detecção de laços (padrão: AUTOMATA_MT_ACELERADA)
+    acelerada: Optional[bool] = None
+
+class EdicaoInput(BaseModel):
+    id: str
+    adicionar_estados: Set[str] = set()
+    remover_estados: Set[str] = set()
+    # Transições novas ou substituídas: {estado: {símbolo lido: (destino, escrito, direção)}}
+    transicoes: Dict[str, Dict[str, Tuple[str, str, str]]] = {}
+    # Símbolos lidos cujas transições são apagadas: {estado: {símbolo lido}}
+    remover_transicoes: Dict[str, Set[str]] = {}
+    adicionar_finais: Set[str] = set()
+    remover_finais: Set[str] = set()
+
+class LoteInput(BaseModel):
+    id: str
+    inputs: List[str]
+    resumo: bool = False
+    # Limites de execução; só podem reduzir os limites globais da API
+    max_passos: Optional[PositiveInt] = None
+    max_segundos: Optional[PositiveFloat] = None
+    max_celulas: Optional[PositiveInt] = None
+    # Fita comprimida com macropassos e detecção de laços (padrão: AUTOMATA_MT_ACELERADA)
+    acelerada: Optional[bool] = None
+
+class RastreioInput(BaseModel):
+    id: str
+    input: str
+    # Primeiro passo da página (proximo_cursor da página anterior)
+    cursor: NonNegativeInt = 0
+    # Configurações por página; só pode reduzir AUTOMATA_RASTREIO_PAGINA_MAX
+    limite: Optional[PositiveInt] = None
+    # Células de cada lado do cabeçote em cada configuração
+    janela: Optional[NonNegativeInt] = None
 
 class mtInfo(BaseModel):
     estados: Set[str]
@@ -20,4 +59,6 @@ class mtInfo(BaseModel):
     transicoes: Dict[str, Dict[str, Tuple[str, str, str]]]
     estado_inicial: str
     estados_finais: Set[str]
-    simbolo_branco: str
\ No newline at end of file
+    simbolo_branco: str
+    # definicao_bytes, compilado_bytes e total_bytes
+    memoria: Dict[str, int]
\ No newline at end of file
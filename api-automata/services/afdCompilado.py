@@ -0,0 +1,285 @@
+"""
+Simulador compilado de AFDs.
+Converte estados e símbolos em inteiros e guarda as transições em uma
+tabela, permitindo testar lotes de strings de forma vetorizada com NumPy.
+"""
+
+from importlib.util import find_spec
+
+# NumPy é opcional; sem ele o lote é avaliado string a string. Ele só é
+# importado na primeira compilação, para não pesar na inicialização da API
+_NUMPY_DISPONIVEL = find_spec("numpy") is not None
+np = None
+
+
+def _carregarNumpy():
+    """Importa o NumPy na primeira chamada; retorna None se ele não estiver instalado."""
+    global np
+    if np is None and _NUMPY_DISPONIVEL:
+        import numpy
+        np = numpy
+    return np
+
+
+# Quantidade de strings processadas por bloco no modo vetorizado
+_STRINGS_POR_BLOCO = 1 << 16
+
+
+class AfdCompilado:
+    """
+    Tabela de transições densa de um AFD.
+
+    Os estados são numerados de 0 a n-1 e recebem um estado morto extra (n),
+    usado quando a string contém um símbolo fora do alfabeto. Na tabela
+    NumPy, a coluna `k` representa símbolos inválidos. Depois de uma edição,
+    `estados` pode ter posições vagas (None), que nenhuma transição alcança.
+    """
+
+    __slots__ = (
+        "estados", "simbolos", "inicial", "finais", "morto",
+        "_linhas", "_tabela", "_finais_np", "_lut"
+    )
+
+    def __init__(self, estados, simbolos, transicoes: dict, estado_inicial: str, estados_finais):
+        self.estados = sorted(estados)
+        self.simbolos = sorted(simbolos)
+        indice_estado = {estado: i for i, estado in enumerate(self.estados)}
+        indice_simbolo = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+
+        self.morto = len(self.estados)
+        self.inicial = indice_estado[estado_inicial]
+        self.finais = frozenset(indice_estado[estado] for estado in estados_finais)
+
+        # Uma linha por estado: símbolo -> índice do próximo estado.
+        # O estado morto não tem transições, então qualquer símbolo o mantém morto.
+        self._linhas = [
+            {simbolo: indice_estado[destino] for simbolo, destino in transicoes.get(estado, {}).items()}
+            for estado in self.estados
+        ]
+        self._linhas.append({})
+
+        self._tabela = None
+        if _carregarNumpy() is not None:
+            self._compilarTabela(transicoes, indice_estado, indice_simbolo)
+
+    def _compilarTabela(self, transicoes: dict, indice_estado: dict, indice_simbolo: dict):
+        k = len(self.simbolos)
+        tabela = np.full((self.morto + 1, k + 1), self.morto, dtype = np.int64)
+        for estado, saidas in transicoes.items():
+            for simbolo, destino in saidas.items():
+                tabela[indice_estado[estado], indice_simbolo[simbolo]] = indice_estado[destino]
+        self._tabela = tabela
+
+        finais = np.zeros(self.morto + 1, dtype = bool)
+        finais[list(self.finais)] = True
+        self._finais_np = finais
+
+        # Tabela de consulta: ponto de código Unicode -> coluna do símbolo.
+        # As strings são lidas caractere a caractere, então só símbolos de um
+        # caractere podem casar; o último índice captura qualquer outro caractere.
+        unitarios = [simbolo for simbolo in self.simbolos if len(simbolo) == 1]
+        maior = max((ord(simbolo) for simbolo in unitarios), default = 0)
+        lut = np.full(maior + 2, k, dtype = np.int64)
+        for simbolo in unitarios:
+            lut[ord(simbolo)] = indice_simbolo[simbolo]
+        self._lut = lut
+
+    @classmethod
+    def deAfd(cls, afd) -> "AfdCompilado":
+        """Compila um DFA do automata-lib."""
+        return cls(afd.states, afd.input_symbols, afd.transitions, afd.initial_state, afd.final_states)
+
+    def editado(self, removidos, linhas: dict, estados_finais) -> "AfdCompilado":
+        """
+        Cópia da tabela com estados removidos e linhas substituídas ou
+        adicionadas, sem recompilar os demais estados.
+
+        Um estado removido deixa sua posição vaga (sem nome e sem
+        transições), reaproveitada pelo próximo estado adicionado; os índices
+        dos outros estados não mudam. O alfabeto é o mesmo.
+
+        Args:
+            removidos: Nomes dos estados removidos; nenhum estado restante leva a eles
+            linhas (dict): Transições {símbolo: destino} dos estados adicionados
+                e dos alterados, completas
+            estados_finais: Estados finais após a edição
+
+        Returns:
+            AfdCompilado: Nova tabela; a original continua válida para quem a estiver usando
+        """
+        estados = list(self.estados)
+        indice = {estado: i for i, estado in enumerate(estados) if estado is not None}
+        vagas = [i for i, estado in enumerate(estados) if estado is None]
+        alterados = []
+        # Um estado removido e recriado mantém o índice, ao qual outras linhas ainda levam
+        for estado in set(removidos) - linhas.keys():
+            i = indice.pop(estado)
+            estados[i] = None
+            vagas.append(i)
+            alterados.append(i)
+        for estado in linhas:
+            if estado not in indice:
+                if vagas:
+                    i = vagas.pop()
+                else:
+                    i = len(estados)
+                    estados.append(None)
+                estados[i] = estado
+                indice[estado] = i
+
+        copia = object.__new__(AfdCompilado)
+        copia.estados = estados
+        copia.simbolos = self.simbolos
+        copia.inicial = self.inicial
+        copia.morto = len(estados)
+        copia.finais = frozenset(indice[estado] for estado in estados_finais)
+
+        # As linhas vagas e as do estado morto ficam vazias; as demais são compartilhadas
+        copia._linhas = self._linhas[:self.morto] + [{}] * (copia.morto + 1 - self.morto)
+        for i in alterados:
+            copia._linhas[i] = {}
+        for estado, saidas in linhas.items():
+            copia._linhas[indice[estado]] = {simbolo: indice[destino] for simbolo, destino in saidas.items()}
+            alterados.append(indice[estado])
+
+        copia._tabela = None
+        if self._tabela is not None and _carregarNumpy() is not None:
+            copia._editarTabela(self, alterados)
+        return copia
+
+    def _editarTabela(self, original: "AfdCompilado", alterados: list[int]):
+        k = len(self.simbolos)
+        if self.morto == original.morto:
+            tabela = original._tabela.copy()
+        else:
+            # Estados novos no fim: o estado morto passa para a última linha
+            tabela = np.full((self.morto + 1, k + 1), self.morto, dtype = np.int64)
+            anterior = original._tabela[:original.morto]
+            tabela[:original.morto] = np.where(anterior == original.morto, self.morto, anterior)
+        for i in alterados:
+            linha = self._linhas[i]
+            tabela[i, :k] = [linha.get(simbolo, self.morto) for simbolo in self.simbolos]
+        self._tabela = tabela
+
+        finais = np.zeros(self.morto + 1, dtype = bool)
+        finais[list(self.finais)] = True
+        self._finais_np = finais
+        self._lut = original._lut
+
+    @property
+    def vetorizado(self) -> bool:
+        """Indica se o teste em lote usa NumPy."""
+        return self._tabela is not None
+
+    def avancar(self, estado: int, trecho: str) -> int:
+        """
+        Lê um trecho de entrada a partir de um estado e retorna o estado alcançado.
+        Permite processar uma entrada em partes, guardando só o estado entre elas.
+        """
+        linhas = self._linhas
+        morto = self.morto
+        for simbolo in trecho:
+            estado = linhas[estado].get(simbolo, morto)
+            if estado == morto:
+                return morto
+        return estado
+
+    def proximo(self, estado: int, simbolo: str) -> int:
+        """Estado (índice) alcançado ao ler um símbolo; o estado morto se não houver transição."""
+        return self._linhas[estado].get(simbolo, self.morto)
+
+    def aceitaEstado(self, estado: int) -> bool:
+        """Indica se o estado (índice) é de aceitação."""
+        return estado in self.finais
+
+    def nomeEstado(self, estado: int) -> str | None:
+        """Nome original do estado, ou None para o estado morto."""
+        return None if estado == self.morto else self.estados[estado]
+
+    def aceita(self, input_string: str) -> bool:
+        """Verifica se uma string é aceita, com o mesmo resultado de DFA.accepts_input."""
+        return self.avancar(self.inicial, input_string) in self.finais
+
+    def rastrear(self, input_string: str, inicio: int = 0):
+        """
+        Gera as configurações da leitura de uma string, uma por símbolo lido.
+
+        A configuração do passo `i` é o estado alcançado após ler `i` símbolos.
+        As anteriores a `inicio` são calculadas, mas não geradas. Um símbolo
+        sem transição encerra a leitura.
+
+        Args:
+            input_string (str): String a ser lida
+            inicio (int): Primeiro passo gerado
+
+        Returns:
+            dict: Valor de retorno do gerador: situacao, aceita, estado_final e passos
+        """
+        linhas = self._linhas
+        morto = self.morto
+        estado = self.inicial
+        passos = 0
+        if inicio == 0:
+            yield {"passo": 0, "estado": self.estados[estado], "simbolo": None}
+
+        for simbolo in input_string:
+            proximo = linhas[estado].get(simbolo, morto)
+            if proximo == morto:
+                break
+            estado = proximo
+            passos += 1
+            if passos >= inicio:
+                yield {"passo": passos, "estado": self.estados[estado], "simbolo": simbolo}
+
+        aceita = passos == len(input_string) and estado in self.finais
+        return {
+            "situacao": "aceita" if aceita else "rejeitada",
+            "aceita": aceita,
+            "estado_final": self.estados[estado],
+            "passos": passos
+        }
+
+    def aceitaLote(self, inputs: list[str]) -> list[bool]:
+        """
+        Verifica a aceitação de várias strings.
+
+        Com NumPy, as strings de cada bloco são ordenadas da maior para a
+        menor e avançadas em conjunto, um símbolo por vez, indexando a tabela
+        de transições. Na posição `j`, só o prefixo de strings com mais de `j`
+        símbolos continua ativo, então não há custo de preenchimento.
+        """
+        if self._tabela is None:
+            return [self.aceita(input_string) for input_string in inputs]
+        # Uma tabela restaurada do armazenamento não passou por __init__
+        _carregarNumpy()
+
+        resultado: list[bool] = []
+        for inicio in range(0, len(inputs), _STRINGS_POR_BLOCO):
+            resultado.extend(self._aceitaBloco(inputs[inicio:inicio + _STRINGS_POR_BLOCO]))
+        return resultado
+
+    def _aceitaBloco(self, bloco: list[str]) -> list[bool]:
+        tamanhos = np.array(list(map(len, bloco)), dtype = np.int64)
+        inicios = np.cumsum(tamanhos) - tamanhos
+
+        # Símbolos de todas as strings do bloco, concatenados
+        codigos = np.frombuffer("".join(bloco).encode("utf-32-le"), dtype = np.uint32)
+        simbolos = self._lut[np.minimum(codigos, len(self._lut) - 1)]
+
+        # Ordena por tamanho decrescente: as strings ativas formam sempre um prefixo
+        ordem = np.argsort(-tamanhos, kind = "stable")
+        inicios = inicios[ordem]
+        ativos_por_posicao = np.searchsorted(-tamanhos[ordem], -np.arange(int(tamanhos.max(initial = 0))), side = "left")
+
+        colunas = self._tabela.shape[1]
+        tabela = self._tabela.ravel()
+        estados = np.full(len(bloco), self.inicial, dtype = np.int64)
+        for posicao, ativos in enumerate(ativos_por_posicao):
+            atuais = estados[:ativos]
+            atuais *= colunas
+            atuais += simbolos[inicios[:ativos] + posicao]
+            estados[:ativos] = tabela[atuais]
+
+        aceitas = np.empty(len(bloco), dtype = bool)
+        aceitas[ordem] = self._finais_np[estados]
+        return aceitas.tolist()
@@ -0,0 +1,123 @@
+"""
+Minimização de AFDs.
+Remove estados inalcançáveis e junta estados equivalentes pelo algoritmo
+de Hopcroft, mantendo o mapeamento para os nomes originais.
+"""
+
+from collections import deque
+
+
+def estadosAlcancaveis(transicoes: dict, estado_inicial: str) -> set[str]:
+    """Retorna os estados alcançáveis a partir do estado inicial (busca em largura)."""
+    alcancaveis = {estado_inicial}
+    fila = deque([estado_inicial])
+    while fila:
+        estado = fila.popleft()
+        for destino in transicoes.get(estado, {}).values():
+            if destino not in alcancaveis:
+                alcancaveis.add(destino)
+                fila.append(destino)
+    return alcancaveis
+
+
+def _particionar(estados: set[str], simbolos, transicoes: dict, estados_finais) -> list[set[str]]:
+    """
+    Algoritmo de Hopcroft: refina a partição {finais, não finais} até que
+    estados do mesmo bloco sejam indistinguíveis.
+    """
+    # Transições inversas: símbolo -> destino -> estados de origem
+    inversas = {simbolo: {} for simbolo in simbolos}
+    for origem in estados:
+        for simbolo, destino in transicoes[origem].items():
+            inversas[simbolo].setdefault(destino, []).append(origem)
+
+    blocos: list[set[str]] = []
+    bloco_de: dict[str, int] = {}
+    for grupo in (estados & set(estados_finais), estados - set(estados_finais)):
+        if grupo:
+            for estado in grupo:
+                bloco_de[estado] = len(blocos)
+            blocos.append(set(grupo))
+
+    pendentes = set()
+    if len(blocos) == 2:
+        pendentes.add(0 if len(blocos[0]) <= len(blocos[1]) else 1)
+
+    while pendentes:
+        divisor = set(blocos[pendentes.pop()])
+        for simbolo in simbolos:
+            # Estados que chegam ao bloco divisor lendo o símbolo, agrupados por bloco
+            tocados: dict[int, set[str]] = {}
+            for destino in divisor:
+                for origem in inversas[simbolo].get(destino, ()):
+                    tocados.setdefault(bloco_de[origem], set()).add(origem)
+
+            for bloco, dentro in tocados.items():
+                if len(dentro) == len(blocos[bloco]):
+                    continue
+
+                # A parte menor vira o bloco novo: cada divisão custa o tamanho
+                # dela, o que mantém o algoritmo em O(n log n)
+                if 2 * len(dentro) <= len(blocos[bloco]):
+                    blocos[bloco] -= dentro
+                    menor = dentro
+                else:
+                    menor = blocos[bloco] - dentro
+                    blocos[bloco] = dentro
+                novo = len(blocos)
+                blocos.append(menor)
+                for estado in menor:
+                    bloco_de[estado] = novo
+
+                # Se o bloco dividido já estava pendente, as duas partes
+                # ficam; senão, basta a menor
+                pendentes.add(novo)
+
+    return blocos
+
+
+def minimizarAfd(estados, simbolos, transicoes: dict, estado_inicial: str, estados_finais) -> dict:
+    """
+    Minimiza um AFD completo.
+
+    Cada estado do AFD mínimo recebe o menor nome (em ordem alfabética) entre
+    os estados originais que ele representa.
+
+    Args:
+        estados: Conjunto de estados
+        simbolos: Alfabeto de entrada
+        transicoes (dict): Transições {estado: {símbolo: estado_destino}}
+        estado_inicial (str): Estado inicial
+        estados_finais: Estados de aceitação
+
+    Returns:
+        dict: Definição do AFD mínimo com:
+            - estados, simbolos, transicoes, estado_inicial, estados_finais
+            - mapa_estados: {estado_minimizado: [estados originais]}
+            - estados_inalcancaveis: Estados originais removidos por não serem alcançáveis
+    """
+    alcancaveis = estadosAlcancaveis(transicoes, estado_inicial)
+    blocos = _particionar(alcancaveis, simbolos, transicoes, estados_finais)
+
+    nome_bloco = {}
+    mapa_estados = {}
+    for bloco in blocos:
+        originais = sorted(bloco)
+        mapa_estados[originais[0]] = originais
+        for estado in originais:
+            nome_bloco[estado] = originais[0]
+
+    novas_transicoes = {
+        nome: {simbolo: nome_bloco[destino] for simbolo, destino in transicoes[originais[0]].items()}
+        for nome, originais in mapa_estados.items()
+    }
+
+    return {
+        "estados": set(mapa_estados),
+        "simbolos": set(simbolos),
+        "transicoes": novas_transicoes,
+        "estado_inicial": nome_bloco[estado_inicial],
+        "estados_finais": {nome_bloco[estado] for estado in estados_finais if estado in alcancaveis},
+        "mapa_estados": mapa_estados,
+        "estados_inalcancaveis": sorted(set(estados) - alcancaveis)
+    }
@@ -0,0 +1,460 @@
+"""
+Operações de linguagens regulares sobre AFDs compilados.
+União, interseção e diferença usam a construção do produto, e as
+verificações (equivalência, inclusão, vazio) fazem a mesma busca sem montar
+o produto. Em todas, só os pares de estados alcançáveis a partir do par
+inicial são gerados, em largura, e as verificações param no primeiro par que
+decide a resposta. Como os símbolos são lidos em ordem, o contraexemplo
+devolvido é a menor string (e, entre as menores, a primeira em ordem
+alfabética) que o comprova. A contagem e a enumeração das strings aceitas
+usam só os estados úteis (alcançáveis e que alcançam um final).
+
+Os dois AFDs são tratados sobre a união dos alfabetos: um símbolo fora do
+alfabeto de um deles leva ao estado morto dele, que não é de aceitação.
+"""
+
+from operator import mul
+
+import config
+from services.afdCompilado import AfdCompilado
+
+OPERACOES_PRODUTO = ("uniao", "intersecao", "diferenca")
+
+# Critério de aceitação de cada operação, a partir da aceitação em cada AFD
+_ACEITACAO = {
+    "uniao": lambda final_a, final_b: final_a or final_b,
+    "intersecao": lambda final_a, final_b: final_a and final_b,
+    "diferenca": lambda final_a, final_b: final_a and not final_b
+}
+
+
+def alfabetoComum(a: AfdCompilado, b: AfdCompilado) -> list[str]:
+    """União ordenada dos alfabetos de dois AFDs."""
+    return sorted(set(a.simbolos) | set(b.simbolos))
+
+
+def explorar(inicial: int, sucessores, alvo = None, max_estados: int | None = None):
+    """
+    Busca em largura a partir de um estado, numerando os estados na ordem
+    em que são descobertos.
+
+    Args:
+        inicial (int): Estado de partida
+        sucessores: Função estado -> destinos, um por símbolo, na ordem dos símbolos
+        alvo: Função estado -> bool; se informada, a busca para no primeiro
+            estado que a satisfaz
+        max_estados (int | None): Máximo de estados descobertos (padrão
+            AUTOMATA_AFD_OPERACOES_MAX_ESTADOS)
+
+    Returns:
+        tuple: (estados na ordem de descoberta, tabela de transições entre os
+            índices dos estados já expandidos, pais (índice do pai, símbolo) de
+            cada estado, índice do estado encontrado ou None)
+
+    Raises:
+        ValueError: Se a busca passar de max_estados
+    """
+    if max_estados is None:
+        max_estados = config.AFD_OPERACOES_MAX_ESTADOS
+    indice = {inicial: 0}
+    ordem = [inicial]
+    pais = [None]
+    tabela = []
+    if alvo is not None and alvo(inicial):
+        return ordem, tabela, pais, 0
+
+    atual = 0
+    while atual < len(ordem):
+        linha = []
+        for simbolo, destino in enumerate(sucessores(ordem[atual])):
+            j = indice.get(destino)
+            if j is None:
+                j = indice[destino] = len(ordem)
+                if j >= max_estados:
+                    raise ValueError(f"A operação passou de {max_estados} estados alcançáveis")
+                ordem.append(destino)
+                pais.append((atual, simbolo))
+                if alvo is not None and alvo(destino):
+                    return ordem, tabela, pais, j
+            linha.append(j)
+        tabela.append(linha)
+        atual += 1
+    return ordem, tabela, pais, None
+
+
+def _testemunha(pais: list, simbolos: list[str], indice: int) -> str:
+    """Reconstrói a string que leva do estado inicial ao estado de índice informado."""
+    lidos = []
+    while pais[indice] is not None:
+        indice, simbolo = pais[indice]
+        lidos.append(simbolos[simbolo])
+    return "".join(reversed(lidos))
+
+
+def _produto(a: AfdCompilado, b: AfdCompilado, simbolos: list[str]):
+    """Par inicial, função de sucessores e decodificação dos pares, codificados como inteiros."""
+    largura = b.morto + 1
+
+    def sucessores(par: int) -> list[int]:
+        estado_a, estado_b = divmod(par, largura)
+        return [a.proximo(estado_a, simbolo) * largura + b.proximo(estado_b, simbolo) for simbolo in simbolos]
+
+    return a.inicial * largura + b.inicial, sucessores, lambda par: divmod(par, largura)
+
+
+def _unico(afd: AfdCompilado, simbolos: list[str]):
+    return lambda estado: [afd.proximo(estado, simbolo) for simbolo in simbolos]
+
+
+def definicaoDeExploracao(simbolos: list[str], tabela: list[list[int]], finais: list[bool]) -> dict:
+    """Definição (no formato de afdInput) de um AFD numerado por explorar, com estados q0, q1, ..."""
+    nomes = [f"q{i}" for i in range(len(tabela))]
+    return {
+        "estados": set(nomes),
+        "simbolos": set(simbolos),
+        "transicoes": {
+            nome: {simbolo: nomes[destino] for simbolo, destino in zip(simbolos, linha)}
+            for nome, linha in zip(nomes, tabela)
+        },
+        "estado_inicial": nomes[0],
+        "estados_finais": {nome for nome, final in zip(nomes, finais) if final}
+    }
+
+
+def produto(a: AfdCompilado, b: AfdCompilado, operacao: str) -> dict:
+    """
+    Monta o AFD da união, interseção ou diferença (L(a) - L(b)) de dois AFDs.
+
+    Args:
+        a, b (AfdCompilado): Operandos
+        operacao (str): "uniao", "intersecao" ou "diferenca"
+
+    Returns:
+        dict: Definição do AFD resultante, só com os pares alcançáveis
+
+    Raises:
+        ValueError: Se o produto passar de AUTOMATA_AFD_OPERACOES_MAX_ESTADOS
+    """
+    simbolos = alfabetoComum(a, b)
+    inicial, sucessores, decodificar = _produto(a, b, simbolos)
+    pares, tabela, _, _ = explorar(inicial, sucessores)
+    aceitacao = _ACEITACAO[operacao]
+    finais = []
+    for par in pares:
+        estado_a, estado_b = decodificar(par)
+        finais.append(aceitacao(estado_a in a.finais, estado_b in b.finais))
+    return definicaoDeExploracao(simbolos, tabela, finais)
+
+
+def complemento(afd: AfdCompilado) -> dict:
+    """
+    Monta o AFD do complemento, sobre o alfabeto do próprio AFD.
+
+    Returns:
+        dict: Definição do AFD resultante, só com os estados alcançáveis
+    """
+    simbolos = list(afd.simbolos)
+    estados, tabela, _, _ = explorar(afd.inicial, _unico(afd, simbolos))
+    return definicaoDeExploracao(simbolos, tabela, [estado not in afd.finais for estado in estados])
+
+
+def contraexemplo(a: AfdCompilado, b: AfdCompilado, inclusao: bool = False) -> str | None:
+    """
+    Procura a menor string que distingue dois AFDs.
+
+    Args:
+        a, b (AfdCompilado): AFDs comparados
+        inclusao (bool): Se True, procura só strings aceitas por a e
+            rejeitadas por b (contraexemplo de L(a) ⊆ L(b)); senão, strings
+            aceitas por exatamente um deles (contraexemplo da equivalência)
+
+    Returns:
+        str | None: O contraexemplo, ou None se as linguagens forem iguais
+            (ou se L(a) ⊆ L(b))
+    """
+    simbolos = alfabetoComum(a, b)
+    inicial, sucessores, decodificar = _produto(a, b, simbolos)
+
+    def distingue(par: int) -> bool:
+        estado_a, estado_b = decodificar(par)
+        final_a, final_b = estado_a in a.finais, estado_b in b.finais
+        return final_a and not final_b if inclusao else final_a != final_b
+
+    _, _, pais, encontrado = explorar(inicial, sucessores, distingue)
+    return None if encontrado is None else _testemunha(pais, simbolos, encontrado)
+
+
+def menorAceita(afd: AfdCompilado) -> str | None:
+    """Menor string aceita pelo AFD, ou None se a linguagem for vazia."""
+    simbolos = list(afd.simbolos)
+    _, _, pais, encontrado = explorar(afd.inicial, _unico(afd, simbolos), lambda estado: estado in afd.finais)
+    return None if encontrado is None else _testemunha(pais, simbolos, encontrado)
+
+
+def _uteis(afd: AfdCompilado) -> tuple[list[int], list[list[int]], list[bool]]:
+    """
+    Estados alcançáveis a partir do inicial, em largura, e quais deles alcançam um final.
+
+    Returns:
+        tuple: (estados na ordem de descoberta, tabela de transições entre
+            seus índices, na ordem dos símbolos, e se cada um é útil)
+    """
+    estados, tabela, _, _ = explorar(afd.inicial, _unico(afd, list(afd.simbolos)))
+
+    # Estados que alcançam um final, pelas transições inversas
+    anteriores = [[] for _ in estados]
+    for origem, linha in enumerate(tabela):
+        for destino in linha:
+            anteriores[destino].append(origem)
+    uteis = [False] * len(estados)
+    pendentes = [i for i, estado in enumerate(estados) if estado in afd.finais]
+    for i in pendentes:
+        uteis[i] = True
+    while pendentes:
+        for origem in anteriores[pendentes.pop()]:
+            if not uteis[origem]:
+                uteis[origem] = True
+                pendentes.append(origem)
+    return estados, tabela, uteis
+
+
+def finitude(afd: AfdCompilado) -> dict:
+    """
+    Verifica se a linguagem do AFD é finita.
+
+    Ela é infinita se houver um ciclo entre os estados úteis (alcançáveis a
+    partir do inicial e que alcançam um estado final); senão, o maior
+    caminho entre o inicial e um final dá o tamanho da maior string aceita.
+
+    Returns:
+        dict: finita (bool) e tamanho_maximo (None se a linguagem for
+            infinita ou vazia)
+    """
+    estados, tabela, uteis = _uteis(afd)
+    if not uteis[0]:
+        return {"finita": True, "tamanho_maximo": None}
+
+    # Ordenação topológica (Kahn) do subgrafo útil; sobra estado se houver ciclo
+    entradas = [0] * len(estados)
+    for origem, linha in enumerate(tabela):
+        if uteis[origem]:
+            for destino in linha:
+                if uteis[destino]:
+                    entradas[destino] += 1
+    ordem = [i for i in range(len(estados)) if uteis[i] and entradas[i] == 0]
+    for origem in ordem:
+        for destino in tabela[origem]:
+            if uteis[destino]:
+                entradas[destino] -= 1
+                if entradas[destino] == 0:
+                    ordem.append(destino)
+    if len(ordem) < sum(uteis):
+        return {"finita": False, "tamanho_maximo": None}
+
+    # Maior caminho a partir do inicial, na ordem topológica
+    distancia = [-1] * len(estados)
+    distancia[0] = 0
+    for origem in ordem:
+        if distancia[origem] >= 0:
+            for destino in tabela[origem]:
+                if uteis[destino]:
+                    distancia[destino] = max(distancia[destino], distancia[origem] + 1)
+    maior = max(distancia[i] for i, estado in enumerate(estados) if estado in afd.finais and distancia[i] >= 0)
+    return {"finita": True, "tamanho_maximo": maior}
+
+
+def _subgrafoUtil(afd: AfdCompilado) -> tuple[list[list[int | None]], list[bool]] | None:
+    """
+    Transições entre os estados úteis, renumerados a partir do inicial (0).
+
+    Returns:
+        tuple | None: (destino de cada estado útil por símbolo, na ordem dos
+            símbolos, ou None se o destino não for útil; se cada um é final),
+            ou None se a linguagem for vazia
+    """
+    estados, tabela, uteis = _uteis(afd)
+    if not uteis[0]:
+        return None
+    indice = {}
+    for i, util in enumerate(uteis):
+        if util:
+            indice[i] = len(indice)
+    saidas = [[indice.get(destino) for destino in tabela[i]] for i in indice]
+    finais = [estados[i] in afd.finais for i in indice]
+    return saidas, finais
+
+
+def _avancar(linhas: list, comprimento: int, modulo: int | None) -> list[int]:
+    """Caminhos de `comprimento` passos do estado 0 até cada estado, um passo por vez."""
+    vetor = [0] * len(linhas)
+    vetor[0] = 1
+    for _ in range(comprimento):
+        proximo = [0] * len(linhas)
+        for origem, quantidade in enumerate(vetor):
+            if quantidade:
+                for destino, multiplicidade in linhas[origem]:
+                    proximo[destino] += quantidade * multiplicidade
+        vetor = proximo if modulo is None else [quantidade % modulo for quantidade in proximo]
+    return vetor
+
+
+def _potencia(linhas: list, comprimento: int, modulo: int | None) -> list[int]:
+    """Mesmo resultado de _avancar, elevando a matriz de adjacência por quadrados sucessivos."""
+    n = len(linhas)
+    matriz = [[0] * n for _ in range(n)]
+    for origem, saidas in enumerate(linhas):
+        for destino, multiplicidade in saidas:
+            matriz[origem][destino] = multiplicidade
+
+    def reduzir(valores: list[int]) -> list[int]:
+        return valores if modulo is None else [valor % modulo for valor in valores]
+
+    vetor = [1] + [0] * (n - 1)
+    while comprimento:
+        if comprimento & 1:
+            vetor = reduzir([sum(map(mul, vetor, coluna)) for coluna in zip(*matriz)])
+        comprimento >>= 1
+        if comprimento:
+            colunas = list(zip(*matriz))
+            matriz = [reduzir([sum(map(mul, linha, coluna)) for coluna in colunas]) for linha in matriz]
+    return vetor
+
+
+def contarPalavras(afd: AfdCompilado, comprimento: int, modulo: int | None = None, max_operacoes: int | None = None) -> dict:
+    """
+    Conta as strings de um comprimento aceitas pelo AFD.
+
+    Só os estados úteis entram na conta. A programação dinâmica avança, um
+    símbolo por vez, o número de caminhos do inicial até cada estado
+    (comprimento × transições operações); a potência da matriz de
+    adjacência por quadrados sucessivos custa estados³ × log2(comprimento)
+    e é usada quando sai mais barata, o que acontece para comprimentos
+    muito grandes.
+
+    Args:
+        afd (AfdCompilado): AFD
+        comprimento (int): Comprimento das strings
+        modulo (int | None): Se informado, o total é calculado módulo este valor
+        max_operacoes (int | None): Máximo de operações estimado (padrão
+            AUTOMATA_AFD_CONTAGEM_MAX_OPERACOES)
+
+    Returns:
+        dict: total, metodo ("programacao_dinamica", "potencia_matriz" ou
+            None se a linguagem for vazia) e estados_uteis
+
+    Raises:
+        ValueError: Se a contagem passar de max_operacoes
+    """
+    if max_operacoes is None:
+        max_operacoes = config.AFD_CONTAGEM_MAX_OPERACOES
+    util = _subgrafoUtil(afd)
+    if util is None:
+        return {"total": 0, "metodo": None, "estados_uteis": 0}
+    saidas, finais = util
+
+    # Linhas esparsas da matriz de adjacência: (destino, quantidade de símbolos)
+    linhas = []
+    for saida in saidas:
+        multiplicidades = {}
+        for destino in saida:
+            if destino is not None:
+                multiplicidades[destino] = multiplicidades.get(destino, 0) + 1
+        linhas.append(list(multiplicidades.items()))
+
+    custo_avanco = comprimento * sum(map(len, linhas))
+    custo_potencia = len(linhas) ** 3 * comprimento.bit_length()
+    if min(custo_avanco, custo_potencia) > max_operacoes:
+        raise ValueError(f"A contagem passaria de {max_operacoes} operações")
+    if custo_avanco <= custo_potencia:
+        metodo, vetor = "programacao_dinamica", _avancar(linhas, comprimento, modulo)
+    else:
+        metodo, vetor = "potencia_matriz", _potencia(linhas, comprimento, modulo)
+
+    total = sum(quantidade for quantidade, final in zip(vetor, finais) if final)
+    return {"total": total if modulo is None else total % modulo, "metodo": metodo, "estados_uteis": len(linhas)}
+
+
+def _palavra(posicao: int, comprimento: int, saidas: list, contagens: list, simbolos: list[str]) -> str:
+    """A string de índice `posicao`, em ordem alfabética, entre as aceitas com `comprimento` símbolos."""
+    estado = 0
+    lidos = []
+    for restantes in range(comprimento - 1, -1, -1):
+        for simbolo, destino in zip(simbolos, saidas[estado]):
+            if destino is None:
+                continue
+            quantidade = contagens[restantes][destino]
+            if posicao < quantidade:
+                lidos.append(simbolo)
+                estado = destino
+                break
+            posicao -= quantidade
+    return "".join(lidos)
+
+
+def enumerarPalavras(
+    afd: AfdCompilado,
+    inicio: int = 0,
+    max_comprimento: int | None = None,
+    max_operacoes: int | None = None
+):
+    """
+    Prepara a enumeração das strings aceitas em ordem shortlex: por
+    comprimento e, no mesmo comprimento, em ordem alfabética.
+
+    Para cada comprimento, conta quantas strings desse tamanho levam cada
+    estado útil a um final. Com essas contagens, a string de um índice é
+    montada diretamente, símbolo a símbolo: as anteriores a `inicio` não
+    são geradas e nenhum conjunto de strings é guardado. Em linguagens
+    infinitas o gerador não termina sozinho; quem consome decide quando
+    parar. Cada comprimento custa estados úteis × símbolos operações,
+    somadas contra o mesmo limite da contagem.
+
+    Args:
+        afd (AfdCompilado): AFD
+        inicio (int): Índice da primeira string gerada
+        max_comprimento (int | None): Comprimento em que a enumeração para
+            (padrão AUTOMATA_AFD_CONTAGEM_MAX_COMPRIMENTO)
+        max_operacoes (int | None): Máximo de operações estimado (padrão
+            AUTOMATA_AFD_CONTAGEM_MAX_OPERACOES)
+
+    Returns:
+        Generator: Gera {"indice", "palavra"}; ao terminar, retorna
+            {"total"} se as strings acabaram, {"comprimento_maximo"} se
+            ele foi atingido ou {"limite_operacoes"} se o limite de
+            operações foi
+    """
+    if max_comprimento is None:
+        max_comprimento = config.AFD_CONTAGEM_MAX_COMPRIMENTO
+    if max_operacoes is None:
+        max_operacoes = config.AFD_CONTAGEM_MAX_OPERACOES
+    # O subgrafo é montado aqui, e não no gerador, para que os erros
+    # apareçam antes de a resposta começar
+    util = _subgrafoUtil(afd)
+    return _gerarPalavras(util, list(afd.simbolos), inicio, max_comprimento, max_operacoes)
+
+
+def _gerarPalavras(util, simbolos: list[str], inicio: int, max_comprimento: int, max_operacoes: int):
+    if util is None:
+        return {"total": 0}
+    saidas, finais = util
+
+    # contagens[r][e]: strings de comprimento r que levam o estado útil e a um final
+    contagens = [[int(final) for final in finais]]
+    primeiro = 0
+    custo_linha = len(saidas) * len(simbolos)
+    operacoes = 0
+    uteis = [[destino for destino in saida if destino is not None] for saida in saidas]
+    # Uma linha toda zerada significa que as strings acabaram: as seguintes também são
+    while any(contagens[-1]):
+        comprimento = len(contagens) - 1
+        if comprimento > max_comprimento:
+            return {"comprimento_maximo": max_comprimento}
+        quantidade = contagens[-1][0]
+        for posicao in range(max(inicio - primeiro, 0), quantidade):
+            yield {"indice": primeiro + posicao, "palavra": _palavra(posicao, comprimento, saidas, contagens, simbolos)}
+        primeiro += quantidade
+        operacoes += custo_linha
+        if operacoes > max_operacoes:
+            return {"limite_operacoes": max_operacoes}
+        contagens.append([sum(map(contagens[-1].__getitem__, destinos)) for destinos in uteis])
+    return {"total": primeiro}
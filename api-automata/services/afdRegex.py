@@ -0,0 +1,311 @@
+"""
+Compilação de expressões regulares em AFDs mínimos.
+A expressão é lida por um analisador descendente recursivo, convertida em um
+AFN com transições vazias (construção de Thompson), determinizada pela
+construção dos subconjuntos (só os conjuntos alcançáveis, em largura) e
+minimizada pelo algoritmo de Hopcroft.
+
+Sintaxe, sobre um alfabeto de símbolos de um caractere:
+    ab        concatenação
+    a|b       alternativa (um lado vazio aceita a string vazia)
+    a* a+ a?  repetições
+    a{2} a{2,} a{2,4}  repetições contadas
+    ( )       agrupamento; () é a string vazia
+    .         qualquer símbolo do alfabeto
+    [abc] [a-c] [^a]  classes de símbolos, sempre dentro do alfabeto
+    \\*        o caractere seguinte, literal
+"""
+
+from itertools import chain, repeat
+
+import config
+from services.afdMinimizacao import minimizarAfd
+from services.afdOperacoes import definicaoDeExploracao, explorar
+
+_ESPECIAIS = set("|*+?(){}[].\\")
+
+
+class _Analisador:
+    """
+    Converte a expressão em uma árvore de tuplas:
+    ("vazio",), ("simbolos", frozenset), ("concatenacao", [nós]),
+    ("alternativa", [nós]), ("estrela", nó) e ("repeticao", nó, mínimo, máximo | None).
+    """
+
+    def __init__(self, padrao: str, alfabeto: frozenset, max_repeticao: int):
+        self.padrao = padrao
+        self.alfabeto = alfabeto
+        self.max_repeticao = max_repeticao
+        self.posicao = 0
+
+    def _erro(self, mensagem: str):
+        raise ValueError(f"{mensagem} (posição {self.posicao})")
+
+    def _atual(self) -> str | None:
+        return self.padrao[self.posicao] if self.posicao < len(self.padrao) else None
+
+    def _simbolo(self, caractere: str) -> str:
+        if caractere not in self.alfabeto:
+            self._erro(f"Símbolo '{caractere}' fora do alfabeto")
+        return caractere
+
+    def analisar(self):
+        arvore = self._alternativa()
+        if self._atual() is not None:
+            self._erro(f"Caractere inesperado '{self._atual()}'")
+        return arvore
+
+    def _alternativa(self):
+        ramos = [self._concatenacao()]
+        while self._atual() == "|":
+            self.posicao += 1
+            ramos.append(self._concatenacao())
+        return ramos[0] if len(ramos) == 1 else ("alternativa", ramos)
+
+    def _concatenacao(self):
+        partes = []
+        while self._atual() not in (None, "|", ")"):
+            partes.append(self._repeticao())
+        if not partes:
+            return ("vazio",)
+        return partes[0] if len(partes) == 1 else ("concatenacao", partes)
+
+    def _repeticao(self):
+        no = self._atomo()
+        while True:
+            caractere = self._atual()
+            if caractere == "*":
+                no = ("estrela", no)
+            elif caractere == "+":
+                no = ("repeticao", no, 1, None)
+            elif caractere == "?":
+                no = ("repeticao", no, 0, 1)
+            elif caractere == "{":
+                no = ("repeticao", no, *self._contagem())
+                continue
+            else:
+                return no
+            self.posicao += 1
+
+    def _contagem(self) -> tuple[int, int | None]:
+        fim = self.padrao.find("}", self.posicao)
+        if fim < 0:
+            self._erro("Repetição sem '}'")
+        minimo, virgula, maximo = self.padrao[self.posicao + 1:fim].partition(",")
+        if not minimo.isdigit() or (maximo and not maximo.isdigit()):
+            self._erro("Repetição inválida")
+        minimo = int(minimo)
+        maximo = int(maximo) if maximo else None if virgula else minimo
+        if maximo is not None and maximo < minimo:
+            self._erro("Repetição com máximo menor que o mínimo")
+        # Cada cópia tem ao menos um estado: contagens maiores passariam do limite do AFN
+        if max(minimo, maximo or 0) > self.max_repeticao:
+            self._erro(f"Repetição acima de {self.max_repeticao}")
+        self.posicao = fim + 1
+        return minimo, maximo
+
+    def _atomo(self):
+        caractere = self._atual()
+        if caractere == "(":
+            self.posicao += 1
+            no = self._alternativa()
+            if self._atual() != ")":
+                self._erro("Falta ')'")
+            self.posicao += 1
+            return no
+        if caractere == "[":
+            return ("simbolos", self._classe())
+        if caractere == ".":
+            self.posicao += 1
+            return ("simbolos", self.alfabeto)
+        if caractere == "\\":
+            self.posicao += 1
+            if self._atual() is None:
+                self._erro("Escape no fim da expressão")
+        elif caractere in _ESPECIAIS:
+            self._erro(f"Caractere inesperado '{caractere}'")
+        simbolo = self._simbolo(self._atual())
+        self.posicao += 1
+        return ("simbolos", frozenset({simbolo}))
+
+    def _classe(self) -> frozenset:
+        self.posicao += 1
+        negada = self._atual() == "^"
+        if negada:
+            self.posicao += 1
+        simbolos = set()
+        primeiro = True
+        while self._atual() != "]" or primeiro:
+            primeiro = False
+            inicio = self._caractereClasse()
+            if self._atual() == "-" and self.posicao + 1 < len(self.padrao) and self.padrao[self.posicao + 1] != "]":
+                self.posicao += 1
+                fim = self._caractereClasse()
+                if fim < inicio:
+                    self._erro(f"Intervalo inválido '{inicio}-{fim}'")
+                simbolos |= {simbolo for simbolo in self.alfabeto if inicio <= simbolo <= fim}
+            else:
+                simbolos.add(self._simbolo(inicio))
+        self.posicao += 1
+        return frozenset(self.alfabeto - simbolos if negada else simbolos)
+
+    def _caractereClasse(self) -> str:
+        if self._atual() == "\\":
+            self.posicao += 1
+        caractere = self._atual()
+        if caractere is None:
+            self._erro("Classe sem ']'")
+        self.posicao += 1
+        return caractere
+
+
+class _Afn:
+    """
+    AFN de Thompson: cada estado tem no máximo uma transição que lê um
+    símbolo de um conjunto, guardada em `leituras`, e transições vazias.
+    """
+
+    def __init__(self, max_estados: int):
+        self.leituras = []
+        self.vazias = []
+        self.max_estados = max_estados
+
+    def _novo(self) -> int:
+        if len(self.leituras) >= self.max_estados:
+            raise ValueError(f"A expressão passou de {self.max_estados} estados no AFN")
+        self.leituras.append(None)
+        self.vazias.append([])
+        return len(self.leituras) - 1
+
+    def construir(self, no) -> tuple[int, int]:
+        """Monta o fragmento de um nó da árvore; retorna (estado inicial, estado final)."""
+        tipo = no[0]
+        if tipo == "vazio":
+            estado = self._novo()
+            return estado, estado
+        if tipo == "simbolos":
+            inicio, fim = self._novo(), self._novo()
+            self.leituras[inicio] = (no[1], fim)
+            return inicio, fim
+        if tipo == "concatenacao":
+            return self._concatenar(no[1])
+        if tipo == "alternativa":
+            inicio, fim = self._novo(), self._novo()
+            for ramo in no[1]:
+                inicio_ramo, fim_ramo = self.construir(ramo)
+                self.vazias[inicio].append(inicio_ramo)
+                self.vazias[fim_ramo].append(fim)
+            return inicio, fim
+        if tipo == "estrela":
+            inicio, fim = self._novo(), self._novo()
+            inicio_corpo, fim_corpo = self.construir(no[1])
+            self.vazias[inicio] += [inicio_corpo, fim]
+            self.vazias[fim_corpo] += [inicio_corpo, fim]
+            return inicio, fim
+
+        # Repetição contada: `minimo` cópias obrigatórias, seguidas de uma
+        # estrela ou de `maximo - minimo` cópias opcionais. As cópias são
+        # geradas uma a uma, então o limite de estados vale antes de qualquer
+        # lista do tamanho da contagem
+        _, corpo, minimo, maximo = no
+        if maximo is None:
+            opcionais = [("estrela", corpo)]
+        else:
+            opcionais = repeat(("alternativa", [corpo, ("vazio",)]), maximo - minimo)
+        return self._concatenar(chain(repeat(corpo, minimo), opcionais))
+
+    def _concatenar(self, partes) -> tuple[int, int]:
+        """Liga em sequência os fragmentos de `partes`; sem partes, aceita a string vazia."""
+        inicio = fim = None
+        for parte in partes:
+            proximo, fim_parte = self.construir(parte)
+            if inicio is None:
+                inicio = proximo
+            else:
+                self.vazias[fim].append(proximo)
+            fim = fim_parte
+        if inicio is None:
+            return self.construir(("vazio",))
+        return inicio, fim
+
+    def fecho(self, estados) -> frozenset:
+        """Estados alcançáveis por transições vazias."""
+        fecho = set(estados)
+        pilha = list(estados)
+        while pilha:
+            for destino in self.vazias[pilha.pop()]:
+                if destino not in fecho:
+                    fecho.add(destino)
+                    pilha.append(destino)
+        return frozenset(fecho)
+
+
+def compilarRegex(padrao: str, simbolos, max_estados: int | None = None) -> tuple[dict, dict]:
+    """
+    Compila uma expressão regular em um AFD mínimo e completo.
+
+    Args:
+        padrao (str): Expressão regular (ver a sintaxe no início do módulo)
+        simbolos: Alfabeto do AFD, com símbolos de um caractere
+        max_estados (int | None): Máximo de estados do AFN e do AFD
+            determinizado (padrão AUTOMATA_AFD_OPERACOES_MAX_ESTADOS)
+
+    Returns:
+        tuple: (definição do AFD mínimo no formato de afdInput, relatório com
+            estados_afn, estados_determinizados e estados)
+
+    Raises:
+        ValueError: Se o alfabeto ou a expressão forem inválidos, se uma
+            repetição contada passar de max_estados ou se algum dos
+            autômatos passar de max_estados
+    """
+    if max_estados is None:
+        max_estados = config.AFD_OPERACOES_MAX_ESTADOS
+    alfabeto = sorted(simbolos)
+    if not alfabeto:
+        raise ValueError("O alfabeto está vazio")
+    if any(len(simbolo) != 1 for simbolo in alfabeto):
+        raise ValueError("Os símbolos do alfabeto devem ter um caractere")
+
+    afn = _Afn(max_estados)
+    try:
+        arvore = _Analisador(padrao, frozenset(alfabeto), max_estados).analisar()
+        inicio, fim = afn.construir(arvore)
+    except RecursionError:
+        raise ValueError("A expressão tem grupos aninhados demais") from None
+
+    # Cada conjunto guarda só os estados que leem um símbolo e o final; os
+    # demais não mudam as transições nem a aceitação. O fecho de cada
+    # estado é calculado uma vez
+    fechos = {}
+
+    def fecho(estado: int) -> frozenset:
+        resultado = fechos.get(estado)
+        if resultado is None:
+            resultado = fechos[estado] = frozenset(
+                alcancado for alcancado in afn.fecho([estado]) if afn.leituras[alcancado] is not None or alcancado == fim
+            )
+        return resultado
+
+    def sucessores(conjunto: frozenset) -> list[frozenset]:
+        destinos = {simbolo: set() for simbolo in alfabeto}
+        for estado in conjunto:
+            leitura = afn.leituras[estado]
+            if leitura is not None:
+                for simbolo in leitura[0]:
+                    destinos[simbolo].add(leitura[1])
+        return [frozenset().union(*map(fecho, destinos[simbolo])) for simbolo in alfabeto]
+
+    conjuntos, tabela, _, _ = explorar(fecho(inicio), sucessores, max_estados = max_estados)
+    determinizado = definicaoDeExploracao(alfabeto, tabela, [fim in conjunto for conjunto in conjuntos])
+    minimo = minimizarAfd(
+        determinizado["estados"], determinizado["simbolos"], determinizado["transicoes"],
+        determinizado["estado_inicial"], determinizado["estados_finais"]
+    )
+    definicao = {campo: minimo[campo] for campo in ("estados", "simbolos", "transicoes", "estado_inicial", "estados_finais")}
+    relatorio = {
+        "estados_afn": len(afn.leituras),
+        "estados_determinizados": len(conjuntos),
+        "estados": len(minimo["estados"])
+    }
+    return definicao, relatorio
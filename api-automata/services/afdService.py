@@ -3,13 +3,36 @@ Service para manipulação de Autômatos Finitos Determinísticos (AFD).
 Implementa operações de criação, teste e visualização de AFDs.
 """
 
-from automata.fa.dfa import DFA
-from schemas.afdSchema import afdInput, afdInfo
-from graphviz import Digraph
+import codecs
+import time
+from typing import TYPE_CHECKING, AsyncIterator
 
-afdAtual: DFA | None = None
+import config
+from schemas.afdSchema import afdInput, afdInfo, EdicaoInput
+from services.afdCompilado import AfdCompilado
+from services import afdOperacoes, afdRegex, edicaoAutomatos, formatoCompacto
+from services.afdMinimizacao import minimizarAfd
+from services.cacheResultados import cache as cacheResultados
+from services.metricasService import medirFase, registrarEntradas, registrarValidacao
+from services.rastreioService import paginar, resolverPagina
+from services.registroService import RegistroAutomatos, hashDefinicao, medirMemoria, memoriaEditada
+from services.visualizacaoService import renderizar
 
-def criarAfd(afd_input: afdInput):
+# O automata-lib (que importa o networkx) e o Graphviz são carregados no
+# primeiro uso, e não na inicialização da API
+if TYPE_CHECKING:
+    from automata.fa.dfa import DFA
+    from graphviz import Digraph
+
+# Cada entrada guarda o DFA, o hash da definição, sua tabela compilada (se
+# habilitada; senão, montada no primeiro uso em "compilado_sob_demanda"), a
+# memória medida na criação, o relatório de minimização (se pedida) e, nos
+# criados por /regex, o relatório da compilação da expressão:
+# {"afd": DFA, "hash": str, "compilado": AfdCompilado | None, "memoria": dict,
+#  "minimizacao": dict | None, "regex": dict | None}
+registro = RegistroAutomatos(tipo = "afd")
+
+def criarAfd(afd_input: afdInput, minimizar: bool = False):
     """
     Cria um novo Autômato Finito Determinístico (AFD).
 
@@ -20,86 +43,661 @@ def criarAfd(afd_input: afdInput):
             - transicoes: Dicionário de transições {estado: {símbolo: estado_destino}}
             - estado_inicial: Estado inicial (str)
             - estados_finais: Conjunto de estados de aceitação (set)
+        minimizar (bool): Se True, remove estados inalcançáveis e junta estados
+            equivalentes antes de armazenar o AFD
 
     Returns:
-        dict: Mensagem de sucesso/erro
+        dict: Mensagem de sucesso/erro, ID do AFD criado e se ele foi reaproveitado.
+        Com minimização, inclui o relatório em "minimizacao".
     """
-    global afdAtual
-    afdAtual = DFA(
+    registrarValidacao("afd")
+    definicao = dict(afd_input)
+    hash_conteudo = hashDefinicao({**definicao, "minimizar": True} if minimizar else definicao)
 
-        states = afd_input.estados,
-        input_symbols = afd_input.simbolos,
-        transitions = afd_input.transicoes,
-        initial_state = afd_input.estado_inicial,
-        final_states = afd_input.estados_finais
-    )
+    # Definições idênticas reaproveitam o autômato já construído e validado
+    afd_id = registro.buscarPorHash(hash_conteudo)
+    if afd_id is not None:
+        entrada = registro.obter(afd_id)
+        if entrada is not None:
+            return _respostaCriacao(afd_id, True, entrada["minimizacao"])
 
-    return {"mensagem": "AFD criado com sucesso"}
+    with medirFase("afd", "construcao"):
+        from automata.fa.dfa import DFA
+        afd = DFA(
+            states = afd_input.estados,
+            input_symbols = afd_input.simbolos,
+            transitions = afd_input.transicoes,
+            initial_state = afd_input.estado_inicial,
+            final_states = afd_input.estados_finais
+        )
+    return _armazenar(afd, hash_conteudo, minimizar)
 
 
+def criarAfdCompacto(corpo: bytes, tipo_conteudo: str, minimizar: bool = False):
+    """
+    Cria um AFD a partir de uma definição no formato compacto (ver services/formatoCompacto.py).
 
-def testarString(input_string: str) -> dict:
+    Args:
+        corpo (bytes): Corpo da requisição, em JSON ou msgpack
+        tipo_conteudo (str): Content-Type da requisição
+        minimizar (bool): Se True, minimiza o AFD antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de criarAfd, ou {"erro"} se a definição for inválida
     """
-    Cria um novo Autômato Finito Determinístico (AFD).
+    try:
+        dados = formatoCompacto.decodificar(corpo, tipo_conteudo)
+    except ValueError as e:
+        return {"erro": str(e)}
+    registrarValidacao("afd")
+    hash_conteudo = formatoCompacto.hashCompacto({**dados, "minimizar": True} if minimizar else dados)
+
+    afd_id = registro.buscarPorHash(hash_conteudo)
+    if afd_id is not None:
+        entrada = registro.obter(afd_id)
+        if entrada is not None:
+            return _respostaCriacao(afd_id, True, entrada["minimizacao"])
+
+    # A conferência da definição substitui a validação do automata-lib
+    try:
+        with medirFase("afd", "construcao"):
+            afd = formatoCompacto.afdCompacto(dados)
+    except ValueError as e:
+        return {"erro": f"Definição inválida: {e}"}
+    return _armazenar(afd, hash_conteudo, minimizar)
+
+
+def _armazenar(afd: "DFA", hash_conteudo: str, minimizar: bool, regex: dict | None = None) -> dict:
+    """Minimiza (se pedido), compila e registra um AFD já validado."""
+    minimizacao = None
+    if minimizar:
+        with medirFase("afd", "minimizacao"):
+            from automata.fa.dfa import DFA
+            minimo = minimizarAfd(afd.states, afd.input_symbols, afd.transitions, afd.initial_state, afd.final_states)
+            minimizacao = {
+                "estados_originais": len(afd.states),
+                "estados_minimizados": len(minimo["estados"]),
+                "transicoes_originais": sum(len(saidas) for saidas in afd.transitions.values()),
+                "transicoes_minimizadas": sum(len(saidas) for saidas in minimo["transicoes"].values()),
+                "estados_inalcancaveis": minimo["estados_inalcancaveis"],
+                "mapa_estados": minimo["mapa_estados"]
+            }
+            afd = DFA(
+                states = minimo["estados"],
+                input_symbols = minimo["simbolos"],
+                transitions = minimo["transicoes"],
+                initial_state = minimo["estado_inicial"],
+                final_states = minimo["estados_finais"]
+            )
+
+    with medirFase("afd", "compilacao"):
+        compilado = AfdCompilado.deAfd(afd) if config.AFD_COMPILADO else None
+    memoria = medirMemoria(afd, compilado)
+
+    entrada = {
+        "afd": afd, "hash": hash_conteudo, "compilado": compilado, "memoria": memoria,
+        "minimizacao": minimizacao, "regex": regex
+    }
+    afd_id = registro.adicionar(entrada, memoria["total_bytes"], hash_conteudo)
+    return _respostaCriacao(afd_id, False, minimizacao)
+
+
+def _respostaCriacao(afd_id: str, reutilizado: bool, minimizacao: dict | None) -> dict:
+    resposta = {"mensagem": "AFD criado com sucesso", "id": afd_id, "reutilizado": reutilizado}
+    if minimizacao is not None:
+        resposta["minimizacao"] = minimizacao
+    return resposta
+
+
+def criarAfdDeRegex(padrao: str, simbolos: set[str]) -> dict:
+    """
+    Cria o AFD mínimo de uma expressão regular sobre o alfabeto informado.
+
+    O resultado fica no mesmo registro dos AFDs criados por /criar. Como o
+    hash usado para reaproveitar AFDs é o do par (expressão, alfabeto), uma
+    expressão já compilada devolve o mesmo ID sem ser compilada de novo.
 
     Args:
-        afd_input (afdInput): Dados do AFD
-            - estados: Conjunto de estados (set)
-            - simbolos: Alfabeto de entrada (set)
-            - transicoes: Dicionário de transições {estado: {símbolo: estado_destino}}
-            - estado_inicial: Estado inicial (str)
-            - estados_finais: Conjunto de estados de aceitação (set)
+        padrao (str): Expressão regular (sintaxe em services/afdRegex.py)
+        simbolos (set[str]): Alfabeto, com símbolos de um caractere
+
+    Returns:
+        dict: Mesmo formato de criarAfd, com o relatório "regex":
+            - padrao: Expressão compilada
+            - estados_afn: Estados do AFN de Thompson
+            - estados_determinizados: Estados alcançáveis da determinização
+            - estados: Estados do AFD mínimo
+            - compilacao_ms: Tempo da expressão ao AFD mínimo (o da primeira
+              vez, quando o AFD é reaproveitado)
+    """
+    registrarValidacao("afd")
+    hash_conteudo = hashDefinicao({"regex": padrao, "simbolos": simbolos})
+    afd_id = registro.buscarPorHash(hash_conteudo)
+    if afd_id is not None:
+        entrada = registro.obter(afd_id)
+        if entrada is not None:
+            return {**_respostaCriacao(afd_id, True, None), "regex": entrada.get("regex")}
+
+    try:
+        with medirFase("afd", "construcao"):
+            from automata.fa.dfa import DFA
+            inicio = time.perf_counter()
+            definicao, relatorio = afdRegex.compilarRegex(padrao, simbolos)
+            compilacao = time.perf_counter() - inicio
+            afd = DFA(
+                states = definicao["estados"],
+                input_symbols = definicao["simbolos"],
+                transitions = definicao["transicoes"],
+                initial_state = definicao["estado_inicial"],
+                final_states = definicao["estados_finais"]
+            )
+    except ValueError as e:
+        return {"erro": f"Expressão regular inválida: {e}"}
+    regex = {"padrao": padrao, **relatorio, "compilacao_ms": round(compilacao * 1000, 3)}
+    return {**_armazenar(afd, hash_conteudo, False, regex), "regex": regex}
+
+
+def editarAfd(edicao: EdicaoInput) -> dict:
+    """
+    Cria um AFD a partir de um registrado, com as alterações informadas.
+
+    Só os estados tocados pela edição são conferidos, e a tabela compilada
+    é copiada e atualizada nas linhas deles (ver services/edicaoAutomatos.py).
+    O AFD editado recebe um novo ID: como definições idênticas compartilham
+    o mesmo ID, o original continua valendo para quem o criou. O hash é o da
+    definição resultante, então um AFD idêntico já registrado (criado ou
+    editado) é reaproveitado.
+
+    Args:
+        edicao (EdicaoInput): ID do AFD e alterações
+            - adicionar_estados / remover_estados: Estados criados e apagados
+            - transicoes: Transições novas ou substituídas {estado: {símbolo: estado_destino}}
+            - adicionar_finais / remover_finais: Estados que passam a ser (ou deixam de ser) finais
+
+    Returns:
+        dict: Mensagem de sucesso, ID do AFD editado, se ele foi reaproveitado,
+            editado_de, total de estados e estados_conferidos, ou {"erro"} se
+            o AFD não existir ou a edição for inválida
+    """
+    entrada = registro.obter(edicao.id)
+    if entrada is None:
+        return {"erro": "AFD não encontrado"}
+    alteracoes = {campo: valor for campo, valor in edicao if campo != "id"}
+    if not any(alteracoes.values()):
+        return {"mensagem": "Nenhuma alteração informada", "id": edicao.id}
+
+    try:
+        with medirFase("afd", "edicao"):
+            afd, compilado, variacao = edicaoAutomatos.editarAfd(entrada["afd"], entrada["compilado"], alteracoes)
+    except ValueError as e:
+        return {"erro": f"Edição inválida: {e}"}
+
+    hash_conteudo = hashDefinicao(dict(afdInput(
+        estados = afd.states,
+        simbolos = afd.input_symbols,
+        transicoes = afd.transitions,
+        estado_inicial = afd.initial_state,
+        estados_finais = afd.final_states
+    )))
+    afd_id = registro.buscarPorHash(hash_conteudo)
+    reutilizado = afd_id is not None and registro.obter(afd_id) is not None
+    if not reutilizado:
+        memoria = memoriaEditada(entrada["memoria"], variacao)
+        nova = {
+            "afd": afd, "hash": hash_conteudo, "compilado": compilado, "memoria": memoria,
+            "minimizacao": None, "regex": None
+        }
+        afd_id = registro.adicionar(nova, memoria["total_bytes"], hash_conteudo)
+    conferidos = alteracoes["remover_estados"] | alteracoes["adicionar_estados"] | alteracoes["transicoes"].keys()
+    return {
+        "mensagem": "AFD editado com sucesso",
+        "id": afd_id,
+        "reutilizado": reutilizado,
+        "editado_de": edicao.id,
+        "estados": len(afd.states),
+        "estados_conferidos": len(conferidos)
+    }
+
+
+def testarString(afd_id: str, input_string: str) -> dict:
+    """
+    Verifica se uma string é aceita pelo AFD informado.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        input_string (str): String a ser testada
 
     Returns:
-        dict: Mensagem de sucesso/erro
+        dict: Resultado do teste com:
+            - string: String testada
+            - aceita: Booleano indicando aceitação
+            - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
     """
-    if afdAtual is None:
-        return {"erro": "Nenhum AFD foi criado ainda"}
+    entrada = registro.obter(afd_id)
+    if entrada is None:
+        return {"erro": "AFD não encontrado"}
+    afd = entrada["afd"]
     
+    registrarEntradas("afd", [input_string])
+    chave = (entrada["hash"], input_string)
+    resultado = cacheResultados.obter("afd", chave)
+    if resultado is not None:
+        return {**resultado, "cache": True}
     try:
-        aceita = afdAtual.accepts_input(input_string)
-        return {
+        compilado = entrada["compilado"]
+        with medirFase("afd", "simulacao"):
+            if compilado is not None:
+                aceita = compilado.aceita(input_string)
+            else:
+                aceita = afd.accepts_input(input_string)
+        resultado = {
             "string": input_string,
             "aceita": aceita,
             "mensagem": "String aceita" if aceita else "String rejeitada"
         }
     except Exception as e:
         return {"erro": f"Erro ao processar string: {str(e)}"}
+    cacheResultados.guardar("afd", chave, resultado)
+    return {**resultado, "cache": False}
     
 
 
-def getAfdInfo() -> afdInfo:
+def testarLote(afd_id: str, inputs: list[str], resumo: bool = False) -> dict:
     """
-    Obtém informações detalhadas do AFD atual.
+    Testa várias strings no AFD informado com uma única busca no registro.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        inputs (list[str]): Strings a serem testadas
+        resumo (bool): Se True, retorna apenas as contagens e os índices rejeitados
 
     Returns:
-        afdInfo: Dados do AFD contendo:
-            - estados: Conjunto de estados
-            - simbolos: Alfabeto de entrada
-            - transicoes: Regras de transição
-            - estado_inicial: Estado inicial
-            - estados_finais: Estados de aceitação
+        dict: Resultado do lote com:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            ou, no modo resumo:
+            - aceitas / rejeitadas: Contagens
+            - indices_rejeitados: Posições das strings rejeitadas
+    """
+    entrada = registro.obter(afd_id)
+    if entrada is None:
+        return {"erro": "AFD não encontrado"}
+    afd = entrada["afd"]
 
-    Raises:
-        Exception: Se nenhum AFD foi criado
+    registrarEntradas("afd", inputs)
+    try:
+        compilado = entrada["compilado"]
+        with medirFase("afd", "simulacao"):
+            if compilado is not None:
+                aceitas = compilado.aceitaLote(inputs)
+            else:
+                aceitas = [afd.accepts_input(input_string) for input_string in inputs]
+    except Exception as e:
+        return {"erro": f"Erro ao processar lote: {str(e)}"}
+
+    if resumo:
+        rejeitados = [indice for indice, aceita in enumerate(aceitas) if not aceita]
+        return {
+            "total": len(aceitas),
+            "aceitas": len(aceitas) - len(rejeitados),
+            "rejeitadas": len(rejeitados),
+            "indices_rejeitados": rejeitados
+        }
+
+    return {"total": len(aceitas), "resultados": aceitas}
+
+
+def _obterCompilado(afd_id: str) -> AfdCompilado | None:
     """
-    if afdAtual is None:
-        return {"erro": "Nenhum AFD foi criado ainda"}
-    
-    print(afdAtual)
-    return afdInfo(
-        estados = afdAtual.states,
-        simbolos = afdAtual.input_symbols,
-        transicoes = afdAtual.transitions,
-        estado_inicial = afdAtual.initial_state,
-        estados_finais = afdAtual.final_states
-    )
+    Retorna a tabela compilada do AFD.
+
+    Com AUTOMATA_AFD_COMPILADO=0, a tabela é montada no primeiro uso e
+    guardada na entrada, à parte, para que /testar continue usando o
+    automata-lib; seu tamanho passa a contar para o limite do registro.
+    """
+    entrada = registro.obter(afd_id)
+    if entrada is None:
+        return None
+    if entrada["compilado"] is not None:
+        return entrada["compilado"]
+
+    def compilar():
+        with medirFase("afd", "compilacao"):
+            return AfdCompilado.deAfd(entrada["afd"])
+
+    return registro.derivado(afd_id, entrada, "compilado_sob_demanda", compilar)
+
+
+async def testarStream(afd_id: str, trechos: AsyncIterator[bytes]) -> dict:
+    """
+    Testa uma única entrada recebida em partes, com memória constante.
+
+    A entrada é decodificada como UTF-8 de forma incremental e apenas o
+    estado atual do AFD é mantido entre um trecho e outro.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        trechos (AsyncIterator[bytes]): Partes da entrada, na ordem
+
+    Returns:
+        dict: Resultado do teste com:
+            - aceita: Booleano indicando aceitação
+            - estado_final: Estado alcançado (None se a entrada tiver símbolo fora do alfabeto)
+            - simbolos_lidos: Quantidade de símbolos processados
+            - mensagem: Descrição textual do resultado
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    estado = compilado.inicial
+    simbolos_lidos = 0
+    try:
+        async for trecho in trechos:
+            texto = decodificador.decode(trecho)
+            simbolos_lidos += len(texto)
+            estado = compilado.avancar(estado, texto)
+        texto = decodificador.decode(b"", final = True)
+        simbolos_lidos += len(texto)
+        estado = compilado.avancar(estado, texto)
+    except UnicodeDecodeError as e:
+        return {"erro": f"Erro ao decodificar entrada: {str(e)}"}
+
+    aceita = compilado.aceitaEstado(estado)
+    return {
+        "aceita": aceita,
+        "estado_final": compilado.nomeEstado(estado),
+        "simbolos_lidos": simbolos_lidos,
+        "mensagem": "String aceita" if aceita else "String rejeitada"
+    }
+
+
+def testarLinhasStream(afd_id: str, trechos: AsyncIterator[bytes]):
+    """
+    Testa cada linha de uma entrada recebida em partes como uma string independente.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        trechos (AsyncIterator[bytes]): Partes da entrada, na ordem
+
+    Returns:
+        AsyncIterator[str] | dict: Gerador de linhas NDJSON no formato
+        {"indice": n, "aceita": bool}, ou mensagem de erro se o AFD não existir
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    return _resultadosPorLinha(compilado, trechos)
+
+
+def _linhaNdjson(indice: int, aceita: bool) -> str:
+    return f'{{"indice":{indice},"aceita":{"true" if aceita else "false"}}}\n'
+
+
+async def _resultadosPorLinha(compilado: AfdCompilado, trechos: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    estado = compilado.inicial
+    indice = 0
+    linha_aberta = False  # Há símbolos lidos de uma linha ainda sem "\n"
+    reservado = ""  # "\r" no fim de um trecho, só descartado se vier seguido de "\n"
+
+    try:
+        final = False
+        iterador = trechos.__aiter__()
+        while not final:
+            try:
+                texto = reservado + decodificador.decode(await iterador.__anext__())
+            except StopAsyncIteration:
+                texto = reservado + decodificador.decode(b"", final = True)
+                final = True
+
+            partes = texto.split("\n")
+            ultima = partes.pop()
+            saida = []
+
+            if partes:
+                # A primeira parte completa a linha que vinha de trechos anteriores
+                estado = compilado.avancar(estado, partes[0].removesuffix("\r"))
+                saida.append(_linhaNdjson(indice, compilado.aceitaEstado(estado)))
+                indice += 1
+
+                # As demais são linhas completas dentro do trecho, testadas em lote
+                completas = [parte.removesuffix("\r") for parte in partes[1:]]
+                for aceita in compilado.aceitaLote(completas):
+                    saida.append(_linhaNdjson(indice, aceita))
+                    indice += 1
+
+                estado = compilado.inicial
+                linha_aberta = False
+
+            reservado = ""
+            if ultima.endswith("\r"):
+                if final:
+                    ultima = ultima[:-1]
+                else:
+                    reservado, ultima = "\r", ultima[:-1]
+            estado = compilado.avancar(estado, ultima)
+            linha_aberta = linha_aberta or bool(ultima) or bool(reservado)
+
+            if final and linha_aberta:
+                saida.append(_linhaNdjson(indice, compilado.aceitaEstado(estado)))
+
+            if saida:
+                yield "".join(saida)
+    except UnicodeDecodeError as e:
+        yield f'{{"erro":"Erro ao decodificar entrada: {e.reason}","linhas_processadas":{indice}}}\n'
+
+
+
+def rastrear(afd_id: str, input_string: str, cursor: int = 0, limite: int | None = None):
+    """
+    Gera, em NDJSON, os estados pelos quais o AFD passa ao ler uma string.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        input_string (str): String a ser lida
+        cursor (int): Primeiro passo da página
+        limite (int | None): Máximo de configurações na página
+
+    Returns:
+        Iterator[str] | dict: Uma linha {"passo", "estado", "simbolo"} por
+            símbolo lido e uma linha final com "fim" (ver rastreioService.paginar),
+            ou um dict com "erro" se o AFD não existir
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    limite, _ = resolverPagina(limite, None)
+    return paginar(compilado.rastrear(input_string, cursor), limite)
+
+
+def _criarDeDefinicao(definicao: dict, minimizar: bool) -> dict:
+    """Registra o AFD resultante de uma operação, reaproveitando um idêntico se existir."""
+    hash_conteudo = hashDefinicao({**definicao, "minimizar": True} if minimizar else definicao)
+    afd_id = registro.buscarPorHash(hash_conteudo)
+    if afd_id is not None:
+        entrada = registro.obter(afd_id)
+        if entrada is not None:
+            return _respostaCriacao(afd_id, True, entrada["minimizacao"])
+
+    with medirFase("afd", "construcao"):
+        from automata.fa.dfa import DFA
+        afd = DFA(
+            states = definicao["estados"],
+            input_symbols = definicao["simbolos"],
+            transitions = definicao["transicoes"],
+            initial_state = definicao["estado_inicial"],
+            final_states = definicao["estados_finais"]
+        )
+    return _armazenar(afd, hash_conteudo, minimizar)
+
+
+def operarAfds(id_a: str, id_b: str, operacao: str, minimizar: bool = False) -> dict:
+    """
+    Cria o AFD da união, interseção ou diferença das linguagens de dois AFDs.
+
+    O produto é montado só com os pares de estados alcançáveis, sobre a
+    união dos alfabetos, e registrado como um AFD novo.
+
+    Args:
+        id_a (str): ID do primeiro AFD
+        id_b (str): ID do segundo AFD
+        operacao (str): "uniao", "intersecao" ou "diferenca" (L(a) - L(b))
+        minimizar (bool): Se True, minimiza o resultado antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de criarAfd, ou {"erro"} se algum AFD não existir
+            ou o produto passar do limite de estados
+    """
+    a, b = _obterCompilado(id_a), _obterCompilado(id_b)
+    if a is None or b is None:
+        return {"erro": "AFD não encontrado"}
+    try:
+        with medirFase("afd", "operacao"):
+            definicao = afdOperacoes.produto(a, b, operacao)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return _criarDeDefinicao(definicao, minimizar)
+
+
+def complementarAfd(afd_id: str, minimizar: bool = False) -> dict:
+    """
+    Cria o AFD do complemento da linguagem de um AFD, sobre o alfabeto dele.
+
+    Args:
+        afd_id (str): ID do AFD
+        minimizar (bool): Se True, minimiza o resultado antes de armazená-lo
+
+    Returns:
+        dict: Mesmo formato de criarAfd, ou {"erro"} se o AFD não existir
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    try:
+        with medirFase("afd", "operacao"):
+            definicao = afdOperacoes.complemento(compilado)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return _criarDeDefinicao(definicao, minimizar)
+
+
+def compararAfds(id_a: str, id_b: str, inclusao: bool = False) -> dict:
+    """
+    Verifica se dois AFDs são equivalentes ou se a linguagem do primeiro
+    está contida na do segundo.
+
+    A busca no produto para no primeiro par de estados que distingue os AFDs.
+
+    Args:
+        id_a (str): ID do primeiro AFD
+        id_b (str): ID do segundo AFD
+        inclusao (bool): Se True, verifica L(a) ⊆ L(b); senão, L(a) = L(b)
+
+    Returns:
+        dict: Resultado com:
+            - equivalentes (ou subconjunto, com inclusao): Booleano com a resposta
+            - contraexemplo: Menor string que contradiz a resposta positiva
+              (aceita por a e rejeitada por b, na inclusão), ou None
+    """
+    a, b = _obterCompilado(id_a), _obterCompilado(id_b)
+    if a is None or b is None:
+        return {"erro": "AFD não encontrado"}
+    try:
+        with medirFase("afd", "operacao"):
+            contraexemplo = afdOperacoes.contraexemplo(a, b, inclusao)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return {"subconjunto" if inclusao else "equivalentes": contraexemplo is None, "contraexemplo": contraexemplo}
+
+
+def analisarLinguagem(afd_id: str) -> dict:
+    """
+    Verifica se a linguagem de um AFD é vazia e se é finita.
+
+    Args:
+        afd_id (str): ID do AFD
+
+    Returns:
+        dict: Resultado com:
+            - vazia: Booleano indicando se nenhuma string é aceita
+            - menor_aceita: Menor string aceita, ou None se a linguagem for vazia
+            - finita: Booleano indicando se a linguagem é finita
+            - tamanho_maximo: Tamanho da maior string aceita (linguagens
+              finitas e não vazias), ou None
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    try:
+        with medirFase("afd", "operacao"):
+            menor = afdOperacoes.menorAceita(compilado)
+            finitude = afdOperacoes.finitude(compilado)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return {"vazia": menor is None, "menor_aceita": menor, **finitude}
+
+
+def contarPalavras(afd_id: str, comprimento: int, modulo: int | None = None) -> dict:
+    """
+    Conta as strings de um comprimento aceitas por um AFD.
+
+    Args:
+        afd_id (str): ID do AFD
+        comprimento (int): Comprimento das strings
+        modulo (int | None): Se informado, o total é devolvido módulo este valor
+
+    Returns:
+        dict: comprimento, modulo, total, metodo ("programacao_dinamica" ou
+            "potencia_matriz") e estados_uteis
+    """
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    # Sem módulo o total cresce até comprimento × log2(símbolos) bits
+    if modulo is None and comprimento > config.AFD_CONTAGEM_MAX_COMPRIMENTO:
+        return {"erro": f"Sem módulo, o comprimento máximo é {config.AFD_CONTAGEM_MAX_COMPRIMENTO}"}
+    try:
+        with medirFase("afd", "operacao"):
+            contagem = afdOperacoes.contarPalavras(compilado, comprimento, modulo)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return {"comprimento": comprimento, "modulo": modulo, **contagem}
 
 
+def enumerarPalavras(afd_id: str, cursor: int = 0, limite: int | None = None):
+    """
+    Gera, em NDJSON, as strings aceitas por um AFD em ordem shortlex.
 
-def visualizarAfd():
+    Args:
+        afd_id (str): ID do AFD
+        cursor (int): Índice da primeira string da página
+        limite (int | None): Máximo de strings na página
+
+    Returns:
+        Iterator[str] | dict: Uma linha {"indice", "palavra"} por string e uma
+            linha final com "fim" (ver rastreioService.paginar), ou um dict
+            com "erro"
     """
-    Obtém informações detalhadas do AFD atual.
+    compilado = _obterCompilado(afd_id)
+    if compilado is None:
+        return {"erro": "AFD não encontrado"}
+    limite, _ = resolverPagina(limite, None)
+    try:
+        palavras = afdOperacoes.enumerarPalavras(compilado, cursor)
+    except ValueError as e:
+        return {"erro": str(e)}
+    return paginar(palavras, limite, "indice")
+
+
+def getAfdInfo(afd_id: str) -> afdInfo:
+    """
+    Obtém informações detalhadas de um AFD.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
 
     Returns:
         afdInfo: Dados do AFD contendo:
@@ -108,31 +706,92 @@ def visualizarAfd():
             - transicoes: Regras de transição
             - estado_inicial: Estado inicial
             - estados_finais: Estados de aceitação
+            - mapa_estados: Estados originais representados por cada
+              estado, se o AFD foi minimizado
+            - memoria: Bytes ocupados pela definição e pelas tabelas compiladas,
+              medidos na criação
 
     Raises:
-        Exception: Se nenhum AFD foi criado
+        Exception: Se o AFD não existir
     """
-    if afdAtual is None:
-        return {"erro": "Nenhum AFD foi criado ainda"}
+    entrada = registro.obter(afd_id)
+    if entrada is None:
+        return {"erro": "AFD não encontrado"}
+    afd = entrada["afd"]
+    minimizacao = entrada["minimizacao"]
     
+    return afdInfo(
+        estados = afd.states,
+        simbolos = afd.input_symbols,
+        transicoes = afd.transitions,
+        estado_inicial = afd.initial_state,
+        estados_finais = afd.final_states,
+        mapa_estados = minimizacao["mapa_estados"] if minimizacao else None,
+        memoria = entrada["memoria"]
+    )
+
+
+
+def _gerarDiagrama(afd: "DFA") -> "Digraph":
+    """Monta o diagrama Graphviz de um AFD."""
+    from graphviz import Digraph
+
     dot = Digraph()
 
     # Indicação do estado inicial
     dot.node("", shape = "none")  # Nó invisível para a seta inicial
-    dot.edge("", afdAtual.initial_state, label = "")  # A seta inicial aponta para o estado inicial
+    dot.edge("", afd.initial_state, label = "")  # A seta inicial aponta para o estado inicial
 
     # Configuração dos nós
-    for estado in afdAtual.states:
-        if estado in afdAtual.final_states:
+    for estado in afd.states:
+        if estado in afd.final_states:
             dot.node(estado, estado, shape = "doublecircle")
         else:
             dot.node(estado, estado, shape="circle")
 
     # Adiciona as transições
-    for estado, transicoes in afdAtual.transitions.items():
+    for estado, transicoes in afd.transitions.items():
         for simbolo, destino in transicoes.items():
             dot.edge(estado, destino, label = simbolo)
 
-    # Salva o arquivo
-    dot.render("afd_visualization", format="png", cleanup = True)
-    return {"mensagem": "Visualização do AFD gerada com sucesso"}
+    return dot
+
+
+
+async def visualizarAfd(afd_id: str, formato: str = "png", if_none_match: str | None = None):
+    """
+    Gera uma visualização gráfica do AFD usando Graphviz.
+
+    A imagem é guardada em cache pelo hash do AFD, então AFDs idênticos
+    só são renderizados uma vez.
+
+    Args:
+        afd_id (str): ID do AFD retornado na criação
+        formato (str): "png", "svg", "pdf" ou "dot" (código-fonte, sem Graphviz)
+        if_none_match (str | None): ETag que o cliente já possui
+
+    Returns:
+        dict: Mensagem de erro, ou a imagem (bytes), seu media type e sua ETag.
+        A imagem é None se a ETag do cliente ainda for válida.
+    """
+    entrada = registro.obter(afd_id)
+    if entrada is None:
+        return {"erro": "AFD não encontrado"}
+    afd = entrada["afd"]
+
+    return await renderizar(
+        "afd", entrada["hash"], lambda: _gerarDiagrama(afd), formato = formato, if_none_match = if_none_match
+    )
+
+
+
+def getEstatisticas() -> dict:
+    """
+    Obtém a ocupação do registro de AFDs e os contadores do cache de criação.
+
+    Returns:
+        dict: Número de autômatos, bytes estimados, limites configurados,
+        acertos e falhas do cache de definições e, em cache_resultados,
+        ocupação e taxa de acertos do cache de resultados de /testar
+    """
+    return {**registro.estatisticas(), "cache_resultados": cacheResultados.estatisticas("afd")}
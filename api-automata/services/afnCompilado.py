@@ -0,0 +1,155 @@
+"""
+Simulador de AFNs por conjuntos de estados em bits.
+Cada conjunto de estados ativos é um inteiro, com um bit por estado, e a
+simulação avança todos os estados de uma vez, sem determinizar o autômato.
+Opcionalmente, as transições entre conjuntos já calculadas ficam em cache,
+formando um AFD construído sob demanda.
+"""
+
+import sys
+
+# Bytes por chave da tabela de espalhamento de um dict grande
+_BYTES_POR_CHAVE = sys.getsizeof(dict.fromkeys(range(1024))) / 1024
+
+
+def _bits(mascara: int):
+    """Índices dos bits ligados de uma máscara."""
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+
+class AfnCompilado:
+    """
+    Tabelas de transição de um AFN em máscaras de bits.
+
+    `_destinos[simbolo][i]` é a máscara dos estados alcançados a partir do
+    estado `i` lendo `simbolo`, já incluindo o fecho das transições vazias.
+    Com `max_conjuntos_cache` > 0, cada par (conjunto, símbolo) calculado é
+    guardado, até esse número de conjuntos distintos.
+    """
+
+    __slots__ = ("estados", "inicial", "finais", "max_conjuntos_cache", "_destinos", "_cache")
+
+    def __init__(
+        self,
+        estados,
+        transicoes: dict,
+        estado_inicial: str,
+        estados_finais,
+        max_conjuntos_cache: int = 0
+    ):
+        self.estados = sorted(estados)
+        indice = {estado: i for i, estado in enumerate(self.estados)}
+
+        fechos = self._fechos(transicoes, indice)
+        self.inicial = fechos[indice[estado_inicial]]
+        self.finais = 0
+        for estado in estados_finais:
+            self.finais |= 1 << indice[estado]
+
+        self._destinos: dict[str, list[int]] = {}
+        for estado, saidas in transicoes.items():
+            for simbolo, destinos in saidas.items():
+                if simbolo == "":
+                    continue
+                linha = self._destinos.setdefault(simbolo, [0] * len(self.estados))
+                for destino in destinos:
+                    linha[indice[estado]] |= fechos[indice[destino]]
+
+        self.max_conjuntos_cache = max_conjuntos_cache
+        self._cache: dict[int, dict[str, int]] = {}
+
+    def _fechos(self, transicoes: dict, indice: dict) -> list[int]:
+        """Fecho das transições vazias de cada estado, como máscara."""
+        vazias = [0] * len(self.estados)
+        for estado, saidas in transicoes.items():
+            for destino in saidas.get("", ()):
+                vazias[indice[estado]] |= 1 << indice[destino]
+
+        fechos = []
+        for i in range(len(self.estados)):
+            fecho = pendentes = 1 << i
+            while pendentes:
+                novos = 0
+                for j in _bits(pendentes):
+                    novos |= vazias[j]
+                pendentes = novos & ~fecho
+                fecho |= novos
+            fechos.append(fecho)
+        return fechos
+
+    @classmethod
+    def deAfn(cls, afn, max_conjuntos_cache: int = 0) -> "AfnCompilado":
+        """Compila um NFA do automata-lib."""
+        return cls(afn.states, afn.transitions, afn.initial_state, afn.final_states, max_conjuntos_cache)
+
+    def tamanhoMaximoCache(self, simbolos: int) -> int:
+        """
+        Estima os bytes do cache cheio, com `max_conjuntos_cache` conjuntos
+        e uma transição guardada por símbolo em cada um.
+
+        Args:
+            simbolos (int): Tamanho do alfabeto
+
+        Returns:
+            int: Tamanho estimado em bytes (0 sem cache)
+        """
+        if self.max_conjuntos_cache <= 0:
+            return 0
+        mascara = sys.getsizeof((1 << len(self.estados)) - 1)
+        saidas = sys.getsizeof(dict.fromkeys(range(simbolos))) + simbolos * mascara
+        return int(self.max_conjuntos_cache * (_BYTES_POR_CHAVE + mascara + saidas))
+
+    @property
+    def conjuntosEmCache(self) -> int:
+        """Quantidade de conjuntos de estados com transições em cache."""
+        return len(self._cache)
+
+    def _mover(self, conjunto: int, simbolo: str) -> int:
+        linha = self._destinos.get(simbolo)
+        if linha is None:
+            return 0
+        proximo = 0
+        for i in _bits(conjunto):
+            proximo |= linha[i]
+        return proximo
+
+    def avancar(self, conjunto: int, trecho: str) -> int:
+        """Lê um trecho a partir de um conjunto de estados e retorna o conjunto alcançado."""
+        if self.max_conjuntos_cache <= 0:
+            for simbolo in trecho:
+                conjunto = self._mover(conjunto, simbolo)
+                if not conjunto:
+                    return 0
+            return conjunto
+
+        cache = self._cache
+        for simbolo in trecho:
+            saidas = cache.get(conjunto)
+            if saidas is None:
+                if len(cache) >= self.max_conjuntos_cache:
+                    proximo = self._mover(conjunto, simbolo)
+                else:
+                    saidas = cache[conjunto] = {}
+            if saidas is not None:
+                proximo = saidas.get(simbolo)
+                if proximo is None:
+                    proximo = saidas[simbolo] = self._mover(conjunto, simbolo)
+            conjunto = proximo
+            if not conjunto:
+                return 0
+        return conjunto
+
+    def nomesEstados(self, conjunto: int) -> list[str]:
+        """Nomes dos estados de um conjunto, em ordem alfabética."""
+        return [self.estados[i] for i in _bits(conjunto)]
+
+    def aceitaConjunto(self, conjunto: int) -> bool:
+        """Indica se o conjunto contém algum estado de aceitação."""
+        return bool(conjunto & self.finais)
+
+    def aceita(self, input_string: str) -> bool:
+        """Verifica se uma string é aceita, com o mesmo resultado de NFA.accepts_input."""
+        return self.aceitaConjunto(self.avancar(self.inicial, input_string))
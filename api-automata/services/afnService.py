@@ -0,0 +1,253 @@
+"""
+Service para manipulação de Autômatos Finitos Não Determinísticos (AFN).
+Implementa operações de criação, teste e visualização de AFNs.
+"""
+
+from typing import TYPE_CHECKING
+
+import config
+from schemas.afnSchema import afnInput, afnInfo
+from services.afnCompilado import AfnCompilado
+from services.cacheResultados import cache as cacheResultados
+from services.metricasService import medirFase, registrarEntradas, registrarValidacao
+from services.registroService import RegistroAutomatos, hashDefinicao, medirMemoria
+from services.visualizacaoService import renderizar
+
+# O automata-lib (que importa o networkx) e o Graphviz são carregados no
+# primeiro uso, e não na inicialização da API
+if TYPE_CHECKING:
+    from automata.fa.nfa import NFA
+    from graphviz import Digraph
+
+# Cada entrada guarda o NFA, o hash da definição, o simulador compilado e a
+# memória medida na criação:
+# {"afn": NFA, "hash": str, "compilado": AfnCompilado, "memoria": dict}
+registro = RegistroAutomatos(tipo = "afn")
+
+def criarAfn(afn_input: afnInput, determinizar: bool = False):
+    """
+    Cria um novo Autômato Finito Não Determinístico (AFN).
+
+    Args:
+        afn_input (afnInput): Dados do AFN
+            - estados: Conjunto de estados (set)
+            - simbolos: Alfabeto de entrada (set)
+            - transicoes: Dicionário {estado: {símbolo: {estados_destino}}},
+              com "" para transições vazias
+            - estado_inicial: Estado inicial (str)
+            - estados_finais: Conjunto de estados de aceitação (set)
+        determinizar (bool): Se True, guarda as transições entre conjuntos de
+            estados já calculadas (AFD construído sob demanda), acelerando
+            testes repetidos
+
+    Returns:
+        dict: Mensagem de sucesso/erro, ID do AFN criado e se ele foi reaproveitado
+    """
+    registrarValidacao("afn")
+    definicao = dict(afn_input)
+    hash_conteudo = hashDefinicao({**definicao, "determinizar": True} if determinizar else definicao)
+
+    # Definições idênticas reaproveitam o autômato já construído e validado
+    afn_id = registro.buscarPorHash(hash_conteudo)
+    if afn_id is not None and registro.obter(afn_id) is not None:
+        return {"mensagem": "AFN criado com sucesso", "id": afn_id, "reutilizado": True}
+
+    with medirFase("afn", "construcao"):
+        from automata.fa.nfa import NFA
+        afn = NFA(
+            states = afn_input.estados,
+            input_symbols = afn_input.simbolos,
+            transitions = afn_input.transicoes,
+            initial_state = afn_input.estado_inicial,
+            final_states = afn_input.estados_finais
+        )
+
+    with medirFase("afn", "compilacao"):
+        compilado = AfnCompilado.deAfn(afn, config.AFN_CACHE_MAX_CONJUNTOS if determinizar else 0)
+    memoria = medirMemoria(afn, compilado)
+    # O cache de conjuntos cresce depois da criação, sem passar pelo registro;
+    # o limite dele já entra na conta
+    cache = compilado.tamanhoMaximoCache(len(afn.input_symbols))
+    memoria = {
+        **memoria,
+        "compilado_bytes": memoria["compilado_bytes"] + cache,
+        "total_bytes": memoria["total_bytes"] + cache
+    }
+
+    entrada = {"afn": afn, "hash": hash_conteudo, "compilado": compilado, "memoria": memoria}
+    afn_id = registro.adicionar(entrada, memoria["total_bytes"], hash_conteudo)
+    return {"mensagem": "AFN criado com sucesso", "id": afn_id, "reutilizado": False}
+
+
+def testarString(afn_id: str, input_string: str) -> dict:
+    """
+    Verifica se uma string é aceita pelo AFN informado.
+
+    A simulação acompanha o conjunto de estados ativos, sem determinizar o AFN.
+
+    Args:
+        afn_id (str): ID do AFN retornado na criação
+        input_string (str): String a ser testada
+
+    Returns:
+        dict: Resultado do teste com:
+            - string: String testada
+            - aceita: Booleano indicando aceitação
+            - estados_ativos: Estados em que o AFN pode estar ao fim da leitura
+            - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
+    """
+    entrada = registro.obter(afn_id)
+    if entrada is None:
+        return {"erro": "AFN não encontrado"}
+    compilado = entrada["compilado"]
+
+    registrarEntradas("afn", [input_string])
+    chave = (entrada["hash"], input_string)
+    resultado = cacheResultados.obter("afn", chave)
+    if resultado is not None:
+        return {**resultado, "cache": True}
+    try:
+        with medirFase("afn", "simulacao"):
+            conjunto = compilado.avancar(compilado.inicial, input_string)
+        aceita = compilado.aceitaConjunto(conjunto)
+        resultado = {
+            "string": input_string,
+            "aceita": aceita,
+            "estados_ativos": compilado.nomesEstados(conjunto),
+            "mensagem": "String aceita" if aceita else "String rejeitada"
+        }
+    except Exception as e:
+        return {"erro": f"Erro ao processar string: {str(e)}"}
+    cacheResultados.guardar("afn", chave, resultado)
+    return {**resultado, "cache": False}
+
+
+def testarLote(afn_id: str, inputs: list[str], resumo: bool = False) -> dict:
+    """
+    Testa várias strings no AFN informado com uma única busca no registro.
+
+    Args:
+        afn_id (str): ID do AFN retornado na criação
+        inputs (list[str]): Strings a serem testadas
+        resumo (bool): Se True, retorna apenas as contagens e os índices rejeitados
+
+    Returns:
+        dict: Resultado do lote com:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            ou, no modo resumo:
+            - aceitas / rejeitadas: Contagens
+            - indices_rejeitados: Posições das strings rejeitadas
+    """
+    entrada = registro.obter(afn_id)
+    if entrada is None:
+        return {"erro": "AFN não encontrado"}
+    compilado = entrada["compilado"]
+
+    registrarEntradas("afn", inputs)
+    try:
+        with medirFase("afn", "simulacao"):
+            aceitas = [compilado.aceita(input_string) for input_string in inputs]
+    except Exception as e:
+        return {"erro": f"Erro ao processar lote: {str(e)}"}
+
+    if resumo:
+        rejeitados = [indice for indice, aceita in enumerate(aceitas) if not aceita]
+        return {
+            "total": len(aceitas),
+            "aceitas": len(aceitas) - len(rejeitados),
+            "rejeitadas": len(rejeitados),
+            "indices_rejeitados": rejeitados
+        }
+
+    return {"total": len(aceitas), "resultados": aceitas}
+
+
+def getAfnInfo(afn_id: str) -> afnInfo:
+    """
+    Obtém informações do AFN informado.
+
+    Args:
+        afn_id (str): ID do AFN retornado na criação
+
+    Returns:
+        afnInfo: Dados do AFN, incluindo se a determinização sob demanda está
+            ativa e a memória ocupada, medida na criação
+    """
+    entrada = registro.obter(afn_id)
+    if entrada is None:
+        return {"erro": "AFN não encontrado"}
+    afn = entrada["afn"]
+
+    return afnInfo(
+        estados = afn.states,
+        simbolos = afn.input_symbols,
+        transicoes = afn.transitions,
+        estado_inicial = afn.initial_state,
+        estados_finais = afn.final_states,
+        determinizar = entrada["compilado"].max_conjuntos_cache > 0,
+        memoria = entrada["memoria"]
+    )
+
+
+def _gerarDiagrama(afn: "NFA") -> "Digraph":
+    """Monta o diagrama Graphviz de um AFN."""
+    from graphviz import Digraph
+
+    dot = Digraph()
+    dot.attr(rankdir = "LR")
+
+    # Indicação do estado inicial
+    dot.node("", shape = "none")
+    dot.edge("", afn.initial_state, label = "")
+
+    for estado in afn.states:
+        dot.node(estado, estado, shape = "doublecircle" if estado in afn.final_states else "circle")
+
+    # Símbolos com o mesmo origem e destino são agrupados em uma só aresta
+    rotulos = {}
+    for estado, transicoes in afn.transitions.items():
+        for simbolo, destinos in transicoes.items():
+            for destino in destinos:
+                rotulos.setdefault((estado, destino), []).append(simbolo or "ε")
+
+    for (estado, destino), simbolos in rotulos.items():
+        dot.edge(estado, destino, label = ",".join(sorted(simbolos)))
+
+    return dot
+
+
+async def visualizarAfn(afn_id: str, formato: str = "png", if_none_match: str | None = None):
+    """
+    Gera uma visualização gráfica do AFN usando Graphviz.
+
+    Args:
+        afn_id (str): ID do AFN retornado na criação
+        formato (str): "png", "svg", "pdf" ou "dot" (código-fonte, sem Graphviz)
+        if_none_match (str | None): ETag que o cliente já possui
+
+    Returns:
+        dict: Mensagem de erro, ou a imagem (bytes), seu media type e sua ETag.
+        A imagem é None se a ETag do cliente ainda for válida.
+    """
+    entrada = registro.obter(afn_id)
+    if entrada is None:
+        return {"erro": "AFN não encontrado"}
+    afn = entrada["afn"]
+
+    return await renderizar(
+        "afn", entrada["hash"], lambda: _gerarDiagrama(afn), formato = formato, if_none_match = if_none_match
+    )
+
+
+def getEstatisticas() -> dict:
+    """
+    Obtém a ocupação do registro de AFNs e os contadores do cache de criação.
+
+    Returns:
+        dict: Número de autômatos, bytes estimados, limites configurados,
+        acertos e falhas do cache de definições e, em cache_resultados,
+        ocupação e taxa de acertos do cache de resultados de /testar
+    """
+    return {**registro.estatisticas(), "cache_resultados": cacheResultados.estatisticas("afn")}
@@ -0,0 +1,223 @@
+"""
+Executor de Autômatos com Pilha determinísticos com detecção de laços.
+Reproduz DPDA.read_input_stepwise, mas interrompe sequências infinitas de
+transições vazias (ε) que o automata-lib executaria indefinidamente.
+"""
+
+# Situações possíveis ao fim de uma execução
+ACEITA = "aceita"
+REJEITADA = "rejeitada"
+LACO_EPSILON = "laco_epsilon"
+
+
+class ApCompilado:
+    """
+    Transições de um AP determinístico em tabelas indexadas por inteiros.
+
+    Estados e símbolos da pilha são internados na criação: o estado i e o
+    símbolo j do topo formam o índice i * símbolos_pilha + j de listas
+    planas, uma para as transições vazias e uma por símbolo de entrada. O
+    símbolo 0 representa a pilha vazia. Em cada par (estado, topo) há
+    transições vazias ou transições que leem a entrada, nunca os dois (o
+    automata-lib valida isso na criação). A pilha é uma lista de inteiros,
+    cujo topo é o último elemento.
+    """
+
+    __slots__ = (
+        "estados", "simbolos_pilha", "inicial", "simbolo_inicial", "modo_aceitacao",
+        "_finais", "_vazias", "_leitura"
+    )
+
+    def __init__(
+        self,
+        transicoes: dict,
+        estado_inicial: str,
+        simbolo_inicial_pilha: str,
+        estados_finais,
+        modo_aceitacao: str = "final_state"
+    ):
+        self.estados = sorted(set(transicoes) | {estado_inicial} | set(estados_finais) | {
+            destino
+            for por_simbolo in transicoes.values()
+            for por_topo in por_simbolo.values()
+            for destino, _ in por_topo.values()
+        })
+        indice_estado = {estado: indice for indice, estado in enumerate(self.estados)}
+        self.simbolos_pilha = [""]
+        indice_pilha = {"": 0}
+
+        def internar(simbolo: str) -> int:
+            if simbolo not in indice_pilha:
+                indice_pilha[simbolo] = len(self.simbolos_pilha)
+                self.simbolos_pilha.append(simbolo)
+            return indice_pilha[simbolo]
+
+        internar(simbolo_inicial_pilha)
+        for por_simbolo in transicoes.values():
+            for por_topo in por_simbolo.values():
+                for topo, (_, empilhar) in por_topo.items():
+                    internar(topo)
+                    for simbolo in empilhar:
+                        internar(simbolo)
+
+        self.inicial = indice_estado[estado_inicial]
+        self.simbolo_inicial = indice_pilha[simbolo_inicial_pilha]
+        self.modo_aceitacao = modo_aceitacao
+        self._finais = [estado in estados_finais for estado in self.estados]
+
+        # Cada célula guarda (destino, símbolos a empilhar com o novo topo por último)
+        celulas = len(self.estados) * len(self.simbolos_pilha)
+        self._vazias: list[tuple | None] = [None] * celulas
+        self._leitura: dict[str, list[tuple | None]] = {}
+        for estado, por_simbolo in transicoes.items():
+            for simbolo, por_topo in por_simbolo.items():
+                tabela = self._vazias if simbolo == "" else self._leitura.setdefault(simbolo, [None] * celulas)
+                for topo, (destino, empilhar) in por_topo.items():
+                    celula = indice_estado[estado] * len(self.simbolos_pilha) + indice_pilha[topo]
+                    # O primeiro símbolo de `empilhar` vira o novo topo
+                    tabela[celula] = (
+                        indice_estado[destino], tuple(indice_pilha[item] for item in reversed(empilhar))
+                    )
+
+    @classmethod
+    def deAp(cls, ap) -> "ApCompilado":
+        """Compila um DPDA do automata-lib."""
+        return cls(ap.transitions, ap.initial_state, ap.initial_stack_symbol, ap.final_states, ap.acceptance_mode)
+
+    def _configuracao(self, passo: int, estado: int, posicao: int, pilha: list, janela: int) -> dict:
+        # Símbolos do topo para baixo, até `janela` deles
+        topo = pilha[:-janela - 1:-1] if janela else []
+        return {
+            "passo": passo,
+            "estado": self.estados[estado],
+            "posicao": posicao,
+            "altura_pilha": len(pilha),
+            "pilha": [self.simbolos_pilha[simbolo] for simbolo in topo]
+        }
+
+    def _aceitou(self, estado: int, pilha: list, restante: int) -> bool:
+        if restante:
+            return False
+        if self.modo_aceitacao in ("empty_stack", "both") and not pilha:
+            return True
+        return self.modo_aceitacao in ("final_state", "both") and self._finais[estado]
+
+    def executar(self, input_string: str) -> dict:
+        """
+        Executa o AP sobre uma string.
+
+        Args:
+            input_string (str): String a ser processada
+
+        Returns:
+            dict: Resultado da execução com:
+                - situacao: "aceita", "rejeitada" ou "laco_epsilon"
+                - aceita: Booleano indicando aceitação
+                - estado_final: Estado da última configuração
+                - passos: Transições aplicadas
+                - max_altura_pilha: Maior altura atingida pela pilha
+        """
+        # Sem passo inicial o gerador não produz configurações: a execução
+        # inteira acontece no primeiro next, que termina com o resultado
+        try:
+            next(self.rastrear(input_string, None))
+        except StopIteration as fim:
+            return fim.value
+
+    def rastrear(self, input_string: str, inicio: int | None = 0, janela: int = 8):
+        """
+        Executa o AP sobre uma string, gerando as configurações a partir do passo `inicio`.
+
+        Durante uma sequência de transições vazias, cada par (estado, topo) é
+        registrado com a altura da pilha. Se o mesmo par reaparece com a pilha
+        igual ou mais alta, sem que nada abaixo do topo registrado tenha sido
+        desempilhado, o AP repetiria o mesmo trecho para sempre: a execução é
+        interrompida e a string rejeitada. Registros cujo topo é desempilhado
+        deixam de valer. O custo total fica limitado pelo tamanho da entrada
+        vezes o número de pares (estado, topo) distintos.
+
+        Args:
+            input_string (str): String a ser processada
+            inicio (int | None): Primeiro passo gerado (None para não gerar nenhum)
+            janela (int): Símbolos do topo da pilha incluídos em cada configuração
+
+        Returns:
+            dict: Valor de retorno do gerador, no formato de `executar`
+        """
+        vazias = self._vazias
+        leitura = self._leitura
+        largura = len(self.simbolos_pilha)
+        estado = self.inicial
+        pilha = [self.simbolo_inicial]
+        posicao = 0
+        tamanho = len(input_string)
+        passos = 0
+        max_altura = 1
+
+        # Células (estado, topo) vistas na sequência atual de transições vazias:
+        # célula -> menor altura registrada, e alturas -> células registradas nela
+        vistos: dict[int, int] = {}
+        por_altura: list[list[int]] = []
+
+        situacao = None
+        if inicio == 0:
+            yield self._configuracao(0, estado, posicao, pilha, janela)
+        while True:
+            celula = estado * largura + (pilha[-1] if pilha else 0)
+            transicao = vazias[celula]
+            if transicao is not None:
+                altura = len(pilha)
+                registrada = vistos.get(celula)
+                if registrada is not None and altura >= registrada:
+                    situacao = LACO_EPSILON
+                    break
+                vistos[celula] = altura
+                while len(por_altura) <= altura:
+                    por_altura.append([])
+                por_altura[altura].append(celula)
+            elif posicao < tamanho:
+                tabela = leitura.get(input_string[posicao])
+                transicao = tabela[celula] if tabela is not None else None
+                if transicao is None:
+                    situacao = REJEITADA
+                    break
+                posicao += 1
+                # Consumir entrada encerra a sequência de transições vazias
+                vistos.clear()
+                por_altura.clear()
+            else:
+                # Sem entrada nem transição vazia: decide pela configuração atual
+                break
+
+            estado, empilhar = transicao
+            if pilha:
+                pilha.pop()
+            # Um registro feito com altura h vale enquanto a pilha não descer
+            # abaixo de h - 1; os registros mais altos que isso são descartados
+            base = len(pilha)
+            while len(por_altura) > base + 2:
+                altura = len(por_altura) - 1
+                for registro in por_altura.pop():
+                    if vistos.get(registro) == altura:
+                        del vistos[registro]
+            pilha.extend(empilhar)
+            passos += 1
+            if len(pilha) > max_altura:
+                max_altura = len(pilha)
+            if inicio is not None and passos >= inicio:
+                yield self._configuracao(passos, estado, posicao, pilha, janela)
+
+            if self._aceitou(estado, pilha, tamanho - posicao):
+                situacao = ACEITA
+                break
+
+        if situacao is None:
+            situacao = ACEITA if self._aceitou(estado, pilha, tamanho - posicao) else REJEITADA
+
+        return {
+            "situacao": situacao,
+            "aceita": situacao == ACEITA,
+            "estado_final": self.estados[estado],
+            "passos": passos,
+            "max_altura_pilha": max_altura
+        }
@@ -3,74 +3,331 @@ Service para manipulação de Autômatos com Pilha (AP).
 Implementa operações de criação, teste e visualização de APs.
 """
 
-from automata.pda.dpda import DPDA
-from schemas.apSchema import apInput, apInfo
-from graphviz import Digraph
+from typing import TYPE_CHECKING
 
-apAtual: DPDA | None = None
+import config
+from schemas.apSchema import apInput, apInfo, EdicaoInput
+from services.apCompilado import ApCompilado, LACO_EPSILON
+from services.apnCompilado import ApnCompilado, LIMITE_EXCEDIDO
+from services import edicaoAutomatos
+from services.cacheResultados import cache as cacheResultados
+from services.metricasService import medirFase, registrarEntradas, registrarValidacao
+from services.rastreioService import paginar, resolverPagina
+from services.registroService import RegistroAutomatos, hashDefinicao, medirMemoria
+from services.visualizacaoService import renderizar
+
+# O automata-lib (que importa o networkx) e o Graphviz são carregados no
+# primeiro uso, e não na inicialização da API
+if TYPE_CHECKING:
+    from automata.pda.dpda import DPDA
+    from automata.pda.npda import NPDA
+    from graphviz import Digraph
+
+# Cada entrada guarda o AP, o hash da definição, o executor compilado e a
+# memória medida na criação:
+# {"ap": DPDA, "hash": str, "compilado": ApCompilado, "memoria": dict} ou
+# {"ap": NPDA, "hash": str, "compilado": ApnCompilado, "memoria": dict}
+registro = RegistroAutomatos(tipo = "ap")
 
 def criarAp(ap_input: apInput):
     """
-    Cria um novo Autômato com Pilha (AP) Determinístico.
+    Cria um novo Autômato com Pilha (AP), determinístico ou não.
 
     Args:
         ap_input (apInput): Dados do AP
         - estados: Conjunto de estados
         - simbolos_entrada: Alfabeto de entrada
         - simbolos_pilha: Alfabeto da pilha
-        - transitions: Função de transição (dict hierárquico)
+        - transitions: Função de transição (dict hierárquico); no AP não
+          determinístico, cada transição é uma lista de pares [estado, empilhar]
         - estado_inicial: Estado inicial
         - simbolo_inicial_pilha: Símbolo inicial da pilha
         - estados_finais: Estados finais
+        - deterministico: Se False, cria um NPDA
+
+    Returns:
+        dict: Mensagem de sucesso/erro, ID do AP criado e se ele foi reaproveitado
+    """
+    registrarValidacao("ap")
+    definicao = dict(ap_input)
+    hash_conteudo = hashDefinicao(definicao)
+
+    # Definições idênticas reaproveitam o autômato já construído e validado
+    ap_id = registro.buscarPorHash(hash_conteudo)
+    if ap_id is not None and registro.obter(ap_id) is not None:
+        return {"mensagem": "AP criado com sucesso", "id": ap_id, "reutilizado": True}
+
+    if ap_input.deterministico:
+        with medirFase("ap", "construcao"):
+            from automata.pda.dpda import DPDA
+            ap = DPDA(
+                states = ap_input.estados,
+                input_symbols = ap_input.simbolos_entrada,
+                stack_symbols = ap_input.simbolos_pilha,
+                transitions = ap_input.transitions,
+                initial_state = ap_input.estado_inicial,
+                initial_stack_symbol = ap_input.simbolo_inicial_pilha,
+                final_states = ap_input.estados_finais
+            )
+        with medirFase("ap", "compilacao"):
+            compilado = ApCompilado.deAp(ap)
+    else:
+        transicoes = _transicoesNaoDeterministicas(ap_input.transitions)
+        if transicoes is None:
+            return {"erro": "Transições de AP não determinístico devem ser listas de pares [estado, empilhar]"}
+        with medirFase("ap", "construcao"):
+            from automata.pda.npda import NPDA
+            ap = NPDA(
+                states = ap_input.estados,
+                input_symbols = ap_input.simbolos_entrada,
+                stack_symbols = ap_input.simbolos_pilha,
+                transitions = transicoes,
+                initial_state = ap_input.estado_inicial,
+                initial_stack_symbol = ap_input.simbolo_inicial_pilha,
+                final_states = ap_input.estados_finais,
+                acceptance_mode = "final_state"
+            )
+        with medirFase("ap", "compilacao"):
+            compilado = ApnCompilado.deAp(ap)
+
+    memoria = medirMemoria(ap, compilado)
+    entrada = {"ap": ap, "hash": hash_conteudo, "compilado": compilado, "memoria": memoria}
+    ap_id = registro.adicionar(entrada, memoria["total_bytes"], hash_conteudo)
+    return {"mensagem": "AP criado com sucesso", "id": ap_id, "reutilizado": False}
+
+
+def editarAp(edicao: EdicaoInput) -> dict:
+    """
+    Cria um AP determinístico a partir de um registrado, com as alterações informadas.
+
+    Só os estados tocados pela edição são conferidos (ver
+    services/edicaoAutomatos.py); o executor compilado é montado a partir
+    das transições editadas, sem a validação do automata-lib. O AP editado
+    recebe um novo ID e o original não muda. O hash é o da definição
+    resultante, então um AP idêntico já registrado é reaproveitado.
+
+    Args:
+        edicao (EdicaoInput): ID do AP e alterações
+            - adicionar_estados / remover_estados: Estados criados e apagados
+            - transicoes: Transições novas ou substituídas {estado: {símbolo: {topo: (destino, empilhar)}}}
+            - remover_transicoes: Transições apagadas {estado: {símbolo: {topo}}}
+            - adicionar_finais / remover_finais: Estados que passam a ser (ou deixam de ser) finais
 
     Returns:
-        dict: Mensagem de sucesso/erro
-    """
-    global apAtual
-    apAtual = DPDA(
-        states = ap_input.estados,
-        input_symbols = ap_input.simbolos_entrada,
-        stack_symbols = ap_input.simbolos_pilha,
-        transitions = ap_input.transitions,
-        initial_state = ap_input.estado_inicial,
-        initial_stack_symbol = ap_input.simbolo_inicial_pilha,
-        final_states = ap_input.estados_finais
+        dict: Mensagem de sucesso, ID do AP editado, se ele foi reaproveitado,
+            editado_de, total de estados e estados_conferidos, ou {"erro"} se
+            o AP não existir, não for determinístico ou a edição for inválida
+    """
+    entrada = registro.obter(edicao.id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+    if not isinstance(entrada["compilado"], ApCompilado):
+        return {"erro": "Só APs determinísticos podem ser editados"}
+    alteracoes = {campo: valor for campo, valor in edicao if campo != "id"}
+    if not any(alteracoes.values()):
+        return {"mensagem": "Nenhuma alteração informada", "id": edicao.id}
+
+    try:
+        with medirFase("ap", "edicao"):
+            ap = edicaoAutomatos.editarAp(entrada["ap"], alteracoes)
+            compilado = ApCompilado.deAp(ap)
+    except ValueError as e:
+        return {"erro": f"Edição inválida: {e}"}
+
+    hash_conteudo = hashDefinicao(dict(apInput(
+        estados = ap.states,
+        simbolos_entrada = ap.input_symbols,
+        simbolos_pilha = ap.stack_symbols,
+        transitions = ap.transitions,
+        estado_inicial = ap.initial_state,
+        estados_finais = ap.final_states,
+        simbolo_inicial_pilha = ap.initial_stack_symbol
+    )))
+    ap_id = registro.buscarPorHash(hash_conteudo)
+    reutilizado = ap_id is not None and registro.obter(ap_id) is not None
+    if not reutilizado:
+        memoria = medirMemoria(ap, compilado)
+        nova = {"ap": ap, "hash": hash_conteudo, "compilado": compilado, "memoria": memoria}
+        ap_id = registro.adicionar(nova, memoria["total_bytes"], hash_conteudo)
+    conferidos = (
+        alteracoes["remover_estados"] | alteracoes["adicionar_estados"]
+        | alteracoes["transicoes"].keys() | alteracoes["remover_transicoes"].keys()
     )
+    return {
+        "mensagem": "AP editado com sucesso",
+        "id": ap_id,
+        "reutilizado": reutilizado,
+        "editado_de": edicao.id,
+        "estados": len(ap.states),
+        "estados_conferidos": len(conferidos)
+    }
 
-    return {"mensagem": "AP criado com sucesso"}
 
-def testarString(input_string: str) -> dict:
+def _transicoesNaoDeterministicas(transitions: dict) -> dict | None:
     """
-    Verifica se uma string é aceita pelo AP atual.
+    Converte {estado: {símbolo: {topo: [[destino, empilhar], ...]}}} para o
+    formato do NPDA, com conjuntos de pares (destino, empilhar).
+
+    Returns:
+        dict | None: Transições convertidas, ou None se algum par for inválido
+    """
+    convertidas = {}
+    for estado, por_simbolo in transitions.items():
+        for simbolo, por_topo in por_simbolo.items():
+            for topo, destinos in por_topo.items():
+                pares = set()
+                for par in destinos:
+                    if not isinstance(par, (list, tuple)) or len(par) != 2:
+                        return None
+                    destino, empilhar = par
+                    pares.add((destino, tuple(empilhar) if isinstance(empilhar, list) else empilhar))
+                convertidas.setdefault(estado, {}).setdefault(simbolo, {})[topo] = pares
+    return convertidas
+
+
+def _executar(compilado, input_string: str) -> dict:
+    """Executa um AP compilado, determinístico ou não."""
+    if isinstance(compilado, ApnCompilado):
+        return compilado.executar(input_string, config.APN_MAX_CONFIGURACOES)
+    return compilado.executar(input_string)
+
+def testarString(ap_id: str, input_string: str) -> dict:
+    """
+    Verifica se uma string é aceita pelo AP informado.
 
     Args:
+    ap_id (str): ID do AP retornado na criação
     input_string (str): String a ser testada
 
     Returns:
         dict: Resultado do teste com:
             - string: String testada
             - aceita: Booleano indicando aceitação
+            - situacao: "aceita", "rejeitada" ou "laco_epsilon" (execução
+              interrompida por um laço infinito de transições vazias); em APs
+              não determinísticos, "limite_excedido" se a busca explorar mais
+              configurações que o limite
+            - estado_final: Estado em que o AP parou (só determinísticos)
+            - passos: Transições aplicadas
+            - max_altura_pilha: Maior altura atingida pela pilha (só determinísticos)
+            - configuracoes: Configurações (estado, posição, topo) exploradas
+              (só não determinísticos)
             - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
 
     Raises:
         Exception: Se ocorrer erro durante o processamento
     """
-    if apAtual is None:
-        return {"erro": "Nenhum AP foi criado ainda"}
-    
+    entrada = registro.obter(ap_id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+
+    registrarEntradas("ap", [input_string])
+    chave = (entrada["hash"], input_string)
+    resultado = cacheResultados.obter("ap", chave)
+    if resultado is not None:
+        return {**resultado, "cache": True}
     try:
-        aceita = apAtual.accepts_input(input_string)
-        return {
-            "string": input_string,
-            "aceita": aceita,
-            "mensagem": "String aceita" if aceita else "String rejeitada"
-        }
+        with medirFase("ap", "simulacao"):
+            execucao = _executar(entrada["compilado"], input_string)
+        resultado = {"string": input_string, **execucao, "mensagem": _mensagem(execucao)}
     except Exception as e:
         return {"erro": f"Erro ao processar string: {str(e)}"}
+    cacheResultados.guardar("ap", chave, resultado)
+    return {**resultado, "cache": False}
+
+
+def _mensagem(execucao: dict) -> str:
+    if execucao["aceita"]:
+        return "String aceita"
+    if execucao["situacao"] == LACO_EPSILON:
+        return "String rejeitada: laço infinito de transições vazias interrompido"
+    if execucao["situacao"] == LIMITE_EXCEDIDO:
+        return "Execução interrompida: limite de configurações excedido"
+    return "String rejeitada"
+
+
+def testarLote(ap_id: str, inputs: list[str], resumo: bool = False) -> dict:
+    """
+    Testa várias strings no AP informado com uma única busca no registro.
+
+    Args:
+        ap_id (str): ID do AP retornado na criação
+        inputs (list[str]): Strings a serem testadas
+        resumo (bool): Se True, retorna apenas as contagens e os índices rejeitados
+
+    Returns:
+        dict: Resultado do lote com:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - situacoes: Situação de cada execução ("aceita", "rejeitada",
+              "laco_epsilon" ou "limite_excedido")
+            ou, no modo resumo:
+            - aceitas / rejeitadas: Contagens
+            - lacos_epsilon: Rejeitadas por laço de transições vazias
+            - limites_excedidos: Interrompidas pelo limite de configurações
+            - indices_rejeitados: Posições das strings rejeitadas
+    """
+    entrada = registro.obter(ap_id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+    compilado = entrada["compilado"]
+
+    registrarEntradas("ap", inputs)
+    try:
+        with medirFase("ap", "simulacao"):
+            execucoes = [_executar(compilado, input_string) for input_string in inputs]
+    except Exception as e:
+        return {"erro": f"Erro ao processar lote: {str(e)}"}
+
+    if resumo:
+        rejeitados = [indice for indice, execucao in enumerate(execucoes) if not execucao["aceita"]]
+        return {
+            "total": len(execucoes),
+            "aceitas": len(execucoes) - len(rejeitados),
+            "rejeitadas": len(rejeitados),
+            "lacos_epsilon": sum(execucao["situacao"] == LACO_EPSILON for execucao in execucoes),
+            "limites_excedidos": sum(execucao["situacao"] == LIMITE_EXCEDIDO for execucao in execucoes),
+            "indices_rejeitados": rejeitados
+        }
+
+    return {
+        "total": len(execucoes),
+        "resultados": [execucao["aceita"] for execucao in execucoes],
+        "situacoes": [execucao["situacao"] for execucao in execucoes]
+    }
 
-def getApInfo() -> apInfo:
+def rastrear(ap_id: str, input_string: str, cursor: int = 0, limite: int | None = None, janela: int | None = None):
     """
-    Obtém informações detalhadas do AP atual.
+    Gera, em NDJSON, as configurações de um AP determinístico ao ler uma string.
+
+    Args:
+        ap_id (str): ID do AP retornado na criação
+        input_string (str): String a ser processada
+        cursor (int): Primeiro passo da página
+        limite (int | None): Máximo de configurações na página
+        janela (int | None): Símbolos do topo da pilha em cada configuração
+
+    Returns:
+        Iterator[str] | dict: Uma linha {"passo", "estado", "posicao",
+            "altura_pilha", "pilha"} por transição (pilha do topo para baixo)
+            e uma linha final com "fim" (ver rastreioService.paginar), ou um
+            dict com "erro"
+    """
+    entrada = registro.obter(ap_id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+    if not isinstance(entrada["compilado"], ApCompilado):
+        return {"erro": "Rastreamento disponível apenas para APs determinísticos"}
+    limite, janela = resolverPagina(limite, janela)
+    return paginar(entrada["compilado"].rastrear(input_string, cursor, janela), limite)
+
+def getApInfo(ap_id: str) -> apInfo:
+    """
+    Obtém informações detalhadas de um AP.
+
+    Args:
+    ap_id (str): ID do AP retornado na criação
 
     Returns:
     apInfo: Dados do AP contendo:
@@ -81,49 +338,59 @@ def getApInfo() -> apInfo:
         - estado_inicial: Estado inicial
         - estados_finais: Estados de aceitação
         - simbolo_inicial_pilha: Símbolo inicial da pilha
+        - deterministico: Se o AP é determinístico
+        - memoria: Bytes ocupados pela definição e pelas tabelas compiladas,
+          medidos na criação
 
     Raises:
-        Exception: Se nenhum AP foi criado
+        Exception: Se o AP não existir
     """
-    if apAtual is None:
-        return {"erro": "Nenhum AP foi criado ainda"}
-    
+    entrada = registro.obter(ap_id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+    ap = entrada["ap"]
+    deterministico = isinstance(entrada["compilado"], ApCompilado)
+
+    transitions = ap.transitions
+    if not deterministico:
+        transitions = {
+            estado: {
+                simbolo: {
+                    topo: sorted([destino, list(empilhar)] for destino, empilhar in destinos)
+                    for topo, destinos in por_topo.items()
+                }
+                for simbolo, por_topo in por_simbolo.items()
+            }
+            for estado, por_simbolo in transitions.items()
+        }
+
     return apInfo(
-        estados = apAtual.states,
-        simbolos_entrada = apAtual.input_symbols,
-        simbolos_pilha = apAtual.stack_symbols,
-        transitions = apAtual.transitions,
-        estado_inicial = apAtual.initial_state,
-        estados_finais = apAtual.final_states,
-        simbolo_inicial_pilha = apAtual.initial_stack_symbol
+        estados = ap.states,
+        simbolos_entrada = ap.input_symbols,
+        simbolos_pilha = ap.stack_symbols,
+        transitions = transitions,
+        estado_inicial = ap.initial_state,
+        estados_finais = ap.final_states,
+        simbolo_inicial_pilha = ap.initial_stack_symbol,
+        deterministico = deterministico,
+        memoria = entrada["memoria"]
     )
 
-def visualizarAp():
-    """
-    Gera uma visualização gráfica do AP usando Graphviz.
+def _gerarDiagrama(ap: "DPDA | NPDA") -> "Digraph":
+    """Monta o diagrama Graphviz de um AP."""
+    from automata.pda.dpda import DPDA
+    from graphviz import Digraph
 
-    Returns:
-    dict: Mensagem de sucesso/erro
-
-    Notes:
-    - Cria arquivo PNG 'ap_visualization.png'
-    - Estados finais têm círculo duplo
-    - Transições mostram: símbolo_entrada,símbolo_pilha_pop/símbolos_pilha_push
-    - Layout horizontal para melhor organização
-    """
-    if apAtual is None:
-        return {"erro": "Nenhum AP foi criado ainda"}
-    
     dot = Digraph()
     dot.attr(rankdir="LR")  # Organiza os estados horizontalmente para evitar sobreposição
 
     # Indicação do estado inicial
     dot.node("", shape="none")
-    dot.edge("", apAtual.initial_state, label="")
+    dot.edge("", ap.initial_state, label="")
 
     # Configuração dos nós
-    for estado in apAtual.states:
-        if estado in apAtual.final_states:
+    for estado in ap.states:
+        if estado in ap.final_states:
             dot.node(estado, estado, shape="doublecircle")
         else:
             dot.node(estado, estado, shape="circle")
@@ -131,20 +398,60 @@ def visualizarAp():
     # Agrupamento de transições para evitar sobreposição de setas
     transicoes_formatadas = {}
 
-    for estado, trans_by_input in apAtual.transitions.items():
+    for estado, trans_by_input in ap.transitions.items():
         for input_symbol, trans_by_stack in trans_by_input.items():
-            for stack_symbol, (next_state, stack_push) in trans_by_stack.items():
-                label = f"{input_symbol},{stack_symbol}/{','.join(stack_push)}"
+            for stack_symbol, destinos in trans_by_stack.items():
+                # No DPDA cada topo leva a um só par (estado, empilhar)
+                destinos = [destinos] if isinstance(ap, DPDA) else sorted(destinos)
+                for next_state, stack_push in destinos:
+                    label = f"{input_symbol},{stack_symbol}/{','.join(stack_push)}"
 
-                if (estado, next_state) in transicoes_formatadas:
-                    transicoes_formatadas[(estado, next_state)].append(label)
-                else:
-                    transicoes_formatadas[(estado, next_state)] = [label]
+                    if (estado, next_state) in transicoes_formatadas:
+                        transicoes_formatadas[(estado, next_state)].append(label)
+                    else:
+                        transicoes_formatadas[(estado, next_state)] = [label]
 
     # Adiciona as transições ao grafo de forma mais organizada
     for (estado, next_state), labels in transicoes_formatadas.items():
         dot.edge(estado, next_state, label="\n".join(labels), constraint="false", minlen="2")
 
-    # Salva o arquivo
-    dot.render("ap_visualization", format="png", cleanup=True)
-    return {"mensagem": "Visualização do AP gerada com sucesso"}
\ No newline at end of file
+    return dot
+
+async def visualizarAp(ap_id: str, formato: str = "png", if_none_match: str | None = None):
+    """
+    Gera uma visualização gráfica do AP usando Graphviz.
+
+    Args:
+    ap_id (str): ID do AP retornado na criação
+    formato (str): "png", "svg", "pdf" ou "dot" (código-fonte, sem Graphviz)
+    if_none_match (str | None): ETag que o cliente já possui
+
+    Returns:
+    dict: Mensagem de erro, ou a imagem (bytes), seu media type e sua ETag.
+    A imagem é None se a ETag do cliente ainda for válida.
+
+    Notes:
+    - A imagem fica em cache pelo hash do AP
+    - Estados finais têm círculo duplo
+    - Transições mostram: símbolo_entrada,símbolo_pilha_pop/símbolos_pilha_push
+    - Layout horizontal para melhor organização
+    """
+    entrada = registro.obter(ap_id)
+    if entrada is None:
+        return {"erro": "AP não encontrado"}
+    ap = entrada["ap"]
+
+    return await renderizar(
+        "ap", entrada["hash"], lambda: _gerarDiagrama(ap), formato = formato, if_none_match = if_none_match
+    )
+
+def getEstatisticas() -> dict:
+    """
+    Obtém a ocupação do registro de APs e os contadores do cache de criação.
+
+    Returns:
+        dict: Número de autômatos, bytes estimados, limites configurados,
+        acertos e falhas do cache de definições e, em cache_resultados,
+        ocupação e taxa de acertos do cache de resultados de /testar
+    """
+    return {**registro.estatisticas(), "cache_resultados": cacheResultados.estatisticas("ap")}
@@ -0,0 +1,241 @@
+"""
+Executor de Autômatos com Pilha não determinísticos (APN).
+Explora todas as configurações alcançáveis com pilhas compartilhadas
+(graph-structured stack): ramos que empilham o mesmo conteúdo sobre pilhas
+diferentes dividem um único nó, e cada configuração é visitada uma vez.
+"""
+
+# Situações possíveis ao fim de uma execução
+ACEITA = "aceita"
+REJEITADA = "rejeitada"
+LIMITE_EXCEDIDO = "limite_excedido"
+
+# Nó que representa o fundo da pilha (pilha vazia, símbolo 0)
+_FUNDO = 0
+
+
+class ApnCompilado:
+    """
+    Transições de um AP não determinístico em tabelas indexadas por inteiros.
+
+    Estados e símbolos da pilha são internados na criação, como em
+    ApCompilado: a célula i * símbolos_pilha + j guarda as opções do estado
+    i com o símbolo j no topo, e o símbolo 0 representa a pilha vazia.
+
+    A busca trabalha com "quadros" (estado, posição na entrada, topo da
+    pilha): o que o AP faz até desempilhar o topo depende só do quadro, não
+    do restante da pilha. Cada quadro guarda os nós que podem estar abaixo
+    do topo e as saídas (estado, posição) em que o topo já foi desempilhado,
+    de modo que pilhas diferentes sob o mesmo quadro reaproveitam a mesma
+    exploração. O número de quadros é limitado por estados x (n + 1) x
+    símbolos da pilha, então a busca sempre termina, inclusive com laços
+    de transições vazias.
+    """
+
+    __slots__ = (
+        "estados", "simbolos_pilha", "inicial", "simbolo_inicial", "modo_aceitacao",
+        "_finais", "_vazias", "_leitura"
+    )
+
+    def __init__(
+        self,
+        transicoes: dict,
+        estado_inicial: str,
+        simbolo_inicial_pilha: str,
+        estados_finais,
+        modo_aceitacao: str = "both"
+    ):
+        self.estados = sorted(set(transicoes) | {estado_inicial} | set(estados_finais) | {
+            destino
+            for por_simbolo in transicoes.values()
+            for por_topo in por_simbolo.values()
+            for destinos in por_topo.values()
+            for destino, _ in destinos
+        })
+        indice_estado = {estado: indice for indice, estado in enumerate(self.estados)}
+        self.simbolos_pilha = [""]
+        indice_pilha = {"": 0}
+
+        def internar(simbolo: str) -> int:
+            if simbolo not in indice_pilha:
+                indice_pilha[simbolo] = len(self.simbolos_pilha)
+                self.simbolos_pilha.append(simbolo)
+            return indice_pilha[simbolo]
+
+        internar(simbolo_inicial_pilha)
+        for por_simbolo in transicoes.values():
+            for por_topo in por_simbolo.values():
+                for topo, destinos in por_topo.items():
+                    internar(topo)
+                    for _, empilhar in destinos:
+                        for simbolo in empilhar:
+                            internar(simbolo)
+
+        self.inicial = indice_estado[estado_inicial]
+        self.simbolo_inicial = indice_pilha[simbolo_inicial_pilha]
+        self.modo_aceitacao = modo_aceitacao
+        self._finais = [estado in estados_finais for estado in self.estados]
+
+        # Cada célula guarda as opções (destino, símbolos a empilhar, topo primeiro),
+        # em uma lista para as transições vazias e uma por símbolo de entrada
+        celulas = len(self.estados) * len(self.simbolos_pilha)
+        self._vazias: list[tuple] = [()] * celulas
+        self._leitura: dict[str, list[tuple]] = {}
+        for estado, por_simbolo in transicoes.items():
+            for simbolo, por_topo in por_simbolo.items():
+                tabela = self._vazias if simbolo == "" else self._leitura.setdefault(simbolo, [()] * celulas)
+                for topo, destinos in por_topo.items():
+                    celula = indice_estado[estado] * len(self.simbolos_pilha) + indice_pilha[topo]
+                    tabela[celula] = tuple(
+                        (indice_estado[destino], tuple(indice_pilha[item] for item in empilhar))
+                        for destino, empilhar in destinos
+                    )
+
+    @classmethod
+    def deAp(cls, ap) -> "ApnCompilado":
+        """Compila um NPDA do automata-lib."""
+        return cls(ap.transitions, ap.initial_state, ap.initial_stack_symbol, ap.final_states, ap.acceptance_mode)
+
+    def _aceitaQuadro(self, estado: int, topo: int) -> bool:
+        # Chamado só para quadros sem entrada restante; topo 0 é a pilha vazia
+        if self.modo_aceitacao in ("empty_stack", "both") and topo == 0:
+            return True
+        return self.modo_aceitacao in ("final_state", "both") and self._finais[estado]
+
+    def executar(self, input_string: str, max_configuracoes: int) -> dict:
+        """
+        Verifica se alguma computação do AP aceita a string.
+
+        Args:
+            input_string (str): String a ser processada
+            max_configuracoes (int): Máximo de quadros explorados
+
+        Returns:
+            dict: Resultado da execução com:
+                - aceita: Booleano indicando aceitação
+                - situacao: "aceita", "rejeitada" ou "limite_excedido"
+                - passos: Transições aplicadas
+                - configuracoes: Quadros (estado, posição, topo) explorados
+        """
+        vazias = self._vazias
+        leitura = self._leitura
+        largura = len(self.simbolos_pilha)
+        por_posicao = len(self.estados) * largura
+        tamanho = len(input_string)
+
+        # Nós da pilha: símbolo, nós que podem estar abaixo e nós que herdam
+        # esses mesmos nós de baixo. O nó 0 é o fundo, que fica sobre si mesmo.
+        simbolos = [0]
+        abaixo: list[set[int]] = [{_FUNDO}]
+        herdeiros: list[set[int]] = [set()]
+        # Quadros: (posição, estado, topo) numerados em um inteiro -> nó,
+        # e as saídas de cada quadro
+        quadros: dict[int, int] = {}
+        dados_quadro: dict[int, tuple] = {}
+        saidas: dict[int, set[tuple]] = {}
+
+        pendentes: list[tuple] = []
+        passos = 0
+        aceita = False
+
+        def novoNo(simbolo: int) -> int:
+            simbolos.append(simbolo)
+            abaixo.append(set())
+            herdeiros.append(set())
+            return len(simbolos) - 1
+
+        def quadro(estado: int, posicao: int, topo: int) -> int:
+            nonlocal aceita
+            chave = posicao * por_posicao + estado * largura + topo
+            no = quadros.get(chave)
+            if no is None:
+                no = quadros[chave] = novoNo(topo)
+                dados_quadro[no] = (estado, posicao, topo)
+                saidas[no] = set()
+                pendentes.append(("explorar", no))
+                if posicao == tamanho and self._aceitaQuadro(estado, topo):
+                    aceita = True
+            return no
+
+        def adicionarAbaixo(no: int, base: int):
+            if base not in abaixo[no]:
+                abaixo[no].add(base)
+                pendentes.append(("base", no, base))
+
+        def herdar(origem: int, destino: int):
+            # `destino` passa a ter sempre os mesmos nós abaixo que `origem`
+            if destino in herdeiros[origem]:
+                return
+            herdeiros[origem].add(destino)
+            for base in list(abaixo[origem]):
+                adicionarAbaixo(destino, base)
+
+        def expor(base: int, estado: int, posicao: int):
+            # O topo foi desempilhado e `base` volta a ser o topo
+            herdar(base, quadro(estado, posicao, simbolos[base]))
+
+        def desempilhar(no: int, estado: int, posicao: int):
+            if (estado, posicao) not in saidas[no]:
+                saidas[no].add((estado, posicao))
+                for base in list(abaixo[no]):
+                    expor(base, estado, posicao)
+
+        inicial = quadro(self.inicial, 0, self.simbolo_inicial)
+        adicionarAbaixo(inicial, _FUNDO)
+
+        while pendentes and not aceita:
+            if len(quadros) > max_configuracoes:
+                break
+            tarefa = pendentes.pop()
+
+            if tarefa[0] == "base":
+                _, no, base = tarefa
+                for herdeiro in herdeiros[no]:
+                    adicionarAbaixo(herdeiro, base)
+                for estado, posicao in saidas.get(no, ()):
+                    expor(base, estado, posicao)
+                continue
+
+            no = tarefa[1]
+            estado, posicao, topo = dados_quadro[no]
+            celula = estado * largura + topo
+            opcoes = [(destino, empilhar, posicao) for destino, empilhar in vazias[celula]]
+            if posicao < tamanho:
+                tabela = leitura.get(input_string[posicao])
+                if tabela is not None:
+                    opcoes += [(destino, empilhar, posicao + 1) for destino, empilhar in tabela[celula]]
+
+            for destino, empilhar, proxima in opcoes:
+                passos += 1
+                if not empilhar:
+                    desempilhar(no, destino, proxima)
+                    continue
+                # Os símbolos abaixo do novo topo ficam em nós próprios,
+                # o mais fundo deles sobre o que estava abaixo do topo antigo
+                anterior = no
+                for simbolo in reversed(empilhar[1:]):
+                    celula = novoNo(simbolo)
+                    if anterior == no:
+                        herdar(no, celula)
+                    else:
+                        adicionarAbaixo(celula, anterior)
+                    anterior = celula
+                novo = quadro(destino, proxima, empilhar[0])
+                if anterior == no:
+                    herdar(no, novo)
+                else:
+                    adicionarAbaixo(novo, anterior)
+
+        if aceita:
+            situacao = ACEITA
+        elif len(quadros) > max_configuracoes:
+            situacao = LIMITE_EXCEDIDO
+        else:
+            situacao = REJEITADA
+
+        return {
+            "aceita": aceita,
+            "situacao": situacao,
+            "passos": passos,
+            "configuracoes": len(quadros)
+        }
@@ -0,0 +1,203 @@
+"""
+Armazenamento persistente dos autômatos criados.
+Guarda cada entrada do registro já construída e compilada, de modo que ela
+sobreviva a reinícios e seja compartilhada entre os workers da API. O
+registro em memória de cada worker funciona como cache à frente dele.
+
+Backends disponíveis (AUTOMATA_ARMAZENAMENTO):
+    memoria: Sem persistência (padrão)
+    sqlite: Um banco SQLite em modo WAL, compartilhado entre processos
+    arquivos: Um arquivo por autômato, gravado de forma atômica
+"""
+
+import os
+import pickle
+import re
+import sqlite3
+import struct
+import tempfile
+import threading
+import zlib
+
+import config
+
+# IDs e hashes gerados pelo registro (uuid4().hex e SHA-256 em hexadecimal)
+_ID_VALIDO = re.compile(r"[0-9a-f]{32}")
+_HASH_VALIDO = re.compile(r"[0-9a-f]{64}")
+
+
+def serializar(valor) -> bytes:
+    """
+    Serializa uma entrada do registro, incluindo as tabelas compiladas.
+
+    Ao desserializar, os objetos do automata-lib são restaurados sem
+    passar de novo pela validação feita na criação.
+    """
+    return zlib.compress(pickle.dumps(valor, protocol = pickle.HIGHEST_PROTOCOL))
+
+
+def desserializar(dados: bytes):
+    """Restaura uma entrada serializada por `serializar`."""
+    return pickle.loads(zlib.decompress(dados))
+
+
+class ArmazenamentoSqlite:
+    """
+    Backend em um banco SQLite.
+
+    Cada thread de cada processo abre sua própria conexão na primeira vez
+    que precisa dela; o modo WAL permite leituras enquanto outro worker grava.
+    """
+
+    nome = "sqlite"
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._local = threading.local()
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None and self._local.pid == os.getpid():
+            return conexao
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok = True)
+        conexao = sqlite3.connect(self.caminho, timeout = 30.0, isolation_level = None)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.execute(
+            "CREATE TABLE IF NOT EXISTS automatos ("
+            "tipo TEXT NOT NULL, id TEXT NOT NULL, hash TEXT, tamanho INTEGER NOT NULL, dados BLOB NOT NULL, "
+            "PRIMARY KEY (tipo, id))"
+        )
+        conexao.execute("CREATE INDEX IF NOT EXISTS automatos_hash ON automatos (tipo, hash)")
+        self._local.conexao = conexao
+        self._local.pid = os.getpid()
+        return conexao
+
+    def salvar(self, tipo: str, automato_id: str, hash_conteudo: str | None, tamanho: int, dados: bytes):
+        self._conexao().execute(
+            "INSERT OR REPLACE INTO automatos (tipo, id, hash, tamanho, dados) VALUES (?, ?, ?, ?, ?)",
+            (tipo, automato_id, hash_conteudo, tamanho, dados)
+        )
+
+    def carregar(self, tipo: str, automato_id: str) -> tuple[bytes, int] | None:
+        linha = self._conexao().execute(
+            "SELECT dados, tamanho FROM automatos WHERE tipo = ? AND id = ?", (tipo, automato_id)
+        ).fetchone()
+        return None if linha is None else (linha[0], linha[1])
+
+    def buscarPorHash(self, tipo: str, hash_conteudo: str) -> str | None:
+        linha = self._conexao().execute(
+            "SELECT id FROM automatos WHERE tipo = ? AND hash = ? ORDER BY rowid DESC LIMIT 1",
+            (tipo, hash_conteudo)
+        ).fetchone()
+        return None if linha is None else linha[0]
+
+    def remover(self, tipo: str, automato_id: str) -> bool:
+        cursor = self._conexao().execute("DELETE FROM automatos WHERE tipo = ? AND id = ?", (tipo, automato_id))
+        return cursor.rowcount > 0
+
+    def contar(self, tipo: str) -> int:
+        return self._conexao().execute("SELECT COUNT(*) FROM automatos WHERE tipo = ?", (tipo,)).fetchone()[0]
+
+
+class ArmazenamentoArquivos:
+    """
+    Backend em arquivos: `<raiz>/<tipo>/<id>.bin` com o tamanho estimado
+    seguido da entrada serializada, e `<raiz>/<tipo>/hash/<hash>` com o ID.
+
+    Os arquivos são escritos em um temporário e renomeados, então um
+    worker nunca lê um arquivo pela metade.
+    """
+
+    nome = "arquivos"
+    _CABECALHO = struct.Struct("<Q")
+
+    def __init__(self, raiz: str):
+        self.raiz = raiz
+
+    def _gravar(self, caminho: str, conteudo: bytes):
+        diretorio = os.path.dirname(caminho)
+        os.makedirs(diretorio, exist_ok = True)
+        descritor, temporario = tempfile.mkstemp(dir = diretorio, suffix = ".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(conteudo)
+            os.replace(temporario, caminho)
+        except OSError:
+            os.unlink(temporario)
+            raise
+
+    def _caminho(self, tipo: str, automato_id: str) -> str:
+        return os.path.join(self.raiz, tipo, f"{automato_id}.bin")
+
+    def salvar(self, tipo: str, automato_id: str, hash_conteudo: str | None, tamanho: int, dados: bytes):
+        self._gravar(self._caminho(tipo, automato_id), self._CABECALHO.pack(tamanho) + dados)
+        if hash_conteudo is not None:
+            self._gravar(os.path.join(self.raiz, tipo, "hash", hash_conteudo), automato_id.encode("ascii"))
+
+    def carregar(self, tipo: str, automato_id: str) -> tuple[bytes, int] | None:
+        # O ID vem da requisição: só IDs no formato gerado viram caminhos
+        if not _ID_VALIDO.fullmatch(automato_id):
+            return None
+        try:
+            with open(self._caminho(tipo, automato_id), "rb") as arquivo:
+                conteudo = arquivo.read()
+        except FileNotFoundError:
+            return None
+        (tamanho,) = self._CABECALHO.unpack_from(conteudo)
+        return conteudo[self._CABECALHO.size:], tamanho
+
+    def buscarPorHash(self, tipo: str, hash_conteudo: str) -> str | None:
+        if not _HASH_VALIDO.fullmatch(hash_conteudo):
+            return None
+        try:
+            with open(os.path.join(self.raiz, tipo, "hash", hash_conteudo), "rb") as arquivo:
+                automato_id = arquivo.read().decode("ascii")
+        except FileNotFoundError:
+            return None
+        # O índice pode apontar para um autômato já removido
+        return automato_id if os.path.exists(self._caminho(tipo, automato_id)) else None
+
+    def remover(self, tipo: str, automato_id: str) -> bool:
+        if not _ID_VALIDO.fullmatch(automato_id):
+            return False
+        try:
+            os.unlink(self._caminho(tipo, automato_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def contar(self, tipo: str) -> int:
+        try:
+            return sum(1 for nome in os.listdir(os.path.join(self.raiz, tipo)) if nome.endswith(".bin"))
+        except FileNotFoundError:
+            return 0
+
+
+def criarArmazenamento(backend: str = config.ARMAZENAMENTO, caminho: str = config.ARMAZENAMENTO_CAMINHO):
+    """
+    Cria o backend de armazenamento configurado.
+
+    Args:
+        backend (str): "memoria", "sqlite" ou "arquivos"
+        caminho (str): Diretório onde os dados são guardados
+
+    Returns:
+        ArmazenamentoSqlite | ArmazenamentoArquivos | None: None se não houver persistência
+
+    Raises:
+        ValueError: Se o backend não for reconhecido
+    """
+    if backend in ("", "memoria"):
+        return None
+    if backend == "sqlite":
+        return ArmazenamentoSqlite(os.path.join(caminho, "automatos.sqlite3"))
+    if backend == "arquivos":
+        return ArmazenamentoArquivos(caminho)
+    raise ValueError(f"Armazenamento desconhecido: {backend}")
+
+
+# Backend compartilhado pelos registros de todos os tipos de autômato.
+# Nada é lido na inicialização: as entradas são carregadas sob demanda.
+armazenamento = criarArmazenamento()
@@ -0,0 +1,101 @@
+"""
+Cache dos resultados de /testar.
+Guarda a resposta de cada teste pela chave (hash da definição, string e,
+nas MTs, limites de execução). Como a chave usa o hash do conteúdo e não o
+ID, um ID que passe a apontar para outra máquina nunca encontra resultados
+da anterior, que deixam de ser acessados e saem do cache pela ordem de uso.
+"""
+
+import threading
+from collections import OrderedDict
+
+import config
+from services.metricasService import registrarCacheResultado
+from services.registroService import estimarTamanho
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados, limitado em entradas e em bytes estimados.
+
+    Os contadores de acertos e falhas são separados por tipo de autômato.
+    """
+
+    def __init__(
+        self,
+        max_itens: int = config.CACHE_RESULTADOS_MAX_ITENS,
+        max_bytes: int = config.CACHE_RESULTADOS_MAX_BYTES
+    ):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        # (tipo, chave) -> (resultado, tamanho)
+        self._itens: OrderedDict[tuple, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._acertos: dict[str, int] = {}
+        self._falhas: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, tipo: str, chave: tuple) -> dict | None:
+        """
+        Busca o resultado guardado para a chave.
+
+        Args:
+            tipo (str): Tipo de autômato ("afd", "afn", "ap" ou "mt")
+            chave (tuple): Hash da definição, string testada e demais parâmetros
+
+        Returns:
+            dict | None: Cópia do resultado, ou None se ele não estiver no cache
+        """
+        if not config.CACHE_RESULTADOS:
+            return None
+        with self._lock:
+            item = self._itens.get((tipo, chave))
+            if item is None:
+                self._falhas[tipo] = self._falhas.get(tipo, 0) + 1
+            else:
+                self._itens.move_to_end((tipo, chave))
+                self._acertos[tipo] = self._acertos.get(tipo, 0) + 1
+        registrarCacheResultado(tipo, item is not None)
+        return None if item is None else dict(item[0])
+
+    def guardar(self, tipo: str, chave: tuple, resultado: dict):
+        """Guarda um resultado, descartando os menos usados se os limites forem ultrapassados."""
+        if not config.CACHE_RESULTADOS:
+            return
+        tamanho = estimarTamanho(chave) + estimarTamanho(resultado)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._itens.pop((tipo, chave), None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._itens[(tipo, chave)] = (dict(resultado), tamanho)
+            self._bytes += tamanho
+            while len(self._itens) > self.max_itens or self._bytes > self.max_bytes:
+                _, (_, descartado) = self._itens.popitem(last = False)
+                self._bytes -= descartado
+
+    def limpar(self):
+        """Descarta todos os resultados guardados, mantendo os contadores."""
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self, tipo: str) -> dict:
+        """Ocupação do cache (todos os tipos) e contadores do tipo informado."""
+        with self._lock:
+            acertos = self._acertos.get(tipo, 0)
+            falhas = self._falhas.get(tipo, 0)
+            return {
+                "ativo": config.CACHE_RESULTADOS,
+                "resultados": len(self._itens),
+                "bytes": self._bytes,
+                "max_resultados": self.max_itens,
+                "max_bytes": self.max_bytes,
+                "acertos": acertos,
+                "falhas": falhas,
+                "taxa_acertos": acertos / (acertos + falhas) if acertos + falhas else 0.0
+            }
+
+
+cache = CacheResultados()
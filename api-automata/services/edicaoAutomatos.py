@@ -0,0 +1,310 @@
+"""
+Edição incremental de AFDs, APs determinísticos e MTs já registrados.
+Uma edição adiciona ou remove estados, transições e estados finais. Só os
+estados tocados por ela são conferidos, com as mesmas regras que o
+automata-lib verificaria na criação, e o autômato editado compartilha com o
+original as linhas de transição dos demais estados, em vez de ser
+construído e validado de novo. O original não é alterado. As tabelas
+compiladas de AFDs e MTs são atualizadas da mesma forma (ver
+AfdCompilado.editado e MtCompilada.editada); a do AP é montada de novo, sem
+a validação do automata-lib.
+
+Os campos da edição são aplicados nesta ordem: remover_transicoes (AP e MT),
+remover_estados, adicionar_estados, transicoes (novas ou substituídas,
+símbolo a símbolo), remover_finais e adicionar_finais. Um estado removido
+e adicionado na mesma edição é recriado, sem as transições anteriores.
+O alfabeto não pode ser alterado: isso tocaria todos os estados.
+"""
+
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from frozendict import frozendict
+
+from services.registroService import estimarTamanho
+
+if TYPE_CHECKING:
+    from automata.fa.dfa import DFA
+    from automata.pda.dpda import DPDA
+    from automata.tm.dtm import DTM
+    from services.afdCompilado import AfdCompilado
+    from services.mtCompilada import MtCompilada
+
+_DIRECOES = ("L", "N", "R")
+
+
+def _listar(itens) -> str:
+    nomes = sorted(map(str, itens))
+    return ", ".join(nomes[:10]) + (f" e mais {len(nomes) - 10}" if len(nomes) > 10 else "")
+
+
+def _exigirVazio(itens, mensagem: str):
+    if itens:
+        raise ValueError(f"{mensagem}: {_listar(itens)}")
+
+
+def _copiar(original, **campos):
+    """
+    Cópia de um autômato do automata-lib com alguns campos trocados, sem validate().
+
+    Os campos informados já devem estar congelados (frozenset, frozendict);
+    os demais são compartilhados com o original, que é imutável.
+    """
+    copia = object.__new__(type(original))
+    for classe in type(original).__mro__:
+        for nome in classe.__dict__.get("__slots__", ()):
+            if nome not in ("__dict__", "__weakref__") and hasattr(original, nome):
+                object.__setattr__(copia, nome, campos.get(nome, getattr(original, nome)))
+    return copia
+
+
+def _estados(automato, edicao: dict) -> tuple[frozenset, set, set]:
+    """Confere os estados removidos e adicionados; retorna (estados após a edição, removidos, adicionados)."""
+    removidos = set(edicao["remover_estados"])
+    novos = set(edicao["adicionar_estados"])
+    _exigirVazio(removidos - automato.states, "Estados inexistentes em remover_estados")
+    if automato.initial_state in removidos:
+        raise ValueError("O estado inicial não pode ser removido")
+    _exigirVazio(novos & (automato.states - removidos), "Estados já existentes em adicionar_estados")
+    return (automato.states - removidos) | novos, removidos, novos
+
+
+def _finais(automato, edicao: dict, estados: frozenset, removidos: set) -> frozenset:
+    _exigirVazio(
+        (edicao["adicionar_finais"] | edicao["remover_finais"]) - estados,
+        "Estados inexistentes em adicionar_finais ou remover_finais"
+    )
+    return frozenset((automato.final_states - removidos - edicao["remover_finais"]) | edicao["adicionar_finais"])
+
+
+def _semReferencias(transicoes, linhas: dict, removidos: set, excluidos: set, destinos):
+    """
+    Confere se alguma transição ainda leva a um estado excluído.
+
+    Percorre as linhas editadas e as originais dos estados que continuam
+    sem alteração; as dos estados removidos são ignoradas.
+    """
+    if not excluidos:
+        return
+    inalteradas = (
+        (origem, saidas) for origem, saidas in transicoes.items() if origem not in removidos and origem not in linhas
+    )
+    for origem, saidas in chain(inalteradas, linhas.items()):
+        alcancados = {destino for resultado in saidas.values() for destino in destinos(resultado)} & excluidos
+        _exigirVazio(alcancados, f"O estado '{origem}' ainda tem transições para estados removidos")
+
+
+def _variacao(antes: list, depois: list) -> int:
+    """Variação estimada em bytes ao trocar as linhas de transição `antes` por `depois`."""
+    return estimarTamanho(depois) - estimarTamanho(antes)
+
+
+def _aplicar(transicoes, removidos: set, linhas: dict) -> frozendict:
+    """Novo dicionário de transições: as linhas dos demais estados são as mesmas do original."""
+    resultado = dict(transicoes)
+    for estado in removidos:
+        resultado.pop(estado, None)
+    for estado, saidas in linhas.items():
+        if saidas:
+            resultado[estado] = frozendict(saidas)
+        else:
+            resultado.pop(estado, None)
+    return frozendict(resultado)
+
+
+def editarAfd(afd: "DFA", compilado: "AfdCompilado | None", edicao: dict) -> tuple:
+    """
+    Aplica uma edição a um AFD.
+
+    Os estados adicionados precisam de uma transição por símbolo (o AFD
+    continua completo); nos demais, as transições informadas substituem as
+    anteriores para os mesmos símbolos.
+
+    Args:
+        afd (DFA): AFD registrado
+        compilado (AfdCompilado | None): Tabela compilada do AFD
+        edicao (dict): Campos de EdicaoInput, sem o ID
+
+    Returns:
+        tuple: (DFA editado, tabela compilada editada ou None, variação
+            estimada do tamanho em bytes)
+
+    Raises:
+        ValueError: Com a descrição do primeiro problema encontrado
+    """
+    estados, removidos, novos = _estados(afd, edicao)
+
+    linhas = {estado: {} for estado in novos}
+    for estado, saidas in edicao["transicoes"].items():
+        if estado not in estados:
+            raise ValueError(f"Transições de um estado inexistente: '{estado}'")
+        _exigirVazio(saidas.keys() - afd.input_symbols, f"Símbolos fora do alfabeto nas transições de '{estado}'")
+        _exigirVazio(set(saidas.values()) - estados, f"Destinos inexistentes nas transições de '{estado}'")
+        linhas[estado] = {**(linhas[estado] if estado in novos else afd.transitions[estado]), **saidas}
+    for estado in novos:
+        _exigirVazio(afd.input_symbols - linhas[estado].keys(), f"Faltam transições do novo estado '{estado}'")
+
+    _semReferencias(afd.transitions, linhas, removidos, removidos - novos, lambda destino: (destino,))
+    finais = _finais(afd, edicao, estados, removidos)
+
+    transicoes = _aplicar(afd.transitions, removidos, linhas)
+    editado = _copiar(afd, states = estados, transitions = transicoes, final_states = finais)
+    editado.clear_cache()
+
+    variacao = _variacao(
+        [afd.transitions[estado] for estado in removidos | linhas.keys() if estado in afd.transitions],
+        [transicoes[estado] for estado in linhas]
+    )
+    if compilado is not None:
+        compilado = compilado.editado(removidos, linhas, finais)
+    return editado, compilado, variacao
+
+
+def editarMt(mt: "DTM", compilada: "MtCompilada | None", edicao: dict) -> tuple:
+    """
+    Aplica uma edição a uma MT.
+
+    As transições informadas criam ou substituem a transição de cada
+    símbolo lido; remover_transicoes apaga transições existentes.
+
+    Args:
+        mt (DTM): MT registrada
+        compilada (MtCompilada | None): Tabela compilada da MT
+        edicao (dict): Campos de EdicaoInput, sem o ID
+
+    Returns:
+        tuple: (DTM editado, tabela compilada editada ou None, variação
+            estimada do tamanho em bytes)
+
+    Raises:
+        ValueError: Com a descrição do primeiro problema encontrado
+    """
+    estados, removidos, novos = _estados(mt, edicao)
+
+    linhas = {estado: {} for estado in novos}
+    for estado, lidos in edicao["remover_transicoes"].items():
+        if estado not in estados or estado in novos:
+            raise ValueError(f"remover_transicoes de um estado inexistente: '{estado}'")
+        linha = dict(mt.transitions.get(estado, {}))
+        _exigirVazio(lidos - linha.keys(), f"Transições inexistentes em '{estado}'")
+        for lido in lidos:
+            del linha[lido]
+        linhas[estado] = linha
+
+    for estado, saidas in edicao["transicoes"].items():
+        if estado not in estados:
+            raise ValueError(f"Transições de um estado inexistente: '{estado}'")
+        _exigirVazio(saidas.keys() - mt.tape_symbols, f"Símbolos fora da fita nas transições de '{estado}'")
+        destinos = {destino for destino, _, _ in saidas.values()}
+        _exigirVazio(destinos - estados, f"Destinos inexistentes nas transições de '{estado}'")
+        escritos = {escrito for _, escrito, _ in saidas.values()}
+        _exigirVazio(escritos - mt.tape_symbols, f"Símbolos escritos fora da fita nas transições de '{estado}'")
+        direcoes = {direcao for _, _, direcao in saidas.values()}
+        _exigirVazio(direcoes - set(_DIRECOES), f"Direções inválidas nas transições de '{estado}' (use L, N ou R)")
+        base = linhas[estado] if estado in linhas else mt.transitions.get(estado, {})
+        linhas[estado] = {**base, **{lido: tuple(resultado) for lido, resultado in saidas.items()}}
+
+    _semReferencias(mt.transitions, linhas, removidos, removidos - novos, lambda resultado: (resultado[0],))
+    finais = _finais(mt, edicao, estados, removidos)
+    if mt.initial_state in finais:
+        raise ValueError("O estado inicial não pode ser final")
+
+    # Só os estados reescritos ou que passaram a ser finais podem violar estas regras
+    def temTransicoes(estado: str) -> bool:
+        return bool(linhas[estado] if estado in linhas else mt.transitions.get(estado))
+
+    _exigirVazio(
+        {estado for estado in (linhas.keys() | edicao["adicionar_finais"]) & finais if temTransicoes(estado)},
+        "Estados finais não podem ter transições"
+    )
+    if not temTransicoes(mt.initial_state) and len(estados) > 1:
+        raise ValueError("O estado inicial não tem transições")
+
+    transicoes = _aplicar(mt.transitions, removidos, linhas)
+    editada = _copiar(mt, states = estados, transitions = transicoes, final_states = finais)
+
+    variacao = _variacao(
+        [mt.transitions[estado] for estado in removidos | linhas.keys() if estado in mt.transitions],
+        [transicoes[estado] for estado in linhas if estado in transicoes]
+    )
+    if compilada is not None:
+        compilada = compilada.editada(removidos, linhas, finais)
+    return editada, compilada, variacao
+
+
+def editarAp(ap: "DPDA", edicao: dict) -> "DPDA":
+    """
+    Aplica uma edição a um AP determinístico.
+
+    As transições informadas criam ou substituem a transição de cada par
+    (símbolo lido, topo); o símbolo "" é a transição vazia. remover_transicoes
+    apaga pares existentes. Como no automata-lib, um topo com transição
+    vazia não pode ter transições que leiam a entrada no mesmo estado.
+
+    Args:
+        ap (DPDA): AP registrado
+        edicao (dict): Campos de EdicaoInput, sem o ID
+
+    Returns:
+        DPDA: AP editado
+
+    Raises:
+        ValueError: Com a descrição do primeiro problema encontrado
+    """
+    estados, removidos, novos = _estados(ap, edicao)
+
+    # Linhas editadas: {estado: {símbolo: {topo: (destino, empilhar)}}}
+    linhas = {estado: {} for estado in novos}
+
+    def linha(estado: str) -> dict:
+        if estado not in linhas:
+            linhas[estado] = {simbolo: dict(por_topo) for simbolo, por_topo in ap.transitions.get(estado, {}).items()}
+        return linhas[estado]
+
+    for estado, por_simbolo in edicao["remover_transicoes"].items():
+        if estado not in estados or estado in novos:
+            raise ValueError(f"remover_transicoes de um estado inexistente: '{estado}'")
+        atual = linha(estado)
+        for simbolo, topos in por_simbolo.items():
+            _exigirVazio(topos - atual.get(simbolo, {}).keys(), f"Transições inexistentes em '{estado}' lendo '{simbolo}'")
+            for topo in topos:
+                del atual[simbolo][topo]
+            if not atual[simbolo]:
+                del atual[simbolo]
+
+    for estado, por_simbolo in edicao["transicoes"].items():
+        if estado not in estados:
+            raise ValueError(f"Transições de um estado inexistente: '{estado}'")
+        _exigirVazio(por_simbolo.keys() - ap.input_symbols - {""}, f"Símbolos fora do alfabeto nas transições de '{estado}'")
+        atual = linha(estado)
+        for simbolo, por_topo in por_simbolo.items():
+            _exigirVazio(por_topo.keys() - ap.stack_symbols, f"Topos fora da pilha nas transições de '{estado}'")
+            _exigirVazio(
+                {destino for destino, _ in por_topo.values()} - estados,
+                f"Destinos inexistentes nas transições de '{estado}'"
+            )
+            _exigirVazio(
+                {item for _, empilhar in por_topo.values() for item in empilhar} - ap.stack_symbols,
+                f"Símbolos empilhados fora da pilha nas transições de '{estado}'"
+            )
+            atual.setdefault(simbolo, {}).update(
+                (topo, (destino, tuple(empilhar) if isinstance(empilhar, list) else empilhar))
+                for topo, (destino, empilhar) in por_topo.items()
+            )
+
+    for estado, atual in linhas.items():
+        vazias = atual.get("", {}).keys()
+        conflitos = {topo for simbolo, por_topo in atual.items() if simbolo != "" for topo in por_topo} & vazias
+        _exigirVazio(conflitos, f"Topos com transição vazia e transições que leem a entrada em '{estado}'")
+
+    _semReferencias(
+        ap.transitions, linhas, removidos, removidos - novos,
+        lambda por_topo: (destino for destino, _ in por_topo.values())
+    )
+    finais = _finais(ap, edicao, estados, removidos)
+
+    transicoes = _aplicar(
+        ap.transitions, removidos,
+        {estado: {simbolo: frozendict(por_topo) for simbolo, por_topo in atual.items()} for estado, atual in linhas.items()}
+    )
+    return _copiar(ap, states = estados, transitions = transicoes, final_states = finais)
@@ -0,0 +1,214 @@
+"""
+Formato compacto de definição para autômatos grandes.
+Estados e símbolos vêm em listas e são referenciados pelo índice; as
+transições formam uma tabela plana de inteiros. O corpo pode ser JSON ou
+msgpack (opcional). A definição é conferida em uma única passada e o
+autômato do automata-lib é montado sem repetir a validação dele, que no
+formato comum se soma à conversão do pydantic para sets e dicts aninhados.
+
+AFD:
+    {"estados": [str], "simbolos": [str], "transicoes": [int],
+     "estado_inicial": int, "estados_finais": [int]}
+    transicoes[e * len(simbolos) + s] é o destino do estado e lendo o
+    símbolo s; a tabela é completa, como exige o automata-lib.
+
+MT:
+    {"estados": [str], "simbolos_fita": [str], "simbolos_entrada": [int],
+     "simbolo_branco": int, "transicoes": [int], "estado_inicial": int,
+     "estados_finais": [int]}
+    transicoes[3 * (e * len(simbolos_fita) + s):][:3] é (destino, símbolo
+    escrito, deslocamento -1, 0 ou 1) do estado e lendo s; destino -1
+    indica que não há transição. simbolos_entrada e simbolo_branco são
+    índices em simbolos_fita.
+"""
+
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from automata.fa.dfa import DFA
+    from automata.tm.dtm import DTM
+
+try:
+    import msgpack
+except ImportError:  # msgpack é opcional: sem ele, só JSON
+    msgpack = None
+
+TIPOS_MSGPACK = ("application/msgpack", "application/x-msgpack")
+
+_DIRECOES = {-1: "L", 0: "N", 1: "R"}
+
+
+def decodificar(corpo: bytes, tipo_conteudo: str) -> dict:
+    """
+    Lê o corpo de uma requisição em JSON ou msgpack, conforme o Content-Type.
+
+    Raises:
+        ValueError: Se o corpo não puder ser lido ou não for um objeto
+    """
+    if tipo_conteudo.split(";")[0].strip().lower() in TIPOS_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Suporte a msgpack não instalado (pip install msgpack)")
+        try:
+            dados = msgpack.unpackb(corpo, raw = False)
+        except Exception as e:
+            raise ValueError(f"Corpo msgpack inválido: {e}")
+    else:
+        try:
+            dados = json.loads(corpo)
+        except ValueError as e:
+            raise ValueError(f"Corpo JSON inválido: {e}")
+    if not isinstance(dados, dict):
+        raise ValueError("A definição deve ser um objeto")
+    return dados
+
+
+def hashCompacto(dados: dict) -> str:
+    """
+    Hash de uma definição compacta, para reaproveitar autômatos idênticos.
+
+    As listas são ordenadas pelo cliente, então a mesma máquina enviada em
+    outra ordem (ou no formato comum) recebe outro hash.
+    """
+    canonico = json.dumps(dados, sort_keys = True, separators = (",", ":"), ensure_ascii = False)
+    return hashlib.sha256(b"compacto:" + canonico.encode("utf-8")).hexdigest()
+
+
+def _campo(dados: dict, nome: str, tipo: type):
+    valor = dados.get(nome)
+    if type(valor) is not tipo:
+        raise ValueError(f"Campo '{nome}' ausente ou com tipo inválido")
+    return valor
+
+
+def _nomes(dados: dict, nome: str) -> list[str]:
+    nomes = _campo(dados, nome, list)
+    if not all(type(item) is str for item in nomes) or len(set(nomes)) != len(nomes):
+        raise ValueError(f"'{nome}' deve ser uma lista de textos distintos")
+    return nomes
+
+
+def _indices(valores: list, minimo: int, limite: int, nome: str):
+    # type(...) is int exclui bool, que o JSON e o msgpack também produzem
+    if not all(type(valor) is int for valor in valores) or (
+        valores and (min(valores) < minimo or max(valores) >= limite)
+    ):
+        raise ValueError(f"'{nome}' contém índices fora do intervalo [{minimo}, {limite})")
+
+
+def _indice(dados: dict, nome: str, limite: int) -> int:
+    valor = _campo(dados, nome, int)
+    _indices([valor], 0, limite, nome)
+    return valor
+
+
+def _semValidacao(classe, **campos):
+    """
+    Monta um autômato do automata-lib como o construtor dele, mas sem validate().
+
+    Os campos são congelados como no construtor; é o mesmo estado que um
+    autômato restaurado com pickle tem.
+    """
+    from automata.base.utils import freeze_value
+
+    automato = object.__new__(classe)
+    for nome, valor in campos.items():
+        object.__setattr__(automato, nome, freeze_value(valor))
+    return automato
+
+
+def afdCompacto(dados: dict) -> "DFA":
+    """
+    Confere uma definição compacta de AFD e monta o DFA correspondente.
+
+    Raises:
+        ValueError: Com a descrição do primeiro problema encontrado
+    """
+    estados = _nomes(dados, "estados")
+    simbolos = _nomes(dados, "simbolos")
+    transicoes = _campo(dados, "transicoes", list)
+    if not estados:
+        raise ValueError("'estados' não pode ser vazio")
+    if len(transicoes) != len(estados) * len(simbolos):
+        raise ValueError("'transicoes' deve ter len(estados) * len(simbolos) destinos")
+    _indices(transicoes, 0, len(estados), "transicoes")
+    inicial = _indice(dados, "estado_inicial", len(estados))
+    finais = _campo(dados, "estados_finais", list)
+    _indices(finais, 0, len(estados), "estados_finais")
+
+    from automata.fa.dfa import DFA
+
+    k = len(simbolos)
+    afd = _semValidacao(
+        DFA,
+        states = frozenset(estados),
+        input_symbols = frozenset(simbolos),
+        transitions = {
+            estado: dict(zip(simbolos, [estados[destino] for destino in transicoes[i * k:(i + 1) * k]]))
+            for i, estado in enumerate(estados)
+        },
+        initial_state = estados[inicial],
+        final_states = frozenset(estados[final] for final in finais),
+        allow_partial = False
+    )
+    afd.clear_cache()
+    return afd
+
+
+def mtCompacta(dados: dict) -> "DTM":
+    """
+    Confere uma definição compacta de MT e monta o DTM correspondente,
+    com as mesmas regras que o automata-lib verificaria.
+
+    Raises:
+        ValueError: Com a descrição do primeiro problema encontrado
+    """
+    estados = _nomes(dados, "estados")
+    simbolos = _nomes(dados, "simbolos_fita")
+    entrada = _campo(dados, "simbolos_entrada", list)
+    _indices(entrada, 0, len(simbolos), "simbolos_entrada")
+    if len(set(entrada)) >= len(simbolos):
+        raise ValueError("'simbolos_entrada' deve ser um subconjunto próprio de 'simbolos_fita'")
+    branco = _indice(dados, "simbolo_branco", len(simbolos))
+    inicial = _indice(dados, "estado_inicial", len(estados))
+    finais = _campo(dados, "estados_finais", list)
+    _indices(finais, 0, len(estados), "estados_finais")
+    if inicial in finais:
+        raise ValueError("O estado inicial não pode ser final")
+
+    k = len(simbolos)
+    tabela = _campo(dados, "transicoes", list)
+    if len(tabela) != 3 * len(estados) * k:
+        raise ValueError("'transicoes' deve ter 3 * len(estados) * len(simbolos_fita) inteiros")
+    destinos, escritos, deslocamentos = tabela[0::3], tabela[1::3], tabela[2::3]
+    _indices(destinos, -1, len(estados), "transicoes (destinos)")
+    _indices(escritos, 0, k, "transicoes (símbolos escritos)")
+    _indices(deslocamentos, -1, 2, "transicoes (deslocamentos)")
+
+    transicoes = {}
+    for celula, destino in enumerate(destinos):
+        if destino >= 0:
+            origem, lido = divmod(celula, k)
+            transicoes.setdefault(estados[origem], {})[simbolos[lido]] = (
+                estados[destino], simbolos[escritos[celula]], _DIRECOES[deslocamentos[celula]]
+            )
+
+    finais = frozenset(estados[final] for final in finais)
+    if not finais.isdisjoint(transicoes):
+        raise ValueError("Estados finais não podem ter transições")
+    if estados[inicial] not in transicoes and len(estados) > 1:
+        raise ValueError("O estado inicial não tem transições")
+
+    from automata.tm.dtm import DTM
+
+    return _semValidacao(
+        DTM,
+        states = frozenset(estados),
+        input_symbols = frozenset(simbolos[simbolo] for simbolo in entrada),
+        tape_symbols = frozenset(simbolos),
+        transitions = transicoes,
+        initial_state = estados[inicial],
+        blank_symbol = simbolos[branco],
+        final_states = finais
+    )
@@ -0,0 +1,249 @@
+"""
+Métricas de latência e vazão da API no formato de texto do Prometheus.
+Histogramas com baldes fixos, atualizados em memória a cada requisição e
+lidos por GET /metrics. Cada observação custa uma busca binária e um
+incremento sob lock, baixo o bastante para deixar as métricas sempre ligadas.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+import config
+
+# Baldes (limites superiores) dos histogramas
+BALDES_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BALDES_CONTAGEM = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Instante (perf_counter) em que a requisição atual chegou ao middleware
+_inicio_requisicao: ContextVar[float | None] = ContextVar("inicio_requisicao", default = None)
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _formatarNumero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+class Histograma:
+    """
+    Histograma com rótulos, no modelo do Prometheus.
+
+    Cada combinação de valores dos rótulos tem sua própria série, com a
+    contagem por balde, a soma e o total de observações.
+    """
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...], baldes: tuple):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self.baldes = baldes
+        # valores dos rótulos -> [contagens por balde (+Inf no fim), soma]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, *rotulos: str):
+        """Registra uma observação na série dos rótulos informados."""
+        indice = bisect.bisect_left(self.baldes, valor)
+        with self._lock:
+            serie = self._series.get(rotulos)
+            if serie is None:
+                serie = self._series[rotulos] = [[0] * (len(self.baldes) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def observarLote(self, valores: list[float], *rotulos: str):
+        """Registra várias observações na mesma série, adquirindo o lock uma só vez."""
+        indices = [bisect.bisect_left(self.baldes, valor) for valor in valores]
+        with self._lock:
+            serie = self._series.get(rotulos)
+            if serie is None:
+                serie = self._series[rotulos] = [[0] * (len(self.baldes) + 1), 0.0]
+            contagens = serie[0]
+            for indice in indices:
+                contagens[indice] += 1
+            serie[1] += sum(valores)
+
+    def formatar(self) -> list[str]:
+        """Linhas do histograma no formato de texto do Prometheus."""
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} histogram"]
+        with self._lock:
+            series = [(rotulos, list(contagens), soma) for rotulos, (contagens, soma) in self._series.items()]
+
+        for valores, contagens, soma in sorted(series):
+            pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(self.rotulos, valores)]
+            acumulado = 0
+            for limite, contagem in zip((*self.baldes, "+Inf"), contagens):
+                acumulado += contagem
+                le = limite if limite == "+Inf" else _formatarNumero(limite)
+                rotulos_balde = ",".join(pares + [f'le="{le}"'])
+                linhas.append(f"{self.nome}_bucket{{{rotulos_balde}}} {acumulado}")
+            sufixo = f"{{{','.join(pares)}}}" if pares else ""
+            linhas.append(f"{self.nome}_sum{sufixo} {_formatarNumero(soma)}")
+            linhas.append(f"{self.nome}_count{sufixo} {acumulado}")
+        return linhas
+
+
+class Contador:
+    """Contador com rótulos, no modelo do Prometheus."""
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...]):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self._series: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, *rotulos: str):
+        """Soma 1 à série dos rótulos informados."""
+        with self._lock:
+            self._series[rotulos] = self._series.get(rotulos, 0) + 1
+
+    def valores(self) -> dict[tuple, int]:
+        """Cópia dos valores de cada série."""
+        with self._lock:
+            return dict(self._series)
+
+    def formatar(self) -> list[str]:
+        """Linhas do contador no formato de texto do Prometheus."""
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} counter"]
+        for valores, total in sorted(self.valores().items()):
+            pares = ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in zip(self.rotulos, valores))
+            linhas.append(f"{self.nome}{{{pares}}} {total}")
+        return linhas
+
+
+DURACAO_REQUISICAO = Histograma(
+    "automata_requisicao_segundos", "Duração das requisições HTTP por rota.",
+    ("metodo", "rota", "status"), BALDES_SEGUNDOS
+)
+DURACAO_FASE = Histograma(
+    "automata_fase_segundos",
+    "Duração de cada fase (validacao, construcao, minimizacao, compilacao, simulacao, operacao, edicao, renderizacao) por tipo de autômato.",
+    ("tipo", "fase"), BALDES_SEGUNDOS
+)
+TAMANHO_ENTRADA = Histograma(
+    "automata_entrada_tamanho", "Tamanho das strings testadas por tipo de autômato.",
+    ("tipo",), BALDES_CONTAGEM
+)
+PASSOS_MT = Histograma(
+    "automata_mt_passos", "Transições executadas por string testada em MTs.",
+    (), BALDES_CONTAGEM
+)
+
+CACHE_RESULTADOS = Contador(
+    "automata_cache_resultados_total", "Buscas no cache de resultados de /testar, por tipo e resultado (acerto ou falha).",
+    ("tipo", "resultado")
+)
+
+_HISTOGRAMAS = (DURACAO_REQUISICAO, DURACAO_FASE, TAMANHO_ENTRADA, PASSOS_MT)
+
+
+class medirFase:
+    """
+    Mede a duração de um bloco como uma fase do tipo de autômato.
+
+    Uso: `with medirFase("afd", "construcao"): ...`
+    """
+
+    __slots__ = ("tipo", "fase", "inicio")
+
+    def __init__(self, tipo: str, fase: str):
+        self.tipo = tipo
+        self.fase = fase
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        if config.METRICAS:
+            DURACAO_FASE.observar(time.perf_counter() - self.inicio, self.tipo, self.fase)
+        return False
+
+
+def registrarValidacao(tipo: str):
+    """
+    Registra, na entrada de um service, o tempo desde a chegada da
+    requisição: leitura do corpo e validação do schema pelo pydantic.
+    """
+    inicio = _inicio_requisicao.get()
+    if config.METRICAS and inicio is not None:
+        DURACAO_FASE.observar(time.perf_counter() - inicio, tipo, "validacao")
+
+
+def registrarEntradas(tipo: str, inputs: list[str]):
+    """Registra o tamanho de cada string testada."""
+    if config.METRICAS:
+        TAMANHO_ENTRADA.observarLote([len(input_string) for input_string in inputs], tipo)
+
+
+def registrarPassosMt(passos: int):
+    """Registra as transições executadas por uma MT em uma string."""
+    if config.METRICAS:
+        PASSOS_MT.observar(passos)
+
+
+def registrarCacheResultado(tipo: str, acerto: bool):
+    """Registra uma busca no cache de resultados de /testar."""
+    if config.METRICAS:
+        CACHE_RESULTADOS.incrementar(tipo, "acerto" if acerto else "falha")
+
+
+def _taxaAcertosCache() -> list[str]:
+    nome = "automata_cache_resultados_taxa_acertos"
+    linhas = [f"# HELP {nome} Fração das buscas no cache de resultados de /testar que foram acertos.", f"# TYPE {nome} gauge"]
+    totais: dict[str, list[int]] = {}
+    for (tipo, resultado), total in CACHE_RESULTADOS.valores().items():
+        totais.setdefault(tipo, [0, 0])[resultado == "acerto"] += total
+    for tipo, (falhas, acertos) in sorted(totais.items()):
+        linhas.append(f'{nome}{{tipo="{_escapar(tipo)}"}} {_formatarNumero(acertos / (acertos + falhas))}')
+    return linhas
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que mede a duração de cada requisição HTTP.
+
+    Os IDs vão no corpo ou na query, então o caminho de uma rota
+    encontrada já identifica o endpoint (por exemplo /api/afd/testar).
+    Caminhos sem rota são agrupados em "desconhecida", para que não
+    criem séries novas.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICAS:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        token = _inicio_requisicao.set(inicio)
+        status = [500]
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _inicio_requisicao.reset(token)
+            rota = scope["path"] if scope.get("route") is not None else "desconhecida"
+            DURACAO_REQUISICAO.observar(time.perf_counter() - inicio, scope["method"], rota, str(status[0]))
+
+
+def formatoPrometheus() -> str:
+    """Todas as métricas no formato de texto do Prometheus."""
+    linhas = []
+    for histograma in _HISTOGRAMAS:
+        linhas.extend(histograma.formatar())
+    linhas.extend(CACHE_RESULTADOS.formatar())
+    linhas.extend(_taxaAcertosCache())
+    return "\n".join(linhas) + "\n"
@@ -0,0 +1,447 @@
+"""
+Executor compilado de Máquinas de Turing determinísticas.
+Converte estados e símbolos da fita em inteiros e guarda a fita em um
+array compacto com a posição do cabeçote, sem criar uma configuração
+por passo como DTM.read_input_stepwise. O modo acelerado guarda a fita em
+sequências de símbolos iguais e atravessa cada sequência em um único passo.
+"""
+
+import time
+from array import array
+from itertools import groupby
+
+# Situações possíveis ao fim de uma execução
+ACEITA = "aceita"
+REJEITADA = "rejeitada"
+LIMITE_EXCEDIDO = "limite_excedido"
+ERRO = "erro"
+# Só no modo acelerado: a MT voltou a uma configuração já vista e nunca para
+LACO = "laco"
+
+# Intervalo, em passos, entre as verificações do relógio (potência de 2)
+PASSOS_ENTRE_VERIFICACOES = 256
+
+_DESLOCAMENTOS = {"L": -1, "N": 0, "R": 1}
+
+
+def _pintar(simbolos: list, tamanhos: list, r: int, a: int, b: int, escrito: int) -> tuple[int, int]:
+    """
+    Escreve `escrito` nas células [a, b) da sequência `r` da fita comprimida.
+
+    A sequência é dividida em até três e a parte escrita é unida às
+    vizinhas com o mesmo símbolo, mantendo as sequências maximais.
+
+    Returns:
+        tuple: (sequência que contém as células escritas, posição de `a` nela)
+    """
+    simbolo = simbolos[r]
+    if simbolo == escrito:
+        return r, a
+    tamanho = tamanhos[r]
+    partes = ([(simbolo, a)] if a else []) + [(escrito, b - a)] + ([(simbolo, tamanho - b)] if b < tamanho else [])
+    simbolos[r:r + 1] = [parte[0] for parte in partes]
+    tamanhos[r:r + 1] = [parte[1] for parte in partes]
+
+    m = r + 1 if a else r
+    if m + 1 < len(simbolos) and simbolos[m + 1] == escrito:
+        tamanhos[m] += tamanhos.pop(m + 1)
+        del simbolos[m + 1]
+    if m > 0 and simbolos[m - 1] == escrito:
+        a = tamanhos[m - 1]
+        tamanhos[m - 1] += tamanhos.pop(m)
+        del simbolos[m]
+        return m - 1, a
+    return m, 0
+
+
+def _normalizada(simbolos: list, tamanhos: list, esquerda: int, branco: int) -> tuple:
+    """Conteúdo da fita comprimida sem os brancos das pontas, com a posição do primeiro símbolo."""
+    i, j = 0, len(simbolos)
+    if simbolos[0] == branco:
+        esquerda += tamanhos[0]
+        i = 1
+    if j > i and simbolos[j - 1] == branco:
+        j -= 1
+    if i == j:
+        return 0, (), ()
+    return esquerda, tuple(simbolos[i:j]), tuple(tamanhos[i:j])
+
+
+class MtCompilada:
+    """
+    Tabela de transições indexada por inteiros de uma MT determinística.
+
+    A transição do estado `e` lendo o símbolo `s` fica em `_tabela[e * k + s]`
+    como (próximo estado, símbolo escrito, deslocamento), ou None se não
+    houver transição. Caracteres da entrada fora do alfabeto da fita recebem
+    códigos a partir de `k`, que nunca têm transição. Depois de uma edição,
+    `estados` pode ter posições vagas (None), que nenhuma transição alcança.
+    """
+
+    __slots__ = ("estados", "simbolos", "inicial", "branco", "_indice_simbolo", "_finais", "_tabela")
+
+    def __init__(self, estados, simbolos_fita, transicoes: dict, estado_inicial: str, simbolo_branco: str, estados_finais):
+        self.estados = sorted(estados)
+        self.simbolos = sorted(set(simbolos_fita) | {simbolo_branco})
+        indice_estado = {estado: i for i, estado in enumerate(self.estados)}
+        self._indice_simbolo = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+
+        self.inicial = indice_estado[estado_inicial]
+        self.branco = self._indice_simbolo[simbolo_branco]
+        self._finais = [estado in estados_finais for estado in self.estados]
+
+        k = len(self.simbolos)
+        self._tabela = [None] * (len(self.estados) * k)
+        for estado, saidas in transicoes.items():
+            for lido, (destino, escrito, direcao) in saidas.items():
+                self._tabela[indice_estado[estado] * k + self._indice_simbolo[lido]] = (
+                    indice_estado[destino], self._indice_simbolo[escrito], _DESLOCAMENTOS[direcao]
+                )
+
+    @classmethod
+    def deMt(cls, mt) -> "MtCompilada":
+        """Compila um DTM do automata-lib."""
+        return cls(mt.states, mt.tape_symbols, mt.transitions, mt.initial_state, mt.blank_symbol, mt.final_states)
+
+    def editada(self, removidos, linhas: dict, estados_finais) -> "MtCompilada":
+        """
+        Cópia da tabela com estados removidos e linhas substituídas ou
+        adicionadas, sem recompilar os demais estados.
+
+        Um estado removido deixa sua posição vaga (sem nome e sem
+        transições), reaproveitada pelo próximo estado adicionado; os índices
+        dos outros estados não mudam. Os símbolos da fita são os mesmos.
+
+        Args:
+            removidos: Nomes dos estados removidos; nenhum estado restante leva a eles
+            linhas (dict): Transições {símbolo lido: (destino, escrito, direção)}
+                dos estados adicionados e dos alterados, completas
+            estados_finais: Estados finais após a edição
+
+        Returns:
+            MtCompilada: Nova tabela; a original continua válida para quem a estiver usando
+        """
+        k = len(self.simbolos)
+        estados = list(self.estados)
+        tabela = list(self._tabela)
+        indice = {estado: i for i, estado in enumerate(estados) if estado is not None}
+        vagas = [i for i, estado in enumerate(estados) if estado is None]
+        # Um estado removido e recriado mantém o índice, ao qual outras linhas ainda levam
+        for estado in set(removidos) - linhas.keys():
+            i = indice.pop(estado)
+            estados[i] = None
+            tabela[i * k:(i + 1) * k] = [None] * k
+            vagas.append(i)
+        for estado in linhas:
+            if estado not in indice:
+                if vagas:
+                    i = vagas.pop()
+                else:
+                    i = len(estados)
+                    estados.append(None)
+                    tabela.extend([None] * k)
+                estados[i] = estado
+                indice[estado] = i
+
+        for estado, saidas in linhas.items():
+            i = indice[estado]
+            tabela[i * k:(i + 1) * k] = [None] * k
+            for lido, (destino, escrito, direcao) in saidas.items():
+                tabela[i * k + self._indice_simbolo[lido]] = (
+                    indice[destino], self._indice_simbolo[escrito], _DESLOCAMENTOS[direcao]
+                )
+
+        copia = object.__new__(MtCompilada)
+        copia.estados = estados
+        copia.simbolos = self.simbolos
+        copia.inicial = self.inicial
+        copia.branco = self.branco
+        copia._indice_simbolo = self._indice_simbolo
+        copia._finais = [estado in estados_finais for estado in estados]
+        copia._tabela = tabela
+        return copia
+
+    def _fitaInicial(self, input_string: str) -> tuple[array, list[str]]:
+        # Símbolos fora do alfabeto recebem códigos novos, válidos só nesta execução
+        nomes = list(self.simbolos)
+        codigos = dict(self._indice_simbolo)
+        celulas = []
+        for simbolo in input_string:
+            codigo = codigos.get(simbolo)
+            if codigo is None:
+                codigo = codigos[simbolo] = len(nomes)
+                nomes.append(simbolo)
+            celulas.append(codigo)
+        if not celulas:
+            celulas.append(self.branco)
+        return array("B" if len(nomes) <= 256 else "I", celulas), nomes
+
+    def executar(self, input_string: str, max_passos: int, prazo: float, max_celulas: int) -> dict:
+        """
+        Executa a MT sobre uma string, com o mesmo resultado de DTM.read_input_stepwise.
+
+        Args:
+            input_string (str): Conteúdo inicial da fita
+            max_passos (int): Máximo de transições aplicadas
+            prazo (float): Instante (time.monotonic) em que a execução é interrompida
+            max_celulas (int): Máximo de células que a fita pode ocupar
+
+        Returns:
+            dict: Mesmo formato de mtService._executarMt
+        """
+        # Sem passo inicial o gerador não produz configurações: a execução
+        # inteira acontece no primeiro next, que termina com o resultado
+        try:
+            next(self.rastrear(input_string, max_passos, prazo, max_celulas, None))
+        except StopIteration as fim:
+            return fim.value
+
+    def rastrear(
+        self,
+        input_string: str,
+        max_passos: int,
+        prazo: float,
+        max_celulas: int,
+        inicio: int | None = 0,
+        janela: int = 8
+    ):
+        """
+        Executa a MT sobre uma string, gerando as configurações a partir do passo `inicio`.
+
+        A fita cresce em blocos para os dois lados; o conteúdo só é
+        convertido de volta para texto nas configurações geradas e ao final.
+        Cada configuração traz as células até `janela` posições de cada lado
+        do cabeçote; as posições contam a partir do primeiro símbolo da entrada.
+
+        Args:
+            input_string (str): Conteúdo inicial da fita
+            max_passos (int): Máximo de transições aplicadas
+            prazo (float): Instante (time.monotonic) em que a execução é interrompida
+            max_celulas (int): Máximo de células que a fita pode ocupar
+            inicio (int | None): Primeiro passo gerado (None para não gerar nenhum)
+            janela (int): Células de cada lado do cabeçote incluídas
+
+        Returns:
+            dict: Valor de retorno do gerador, no formato de `executar`
+        """
+        fita, nomes = self._fitaInicial(input_string)
+        branco = self.branco
+        k = len(self.simbolos)
+        tabela = self._tabela
+        finais = self._finais
+        mascara = PASSOS_ENTRE_VERIFICACOES - 1
+
+        # Células ocupadas: fita[esquerda:direita]; cabeçote em fita[posicao];
+        # o primeiro símbolo da entrada está em fita[origem]
+        esquerda, direita, posicao, origem = 0, len(fita), 0, 0
+        estado = self.inicial
+        passos = 0
+        situacao = None
+        limite = None
+
+        while True:
+            if inicio is not None and passos >= inicio:
+                inicio_janela = max(esquerda, posicao - janela)
+                yield {
+                    "passo": passos,
+                    "estado": self.estados[estado],
+                    "cabecote": posicao - origem,
+                    "inicio_janela": inicio_janela - origem,
+                    "fita": [nomes[simbolo] for simbolo in fita[inicio_janela:min(direita, posicao + janela + 1)]]
+                }
+            if direita - esquerda > max_celulas:
+                situacao, limite = LIMITE_EXCEDIDO, "fita"
+                break
+            if finais[estado]:
+                situacao = ACEITA
+                break
+            if passos >= max_passos:
+                situacao, limite = LIMITE_EXCEDIDO, "passos"
+                break
+            if passos & mascara == 0 and time.monotonic() >= prazo:
+                situacao, limite = LIMITE_EXCEDIDO, "tempo"
+                break
+
+            simbolo = fita[posicao]
+            transicao = tabela[estado * k + simbolo] if simbolo < k else None
+            if transicao is None:
+                situacao = REJEITADA
+                break
+
+            estado, fita[posicao], deslocamento = transicao
+            posicao += deslocamento
+            passos += 1
+
+            if posicao < esquerda:
+                esquerda = posicao
+                if posicao < 0:
+                    # Dobra a fita para a esquerda, preenchendo com brancos
+                    extra = len(fita)
+                    fita = array(fita.typecode, [branco]) * extra + fita
+                    esquerda += extra
+                    direita += extra
+                    posicao += extra
+                    origem += extra
+            elif posicao >= direita:
+                direita = posicao + 1
+                if direita > len(fita):
+                    fita.extend(array(fita.typecode, [branco]) * len(fita))
+
+        return {
+            "situacao": situacao,
+            "aceita": situacao == ACEITA,
+            "fita_final": "".join([nomes[simbolo] for simbolo in fita[esquerda:direita]]),
+            "estado_final": self.estados[estado],
+            "passos": passos,
+            "max_celulas_fita": direita - esquerda,
+            "limite": limite,
+            "detalhe": None
+        }
+
+    def executarAcelerada(self, input_string: str, max_passos: int, prazo: float, max_celulas: int) -> dict:
+        """
+        Executa a MT com a fita comprimida em sequências de símbolos iguais.
+
+        Quando o estado atual lê um símbolo e a transição mantém o estado e
+        move o cabeçote, a MT atravessa toda a sequência desse símbolo à
+        frente; esses passos são aplicados de uma vez (um macropasso), ainda
+        que a transição troque o símbolo. A sequência de brancos além da
+        ponta da fita não tem fim, então só os limites encerram a travessia.
+        Os macropassos param exatamente no limite de passos ou de fita, e a
+        fita final, o estado, os passos e as células ocupadas são os mesmos
+        da execução passo a passo; só o relógio é consultado a cada
+        `PASSOS_ENTRE_VERIFICACOES` macropassos.
+
+        Configurações repetidas (estado, fita sem os brancos das pontas e
+        posição do cabeçote) são detectadas pelo método de Brent: a atual é
+        comparada com uma guardada, renovada a cada potência de 2
+        macropassos. Uma repetição encerra a execução com a situação LACO.
+        Laços que se deslocam pela fita, sem repetir a configuração, só
+        terminam nos limites.
+
+        Cada escrita custa proporcional ao número de sequências, então
+        fitas com muitas trocas de símbolo rodam melhor em `executar`.
+
+        Args:
+            input_string (str): Conteúdo inicial da fita
+            max_passos (int): Máximo de transições aplicadas
+            prazo (float): Instante (time.monotonic) em que a execução é interrompida
+            max_celulas (int): Máximo de células que a fita pode ocupar
+
+        Returns:
+            dict: Formato de `executar`, com a situação LACO possível e
+                macro_passos (iterações realizadas)
+        """
+        celulas, nomes = self._fitaInicial(input_string)
+        simbolos, tamanhos = [], []
+        for simbolo, grupo in groupby(celulas):
+            simbolos.append(simbolo)
+            tamanhos.append(sum(1 for _ in grupo))
+
+        branco = self.branco
+        k = len(self.simbolos)
+        tabela = self._tabela
+        finais = self._finais
+        mascara = PASSOS_ENTRE_VERIFICACOES - 1
+
+        # Células ocupadas: [esquerda, direita), contadas a partir do primeiro
+        # símbolo da entrada; o cabeçote está na célula `o` da sequência `r`
+        esquerda, direita, posicao = 0, len(celulas), 0
+        r, o = 0, 0
+        estado = self.inicial
+        passos = macro_passos = 0
+        guardada, proxima_guarda = None, 1
+        situacao = None
+        limite = None
+
+        while True:
+            if direita - esquerda > max_celulas:
+                situacao, limite = LIMITE_EXCEDIDO, "fita"
+                break
+            if finais[estado]:
+                situacao = ACEITA
+                break
+            if passos >= max_passos:
+                situacao, limite = LIMITE_EXCEDIDO, "passos"
+                break
+            if macro_passos & mascara == 0 and time.monotonic() >= prazo:
+                situacao, limite = LIMITE_EXCEDIDO, "tempo"
+                break
+            if (
+                guardada is not None and guardada[0] == estado and guardada[1] == posicao
+                and guardada[2] == _normalizada(simbolos, tamanhos, esquerda, branco)
+            ):
+                situacao = LACO
+                break
+            if macro_passos == proxima_guarda:
+                guardada = (estado, posicao, _normalizada(simbolos, tamanhos, esquerda, branco))
+                proxima_guarda *= 2
+
+            simbolo = simbolos[r]
+            transicao = tabela[estado * k + simbolo] if simbolo < k else None
+            if transicao is None:
+                situacao = REJEITADA
+                break
+            destino, escrito, deslocamento = transicao
+
+            n = 1
+            if destino == estado and deslocamento:
+                # Células à frente na sequência atual (incluindo a do cabeçote)
+                # e dentro da fita ocupada
+                if deslocamento > 0:
+                    n, ponta, dentro = tamanhos[r] - o, r == len(simbolos) - 1, direita - 1 - posicao
+                else:
+                    n, ponta, dentro = o + 1, r == 0, posicao - esquerda
+                if simbolo == branco and ponta:
+                    n = max_passos
+                # Para no passo em que a fita passaria do limite de células
+                n = min(n, max_passos - passos, max_celulas - (direita - esquerda) + dentro + 1)
+
+            # A célula em que o cabeçote para passa a ocupar a fita
+            alvo = posicao + deslocamento * n
+            if alvo >= direita:
+                extra = alvo + 1 - direita
+                if simbolos[-1] == branco:
+                    tamanhos[-1] += extra
+                else:
+                    simbolos.append(branco)
+                    tamanhos.append(extra)
+                direita += extra
+            elif alvo < esquerda:
+                extra = esquerda - alvo
+                if simbolos[0] == branco:
+                    tamanhos[0] += extra
+                    if r == 0:
+                        o += extra
+                else:
+                    simbolos.insert(0, branco)
+                    tamanhos.insert(0, extra)
+                    r += 1
+                esquerda -= extra
+
+            inicio = o if deslocamento >= 0 else o - n + 1
+            r, inicio = _pintar(simbolos, tamanhos, r, inicio, inicio + n, escrito)
+            o = inicio + n if deslocamento > 0 else inicio - 1 if deslocamento < 0 else inicio
+            while o >= tamanhos[r]:
+                o -= tamanhos[r]
+                r += 1
+            while o < 0:
+                r -= 1
+                o += tamanhos[r]
+
+            estado = destino
+            posicao = alvo
+            passos += n
+            macro_passos += 1
+
+        return {
+            "situacao": situacao,
+            "aceita": situacao == ACEITA,
+            "fita_final": "".join([nomes[simbolo] * tamanho for simbolo, tamanho in zip(simbolos, tamanhos)]),
+            "estado_final": self.estados[estado],
+            "passos": passos,
+            "max_celulas_fita": direita - esquerda,
+            "limite": limite,
+            "detalhe": None,
+            "macro_passos": macro_passos
+        }
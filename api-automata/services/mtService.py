@@ -2,11 +2,31 @@
 Service para manipulação de Máquinas de Turing (MT).
 Implementa operações de criação, teste e visualização de MTs.
 """
-from automata.tm.dtm import DTM
-from schemas.mtSchema import mtInput, mtInfo
-from graphviz import Digraph
+import time
+from typing import TYPE_CHECKING
 
-mtAtual: DTM | None = None
+import config
+from automata.base.exceptions import RejectionException
+from schemas.mtSchema import mtInput, mtInfo, EdicaoInput
+from services import edicaoAutomatos, formatoCompacto
+from services.cacheResultados import cache as cacheResultados
+from services.metricasService import medirFase, registrarEntradas, registrarPassosMt, registrarValidacao
+from services.mtCompilada import MtCompilada, ACEITA, REJEITADA, LIMITE_EXCEDIDO, ERRO, LACO, PASSOS_ENTRE_VERIFICACOES
+from services.rastreioService import paginar, resolverPagina
+from services.registroService import RegistroAutomatos, hashDefinicao, medirMemoria, memoriaEditada
+from services.visualizacaoService import renderizar
+
+# O automata-lib (que importa o networkx) e o Graphviz são carregados no
+# primeiro uso, e não na inicialização da API
+if TYPE_CHECKING:
+    from automata.tm.dtm import DTM
+    from graphviz import Digraph
+
+# Cada entrada guarda o DTM, o hash da definição, a tabela compilada (se
+# habilitada; senão, montada no primeiro uso em "compilada_sob_demanda") e a
+# memória medida na criação:
+# {"mt": DTM, "hash": str, "compilada": MtCompilada | None, "memoria": dict}
+registro = RegistroAutomatos(tipo = "mt")
 
 def criarMt(mt_input: mtInput):
     """
@@ -23,78 +43,475 @@ def criarMt(mt_input: mtInput):
             - estados_finais: Estados finais
 
     Returns:
-        dict: Mensagem de sucesso/erro
-    """
-    global mtAtual
-    mtAtual = DTM(
-        states = mt_input.estados,
-        input_symbols = mt_input.simbolos_entrada,
-        tape_symbols = mt_input.simbolos_fita,
-        transitions = mt_input.transicoes,
-        initial_state = mt_input.estado_inicial,
-        blank_symbol = mt_input.simbolo_branco,
-        final_states = mt_input.estados_finais
+        dict: Mensagem de sucesso/erro, ID da MT criada e se ela foi reaproveitada
+    """
+    registrarValidacao("mt")
+    definicao = dict(mt_input)
+    hash_conteudo = hashDefinicao(definicao)
+
+    # Definições idênticas reaproveitam o autômato já construído e validado
+    mt_id = registro.buscarPorHash(hash_conteudo)
+    if mt_id is not None and registro.obter(mt_id) is not None:
+        return {"mensagem": "MT criada com sucesso", "id": mt_id, "reutilizado": True}
+
+    with medirFase("mt", "construcao"):
+        from automata.tm.dtm import DTM
+        mt = DTM(
+            states = mt_input.estados,
+            input_symbols = mt_input.simbolos_entrada,
+            tape_symbols = mt_input.simbolos_fita,
+            transitions = mt_input.transicoes,
+            initial_state = mt_input.estado_inicial,
+            blank_symbol = mt_input.simbolo_branco,
+            final_states = mt_input.estados_finais
+        )
+    return _armazenar(mt, hash_conteudo)
+
+
+def criarMtCompacta(corpo: bytes, tipo_conteudo: str):
+    """
+    Cria uma MT a partir de uma definição no formato compacto (ver services/formatoCompacto.py).
+
+    Args:
+        corpo (bytes): Corpo da requisição, em JSON ou msgpack
+        tipo_conteudo (str): Content-Type da requisição
+
+    Returns:
+        dict: Mesmo formato de criarMt, ou {"erro"} se a definição for inválida
+    """
+    try:
+        dados = formatoCompacto.decodificar(corpo, tipo_conteudo)
+    except ValueError as e:
+        return {"erro": str(e)}
+    registrarValidacao("mt")
+    hash_conteudo = formatoCompacto.hashCompacto(dados)
+
+    mt_id = registro.buscarPorHash(hash_conteudo)
+    if mt_id is not None and registro.obter(mt_id) is not None:
+        return {"mensagem": "MT criada com sucesso", "id": mt_id, "reutilizado": True}
+
+    # A conferência da definição substitui a validação do automata-lib
+    try:
+        with medirFase("mt", "construcao"):
+            mt = formatoCompacto.mtCompacta(dados)
+    except ValueError as e:
+        return {"erro": f"Definição inválida: {e}"}
+    return _armazenar(mt, hash_conteudo)
+
+
+def _armazenar(mt: "DTM", hash_conteudo: str) -> dict:
+    """Compila e registra uma MT já validada."""
+    with medirFase("mt", "compilacao"):
+        compilada = MtCompilada.deMt(mt) if config.MT_COMPILADA else None
+    memoria = medirMemoria(mt, compilada)
+
+    entrada = {"mt": mt, "hash": hash_conteudo, "compilada": compilada, "memoria": memoria}
+    mt_id = registro.adicionar(entrada, memoria["total_bytes"], hash_conteudo)
+    return {"mensagem": "MT criada com sucesso", "id": mt_id, "reutilizado": False}
+
+
+def editarMt(edicao: EdicaoInput) -> dict:
+    """
+    Cria uma MT a partir de uma registrada, com as alterações informadas.
+
+    Só os estados tocados pela edição são conferidos, e a tabela compilada
+    é copiada e atualizada nas linhas deles (ver services/edicaoAutomatos.py).
+    A MT editada recebe um novo ID: como definições idênticas compartilham
+    o mesmo ID, a original continua valendo para quem a criou. O hash é o da
+    definição resultante, então uma MT idêntica já registrada é reaproveitada.
+
+    Args:
+        edicao (EdicaoInput): ID da MT e alterações
+            - adicionar_estados / remover_estados: Estados criados e apagados
+            - transicoes: Transições novas ou substituídas {estado: {lido: (destino, escrito, direção)}}
+            - remover_transicoes: Transições apagadas {estado: {lido}}
+            - adicionar_finais / remover_finais: Estados que passam a ser (ou deixam de ser) finais
+
+    Returns:
+        dict: Mensagem de sucesso, ID da MT editada, se ela foi reaproveitada,
+            editado_de, total de estados e estados_conferidos, ou {"erro"} se
+            a MT não existir ou a edição for inválida
+    """
+    entrada = registro.obter(edicao.id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
+    alteracoes = {campo: valor for campo, valor in edicao if campo != "id"}
+    if not any(alteracoes.values()):
+        return {"mensagem": "Nenhuma alteração informada", "id": edicao.id}
+
+    try:
+        with medirFase("mt", "edicao"):
+            mt, compilada, variacao = edicaoAutomatos.editarMt(entrada["mt"], entrada["compilada"], alteracoes)
+    except ValueError as e:
+        return {"erro": f"Edição inválida: {e}"}
+
+    hash_conteudo = hashDefinicao(dict(mtInput(
+        estados = mt.states,
+        simbolos_fita = mt.tape_symbols,
+        simbolos_entrada = mt.input_symbols,
+        transicoes = mt.transitions,
+        estado_inicial = mt.initial_state,
+        estados_finais = mt.final_states,
+        simbolo_branco = mt.blank_symbol
+    )))
+    mt_id = registro.buscarPorHash(hash_conteudo)
+    reutilizado = mt_id is not None and registro.obter(mt_id) is not None
+    if not reutilizado:
+        memoria = memoriaEditada(entrada["memoria"], variacao)
+        nova = {"mt": mt, "hash": hash_conteudo, "compilada": compilada, "memoria": memoria}
+        mt_id = registro.adicionar(nova, memoria["total_bytes"], hash_conteudo)
+    conferidos = (
+        alteracoes["remover_estados"] | alteracoes["adicionar_estados"]
+        | alteracoes["transicoes"].keys() | alteracoes["remover_transicoes"].keys()
     )
+    return {
+        "mensagem": "MT editada com sucesso",
+        "id": mt_id,
+        "reutilizado": reutilizado,
+        "editado_de": edicao.id,
+        "estados": len(mt.states),
+        "estados_conferidos": len(conferidos)
+    }
 
-    return {"mensagem": "MT criada com sucesso"}
+def _resolverLimites(max_passos: int | None, max_segundos: float | None, max_celulas: int | None) -> tuple:
+    """
+    Combina os limites pedidos na requisição com os limites globais.
 
-def testarString(input_string: str) -> dict:
+    Os limites da requisição só podem reduzir os globais, nunca ampliá-los.
     """
-    Verifica se uma string é aceita pela MT atual.
+    def menor(pedido, maximo):
+        return maximo if pedido is None else min(pedido, maximo)
+
+    return (
+        menor(max_passos, config.MT_MAX_PASSOS),
+        menor(max_segundos, config.MT_MAX_SEGUNDOS),
+        menor(max_celulas, config.MT_MAX_CELULAS_FITA)
+    )
+
+
+def _executar(
+    entrada: dict,
+    input_string: str,
+    max_passos: int,
+    prazo: float,
+    max_celulas: int,
+    acelerada: MtCompilada | None = None
+) -> dict:
+    """
+    Executa a MT da entrada pela tabela compilada, se houver, ou pelo automata-lib.
+    Com `acelerada`, usa o modo de fita comprimida dessa tabela.
+    """
+    if acelerada is not None:
+        execucao = acelerada.executarAcelerada(input_string, max_passos, prazo, max_celulas)
+    elif entrada["compilada"] is not None:
+        execucao = entrada["compilada"].executar(input_string, max_passos, prazo, max_celulas)
+    else:
+        execucao = _executarMt(entrada["mt"], input_string, max_passos, prazo, max_celulas)
+    registrarPassosMt(execucao["passos"])
+    return execucao
+
+
+def _executarMt(mt: "DTM", input_string: str, max_passos: int, prazo: float, max_celulas: int) -> dict:
+    """
+    Executa a MT sobre uma string pelo automata-lib, respeitando os limites de execução.
 
     Args:
+        mt (DTM): Máquina a executar
+        input_string (str): Conteúdo inicial da fita
+        max_passos (int): Máximo de transições aplicadas
+        prazo (float): Instante (time.monotonic) em que a execução é interrompida
+        max_celulas (int): Máximo de células que a fita pode ocupar
+
+    Returns:
+        dict: Resultado da execução com:
+            - situacao: "aceita", "rejeitada" (parou sem transição definida),
+              "limite_excedido" ou "erro"
+            - aceita: Booleano indicando aceitação
+            - fita_final: Conteúdo da fita na última configuração
+            - estado_final: Estado da última configuração
+            - passos: Transições aplicadas
+            - max_celulas_fita: Maior tamanho atingido pela fita
+            - limite: "passos", "tempo" ou "fita" quando algum limite foi atingido
+            - detalhe: Mensagem da exceção em caso de erro
+    """
+    final_config = None
+    passos = -1  # A primeira configuração é a inicial, antes de qualquer transição
+    celulas = max(len(input_string), 1)
+    situacao = None
+    limite = None
+    detalhe = None
+
+    try:
+        for final_config in mt.read_input_stepwise(input_string):
+            passos += 1
+            celulas = max(celulas, len(final_config.tape))
+            if celulas > max_celulas:
+                limite = "fita"
+            elif final_config.state in mt.final_states:
+                break
+            elif passos >= max_passos:
+                limite = "passos"
+            elif passos % PASSOS_ENTRE_VERIFICACOES == 0 and time.monotonic() >= prazo:
+                limite = "tempo"
+            if limite is not None:
+                situacao = LIMITE_EXCEDIDO
+                break
+    except RejectionException:
+        # Nenhuma transição definida: a MT parou em um estado não final
+        situacao = REJEITADA
+    except Exception as e:
+        situacao = ERRO
+        detalhe = str(e)
+
+    if final_config is None:
+        # Nenhuma configuração foi gerada: a fita permanece com a string original
+        return {
+            "situacao": situacao or REJEITADA, "aceita": False, "fita_final": input_string,
+            "estado_final": None, "passos": 0, "max_celulas_fita": celulas,
+            "limite": limite, "detalhe": detalhe
+        }
+
+    aceita = situacao is None and final_config.state in mt.final_states
+    if situacao is None:
+        situacao = ACEITA if aceita else REJEITADA
+
+    return {
+        "situacao": situacao,
+        "aceita": aceita,
+        "fita_final": "".join(final_config.tape),
+        "estado_final": final_config.state,
+        "passos": max(passos, 0),
+        "max_celulas_fita": celulas,
+        "limite": limite,
+        "detalhe": detalhe
+    }
+
+
+def _compilada(mt_id: str, entrada: dict) -> MtCompilada:
+    """
+    Retorna a tabela compilada da MT.
+
+    Com AUTOMATA_MT_COMPILADA=0, a tabela é montada no primeiro uso e
+    guardada na entrada, à parte, para que /testar continue usando o
+    automata-lib; seu tamanho passa a contar para o limite do registro.
+    """
+    if entrada["compilada"] is not None:
+        return entrada["compilada"]
+
+    def compilar():
+        with medirFase("mt", "compilacao"):
+            return MtCompilada.deMt(entrada["mt"])
+
+    return registro.derivado(mt_id, entrada, "compilada_sob_demanda", compilar)
+
+
+def _tabelaAcelerada(mt_id: str, entrada: dict, acelerada: bool | None) -> MtCompilada | None:
+    """Tabela para o modo acelerado (ver _compilada); None fora dele."""
+    if not (config.MT_ACELERADA if acelerada is None else acelerada):
+        return None
+    return _compilada(mt_id, entrada)
+
+
+def _mensagem(execucao: dict) -> str:
+    if execucao["situacao"] == ACEITA:
+        return "String aceita"
+    if execucao["situacao"] == REJEITADA:
+        return "String rejeitada"
+    if execucao["situacao"] == LIMITE_EXCEDIDO:
+        nomes = {"passos": "de passos", "tempo": "de tempo", "fita": "de células da fita"}
+        return f"Execução interrompida: limite {nomes[execucao['limite']]} atingido"
+    if execucao["situacao"] == LACO:
+        return "A MT repetiu uma configuração e não vai parar"
+    return f"Erro durante a execução: {execucao['detalhe']}"
+
+
+def testarString(
+    mt_id: str,
+    input_string: str,
+    max_passos: int | None = None,
+    max_segundos: float | None = None,
+    max_celulas: int | None = None,
+    acelerada: bool | None = None
+) -> dict:
+    """
+    Verifica se uma string é aceita pela MT informada.
+
+    A execução é interrompida ao atingir o limite de passos, de tempo ou de
+    células da fita. Os limites informados só podem reduzir os globais
+    (`AUTOMATA_MT_MAX_*`). No modo acelerado (MtCompilada.executarAcelerada),
+    o resultado é o mesmo, mas uma configuração repetida encerra a execução
+    com a situação "laco" antes de chegar aos limites.
+
+    Args:
+        mt_id (str): ID da MT retornado na criação
         input_string (str): String a ser testada
+        max_passos (int | None): Máximo de transições
+        max_segundos (float | None): Tempo máximo de execução
+        max_celulas (int | None): Máximo de células da fita
+        acelerada (bool | None): Usa o modo acelerado (padrão: AUTOMATA_MT_ACELERADA)
 
     Returns:
         dict: Resultado do teste contendo:
             - string: String testada
             - aceita: Booleano indicando aceitação
+            - situacao: "aceita", "rejeitada", "limite_excedido", "laco" ou "erro"
             - fita_final: Conteúdo final da fita
+            - estado_final: Estado em que a MT parou
+            - passos: Transições aplicadas
+            - max_celulas_fita: Maior tamanho atingido pela fita
+            - limite: Limite atingido ("passos", "tempo" ou "fita"), se houver
             - mensagem: Descrição textual do resultado
+            - cache: Se o resultado veio do cache de resultados
     """
-    if mtAtual is None:
-        return {"erro": "Nenhuma MT foi criada ainda"}
-    
-    try:
-        # Executa a MT passo a passo
-        config = mtAtual.read_input_stepwise(input_string)
-        
-        # Variável para armazenar a última configuração válida
-        final_config = None
-        
-        # Percorre até o estado final ou até a MT parar
-        try:
-            for final_config in config:
-                pass
-        except Exception:
-            # Se houver exceção durante a execução, usa a última configuração válida
-            pass
-
-        # Se não conseguimos obter nenhuma configuração, a string é rejeitada
-        if final_config is None:
-            return {
-                "string": input_string,
-                "aceita": False,
-                "fita_final": input_string,  # Retorna a string original como estava na fita
-                "mensagem": "String rejeitada"
-            }
-
-        # Obtém o conteúdo final da fita
-        fita_final = "".join(final_config.tape)
-        aceita = final_config.state in mtAtual.final_states
+    entrada = registro.obter(mt_id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
+
+    max_passos, max_segundos, max_celulas = _resolverLimites(max_passos, max_segundos, max_celulas)
+    registrarEntradas("mt", [input_string])
+    # O limite de tempo fica fora da chave: uma execução que terminou antes
+    # dele dá o mesmo resultado com qualquer prazo, e as interrompidas por
+    # tempo não são guardadas
+    tabela = _tabelaAcelerada(mt_id, entrada, acelerada)
+    chave = (entrada["hash"], input_string, max_passos, max_celulas, tabela is not None)
+    resultado = cacheResultados.obter("mt", chave)
+    if resultado is not None:
+        return {**resultado, "cache": True}
+    with medirFase("mt", "simulacao"):
+        execucao = _executar(entrada, input_string, max_passos, time.monotonic() + max_segundos, max_celulas, tabela)
+
+    resultado = {
+        "string": input_string,
+        "aceita": execucao["aceita"],
+        "situacao": execucao["situacao"],
+        "fita_final": execucao["fita_final"],
+        "estado_final": execucao["estado_final"],
+        "passos": execucao["passos"],
+        "max_celulas_fita": execucao["max_celulas_fita"],
+        "limite": execucao["limite"],
+        "mensagem": _mensagem(execucao)
+    }
+    if execucao["limite"] != "tempo":
+        cacheResultados.guardar("mt", chave, resultado)
+    return {**resultado, "cache": False}
+
+def testarLote(
+    mt_id: str,
+    inputs: list[str],
+    resumo: bool = False,
+    max_passos: int | None = None,
+    max_segundos: float | None = None,
+    max_celulas: int | None = None,
+    acelerada: bool | None = None
+) -> dict:
+    """
+    Testa várias strings na MT informada com uma única busca no registro.
+
+    Os limites de passos e de fita valem para cada string; o limite de tempo
+    vale para o lote inteiro, e as strings não executadas dentro dele são
+    marcadas como "limite_excedido".
+
+    Args:
+        mt_id (str): ID da MT retornado na criação
+        inputs (list[str]): Strings a serem testadas
+        resumo (bool): Se True, retorna apenas as contagens e os índices rejeitados
+        max_passos, max_segundos, max_celulas: Limites de execução (ver testarString)
+        acelerada (bool | None): Usa o modo acelerado (ver testarString)
+
+    Returns:
+        dict: Resultado do lote com:
+            - total: Quantidade de strings testadas
+            - resultados: Aceitação de cada string, na ordem recebida
+            - situacoes: Situação de cada execução
+            - fitas_finais: Conteúdo final da fita para cada string
+            - passos: Transições aplicadas em cada string
+            - max_celulas_fita: Maior tamanho de fita atingido no lote
+            ou, no modo resumo:
+            - aceitas / rejeitadas: Contagens (rejeitadas inclui limites e erros)
+            - limites_excedidos / lacos / erros: Contagens por situação
+            - indices_rejeitados: Posições das strings não aceitas
+            - passos_total, max_celulas_fita: Totais do lote
+    """
+    entrada = registro.obter(mt_id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
 
+    max_passos, max_segundos, max_celulas = _resolverLimites(max_passos, max_segundos, max_celulas)
+    prazo = time.monotonic() + max_segundos
+    tabela = _tabelaAcelerada(mt_id, entrada, acelerada)
+    registrarEntradas("mt", inputs)
+    with medirFase("mt", "simulacao"):
+        execucoes = [_executar(entrada, input_string, max_passos, prazo, max_celulas, tabela) for input_string in inputs]
+
+    max_celulas_fita = max((execucao["max_celulas_fita"] for execucao in execucoes), default = 0)
+    if resumo:
+        rejeitados = [indice for indice, execucao in enumerate(execucoes) if not execucao["aceita"]]
         return {
-            "string": input_string,
-            "aceita": aceita,
-            "fita_final": fita_final,
-            "mensagem": "String aceita" if aceita else "String rejeitada"
+            "total": len(execucoes),
+            "aceitas": len(execucoes) - len(rejeitados),
+            "rejeitadas": len(rejeitados),
+            "limites_excedidos": sum(execucao["situacao"] == LIMITE_EXCEDIDO for execucao in execucoes),
+            "lacos": sum(execucao["situacao"] == LACO for execucao in execucoes),
+            "erros": sum(execucao["situacao"] == ERRO for execucao in execucoes),
+            "indices_rejeitados": rejeitados,
+            "passos_total": sum(execucao["passos"] for execucao in execucoes),
+            "max_celulas_fita": max_celulas_fita
         }
-    except Exception as e:
-        return {"erro": f"Erro ao processar string: {str(e)}"}
 
-def getMtInfo() -> mtInfo:
+    return {
+        "total": len(execucoes),
+        "resultados": [execucao["aceita"] for execucao in execucoes],
+        "situacoes": [execucao["situacao"] for execucao in execucoes],
+        "fitas_finais": [execucao["fita_final"] for execucao in execucoes],
+        "passos": [execucao["passos"] for execucao in execucoes],
+        "max_celulas_fita": max_celulas_fita
+    }
+
+def _resultadoRastreio(configuracoes):
+    # A fita final pode ser enorme: a última configuração já traz a janela dela
+    execucao = yield from configuracoes
+    execucao.pop("fita_final")
+    execucao.pop("detalhe")
+    return execucao
+
+
+def rastrear(mt_id: str, input_string: str, cursor: int = 0, limite: int | None = None, janela: int | None = None):
+    """
+    Gera, em NDJSON, as configurações da MT ao executar uma string.
+
+    A execução respeita os limites globais de passos, tempo e células da
+    fita (`AUTOMATA_MT_MAX_*`); o prazo conta a partir da requisição.
+
+    Args:
+        mt_id (str): ID da MT retornado na criação
+        input_string (str): Conteúdo inicial da fita
+        cursor (int): Primeiro passo da página
+        limite (int | None): Máximo de configurações na página
+        janela (int | None): Células de cada lado do cabeçote em cada configuração
+
+    Returns:
+        Iterator[str] | dict: Uma linha {"passo", "estado", "cabecote",
+            "inicio_janela", "fita"} por configuração e uma linha final com
+            "fim" (ver rastreioService.paginar), ou um dict com "erro"
+    """
+    entrada = registro.obter(mt_id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
+
+    compilada = _compilada(mt_id, entrada)
+    max_passos, max_segundos, max_celulas = _resolverLimites(None, None, None)
+    limite, janela = resolverPagina(limite, janela)
+    configuracoes = compilada.rastrear(
+        input_string, max_passos, time.monotonic() + max_segundos, max_celulas, cursor, janela
+    )
+    return paginar(_resultadoRastreio(configuracoes), limite)
+
+def getMtInfo(mt_id: str) -> mtInfo:
     """
-    Obtém informações da MT atual.
+    Obtém informações de uma MT.
+
+    Args:
+        mt_id (str): ID da MT retornado na criação
 
     Returns:
         mtInfo: Dados da MT
@@ -105,50 +522,44 @@ def getMtInfo() -> mtInfo:
             - estado_inicial: Estado inicial
             - estados_finais: Estados finais
             - simbolo_branco: Símbolo em branco
+            - memoria: Bytes ocupados pela definição e pela tabela compilada,
+              medidos na criação
 
     Raises:
-        Exception: Se nenhuma MT foi criada
+        Exception: Se a MT não existir
     """
-    if mtAtual is None:
-        return {"erro": "Nenhuma MT foi criada ainda"}
+    entrada = registro.obter(mt_id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
+    mt = entrada["mt"]
     
     return mtInfo(
-        estados = mtAtual.states,
-        simbolos_fita = mtAtual.tape_symbols,
-        simbolos_entrada = mtAtual.input_symbols,
-        transicoes = mtAtual.transitions,
-        estado_inicial = mtAtual.initial_state,
-        estados_finais = mtAtual.final_states,
-        simbolo_branco = mtAtual.blank_symbol
+        estados = mt.states,
+        simbolos_fita = mt.tape_symbols,
+        simbolos_entrada = mt.input_symbols,
+        transicoes = mt.transitions,
+        estado_inicial = mt.initial_state,
+        estados_finais = mt.final_states,
+        simbolo_branco = mt.blank_symbol,
+        memoria = entrada["memoria"]
     )
 
 
 
-def visualizarMt():
-    """
-    Gera visualização gráfica da MT atual.
-
-    Returns:
-        dict: Mensagem de sucesso/erro
+def _gerarDiagrama(mt: "DTM") -> "Digraph":
+    """Monta o diagrama Graphviz de uma MT."""
+    from graphviz import Digraph
 
-    Notes:
-        - Gera arquivo PNG com diagrama da MT
-        - Estados finais são representados com círculo duplo
-        - Transições mostram símbolo lido/escrito e direção
-    """
-    if mtAtual is None:
-        return {"erro": "Nenhuma MT foi criada ainda"}
-    
     dot = Digraph()
     dot.attr(rankdir="LR")  # Layout da esquerda para a direita
 
     # Indicação do estado inicial
     dot.node("", shape="none")
-    dot.edge("", mtAtual.initial_state, label="")
+    dot.edge("", mt.initial_state, label="")
 
     # Configuração dos nós
-    for estado in mtAtual.states:
-        if estado in mtAtual.final_states:
+    for estado in mt.states:
+        if estado in mt.final_states:
             dot.node(estado, estado, shape="doublecircle")
         else:
             dot.node(estado, estado, shape="circle")
@@ -156,7 +567,7 @@ def visualizarMt():
     # Adiciona as transições agrupando as que têm o mesmo destino
     transicoes_formatadas = {}
     
-    for estado, trans_by_symbol in mtAtual.transitions.items():
+    for estado, trans_by_symbol in mt.transitions.items():
         for symbol, (next_state, write_symbol, direction) in trans_by_symbol.items():
             label = f"{symbol}/{write_symbol},{direction}"
             
@@ -169,6 +580,45 @@ def visualizarMt():
     for (estado, next_state), labels in transicoes_formatadas.items():
         dot.edge(estado, next_state, label="\n".join(labels), constraint="false", minlen="2")
 
-    # Salva o arquivo
-    dot.render("mt_visualization", format="png", cleanup=True)
-    return {"mensagem": "Visualização da MT gerada com sucesso"}
+    return dot
+
+
+async def visualizarMt(mt_id: str, formato: str = "png", if_none_match: str | None = None):
+    """
+    Gera visualização gráfica de uma MT.
+
+    Args:
+        mt_id (str): ID da MT retornado na criação
+        formato (str): "png", "svg", "pdf" ou "dot" (código-fonte, sem Graphviz)
+        if_none_match (str | None): ETag que o cliente já possui
+
+    Returns:
+        dict: Mensagem de erro, ou a imagem (bytes), seu media type e sua ETag.
+        A imagem é None se a ETag do cliente ainda for válida.
+
+    Notes:
+        - A imagem fica em cache pelo hash da MT
+        - Estados finais são representados com círculo duplo
+        - Transições mostram símbolo lido/escrito e direção
+    """
+    entrada = registro.obter(mt_id)
+    if entrada is None:
+        return {"erro": "MT não encontrada"}
+    mt = entrada["mt"]
+
+    return await renderizar(
+        "mt", entrada["hash"], lambda: _gerarDiagrama(mt), formato = formato, if_none_match = if_none_match
+    )
+
+
+
+def getEstatisticas() -> dict:
+    """
+    Obtém a ocupação do registro de MTs e os contadores do cache de criação.
+
+    Returns:
+        dict: Número de autômatos, bytes estimados, limites configurados,
+        acertos e falhas do cache de definições e, em cache_resultados,
+        ocupação e taxa de acertos do cache de resultados de /testar
+    """
+    return {**registro.estatisticas(), "cache_resultados": cacheResultados.estatisticas("mt")}
@@ -0,0 +1,57 @@
+"""
+Paginação dos rastreamentos passo a passo (/rastrear).
+Os executores compilados geram as configurações de uma execução uma a uma;
+aqui elas viram linhas NDJSON, em páginas de tamanho limitado. O cursor é o
+número do passo: a página seguinte executa de novo a máquina desde o início,
+sem gerar as configurações anteriores ao cursor, então nenhuma execução
+precisa ficar guardada em memória entre as requisições.
+"""
+
+import json
+from typing import Iterator
+
+import config
+
+
+def resolverPagina(limite: int | None, janela: int | None) -> tuple[int, int]:
+    """
+    Combina o tamanho de página e a janela pedidos com os limites globais.
+
+    Os valores da requisição só podem reduzir os globais, nunca ampliá-los.
+    """
+    limite = config.RASTREIO_PAGINA_PADRAO if limite is None else limite
+    janela = 8 if janela is None else janela
+    return min(limite, config.RASTREIO_PAGINA_MAX), min(janela, config.RASTREIO_JANELA_MAX)
+
+
+def _linha(objeto: dict) -> str:
+    return json.dumps(objeto, ensure_ascii = False, separators = (",", ":")) + "\n"
+
+
+def paginar(configuracoes, limite: int, campo_cursor: str = "passo") -> Iterator[str]:
+    """
+    Converte as configurações de uma execução em uma página NDJSON.
+
+    Args:
+        configuracoes: Gerador de configurações que retorna o resultado da execução
+        limite (int): Máximo de configurações na página
+        campo_cursor (str): Campo da configuração usado como proximo_cursor
+
+    Yields:
+        str: Uma linha por configuração, seguida de uma linha final com
+            {"fim": false, "proximo_cursor"} se a execução continua depois da
+            página, ou {"fim": true, ...resultado} se ela terminou
+    """
+    emitidas = 0
+    while True:
+        try:
+            configuracao = next(configuracoes)
+        except StopIteration as fim:
+            yield _linha({"fim": True, **fim.value})
+            return
+        if emitidas == limite:
+            configuracoes.close()
+            yield _linha({"fim": False, "proximo_cursor": configuracao[campo_cursor]})
+            return
+        emitidas += 1
+        yield _linha(configuracao)
@@ -0,0 +1,376 @@
+"""
+Registro em memória dos autômatos criados.
+Cada autômato recebe um ID próprio, permitindo que vários clientes
+trabalhem com máquinas diferentes ao mesmo tempo. Definições idênticas
+são reconhecidas pelo hash do conteúdo e compartilham o mesmo ID.
+Com um armazenamento persistente configurado, o registro funciona como
+cache das entradas guardadas nele.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import OrderedDict
+
+import config
+from services import armazenamentoService
+
+
+def _atributos(obj) -> list:
+    """Valores dos atributos de instância de um objeto, em __slots__ e em __dict__."""
+    valores = list(vars(obj).values()) if hasattr(obj, "__dict__") else []
+    for classe in type(obj).__mro__:
+        slots = classe.__dict__.get("__slots__", ())
+        for nome in (slots,) if isinstance(slots, str) else slots:
+            if nome not in ("__dict__", "__weakref__") and hasattr(obj, nome):
+                valores.append(getattr(obj, nome))
+    return valores
+
+
+def estimarTamanho(obj, _vistos: set | None = None) -> int:
+    """
+    Estima o tamanho em bytes de um objeto e de tudo que ele referencia.
+
+    Args:
+        obj: Objeto a ser medido (dicts, listas, sets, tuplas, strings,
+            arrays e instâncias com __slots__ ou __dict__, como os
+            autômatos do automata-lib e as tabelas compiladas)
+
+    Returns:
+        int: Tamanho aproximado em bytes
+    """
+    if _vistos is None:
+        _vistos = set()
+    if id(obj) in _vistos:
+        return 0
+    _vistos.add(id(obj))
+
+    tamanho = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for chave, valor in obj.items():
+            tamanho += estimarTamanho(chave, _vistos) + estimarTamanho(valor, _vistos)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            tamanho += estimarTamanho(item, _vistos)
+    elif not isinstance(obj, (str, bytes, int, float, type, types.ModuleType, types.FunctionType, types.MethodType)):
+        # Arrays (array.array, NumPy) já incluem os dados em getsizeof
+        for valor in _atributos(obj):
+            tamanho += estimarTamanho(valor, _vistos)
+    return tamanho
+
+
+def medirMemoria(automato, compilado) -> dict:
+    """
+    Mede a memória ocupada por um autômato e por suas tabelas compiladas.
+
+    Args:
+        automato: Objeto do automata-lib guardado no registro
+        compilado: Tabelas compiladas na criação (None se a compilação estiver desligada)
+
+    Returns:
+        dict: definicao_bytes, compilado_bytes e total_bytes
+    """
+    definicao = estimarTamanho(automato)
+    tabelas = estimarTamanho(compilado) if compilado is not None else 0
+    return {"definicao_bytes": definicao, "compilado_bytes": tabelas, "total_bytes": definicao + tabelas}
+
+
+def memoriaEditada(memoria: dict, variacao: int) -> dict:
+    """
+    Estima a memória de um autômato editado a partir da medida no original,
+    sem medir de novo as partes compartilhadas com ele.
+
+    Args:
+        memoria (dict): Medição do autômato original (ver medirMemoria)
+        variacao (int): Variação estimada, em bytes, da definição
+
+    Returns:
+        dict: definicao_bytes, compilado_bytes e total_bytes
+    """
+    definicao = max(memoria["definicao_bytes"] + variacao, 0)
+    return {**memoria, "definicao_bytes": definicao, "total_bytes": definicao + memoria["compilado_bytes"]}
+
+
+def _normalizar(obj):
+    """Converte conjuntos em listas ordenadas e tuplas em listas, recursivamente."""
+    if isinstance(obj, dict):
+        return {str(chave): _normalizar(valor) for chave, valor in obj.items()}
+    if isinstance(obj, (set, frozenset)):
+        return sorted((_normalizar(item) for item in obj), key = lambda item: json.dumps(item, sort_keys = True))
+    if isinstance(obj, (list, tuple)):
+        return [_normalizar(item) for item in obj]
+    return obj
+
+
+def hashDefinicao(definicao: dict) -> str:
+    """
+    Calcula o hash canônico da definição de um autômato.
+
+    Estados, símbolos e transições são ordenados antes do cálculo, de modo
+    que definições equivalentes enviadas em ordens diferentes gerem o mesmo hash.
+
+    Args:
+        definicao (dict): Campos do schema de entrada do autômato
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    canonico = json.dumps(_normalizar(definicao), sort_keys = True, separators = (",", ":"))
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+class _Entrada:
+    __slots__ = ("valor", "tamanho", "expira_em", "hash")
+
+    def __init__(self, valor, tamanho: int, expira_em: float, hash_conteudo: str | None):
+        self.valor = valor
+        self.tamanho = tamanho
+        self.expira_em = expira_em
+        self.hash = hash_conteudo
+
+
+class RegistroAutomatos:
+    """
+    Registro de autômatos indexado por ID.
+
+    Mantém as entradas em ordem de uso (LRU). Uma entrada é descartada
+    quando fica sem acesso por mais de `ttl` segundos ou quando o registro
+    ultrapassa `max_itens` entradas ou `max_bytes` bytes estimados.
+
+    Entradas adicionadas com hash de conteúdo também são indexadas por ele,
+    permitindo reaproveitar um autômato já construído e validado.
+
+    Com `tipo` informado e um armazenamento configurado, cada entrada
+    adicionada também é gravada nele, e IDs ou hashes ausentes da memória
+    são procurados lá. Uma entrada descartada da memória continua
+    disponível no armazenamento.
+    """
+
+    def __init__(
+        self,
+        max_itens: int = config.REGISTRO_MAX_AUTOMATOS,
+        max_bytes: int = config.REGISTRO_MAX_BYTES,
+        ttl: float = config.REGISTRO_TTL_SEGUNDOS,
+        tipo: str | None = None,
+        armazenamento = None
+    ):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.tipo = tipo
+        if armazenamento is None and tipo is not None:
+            armazenamento = armazenamentoService.armazenamento
+        self.armazenamento = armazenamento
+        self._itens: OrderedDict[str, _Entrada] = OrderedDict()
+        self._bytes = 0
+        self._por_hash: dict[str, str] = {}
+        self._acertos = 0
+        self._falhas = 0
+        self._lock = threading.Lock()
+
+    def adicionar(self, valor, tamanho: int = 0, hash_conteudo: str | None = None) -> str:
+        """
+        Armazena um autômato e retorna o ID gerado para ele.
+
+        Args:
+            valor: Autômato (ou estrutura associada) a ser armazenado
+            tamanho (int): Tamanho estimado em bytes
+            hash_conteudo (str | None): Hash canônico da definição
+
+        Returns:
+            str: ID do autômato. Se outro autômato com o mesmo hash já
+            estiver registrado, retorna o ID existente.
+        """
+        with self._lock:
+            if hash_conteudo is not None:
+                existente = self._por_hash.get(hash_conteudo)
+                if existente is not None and self._entradaValida(existente) is not None:
+                    return existente
+
+            automato_id = uuid.uuid4().hex
+            self._inserir(automato_id, valor, tamanho, hash_conteudo)
+
+        if self.armazenamento is not None:
+            self.armazenamento.salvar(
+                self.tipo, automato_id, hash_conteudo, tamanho, armazenamentoService.serializar(valor)
+            )
+        return automato_id
+
+    def obter(self, automato_id: str):
+        """
+        Busca um autômato pelo ID, renovando seu prazo de expiração.
+
+        Se ele não estiver em memória, é carregado do armazenamento.
+
+        Returns:
+            O valor armazenado, ou None se o ID não existir ou tiver expirado
+        """
+        with self._lock:
+            entrada = self._entradaValida(automato_id)
+            if entrada is not None:
+                return entrada.valor
+            if self.armazenamento is None:
+                return None
+
+        # A leitura é feita fora do lock; se outra thread carregar o mesmo
+        # ID nesse meio tempo, a entrada dela é mantida
+        salvo = self.armazenamento.carregar(self.tipo, automato_id)
+        if salvo is None:
+            return None
+        dados, tamanho = salvo
+        try:
+            valor = armazenamentoService.desserializar(dados)
+        except Exception:
+            # Entrada gravada por uma versão incompatível do código
+            return None
+
+        with self._lock:
+            entrada = self._entradaValida(automato_id)
+            if entrada is not None:
+                return entrada.valor
+            self._inserir(automato_id, valor, tamanho, valor.get("hash") if isinstance(valor, dict) else None)
+            return valor
+
+    def buscarPorHash(self, hash_conteudo: str) -> str | None:
+        """
+        Procura um autômato já registrado com a mesma definição.
+
+        Args:
+            hash_conteudo (str): Hash canônico da definição
+
+        Returns:
+            str | None: ID do autômato existente, ou None se não houver
+        """
+        with self._lock:
+            automato_id = self._por_hash.get(hash_conteudo)
+            if automato_id is not None and self._entradaValida(automato_id) is not None:
+                self._acertos += 1
+                return automato_id
+            if self.armazenamento is None:
+                self._falhas += 1
+                return None
+
+        # Definição criada por outro worker ou antes de um reinício
+        automato_id = self.armazenamento.buscarPorHash(self.tipo, hash_conteudo)
+        with self._lock:
+            if automato_id is None:
+                self._falhas += 1
+            else:
+                self._acertos += 1
+        return automato_id
+
+    def derivado(self, automato_id: str, valor: dict, chave: str, construir):
+        """
+        Retorna um dado derivado de uma entrada, como uma tabela compilada
+        sob demanda, construindo-o na primeira chamada.
+
+        O dado fica guardado em `valor[chave]`, e seu tamanho estimado passa
+        a contar para o limite de bytes do registro. A construção é feita
+        fora do lock; se duas threads construírem o mesmo dado, fica o
+        primeiro guardado.
+
+        Args:
+            automato_id (str): ID da entrada
+            valor (dict): Entrada retornada por obter
+            chave (str): Chave em que o dado é guardado na entrada
+            construir: Função sem argumentos que constrói o dado
+
+        Returns:
+            O dado derivado
+        """
+        existente = valor.get(chave)
+        if existente is not None:
+            return existente
+
+        construido = construir()
+        tamanho = estimarTamanho(construido)
+        with self._lock:
+            existente = valor.get(chave)
+            if existente is not None:
+                return existente
+            valor[chave] = construido
+            # A entrada pode ter sido descartada ou recarregada do
+            # armazenamento desde o obter; nesse caso não há o que contabilizar
+            entrada = self._itens.get(automato_id)
+            if entrada is not None and entrada.valor is valor:
+                entrada.tamanho += tamanho
+                self._bytes += tamanho
+                self._descartarExcedentes()
+        return construido
+
+    def remover(self, automato_id: str) -> bool:
+        """Remove um autômato do registro e do armazenamento. Retorna False se ele não existir."""
+        with self._lock:
+            existia = automato_id in self._itens
+            if existia:
+                self._removerEntrada(automato_id)
+        if self.armazenamento is not None:
+            existia = self.armazenamento.remover(self.tipo, automato_id) or existia
+        return existia
+
+    def estatisticas(self) -> dict:
+        """Retorna a ocupação atual do registro e, se houver, do armazenamento."""
+        with self._lock:
+            estatisticas = {
+                "automatos": len(self._itens),
+                "bytes": self._bytes,
+                "max_automatos": self.max_itens,
+                "max_bytes": self.max_bytes,
+                "ttl_segundos": self.ttl,
+                "cache_acertos": self._acertos,
+                "cache_falhas": self._falhas
+            }
+        if self.armazenamento is not None:
+            estatisticas["armazenamento"] = self.armazenamento.nome
+            estatisticas["automatos_armazenados"] = self.armazenamento.contar(self.tipo)
+        return estatisticas
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def _inserir(self, automato_id: str, valor, tamanho: int, hash_conteudo: str | None):
+        # Deve ser chamado com o lock adquirido
+        self._itens[automato_id] = _Entrada(valor, tamanho, time.monotonic() + self.ttl, hash_conteudo)
+        self._bytes += tamanho
+        if hash_conteudo is not None:
+            self._por_hash[hash_conteudo] = automato_id
+        self._descartarExcedentes()
+
+    def _entradaValida(self, automato_id: str) -> _Entrada | None:
+        # Deve ser chamado com o lock adquirido
+        entrada = self._itens.get(automato_id)
+        if entrada is None:
+            return None
+
+        agora = time.monotonic()
+        if entrada.expira_em <= agora:
+            self._removerEntrada(automato_id)
+            return None
+
+        entrada.expira_em = agora + self.ttl
+        self._itens.move_to_end(automato_id)
+        return entrada
+
+    def _removerEntrada(self, automato_id: str):
+        entrada = self._itens.pop(automato_id)
+        self._bytes -= entrada.tamanho
+        if entrada.hash is not None and self._por_hash.get(entrada.hash) == automato_id:
+            del self._por_hash[entrada.hash]
+
+    def _descartarExcedentes(self):
+        # As entradas estão ordenadas do uso mais antigo para o mais recente,
+        # então as expiradas e as menos usadas ficam sempre no início.
+        agora = time.monotonic()
+        while self._itens:
+            automato_id, entrada = next(iter(self._itens.items()))
+            excedeu = len(self._itens) > self.max_itens or self._bytes > self.max_bytes
+            if not excedeu and entrada.expira_em > agora:
+                break
+            # Nunca descarta a entrada recém-adicionada
+            if len(self._itens) == 1:
+                break
+            self._removerEntrada(automato_id)
@@ -0,0 +1,318 @@
+"""
+Renderização e cache das visualizações geradas pelo Graphviz.
+As imagens são indexadas pelo hash do conteúdo do autômato, ficam em memória
+e em disco, e são servidas sem arquivos temporários. A renderização roda fora
+do event loop, com um número limitado de processos do Graphviz por vez.
+"""
+
+import asyncio
+import os
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import config
+from services.metricasService import medirFase
+
+# Formatos aceitos em /visualizar e seus media types
+FORMATOS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+    "dot": "text/vnd.graphviz; charset=utf-8"
+}
+
+
+class ErroRenderizacao(Exception):
+    """Falha ao renderizar um diagrama, com o status HTTP correspondente."""
+
+    def __init__(self, mensagem: str, codigo_http: int = 500):
+        super().__init__(mensagem)
+        self.codigo_http = codigo_http
+
+
+def etagsCorrespondem(if_none_match: str | None, etag: str) -> bool:
+    """
+    Verifica se o cabeçalho If-None-Match do cliente corresponde à ETag atual.
+
+    Aceita listas separadas por vírgula, ETags fracas (W/"...") e "*".
+    """
+    if not if_none_match:
+        return False
+    for candidata in if_none_match.split(","):
+        candidata = candidata.strip()
+        if candidata == "*" or candidata.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CacheRenderizacao:
+    """
+    Cache de imagens em dois níveis.
+
+    Em memória, mantém as imagens mais usadas até `max_bytes_memoria` (LRU).
+    Em disco, grava cada imagem em `diretorio` e remove as menos recentes
+    quando o total passa de `max_bytes_disco`. Sem diretório, usa só a memória.
+    """
+
+    def __init__(
+        self,
+        max_bytes_memoria: int = config.RENDER_CACHE_MEMORIA_MAX_BYTES,
+        diretorio: str | None = config.RENDER_CACHE_DIRETORIO,
+        max_bytes_disco: int = config.RENDER_CACHE_DISCO_MAX_BYTES
+    ):
+        self.max_bytes_memoria = max_bytes_memoria
+        self.diretorio = diretorio or None
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes_memoria = 0
+        self._bytes_disco: int | None = None  # Calculado na primeira gravação
+        self._acertos_memoria = 0
+        self._acertos_disco = 0
+        self._falhas = 0
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str, gerar: Callable[[], bytes]) -> bytes:
+        """
+        Retorna a imagem da chave, gerando-a com `gerar` apenas se não estiver em cache.
+
+        Args:
+            chave (str): Identificador do conteúdo (hash do autômato e formato)
+            gerar (Callable[[], bytes]): Função que renderiza a imagem
+
+        Returns:
+            bytes: Conteúdo da imagem
+        """
+        imagem = self.buscarMemoria(chave)
+        if imagem is not None:
+            return imagem
+
+        imagem = self._lerDisco(chave)
+        if imagem is not None:
+            with self._lock:
+                self._acertos_disco += 1
+        else:
+            imagem = gerar()
+            with self._lock:
+                self._falhas += 1
+            self._gravarDisco(chave, imagem)
+
+        self._guardarMemoria(chave, imagem)
+        return imagem
+
+    def buscarMemoria(self, chave: str) -> bytes | None:
+        """Retorna a imagem da chave se ela estiver no cache em memória."""
+        with self._lock:
+            imagem = self._memoria.get(chave)
+            if imagem is not None:
+                self._memoria.move_to_end(chave)
+                self._acertos_memoria += 1
+            return imagem
+
+    def estatisticas(self) -> dict:
+        """Retorna a ocupação e os contadores do cache."""
+        with self._lock:
+            return {
+                "imagens_memoria": len(self._memoria),
+                "bytes_memoria": self._bytes_memoria,
+                "bytes_disco": self._bytes_disco,
+                "acertos_memoria": self._acertos_memoria,
+                "acertos_disco": self._acertos_disco,
+                "falhas": self._falhas
+            }
+
+    def _guardarMemoria(self, chave: str, imagem: bytes):
+        if len(imagem) > self.max_bytes_memoria:
+            return
+        with self._lock:
+            if chave in self._memoria:
+                return
+            self._memoria[chave] = imagem
+            self._bytes_memoria += len(imagem)
+            while self._bytes_memoria > self.max_bytes_memoria:
+                _, descartada = self._memoria.popitem(last = False)
+                self._bytes_memoria -= len(descartada)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave)
+
+    def _lerDisco(self, chave: str) -> bytes | None:
+        if self.diretorio is None:
+            return None
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "rb") as arquivo:
+                imagem = arquivo.read()
+            os.utime(caminho)  # Marca como usada recentemente para o descarte
+            return imagem
+        except OSError:
+            return None
+
+    def _gravarDisco(self, chave: str, imagem: bytes):
+        if self.diretorio is None or len(imagem) > self.max_bytes_disco:
+            return
+        try:
+            os.makedirs(self.diretorio, exist_ok = True)
+            # Grava em arquivo temporário e renomeia, para que requisições
+            # simultâneas nunca leiam uma imagem incompleta
+            descritor, temporario = tempfile.mkstemp(dir = self.diretorio, prefix = ".tmp-")
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(imagem)
+            os.replace(temporario, self._caminho(chave))
+        except OSError:
+            return
+
+        with self._lock:
+            if self._bytes_disco is None:
+                self._bytes_disco = self._tamanhoDisco()
+            else:
+                self._bytes_disco += len(imagem)
+            if self._bytes_disco > self.max_bytes_disco:
+                self._liberarDisco()
+
+    def _arquivosDisco(self) -> list[os.DirEntry]:
+        try:
+            return [item for item in os.scandir(self.diretorio) if item.is_file() and not item.name.startswith(".tmp-")]
+        except OSError:
+            return []
+
+    def _tamanhoDisco(self) -> int:
+        return sum(item.stat().st_size for item in self._arquivosDisco())
+
+    def _liberarDisco(self):
+        # Remove os arquivos menos usados até ficar abaixo de 90% do limite
+        arquivos = sorted(self._arquivosDisco(), key = lambda item: item.stat().st_mtime)
+        total = sum(item.stat().st_size for item in arquivos)
+        for item in arquivos:
+            if total <= self.max_bytes_disco * 0.9:
+                break
+            try:
+                tamanho = item.stat().st_size
+                os.remove(item.path)
+                total -= tamanho
+            except OSError:
+                pass
+        self._bytes_disco = total
+
+
+cache = CacheRenderizacao()
+
+# Cada thread do pool acompanha um processo do Graphviz, então o pool limita
+# quantas renderizações rodam ao mesmo tempo sem ocupar o event loop
+_executor = ThreadPoolExecutor(max_workers = max(1, config.RENDER_WORKERS), thread_name_prefix = "render")
+_em_andamento: dict[str, asyncio.Future] = {}
+
+
+def _executarGraphviz(diagrama, formato: str) -> bytes:
+    """
+    Executa o Graphviz sobre o diagrama e retorna a saída no formato pedido.
+
+    Diagramas com mais de `RENDER_LIMITE_ELEMENTOS` nós e arestas usam o motor
+    `RENDER_MOTOR_GRANDE` e arestas retas, bem mais baratos que o layout do dot.
+    O processo é encerrado se passar de `RENDER_TIMEOUT_SEGUNDOS`.
+    """
+    motor = diagrama.engine
+    if len(diagrama.body) > config.RENDER_LIMITE_ELEMENTOS:
+        motor = config.RENDER_MOTOR_GRANDE
+        diagrama.graph_attr["splines"] = "line"
+
+    try:
+        processo = subprocess.run(
+            ["dot", f"-K{motor}", f"-T{formato}"],
+            input = diagrama.source.encode("utf-8"),
+            capture_output = True,
+            timeout = config.RENDER_TIMEOUT_SEGUNDOS
+        )
+    except FileNotFoundError:
+        raise ErroRenderizacao("Graphviz não está instalado no servidor")
+    except subprocess.TimeoutExpired:
+        raise ErroRenderizacao(f"A renderização excedeu {config.RENDER_TIMEOUT_SEGUNDOS:g} segundos", 504)
+
+    if processo.returncode != 0:
+        detalhe = processo.stderr.decode("utf-8", errors = "replace").strip()
+        raise ErroRenderizacao(f"Erro do Graphviz: {detalhe}")
+    return processo.stdout
+
+
+def _gerarImagem(tipo: str, gerar_diagrama: Callable, formato: str) -> bytes:
+    with medirFase(tipo, "renderizacao"):
+        diagrama = gerar_diagrama()
+        # O código-fonte é a própria saída, sem passar pelo Graphviz
+        if formato == "dot":
+            return diagrama.source.encode("utf-8")
+        return _executarGraphviz(diagrama, formato)
+
+
+async def _renderizarNoPool(tipo: str, chave: str, gerar_diagrama: Callable, formato: str) -> bytes:
+    # Requisições simultâneas pela mesma imagem aguardam a mesma renderização
+    tarefa = _em_andamento.get(chave)
+    if tarefa is None:
+        if len(_em_andamento) >= config.RENDER_FILA_MAX:
+            raise ErroRenderizacao("Fila de renderização cheia, tente novamente em instantes", 503)
+
+        loop = asyncio.get_running_loop()
+        tarefa = loop.run_in_executor(
+            _executor, cache.obter, chave, lambda: _gerarImagem(tipo, gerar_diagrama, formato)
+        )
+        _em_andamento[chave] = tarefa
+        tarefa.add_done_callback(lambda _: _em_andamento.pop(chave, None))
+
+    # shield: se o cliente desconectar, a renderização continua para os demais
+    return await asyncio.shield(tarefa)
+
+
+def estatisticas() -> dict:
+    """Retorna os contadores do cache e as renderizações em andamento."""
+    return {**cache.estatisticas(), "renderizacoes_em_andamento": len(_em_andamento)}
+
+
+async def renderizar(
+    tipo: str,
+    hash_conteudo: str,
+    gerar_diagrama: Callable,
+    formato: str = "png",
+    if_none_match: str | None = None
+) -> dict:
+    """
+    Obtém a imagem de um autômato, renderizando-a só se ainda não estiver em cache.
+
+    O formato "dot" devolve o código-fonte do diagrama sem executar o
+    Graphviz, mas, como os demais, é montado no pool e guardado no cache:
+    em autômatos grandes, montar o Digraph também é caro.
+
+    Args:
+        tipo (str): Tipo do autômato ("afd", "afn", "ap" ou "mt")
+        hash_conteudo (str): Hash canônico da definição do autômato
+        gerar_diagrama (Callable): Função que monta o Digraph do autômato
+        formato (str): "png", "svg", "pdf" ou "dot"
+        if_none_match (str | None): Cabeçalho If-None-Match enviado pelo cliente
+
+    Returns:
+        dict: Resultado com:
+            - etag: ETag da imagem
+            - media_type: Media type do formato
+            - imagem: Conteúdo da imagem, ou None se o cliente já possui
+              a versão atual (resposta 304)
+        ou, em caso de falha, erro e codigo_http
+    """
+    if formato not in FORMATOS:
+        return {"erro": f"Formato inválido: {formato}. Use {', '.join(FORMATOS)}", "codigo_http": 400}
+
+    etag = f'"{tipo}-{hash_conteudo}-{formato}"'
+    resultado = {"etag": etag, "media_type": FORMATOS[formato], "imagem": None}
+    if etagsCorrespondem(if_none_match, etag):
+        return resultado
+
+    chave = f"{tipo}-{hash_conteudo}.{formato}"
+    imagem = cache.buscarMemoria(chave)
+    if imagem is None:
+        try:
+            imagem = await _renderizarNoPool(tipo, chave, gerar_diagrama, formato)
+        except ErroRenderizacao as erro:
+            return {"erro": str(erro), "codigo_http": erro.codigo_http}
+
+    resultado["imagem"] = imagem
+    return resultado
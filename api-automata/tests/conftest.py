@@ -0,0 +1,105 @@
+"""
+Configuração comum dos testes: a API roda em processo, sem armazenamento
+persistente nem cache de visualizações em disco, e as definições de
+exemplo são as de testes.txt.
+"""
+
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["AUTOMATA_ARMAZENAMENTO"] = "memoria"
+os.environ["AUTOMATA_RENDER_CACHE_DIRETORIO"] = ""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+# Múltiplos de 3 em binário
+AFD = {
+    "estados": ["q0", "q1", "q2"],
+    "simbolos": ["0", "1"],
+    "transicoes": {
+        "q0": {"0": "q0", "1": "q1"},
+        "q1": {"0": "q2", "1": "q0"},
+        "q2": {"0": "q1", "1": "q2"}
+    },
+    "estado_inicial": "q0",
+    "estados_finais": ["q0"]
+}
+
+# Strings sobre {a, b} terminadas em ab
+AFN = {
+    "estados": ["p", "q", "r"],
+    "simbolos": ["a", "b"],
+    "transicoes": {"p": {"a": ["p", "q"], "b": ["p"]}, "q": {"b": ["r"]}, "r": {}},
+    "estado_inicial": "p",
+    "estados_finais": ["r"]
+}
+
+# a^n b^n
+AP = {
+    "estados": ["q0", "q1", "q2", "q_error"],
+    "simbolos_entrada": ["a", "b"],
+    "simbolos_pilha": ["A", "Z"],
+    "transitions": {
+        "q0": {
+            "a": {"Z": ["q0", ["A", "Z"]], "A": ["q0", ["A", "A"]]},
+            "b": {"Z": ["q_error", ["Z"]], "A": ["q1", []]}
+        },
+        "q1": {
+            "b": {"A": ["q1", []]},
+            "a": {"A": ["q_error", ["A"]]},
+            "": {"Z": ["q2", ["Z"]]}
+        },
+        "q_error": {}
+    },
+    "estado_inicial": "q0",
+    "simbolo_inicial_pilha": "Z",
+    "estados_finais": ["q2"]
+}
+
+# a^n b^n c^n
+MT = {
+    "estados": ["q0", "q1", "q2", "q3", "q4", "qf"],
+    "simbolos_entrada": ["a", "b", "c"],
+    "simbolos_fita": ["a", "b", "c", "X", "Y", "Z", ""],
+    "transicoes": {
+        "q0": {"a": ["q1", "X", "R"], "Y": ["q3", "Y", "R"], "b": ["q0", "b", "L"], "Z": ["q0", "Z", "L"]},
+        "q1": {"a": ["q1", "a", "R"], "b": ["q2", "Y", "R"], "Y": ["q1", "Y", "R"]},
+        "q2": {"b": ["q2", "b", "R"], "c": ["q4", "Z", "L"], "Z": ["q2", "Z", "R"]},
+        "q3": {"Y": ["q3", "Y", "R"], "Z": ["q3", "Z", "R"], "": ["qf", "", "R"]},
+        "q4": {"a": ["q4", "a", "L"], "X": ["q0", "X", "R"], "b": ["q4", "b", "L"], "Y": ["q4", "Y", "L"], "Z": ["q4", "Z", "L"]}
+    },
+    "estado_inicial": "q0",
+    "simbolo_branco": "",
+    "estados_finais": ["qf"]
+}
+
+
+@pytest.fixture(scope = "session")
+def cliente() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def afd() -> dict:
+    return copy.deepcopy(AFD)
+
+
+@pytest.fixture
+def afn() -> dict:
+    return copy.deepcopy(AFN)
+
+
+@pytest.fixture
+def ap() -> dict:
+    return copy.deepcopy(AP)
+
+
+@pytest.fixture
+def mt() -> dict:
+    return copy.deepcopy(MT)
@@ -0,0 +1,72 @@
+"""
+Comparação do AFD compilado (AfdCompilado), string a string e em lote com
+NumPy, com DFA.accepts_input.
+"""
+
+import random
+from importlib.util import find_spec
+
+import pytest
+from automata.fa.dfa import DFA
+
+import config
+from services import afdService
+from services.afdCompilado import AfdCompilado
+from services.registroService import RegistroAutomatos
+
+
+def afdAleatorio(rng: random.Random, quantidade_estados: int) -> DFA:
+    """AFD parcial: algumas transições ficam indefinidas."""
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    return DFA(
+        states = set(estados),
+        input_symbols = {"a", "b", "c"},
+        transitions = {
+            estado: {simbolo: rng.choice(estados) for simbolo in "abc" if rng.random() < 0.85}
+            for estado in estados
+        },
+        initial_state = "q0",
+        final_states = {estado for estado in estados if rng.random() < 0.4},
+        allow_partial = True
+    )
+
+
+@pytest.mark.parametrize("semente", range(40))
+def testCompiladoIgualAoAutomataLib(semente):
+    rng = random.Random(semente)
+    afd = afdAleatorio(rng, rng.randint(1, 8))
+    compilado = AfdCompilado.deAfd(afd)
+    # Strings de tamanhos variados, com símbolos fora do alfabeto em algumas
+    entradas = ["".join(rng.choice("abc" if rng.random() < 0.9 else "abcdé") for _ in range(rng.randint(0, 30))) for _ in range(300)]
+
+    esperado = [afd.accepts_input(entrada) for entrada in entradas]
+
+    assert [compilado.aceita(entrada) for entrada in entradas] == esperado
+    assert compilado.aceitaLote(entradas) == esperado
+    assert compilado.vetorizado == (find_spec("numpy") is not None)
+
+
+def testLoteVazioEStringVazia():
+    afd = afdAleatorio(random.Random(3), 4)
+    compilado = AfdCompilado.deAfd(afd)
+
+    assert compilado.aceitaLote([]) == []
+    assert compilado.aceitaLote(["", ""]) == [afd.accepts_input("")] * 2
+
+
+def testTabelaSobDemandaMontadaUmaVez(cliente, afd, monkeypatch):
+    """Com AUTOMATA_AFD_COMPILADO=0, a tabela montada no primeiro uso é reaproveitada e contabilizada."""
+    monkeypatch.setattr(config, "AFD_COMPILADO", False)
+    monkeypatch.setattr(afdService, "registro", RegistroAutomatos(tipo = "afd", armazenamento = None))
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    bytes_antes = afdService.registro.estatisticas()["bytes"]
+    compilacoes = []
+    deAfd = AfdCompilado.deAfd
+    monkeypatch.setattr(AfdCompilado, "deAfd", lambda automato: compilacoes.append(automato) or deAfd(automato))
+
+    cliente.post("/api/afd/rastrear", json = {"id": afd_id, "input": "1001"})
+    cliente.get("/api/afd/contar", params = {"id": afd_id, "comprimento": 5})
+    cliente.post("/api/afd/enumerar", json = {"id": afd_id, "limite": 3})
+
+    assert len(compilacoes) == 1
+    assert afdService.registro.estatisticas()["bytes"] > bytes_antes
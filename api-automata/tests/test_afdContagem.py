@@ -0,0 +1,203 @@
+"""
+Contagem e enumeração das strings aceitas por um AFD (afdOperacoes),
+comparadas com a força bruta.
+"""
+
+import itertools
+import json
+import random
+
+import pytest
+from automata.fa.dfa import DFA
+
+import config
+from services.afdCompilado import AfdCompilado
+from services.afdOperacoes import contarPalavras, enumerarPalavras
+
+MODULO = 1_000_000_007
+
+
+def afdAleatorio(rng: random.Random, quantidade_estados: int, simbolos: str = "ab") -> DFA:
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    return DFA(
+        states = set(estados),
+        input_symbols = set(simbolos),
+        transitions = {estado: {simbolo: rng.choice(estados) for simbolo in simbolos} for estado in estados},
+        initial_state = "q0",
+        final_states = {estado for estado in estados if rng.random() < 0.35}
+    )
+
+
+def _afdCiclo() -> DFA:
+    """a percorre 8 estados em ciclo e só a^(8k) é aceita; b leva a um estado morto."""
+    estados = [f"q{i}" for i in range(8)]
+    transicoes = {estado: {"a": estados[(i + 1) % 8], "b": "m"} for i, estado in enumerate(estados)}
+    transicoes["m"] = {"a": "m", "b": "m"}
+    return DFA(
+        states = set(estados) | {"m"},
+        input_symbols = {"a", "b"},
+        transitions = transicoes,
+        initial_state = "q0",
+        final_states = {"q0"}
+    )
+
+
+def _aceitas(afd: DFA, comprimento: int) -> list[str]:
+    simbolos = sorted(afd.input_symbols)
+    return [
+        "".join(letras) for letras in itertools.product(simbolos, repeat = comprimento)
+        if afd.accepts_input("".join(letras))
+    ]
+
+
+def _contarPorVetor(afd: DFA, comprimento: int, modulo: int) -> int:
+    """Contagem de referência: caminhos até cada estado, um símbolo por vez."""
+    vetor = {estado: 0 for estado in afd.states}
+    vetor[afd.initial_state] = 1
+    for _ in range(comprimento):
+        proximo = dict.fromkeys(afd.states, 0)
+        for estado, quantidade in vetor.items():
+            for destino in afd.transitions[estado].values():
+                proximo[destino] = (proximo[destino] + quantidade) % modulo
+        vetor = proximo
+    return sum(vetor[estado] for estado in afd.final_states) % modulo
+
+
+def _consumir(gerador, maximo: int) -> tuple[list[dict], dict | None]:
+    """Até `maximo` itens do gerador e o valor retornado, se ele terminar antes."""
+    itens = []
+    try:
+        while len(itens) < maximo:
+            itens.append(next(gerador))
+    except StopIteration as fim:
+        return itens, fim.value
+    return itens, None
+
+
+@pytest.mark.parametrize("semente", range(60))
+def testContagemIgualAForcaBruta(semente):
+    rng = random.Random(semente)
+    afd = afdAleatorio(rng, rng.randint(1, 6), rng.choice(["ab", "abc"]))
+    compilado = AfdCompilado.deAfd(afd)
+
+    for comprimento in range(7):
+        assert contarPalavras(compilado, comprimento)["total"] == len(_aceitas(afd, comprimento)), comprimento
+
+
+@pytest.mark.parametrize("semente", range(30))
+def testPotenciaDaMatrizIgualAoVetor(semente):
+    rng = random.Random(semente)
+    afd = afdAleatorio(rng, rng.randint(2, 5))
+    compilado = AfdCompilado.deAfd(afd)
+
+    resultado = contarPalavras(compilado, 3000, MODULO)
+
+    assert resultado["total"] == _contarPorVetor(afd, 3000, MODULO)
+    assert resultado["metodo"] in ("potencia_matriz", None)
+
+
+def testContagemAcimaDoLimiteDeOperacoes():
+    with pytest.raises(ValueError, match = "passaria de 10 operações"):
+        contarPalavras(AfdCompilado.deAfd(_afdCiclo()), 1000, MODULO, max_operacoes = 10)
+
+
+@pytest.mark.parametrize("semente", range(60))
+def testEnumeracaoIgualAForcaBruta(semente):
+    rng = random.Random(semente)
+    afd = afdAleatorio(rng, rng.randint(1, 6), rng.choice(["ab", "abc"]))
+    esperado = [palavra for comprimento in range(7) for palavra in _aceitas(afd, comprimento)]
+    compilado = AfdCompilado.deAfd(afd)
+
+    palavras, fim = _consumir(enumerarPalavras(compilado, max_comprimento = 6), 10**6)
+
+    assert [item["palavra"] for item in palavras] == esperado
+    assert [item["indice"] for item in palavras] == list(range(len(esperado)))
+    assert fim in ({"total": len(esperado)}, {"comprimento_maximo": 6})
+
+    inicio = len(esperado) // 2
+    a_partir, _ = _consumir(enumerarPalavras(compilado, inicio, max_comprimento = 6), 10**6)
+    assert a_partir == palavras[inicio:]
+
+
+def testLinguagemFinitaTerminaComTotal():
+    afd = DFA(
+        states = {"q0", "q1", "q2", "m"},
+        input_symbols = {"a", "b"},
+        transitions = {
+            "q0": {"a": "q1", "b": "q1"}, "q1": {"a": "q2", "b": "m"},
+            "q2": {"a": "m", "b": "m"}, "m": {"a": "m", "b": "m"}
+        },
+        initial_state = "q0",
+        final_states = {"q1", "q2"}
+    )
+
+    palavras, fim = _consumir(enumerarPalavras(AfdCompilado.deAfd(afd)), 100)
+
+    assert [item["palavra"] for item in palavras] == ["a", "b", "aa", "ba"]
+    assert fim == {"total": 4}
+
+
+def testEnumeracaoParaNoLimiteDeOperacoes():
+    """Cada comprimento percorrido, com ou sem strings aceitas, é cobrado do limite."""
+    # 8 estados úteis × 2 símbolos = 16 operações por comprimento, cobradas
+    # depois de gerar as strings dele: os comprimentos 0 a 40 são gerados
+    palavras, fim = _consumir(enumerarPalavras(AfdCompilado.deAfd(_afdCiclo()), max_operacoes = 16 * 40), 100)
+
+    assert fim == {"limite_operacoes": 16 * 40}
+    assert [item["palavra"] for item in palavras] == ["a" * comprimento for comprimento in range(0, 41, 8)]
+
+
+def _linhas(resposta) -> list[dict]:
+    assert resposta.status_code == 200
+    return [json.loads(linha) for linha in resposta.text.splitlines()]
+
+
+def testEndpointEnumerarSegueCursores(cliente, afd):
+    """Múltiplos de 3 em binário: as páginas concatenadas seguem a ordem shortlex."""
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    palavras = []
+    cursor = 0
+    while len(palavras) < 40:
+        *pagina, fim = _linhas(cliente.post("/api/afd/enumerar", json = {"id": afd_id, "cursor": cursor, "limite": 7}))
+        assert fim["fim"] is False
+        assert [item["indice"] for item in pagina] == list(range(cursor, cursor + 7))
+        palavras.extend(item["palavra"] for item in pagina)
+        cursor = fim["proximo_cursor"]
+
+    esperado = sorted(
+        (palavra for comprimento in range(8) for palavra in map("".join, itertools.product("01", repeat = comprimento))
+         if int(palavra or "0", 2) % 3 == 0),
+        key = lambda palavra: (len(palavra), palavra)
+    )
+    assert palavras == esperado[:len(palavras)]
+    assert cliente.get("/api/afd/enumerar", params = {"id": afd_id, "cursor": 7, "limite": 7}).text == \
+        cliente.post("/api/afd/enumerar", json = {"id": afd_id, "cursor": 7, "limite": 7}).text
+
+
+def testEndpointEnumerarTerminaNoLimiteDeOperacoes(cliente, afd, monkeypatch):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    monkeypatch.setattr(config, "AFD_CONTAGEM_MAX_OPERACOES", 30)
+
+    *pagina, fim = _linhas(cliente.post("/api/afd/enumerar", json = {"id": afd_id, "limite": 1000}))
+
+    assert fim == {"fim": True, "limite_operacoes": 30}
+    assert len(pagina) > 0
+
+
+def testEndpointContarRecusaContagensGrandes(cliente, afd, monkeypatch):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+
+    sem_modulo = cliente.get("/api/afd/contar", params = {"id": afd_id, "comprimento": config.AFD_CONTAGEM_MAX_COMPRIMENTO + 1})
+    monkeypatch.setattr(config, "AFD_CONTAGEM_MAX_OPERACOES", 10)
+    acima_do_limite = cliente.get("/api/afd/contar", params = {"id": afd_id, "comprimento": 500, "modulo": 7})
+
+    assert "erro" in sem_modulo.json()
+    assert "passaria de 10 operações" in acima_do_limite.json()["erro"]
+
+
+def testEndpointContar(cliente, afd):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+
+    resultado = cliente.get("/api/afd/contar", params = {"id": afd_id, "comprimento": 6}).json()
+
+    assert resultado["total"] == sum(1 for valor in range(2 ** 6) if valor % 3 == 0)
@@ -0,0 +1,121 @@
+"""
+Compilação de expressões regulares em AFDs (afdRegex), comparada com re.fullmatch.
+"""
+
+import itertools
+import random
+import re
+
+import pytest
+from automata.fa.dfa import DFA
+
+import config
+from services.afdRegex import compilarRegex
+
+ALFABETO = "abc"
+
+
+def expressaoAleatoria(rng: random.Random, profundidade: int = 0) -> str:
+    """Expressão com a mesma interpretação na sintaxe de afdRegex e na do módulo re."""
+    if profundidade >= 3 or rng.random() < 0.3:
+        return rng.choice(["a", "b", "c", ".", "[ab]", "[^a]", "[a-b]", "[bc]", "()"])
+    escolha = rng.random()
+    if escolha < 0.35:
+        return "".join(expressaoAleatoria(rng, profundidade + 1) for _ in range(rng.randint(2, 3)))
+    if escolha < 0.6:
+        ramos = [expressaoAleatoria(rng, profundidade + 1) for _ in range(rng.randint(2, 3))]
+        if rng.random() < 0.15:
+            ramos.append("")
+        return "(" + "|".join(ramos) + ")"
+    # Repetições sempre sobre um grupo: o módulo re não aceita a** nem a*{2}
+    sufixo = rng.choice(["*", "+", "?", "{2}", "{0,2}", "{1,}", "{2,3}"])
+    return "(" + expressaoAleatoria(rng, profundidade + 1) + ")" + sufixo
+
+
+def _aceita(definicao: dict, entrada: str) -> bool:
+    estado = definicao["estado_inicial"]
+    for simbolo in entrada:
+        estado = definicao["transicoes"][estado][simbolo]
+    return estado in definicao["estados_finais"]
+
+
+def _entradas(max_comprimento: int):
+    for comprimento in range(max_comprimento + 1):
+        for letras in itertools.product(ALFABETO, repeat = comprimento):
+            yield "".join(letras)
+
+
+@pytest.mark.parametrize("semente", range(150))
+def testAfdIgualAoModuloRe(semente):
+    padrao = expressaoAleatoria(random.Random(semente))
+    definicao, relatorio = compilarRegex(padrao, set(ALFABETO))
+    compilada = re.compile(padrao)
+
+    for entrada in _entradas(5):
+        assert _aceita(definicao, entrada) == (compilada.fullmatch(entrada) is not None), (padrao, entrada)
+    assert relatorio["estados"] == len(definicao["estados"])
+
+
+@pytest.mark.parametrize("semente", range(0, 150, 10))
+def testAfdEMinimo(semente):
+    padrao = expressaoAleatoria(random.Random(semente))
+    definicao, _ = compilarRegex(padrao, set(ALFABETO))
+
+    afd = DFA(
+        states = set(definicao["estados"]),
+        input_symbols = set(definicao["simbolos"]),
+        transitions = definicao["transicoes"],
+        initial_state = definicao["estado_inicial"],
+        final_states = set(definicao["estados_finais"])
+    )
+    assert len(afd.minify().states) == len(definicao["estados"])
+
+
+@pytest.mark.parametrize("padrao", [r"a\.b", r"[\]a]+", r"\(", r"(a|)b", r"[a-c]{3}", r"[^ab]*c"])
+def testEscapesEClasses(padrao):
+    definicao, _ = compilarRegex(padrao, set("abc.()]"))
+    compilada = re.compile(padrao)
+
+    for comprimento in range(4):
+        for letras in itertools.product("abc.()]", repeat = comprimento):
+            entrada = "".join(letras)
+            assert _aceita(definicao, entrada) == (compilada.fullmatch(entrada) is not None), entrada
+
+
+@pytest.mark.parametrize("padrao, mensagem", [
+    ("a(b", "Falta ')'"),
+    ("a{3,1}", "máximo menor"),
+    ("d", "fora do alfabeto"),
+    ("*a", "Caractere inesperado"),
+    ("a{2", "sem '}'"),
+])
+def testExpressoesInvalidas(padrao, mensagem):
+    with pytest.raises(ValueError, match = re.escape(mensagem)):
+        compilarRegex(padrao, set(ALFABETO))
+
+
+def testLimiteDeEstados():
+    with pytest.raises(ValueError, match = "Repetição acima de 10"):
+        compilarRegex("a{11}", set(ALFABETO), max_estados = 10)
+    with pytest.raises(ValueError, match = "20 estados"):
+        compilarRegex("(a|b)*a(a|b){5}", set(ALFABETO), max_estados = 20)
+
+
+def testEndpointReaproveitaExpressaoCompilada(cliente):
+    corpo = {"padrao": "(ab|c)*a?", "simbolos": ["a", "b", "c"]}
+    primeira = cliente.post("/api/afd/regex", json = corpo).json()
+    segunda = cliente.post("/api/afd/regex", json = corpo).json()
+
+    assert segunda["id"] == primeira["id"]
+    assert segunda["reutilizado"] is True
+    for entrada, aceita in [("", True), ("abca", True), ("ac", False), ("abab", True), ("ba", False)]:
+        resultado = cliente.post("/api/afd/testar", json = {"id": primeira["id"], "input": entrada}).json()
+        assert resultado["aceita"] is aceita, entrada
+
+
+def testEndpointRecusaExpressaoGrandeDemais(cliente, monkeypatch):
+    monkeypatch.setattr(config, "AFD_OPERACOES_MAX_ESTADOS", 50)
+
+    resposta = cliente.post("/api/afd/regex", json = {"padrao": "a{100}", "simbolos": ["a"]})
+
+    assert "Repetição acima de 50" in resposta.json()["erro"]
@@ -0,0 +1,108 @@
+"""
+Comparação do AP determinístico compilado (ApCompilado) com DPDA.read_input_stepwise.
+
+O automata-lib não para em laços de transições vazias; a execução de
+referência é cortada em LIMITE_CONFIGURACOES, e só nesse caso o AP
+compilado deve terminar com "laco_epsilon".
+"""
+
+import itertools
+import random
+from itertools import islice
+
+import pytest
+from automata.base.exceptions import RejectionException
+from automata.pda.dpda import DPDA
+
+from services.apCompilado import ApCompilado, LACO_EPSILON
+
+LIMITE_CONFIGURACOES = 500
+
+
+def apAleatorio(rng: random.Random, quantidade_estados: int, modo_aceitacao: str) -> DPDA:
+    """
+    DPDA com transições sorteadas. Cada par (estado, topo) recebe uma
+    transição vazia ou transições que leem a entrada, nunca os dois.
+    """
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    transicoes = {estado: {} for estado in estados}
+    for estado, topo in itertools.product(estados, "ZAB"):
+        simbolos = [""] if rng.random() < 0.3 else [s for s in "ab" if rng.random() < 0.8]
+        for simbolo in simbolos:
+            empilhar = tuple(rng.choice("ZAB") for _ in range(rng.choice((0, 1, 1, 2))))
+            transicoes[estado].setdefault(simbolo, {})[topo] = (rng.choice(estados), empilhar)
+    return DPDA(
+        states = set(estados),
+        input_symbols = {"a", "b"},
+        stack_symbols = {"Z", "A", "B"},
+        transitions = transicoes,
+        initial_state = "q0",
+        initial_stack_symbol = "Z",
+        final_states = {estado for estado in estados if rng.random() < 0.4},
+        acceptance_mode = modo_aceitacao
+    )
+
+
+def executarReferencia(ap: DPDA, entrada: str) -> dict | None:
+    """Resultado pelo automata-lib, ou None se a execução não terminar dentro do limite."""
+    configuracoes = []
+    try:
+        for configuracao in islice(ap.read_input_stepwise(entrada), LIMITE_CONFIGURACOES):
+            configuracoes.append(configuracao)
+        aceita = True
+    except RejectionException:
+        aceita = False
+    else:
+        if len(configuracoes) == LIMITE_CONFIGURACOES:
+            return None
+
+    return {
+        "aceita": aceita,
+        "estado_final": configuracoes[-1].state,
+        "passos": len(configuracoes) - 1,
+        "max_altura_pilha": max(len(configuracao.stack.stack) for configuracao in configuracoes)
+    }
+
+
+@pytest.mark.parametrize("modo_aceitacao", ["final_state", "empty_stack", "both"])
+@pytest.mark.parametrize("semente", range(30))
+def testCompiladoIgualAoAutomataLib(semente, modo_aceitacao):
+    rng = random.Random(semente)
+    ap = apAleatorio(rng, rng.randint(1, 4), modo_aceitacao)
+    compilado = ApCompilado.deAp(ap)
+
+    for comprimento in range(5):
+        for letras in itertools.product("ab", repeat = comprimento):
+            entrada = "".join(letras)
+            esperado = executarReferencia(ap, entrada)
+            obtido = compilado.executar(entrada)
+            if esperado is None:
+                assert obtido["situacao"] == LACO_EPSILON, (semente, entrada)
+                assert obtido["aceita"] is False
+            else:
+                assert obtido["situacao"] != LACO_EPSILON, (semente, entrada)
+                assert {chave: obtido[chave] for chave in esperado} == esperado, (semente, entrada)
+
+
+def testExemploDeTestesTxt(ap):
+    dpda = DPDA(
+        states = set(ap["estados"]),
+        input_symbols = set(ap["simbolos_entrada"]),
+        stack_symbols = set(ap["simbolos_pilha"]),
+        transitions = {
+            estado: {
+                simbolo: {topo: (destino, tuple(empilhar)) for topo, (destino, empilhar) in por_topo.items()}
+                for simbolo, por_topo in por_simbolo.items()
+            }
+            for estado, por_simbolo in ap["transitions"].items()
+        },
+        initial_state = ap["estado_inicial"],
+        initial_stack_symbol = ap["simbolo_inicial_pilha"],
+        final_states = set(ap["estados_finais"])
+    )
+    compilado = ApCompilado.deAp(dpda)
+
+    for entrada in ["", "ab", "aabb", "aaabbb", "aab", "abb", "ba", "abab"]:
+        esperado = executarReferencia(dpda, entrada)
+        obtido = compilado.executar(entrada)
+        assert {chave: obtido[chave] for chave in esperado} == esperado, entrada
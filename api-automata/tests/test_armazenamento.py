@@ -0,0 +1,82 @@
+"""
+Armazenamento persistente: entradas gravadas por um registro são lidas por
+outro, como após um reinício ou em outro worker.
+"""
+
+import pytest
+
+from services import afdService, apService, mtService, armazenamentoService
+from services.registroService import RegistroAutomatos
+
+BACKENDS = ["sqlite", "arquivos"]
+
+
+@pytest.fixture(params = BACKENDS)
+def armazenamento(request, tmp_path):
+    return armazenamentoService.criarArmazenamento(request.param, str(tmp_path))
+
+
+def testEntradaSobreviveAoReinicio(armazenamento):
+    registro = RegistroAutomatos(tipo = "afd", armazenamento = armazenamento)
+    automato_id = registro.adicionar({"valor": [1, 2, 3], "hash": "a" * 64}, 100, "a" * 64)
+
+    reiniciado = RegistroAutomatos(tipo = "afd", armazenamento = armazenamento)
+
+    assert len(reiniciado) == 0
+    assert reiniciado.buscarPorHash("a" * 64) == automato_id
+    assert reiniciado.obter(automato_id) == {"valor": [1, 2, 3], "hash": "a" * 64}
+    assert reiniciado.estatisticas()["bytes"] == 100
+
+
+def testTiposNaoSeMisturam(armazenamento):
+    automato_id = RegistroAutomatos(tipo = "afd", armazenamento = armazenamento).adicionar({"hash": None})
+
+    assert RegistroAutomatos(tipo = "mt", armazenamento = armazenamento).obter(automato_id) is None
+    assert armazenamento.contar("afd") == 1
+    assert armazenamento.contar("mt") == 0
+
+
+def testRemoverApagaDoArmazenamento(armazenamento):
+    registro = RegistroAutomatos(tipo = "afd", armazenamento = armazenamento)
+    automato_id = registro.adicionar({"hash": "b" * 64}, 0, "b" * 64)
+
+    assert registro.remover(automato_id) is True
+
+    reiniciado = RegistroAutomatos(tipo = "afd", armazenamento = armazenamento)
+    assert reiniciado.obter(automato_id) is None
+    assert reiniciado.buscarPorHash("b" * 64) is None
+    assert registro.remover(automato_id) is False
+
+
+def testEntradaDescartadaDaMemoriaContinuaDisponivel(armazenamento):
+    registro = RegistroAutomatos(max_itens = 1, tipo = "afd", armazenamento = armazenamento)
+    primeiro = registro.adicionar({"n": 1})
+    registro.adicionar({"n": 2})
+
+    assert len(registro) == 1
+    assert registro.obter(primeiro) == {"n": 1}
+
+
+@pytest.mark.parametrize("automato_id", ["../../etc/passwd", "0" * 31, "", "G" * 32])
+def testIdsForaDoFormatoNaoSaoProcurados(armazenamento, automato_id):
+    assert RegistroAutomatos(tipo = "afd", armazenamento = armazenamento).obter(automato_id) is None
+
+
+@pytest.mark.parametrize("tipo, servico, exemplo, entrada, esperado", [
+    ("afd", afdService, "afd", "110", True),
+    ("ap", apService, "ap", "aabb", True),
+    ("mt", mtService, "mt", "aabbcc", True),
+])
+def testAutomatoCriadoPelaApiFuncionaAposReinicio(
+    cliente, request, monkeypatch, armazenamento, tipo, servico, exemplo, entrada, esperado
+):
+    """As tabelas compiladas são restauradas junto com a entrada, sem nova criação."""
+    monkeypatch.setattr(servico, "registro", RegistroAutomatos(tipo = tipo, armazenamento = armazenamento))
+    automato_id = cliente.post(f"/api/{tipo}/criar", json = request.getfixturevalue(exemplo)).json()["id"]
+
+    monkeypatch.setattr(servico, "registro", RegistroAutomatos(tipo = tipo, armazenamento = armazenamento))
+    resultado = cliente.post(f"/api/{tipo}/testar", json = {"id": automato_id, "input": entrada}).json()
+
+    assert resultado["aceita"] is esperado
+    assert len(servico.registro) == 1
+    assert cliente.get(f"/api/{tipo}/info", params = {"id": automato_id}).status_code == 200
@@ -0,0 +1,76 @@
+"""
+Modo acelerado da MT (MtCompilada.executarAcelerada): mesmo resultado da
+execução passo a passo, exceto quando detecta que a MT não vai parar.
+"""
+
+import random
+import time
+
+import pytest
+
+import config
+from services import mtService
+from services.mtCompilada import MtCompilada
+from services.registroService import RegistroAutomatos
+from test_mtCompilada import mtAleatoria, _entradas
+
+
+@pytest.mark.parametrize("semente", range(40))
+def testAceleradaIgualAExecucaoPassoAPasso(semente):
+    rng = random.Random(semente)
+    compilada = MtCompilada.deMt(mtAleatoria(rng, rng.randint(1, 5)))
+    prazo = time.monotonic() + 60
+
+    for entrada in _entradas(4):
+        for max_passos, max_celulas in ((2000, 1000), (2000, 6), (7, 1000)):
+            esperado = compilada.executar(entrada, max_passos, prazo, max_celulas)
+            obtido = compilada.executarAcelerada(entrada, max_passos, prazo, max_celulas)
+            assert obtido.pop("macro_passos") <= max(obtido["passos"], 1)
+            if obtido["situacao"] == "laco":
+                # Uma configuração repetida: a execução passo a passo só para em um limite
+                assert esperado["situacao"] == "limite_excedido", (semente, entrada)
+                assert obtido["aceita"] is False
+            else:
+                assert obtido == esperado, (semente, entrada, max_passos, max_celulas)
+
+
+def testAceleradaAtravessaSequenciasEmMacroPassos():
+    """Percorrer uma sequência longa de um mesmo símbolo custa poucos macropassos."""
+    from automata.tm.dtm import DTM
+    mt = DTM(
+        states = {"q0", "q1", "qf"},
+        input_symbols = {"a"},
+        tape_symbols = {"a", "_"},
+        transitions = {"q0": {"a": ("q0", "a", "R"), "_": ("q1", "_", "L")}, "q1": {"a": ("q1", "a", "L"), "_": ("qf", "_", "R")}},
+        initial_state = "q0",
+        blank_symbol = "_",
+        final_states = {"qf"}
+    )
+    compilada = MtCompilada.deMt(mt)
+    prazo = time.monotonic() + 60
+
+    resultado = compilada.executarAcelerada("a" * 10_000, 100_000, prazo, 100_000)
+
+    assert resultado["aceita"] is True
+    assert resultado["passos"] == 20_002
+    assert resultado["macro_passos"] < 10
+
+
+def testAceleradaSemCompilacaoCompilaUmaVez(cliente, mt, monkeypatch):
+    """Com AUTOMATA_MT_COMPILADA=0, a tabela do modo acelerado é montada uma vez por MT."""
+    monkeypatch.setattr(config, "MT_COMPILADA", False)
+    monkeypatch.setattr(mtService, "registro", RegistroAutomatos(tipo = "mt", armazenamento = None))
+    mt_id = cliente.post("/api/mt/criar", json = mt).json()["id"]
+    compilacoes = []
+    deMt = MtCompilada.deMt
+    monkeypatch.setattr(MtCompilada, "deMt", lambda maquina: compilacoes.append(maquina) or deMt(maquina))
+
+    for entrada in ["abc", "aabbcc", "aabc"]:
+        cliente.post("/api/mt/testar", json = {"id": mt_id, "input": entrada, "acelerada": True})
+    cliente.post("/api/mt/testar-lote", json = {"id": mt_id, "inputs": ["ab", "abcc"], "acelerada": True})
+    sem_aceleracao = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": "aaabbbccc", "acelerada": False}).json()
+
+    assert len(compilacoes) == 1
+    assert sem_aceleracao["aceita"] is True
+    bytes_registro = mtService.registro.estatisticas()["bytes"]
+    assert bytes_registro > cliente.get("/api/mt/info", params = {"id": mt_id}).json()["memoria"]["total_bytes"]
@@ -0,0 +1,73 @@
+"""
+Comparação da MT compilada (MtCompilada) com a execução pelo automata-lib.
+"""
+
+import itertools
+import random
+import time
+
+import pytest
+from automata.tm.dtm import DTM
+
+from services.mtCompilada import MtCompilada
+from services.mtService import _executarMt
+
+SIMBOLOS_FITA = ["a", "b", "X", "_"]
+
+
+def mtAleatoria(rng: random.Random, quantidade_estados: int) -> DTM:
+    """DTM com transições sorteadas; alguns pares (estado, símbolo) ficam sem transição."""
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    transicoes = {}
+    for estado in estados:
+        transicoes[estado] = {
+            simbolo: (rng.choice(estados + ["qf"]), rng.choice(SIMBOLOS_FITA), rng.choice("LRN"))
+            for simbolo in SIMBOLOS_FITA
+            if rng.random() < 0.85
+        }
+    return DTM(
+        states = set(estados) | {"qf"},
+        input_symbols = {"a", "b"},
+        tape_symbols = set(SIMBOLOS_FITA),
+        transitions = transicoes,
+        initial_state = "q0",
+        blank_symbol = "_",
+        final_states = {"qf"}
+    )
+
+
+def _entradas(max_comprimento: int):
+    for comprimento in range(max_comprimento + 1):
+        for letras in itertools.product("ab", repeat = comprimento):
+            yield "".join(letras)
+
+
+@pytest.mark.parametrize("semente", range(40))
+def testCompiladaIgualAoAutomataLib(semente):
+    rng = random.Random(semente)
+    mt = mtAleatoria(rng, rng.randint(1, 5))
+    compilada = MtCompilada.deMt(mt)
+    prazo = time.monotonic() + 60
+
+    for entrada in _entradas(4):
+        for max_passos, max_celulas in ((300, 1000), (300, 6), (7, 1000)):
+            esperado = _executarMt(mt, entrada, max_passos, prazo, max_celulas)
+            obtido = compilada.executar(entrada, max_passos, prazo, max_celulas)
+            assert obtido == esperado, (semente, entrada, max_passos, max_celulas)
+
+
+def testExemploDeTestesTxt(mt):
+    maquina = DTM(
+        states = set(mt["estados"]),
+        input_symbols = set(mt["simbolos_entrada"]),
+        tape_symbols = set(mt["simbolos_fita"]),
+        transitions = {estado: {lido: tuple(acao) for lido, acao in linha.items()} for estado, linha in mt["transicoes"].items()},
+        initial_state = mt["estado_inicial"],
+        blank_symbol = mt["simbolo_branco"],
+        final_states = set(mt["estados_finais"])
+    )
+    compilada = MtCompilada.deMt(maquina)
+    prazo = time.monotonic() + 60
+
+    for entrada in ["", "abc", "aabbcc", "aaabbbccc", "aabbc", "abcabc", "cba"]:
+        assert compilada.executar(entrada, 10_000, prazo, 1000) == _executarMt(maquina, entrada, 10_000, prazo, 1000)
@@ -0,0 +1,98 @@
+"""
+Limites de passos, tempo e fita na execução de MTs.
+"""
+
+import pytest
+
+import config
+
+# Alterna entre duas células para sempre, sem aumentar a fita
+MT_VAI_E_VOLTA = {
+    "estados": ["q0", "q1", "qf"],
+    "simbolos_entrada": ["a"],
+    "simbolos_fita": ["a", ""],
+    "transicoes": {"q0": {"a": ["q1", "a", "R"]}, "q1": {"": ["q0", "", "L"]}},
+    "estado_inicial": "q0",
+    "simbolo_branco": "",
+    "estados_finais": ["qf"]
+}
+
+# Anda para a direita para sempre, ocupando uma célula nova a cada passo
+MT_SEM_FIM = {
+    "estados": ["q0", "qf"],
+    "simbolos_entrada": ["a"],
+    "simbolos_fita": ["a", ""],
+    "transicoes": {"q0": {"a": ["q0", "a", "R"], "": ["q0", "", "R"]}},
+    "estado_inicial": "q0",
+    "simbolo_branco": "",
+    "estados_finais": ["qf"]
+}
+
+
+def _criar(cliente, definicao) -> str:
+    return cliente.post("/api/mt/criar", json = definicao).json()["id"]
+
+
+@pytest.mark.parametrize("entrada, aceita", [("aabbcc", True), ("aabbc", False), ("", False)])
+def testMtQueParaNaoAtingeLimites(cliente, mt, entrada, aceita):
+    mt_id = _criar(cliente, mt)
+
+    resultado = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": entrada}).json()
+
+    assert resultado["aceita"] is aceita
+    assert resultado["situacao"] == ("aceita" if aceita else "rejeitada")
+    assert resultado["limite"] is None
+
+
+def testLimiteDePassos(cliente):
+    mt_id = _criar(cliente, MT_VAI_E_VOLTA)
+
+    resultado = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": "a", "max_passos": 50}).json()
+
+    assert resultado["situacao"] == "limite_excedido"
+    assert resultado["limite"] == "passos"
+    assert resultado["passos"] == 50
+    assert resultado["aceita"] is False
+
+
+def testLimiteDeFita(cliente):
+    mt_id = _criar(cliente, MT_SEM_FIM)
+
+    resultado = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": "a", "max_celulas": 20}).json()
+
+    assert resultado["situacao"] == "limite_excedido"
+    assert resultado["limite"] == "fita"
+    # A execução para no passo em que a fita passa do limite
+    assert resultado["max_celulas_fita"] == 21
+
+
+def testLimiteDeTempo(cliente):
+    mt_id = _criar(cliente, MT_VAI_E_VOLTA)
+
+    resultado = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": "a", "max_segundos": 0.001}).json()
+
+    assert resultado["situacao"] == "limite_excedido"
+    assert resultado["limite"] == "tempo"
+    assert resultado["cache"] is False
+
+
+def testLimiteInformadoNaoAumentaOGlobal(cliente, monkeypatch):
+    mt_id = _criar(cliente, MT_VAI_E_VOLTA)
+    monkeypatch.setattr(config, "MT_MAX_PASSOS", 10)
+
+    resultado = cliente.post("/api/mt/testar", json = {"id": mt_id, "input": "a", "max_passos": 1000}).json()
+
+    assert resultado["limite"] == "passos"
+    assert resultado["passos"] == 10
+
+
+def testLimitesNoLote(cliente):
+    """No lote, os limites de passos valem para cada string."""
+    mt_id = _criar(cliente, MT_VAI_E_VOLTA)
+
+    resultado = cliente.post(
+        "/api/mt/testar-lote", json = {"id": mt_id, "inputs": ["a", "", "aa"], "max_passos": 30}
+    ).json()
+
+    assert resultado["situacoes"] == ["limite_excedido", "rejeitada", "rejeitada"]
+    assert resultado["passos"][0] == 30
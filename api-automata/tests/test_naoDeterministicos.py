@@ -0,0 +1,167 @@
+"""
+Comparação dos executores não determinísticos (AfnCompilado e
+ApnCompilado) com o automata-lib.
+"""
+
+import itertools
+import random
+from itertools import islice
+
+import pytest
+from automata.base.exceptions import RejectionException
+from automata.fa.nfa import NFA
+from automata.pda.npda import NPDA
+
+from services.afnCompilado import AfnCompilado
+from services.apnCompilado import ApnCompilado, ACEITA, REJEITADA
+
+# Níveis de NPDA.read_input_stepwise percorridos antes de desistir da referência
+LIMITE_NIVEIS = 200
+
+
+def _entradas(max_comprimento: int):
+    for comprimento in range(max_comprimento + 1):
+        for letras in itertools.product("ab", repeat = comprimento):
+            yield "".join(letras)
+
+
+def afnAleatorio(rng: random.Random, quantidade_estados: int) -> NFA:
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    transicoes = {}
+    for estado in estados:
+        transicoes[estado] = {}
+        for simbolo in ("a", "b", ""):
+            destinos = {destino for destino in estados if rng.random() < (0.15 if simbolo == "" else 0.3)}
+            if destinos:
+                transicoes[estado][simbolo] = destinos
+    return NFA(
+        states = set(estados),
+        input_symbols = {"a", "b"},
+        transitions = transicoes,
+        initial_state = "q0",
+        final_states = {estado for estado in estados if rng.random() < 0.3}
+    )
+
+
+@pytest.mark.parametrize("max_conjuntos_cache", [0, 3, 1000])
+@pytest.mark.parametrize("semente", range(30))
+def testAfnCompiladoIgualAoAutomataLib(semente, max_conjuntos_cache):
+    rng = random.Random(semente)
+    afn = afnAleatorio(rng, rng.randint(1, 6))
+    compilado = AfnCompilado.deAfn(afn, max_conjuntos_cache)
+
+    for entrada in _entradas(6):
+        assert compilado.aceita(entrada) == afn.accepts_input(entrada), (semente, entrada)
+    assert compilado.conjuntosEmCache <= max_conjuntos_cache
+
+
+def apnAleatorio(rng: random.Random, quantidade_estados: int, modo_aceitacao: str) -> NPDA:
+    """
+    NPDA com transições sorteadas. As transições vazias empilham no máximo
+    um símbolo no lugar do topo, de modo que as configurações alcançáveis
+    são finitas e podem ser percorridas por aceitaReferencia.
+    """
+    estados = [f"q{i}" for i in range(quantidade_estados)]
+    transicoes = {estado: {} for estado in estados}
+    for estado, simbolo, topo in itertools.product(estados, ("a", "b", ""), "ZAB"):
+        opcoes = set()
+        for _ in range(rng.choice((0, 0, 1, 1, 2))):
+            maximo = 1 if simbolo == "" else 2
+            empilhar = tuple(rng.choice("ZAB") for _ in range(rng.randint(0, maximo)))
+            opcoes.add((rng.choice(estados), empilhar))
+        if opcoes:
+            transicoes[estado].setdefault(simbolo, {})[topo] = opcoes
+    return NPDA(
+        states = set(estados),
+        input_symbols = {"a", "b"},
+        stack_symbols = {"Z", "A", "B"},
+        transitions = transicoes,
+        initial_state = "q0",
+        initial_stack_symbol = "Z",
+        final_states = {estado for estado in estados if rng.random() < 0.3},
+        acceptance_mode = modo_aceitacao
+    )
+
+
+def aceitaReferencia(ap: NPDA, entrada: str) -> bool:
+    """Busca exaustiva nas configurações (estado, posição, pilha) alcançáveis."""
+    inicial = (ap.initial_state, 0, (ap.initial_stack_symbol,))
+    vistas = {inicial}
+    pendentes = [inicial]
+    while pendentes:
+        estado, posicao, pilha = pendentes.pop()
+        if posicao == len(entrada):
+            if ap.acceptance_mode in ("empty_stack", "both") and not pilha:
+                return True
+            if ap.acceptance_mode in ("final_state", "both") and estado in ap.final_states:
+                return True
+        topo = pilha[-1] if pilha else ""
+        simbolos = [("", posicao)]
+        if posicao < len(entrada):
+            simbolos.append((entrada[posicao], posicao + 1))
+        for simbolo, proxima in simbolos:
+            for destino, empilhar in ap.transitions.get(estado, {}).get(simbolo, {}).get(topo, ()):
+                configuracao = (destino, proxima, pilha[:-1] + tuple(reversed(empilhar)))
+                if configuracao not in vistas:
+                    vistas.add(configuracao)
+                    pendentes.append(configuracao)
+    return False
+
+
+def aceitaAutomataLib(ap: NPDA, entrada: str) -> bool | None:
+    """Resultado de NPDA.read_input_stepwise, ou None se não terminar em LIMITE_NIVEIS níveis."""
+    niveis = 0
+    try:
+        for _ in islice(ap.read_input_stepwise(entrada), LIMITE_NIVEIS):
+            niveis += 1
+    except RejectionException:
+        return False
+    return None if niveis == LIMITE_NIVEIS else True
+
+
+@pytest.mark.parametrize("modo_aceitacao", ["final_state", "empty_stack", "both"])
+@pytest.mark.parametrize("semente", range(20))
+def testApnCompiladoIgualAoAutomataLib(semente, modo_aceitacao):
+    rng = random.Random(semente)
+    ap = apnAleatorio(rng, rng.randint(1, 3), modo_aceitacao)
+    compilado = ApnCompilado.deAp(ap)
+
+    for entrada in _entradas(4):
+        esperado = aceitaReferencia(ap, entrada)
+        automata_lib = aceitaAutomataLib(ap, entrada)
+        assert automata_lib in (None, esperado), (semente, entrada)
+
+        obtido = compilado.executar(entrada, 100_000)
+        assert obtido["aceita"] == esperado, (semente, entrada)
+        assert obtido["situacao"] == (ACEITA if esperado else REJEITADA)
+
+
+def testApnComLacoVazioQueEmpilha():
+    """
+    Um laço de transições vazias que empilha sem parar não impede a busca
+    de terminar: o AP empilha um A por b e aceita exatamente b^n, n >= 1.
+    """
+    ap = NPDA(
+        states = {"q0", "q1", "qf"},
+        input_symbols = {"a", "b"},
+        stack_symbols = {"Z", "A"},
+        transitions = {
+            "q0": {
+                "": {"Z": {("q0", ("A", "Z"))}, "A": {("q0", ("A", "A"))}},
+                "b": {"A": {("q1", ())}}
+            },
+            "q1": {
+                "b": {"A": {("q1", ())}},
+                "": {"Z": {("qf", ("Z",))}}
+            }
+        },
+        initial_state = "q0",
+        initial_stack_symbol = "Z",
+        final_states = {"qf"},
+        acceptance_mode = "final_state"
+    )
+    compilado = ApnCompilado.deAp(ap)
+
+    for entrada in _entradas(6):
+        esperado = len(entrada) > 0 and set(entrada) == {"b"}
+        assert compilado.executar(entrada, 100_000)["aceita"] == esperado, entrada
@@ -0,0 +1,124 @@
+"""
+Paginação de /rastrear: seguir os cursores página a página deve produzir
+exatamente o mesmo rastreamento que uma página única.
+"""
+
+import json
+
+import pytest
+
+import config
+from services import mtService
+from services.mtCompilada import MtCompilada
+from services.registroService import RegistroAutomatos
+
+CASOS = [
+    ("afd", "afd", "1101101"),
+    ("ap", "ap", "aaabbb"),
+    ("ap", "ap", "aabbb"),
+    ("mt", "mt", "aabbcc"),
+    ("mt", "mt", "aabcc"),
+]
+
+
+def _linhas(resposta) -> list[dict]:
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(linha) for linha in resposta.text.splitlines()]
+
+
+def _seguirCursores(cliente, tipo: str, corpo: dict, limite: int) -> tuple[list[dict], dict, int]:
+    """Retorna as configurações de todas as páginas, a linha final e a quantidade de páginas."""
+    configuracoes = []
+    cursor = 0
+    paginas = 0
+    while True:
+        linhas = _linhas(cliente.post(f"/api/{tipo}/rastrear", json = {**corpo, "cursor": cursor, "limite": limite}))
+        paginas += 1
+        *pagina, fim = linhas
+        assert len(pagina) <= limite
+        configuracoes.extend(pagina)
+        if fim["fim"]:
+            return configuracoes, fim, paginas
+        assert fim["proximo_cursor"] > cursor
+        cursor = fim["proximo_cursor"]
+
+
+@pytest.mark.parametrize("limite", [1, 2, 3, 7])
+@pytest.mark.parametrize("tipo, exemplo, entrada", CASOS)
+def testPaginasConcatenadasIguaisAPaginaUnica(cliente, request, tipo, exemplo, entrada, limite):
+    automato_id = cliente.post(f"/api/{tipo}/criar", json = request.getfixturevalue(exemplo)).json()["id"]
+    corpo = {"id": automato_id, "input": entrada}
+
+    *completo, fim_completo = _linhas(cliente.post(f"/api/{tipo}/rastrear", json = corpo))
+    paginado, fim_paginado, paginas = _seguirCursores(cliente, tipo, corpo, limite)
+
+    assert fim_completo["fim"] is True
+    assert paginado == completo
+    assert fim_paginado == fim_completo
+    # A última página cheia já traz o resultado, sem uma página vazia depois
+    assert paginas == max(1, -(-len(completo) // limite))
+
+
+@pytest.mark.parametrize("tipo, exemplo, entrada", CASOS)
+def testGetIgualAoPost(cliente, request, tipo, exemplo, entrada):
+    automato_id = cliente.post(f"/api/{tipo}/criar", json = request.getfixturevalue(exemplo)).json()["id"]
+    parametros = {"id": automato_id, "input": entrada, "cursor": 2, "limite": 3}
+
+    assert cliente.get(f"/api/{tipo}/rastrear", params = parametros).text == \
+        cliente.post(f"/api/{tipo}/rastrear", json = parametros).text
+
+
+def testLimiteDaPaginaNaoPassaDoGlobal(cliente, afd, monkeypatch):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    monkeypatch.setattr(config, "RASTREIO_PAGINA_MAX", 2)
+
+    *pagina, fim = _linhas(cliente.post("/api/afd/rastrear", json = {"id": afd_id, "input": "10101", "limite": 100}))
+
+    assert len(pagina) == 2
+    assert fim == {"fim": False, "proximo_cursor": pagina[-1]["passo"] + 1}
+
+
+def testCursorAlemDoFimDevolveSoOResultado(cliente, afd):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+
+    linhas = _linhas(cliente.post("/api/afd/rastrear", json = {"id": afd_id, "input": "11", "cursor": 50}))
+
+    assert len(linhas) == 1
+    assert linhas[0]["fim"] is True
+    assert linhas[0]["aceita"] is True
+
+
+def testRastreioDeMtRespeitaOLimiteDePassos(cliente, mt, monkeypatch):
+    """Uma página da MT que não para termina com o limite global de passos."""
+    mt["transicoes"]["q0"]["c"] = ["q0", "c", "N"]
+    mt_id = cliente.post("/api/mt/criar", json = mt).json()["id"]
+    monkeypatch.setattr(config, "MT_MAX_PASSOS", 20)
+
+    configuracoes, fim, _ = _seguirCursores(cliente, "mt", {"id": mt_id, "input": "c"}, 6)
+
+    assert [configuracao["passo"] for configuracao in configuracoes] == list(range(21))
+    assert fim["situacao"] == "limite_excedido"
+    assert fim["limite"] == "passos"
+
+
+def testMtSemCompilacaoCompilaUmaVezParaTodasAsPaginas(cliente, mt, monkeypatch):
+    """Com AUTOMATA_MT_COMPILADA=0, a tabela montada na primeira página é reaproveitada nas seguintes."""
+    monkeypatch.setattr(config, "MT_COMPILADA", False)
+    monkeypatch.setattr(mtService, "registro", RegistroAutomatos(tipo = "mt", armazenamento = None))
+    mt_id = cliente.post("/api/mt/criar", json = mt).json()["id"]
+    compilacoes = []
+    deMt = MtCompilada.deMt
+    monkeypatch.setattr(MtCompilada, "deMt", lambda maquina: compilacoes.append(maquina) or deMt(maquina))
+
+    _, _, paginas = _seguirCursores(cliente, "mt", {"id": mt_id, "input": "aabbcc"}, 5)
+
+    assert paginas > 1
+    assert len(compilacoes) == 1
+
+
+@pytest.mark.parametrize("tipo", ["afd", "ap", "mt"])
+def testIdInexistente(cliente, tipo):
+    resposta = cliente.post(f"/api/{tipo}/rastrear", json = {"id": "0" * 32, "input": ""})
+
+    assert "erro" in resposta.json()
@@ -0,0 +1,64 @@
+"""
+Reaproveitamento de autômatos com a mesma definição (hash de conteúdo).
+"""
+
+import pytest
+
+from services import afdService, afnService, apService, mtService, armazenamentoService
+from services.registroService import RegistroAutomatos
+
+TIPOS = [
+    ("afd", afdService, "afd"),
+    ("afn", afnService, "afn"),
+    ("ap", apService, "ap"),
+    ("mt", mtService, "mt"),
+]
+
+
+@pytest.mark.parametrize("tipo, servico, exemplo", TIPOS)
+def testDefinicaoIdenticaReaproveitaId(cliente, request, tipo, servico, exemplo):
+    """Criar duas vezes a mesma definição devolve o mesmo ID."""
+    definicao = request.getfixturevalue(exemplo)
+    primeira = cliente.post(f"/api/{tipo}/criar", json = definicao).json()
+    segunda = cliente.post(f"/api/{tipo}/criar", json = definicao).json()
+
+    assert "erro" not in primeira
+    assert segunda["id"] == primeira["id"]
+    assert segunda["reutilizado"] is True
+
+
+@pytest.mark.parametrize("tipo, servico, exemplo", TIPOS)
+def testEntradaIlegivelNoArmazenamentoEReconstruida(cliente, request, monkeypatch, tmp_path, tipo, servico, exemplo):
+    """
+    Um hash encontrado no armazenamento cuja entrada não pode ser carregada
+    não é devolvido: o autômato é construído de novo com outro ID.
+    """
+    definicao = request.getfixturevalue(exemplo)
+    armazenamento = armazenamentoService.criarArmazenamento("sqlite", str(tmp_path))
+    monkeypatch.setattr(servico, "registro", RegistroAutomatos(tipo = tipo, armazenamento = armazenamento))
+    original = cliente.post(f"/api/{tipo}/criar", json = definicao).json()["id"]
+
+    # Outro worker, com a memória vazia, encontra a entrada corrompida
+    armazenamento.salvar(tipo, original, servico.registro._itens[original].hash, 0, b"corrompido")
+    monkeypatch.setattr(servico, "registro", RegistroAutomatos(tipo = tipo, armazenamento = armazenamento))
+    reconstruido = cliente.post(f"/api/{tipo}/criar", json = definicao).json()
+
+    assert reconstruido["id"] != original
+    assert reconstruido["reutilizado"] is False
+    assert cliente.get(f"/api/{tipo}/info", params = {"id": reconstruido["id"]}).status_code == 200
+
+    repetido = cliente.post(f"/api/{tipo}/criar", json = definicao).json()
+    assert repetido["id"] == reconstruido["id"]
+    assert repetido["reutilizado"] is True
+
+
+def testEdicaoIgualAUmAutomatoExistenteReaproveitaId(cliente, afd):
+    """Uma edição que produz um AFD já registrado devolve o ID dele."""
+    original = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    alterado = dict(afd, estados_finais = ["q0", "q1"])
+    existente = cliente.post("/api/afd/criar", json = alterado).json()["id"]
+
+    editado = cliente.patch("/api/afd/editar", json = {"id": original, "adicionar_finais": ["q1"]}).json()
+
+    assert editado["id"] == existente
+    assert editado["reutilizado"] is True
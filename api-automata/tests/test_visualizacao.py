@@ -0,0 +1,78 @@
+"""
+Visualizações: cache, ETag e limite da fila de renderização.
+
+Só o formato "dot" é usado, já que ele não depende do executável do Graphviz.
+"""
+
+import pytest
+
+import config
+from services import visualizacaoService
+from services.visualizacaoService import CacheRenderizacao
+
+
+@pytest.fixture(autouse = True)
+def cacheVazio(monkeypatch):
+    cache = CacheRenderizacao(diretorio = None)
+    monkeypatch.setattr(visualizacaoService, "cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize("tipo, exemplo", [("afd", "afd"), ("afn", "afn"), ("ap", "ap"), ("mt", "mt")])
+def testDotEMontadoUmaVezEServidoDoCache(cliente, request, cacheVazio, tipo, exemplo):
+    """O código-fonte DOT passa pelo cache: a segunda requisição não o monta de novo."""
+    automato_id = cliente.post(f"/api/{tipo}/criar", json = request.getfixturevalue(exemplo)).json()["id"]
+
+    primeira = cliente.get(f"/api/{tipo}/visualizar", params = {"id": automato_id, "formato": "dot"})
+    segunda = cliente.get(f"/api/{tipo}/visualizar", params = {"id": automato_id, "formato": "dot"})
+
+    assert primeira.status_code == 200
+    assert primeira.text.lstrip().startswith("digraph")
+    assert segunda.content == primeira.content
+    estatisticas = cacheVazio.estatisticas()
+    assert estatisticas["falhas"] == 1
+    assert estatisticas["acertos_memoria"] == 1
+
+
+def testEtagCorrespondenteDevolve304(cliente, afd):
+    """Com If-None-Match igual à ETag, a resposta é 304 sem corpo."""
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    resposta = cliente.get("/api/afd/visualizar", params = {"id": afd_id, "formato": "dot"})
+
+    repetida = cliente.get(
+        "/api/afd/visualizar",
+        params = {"id": afd_id, "formato": "dot"},
+        headers = {"If-None-Match": resposta.headers["ETag"]}
+    )
+
+    assert repetida.status_code == 304
+    assert repetida.content == b""
+
+
+def testFilaCheiaDevolve503(cliente, afd, monkeypatch):
+    """Sem vaga na fila de renderização, uma imagem fora do cache devolve 503."""
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    monkeypatch.setattr(config, "RENDER_FILA_MAX", 0)
+
+    resposta = cliente.get("/api/afd/visualizar", params = {"id": afd_id, "formato": "dot"})
+
+    assert resposta.status_code == 503
+
+
+def testImagemEmCacheNaoUsaAFila(cliente, afd, monkeypatch):
+    """Uma imagem já em cache é servida mesmo com a fila de renderização cheia."""
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+    assert cliente.get("/api/afd/visualizar", params = {"id": afd_id, "formato": "dot"}).status_code == 200
+    monkeypatch.setattr(config, "RENDER_FILA_MAX", 0)
+
+    resposta = cliente.get("/api/afd/visualizar", params = {"id": afd_id, "formato": "dot"})
+
+    assert resposta.status_code == 200
+
+
+def testFormatoInvalidoDevolve400(cliente, afd):
+    afd_id = cliente.post("/api/afd/criar", json = afd).json()["id"]
+
+    resposta = cliente.get("/api/afd/visualizar", params = {"id": afd_id, "formato": "gif"})
+
+    assert resposta.status_code == 400